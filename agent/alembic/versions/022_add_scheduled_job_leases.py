@@ -0,0 +1,28 @@
+"""Add lease_expires_at to scheduled_jobs for SKIP LOCKED job claiming.
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-16
+"""
+
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "scheduled_jobs",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("scheduled_jobs", "lease_expires_at")
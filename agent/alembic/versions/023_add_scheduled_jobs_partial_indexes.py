@@ -0,0 +1,49 @@
+"""Replace the full (status, next_run_at) index on scheduled_jobs with partial
+indexes over active jobs for the due-job scan, stale sweep and workflow lookups.
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-16
+"""
+
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_scheduled_jobs_active_next_run",
+        "scheduled_jobs",
+        ["next_run_at"],
+        postgresql_where=sa.text("status = 'active'"),
+        postgresql_include=["id", "lease_expires_at"],
+    )
+    op.create_index(
+        "ix_scheduled_jobs_active_created",
+        "scheduled_jobs",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'active' AND job_type <> 'cron'"),
+    )
+    op.create_index(
+        "ix_scheduled_jobs_active_workflow",
+        "scheduled_jobs",
+        ["workflow_id"],
+        postgresql_where=sa.text("status = 'active' AND workflow_id IS NOT NULL"),
+    )
+    # Superseded: it also indexed every finished job
+    op.drop_index("ix_scheduled_jobs_status_next_run", table_name="scheduled_jobs")
+
+
+def downgrade() -> None:
+    op.create_index("ix_scheduled_jobs_status_next_run", "scheduled_jobs", ["status", "next_run_at"])
+    op.drop_index("ix_scheduled_jobs_active_workflow", table_name="scheduled_jobs")
+    op.drop_index("ix_scheduled_jobs_active_created", table_name="scheduled_jobs")
+    op.drop_index("ix_scheduled_jobs_active_next_run", table_name="scheduled_jobs")
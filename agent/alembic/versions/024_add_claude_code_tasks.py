@@ -0,0 +1,82 @@
+"""Add claude_code_tasks — the claude_code task registry, replacing the
+per-workspace task_meta_<id>.json files.
+
+Existing metadata files are imported by the claude_code module on startup.
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-16
+"""
+
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "024"
+down_revision: Union[str, None] = "023"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "claude_code_tasks",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("repo_url", sa.String(), nullable=True),
+        sa.Column("branch", sa.String(), nullable=True),
+        sa.Column("source_branch", sa.String(), nullable=True),
+        sa.Column("workspace", sa.String(), nullable=False, server_default=""),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("mode", sa.String(), nullable=False, server_default="execute"),
+        sa.Column("auto_push", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("parent_task_id", sa.String(), nullable=True),
+        sa.Column("group_id", sa.String(), nullable=True),
+        sa.Column("continue_session", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("peak_context_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latest_context_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("num_compactions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("num_turns_tracked", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("num_continuations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("context_model", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_claude_code_tasks_user_created", "claude_code_tasks", ["user_id", "created_at"])
+    op.create_index(
+        "ix_claude_code_tasks_user_status_created",
+        "claude_code_tasks",
+        ["user_id", "status", "created_at"],
+    )
+    op.create_index("ix_claude_code_tasks_parent", "claude_code_tasks", ["parent_task_id"])
+    op.create_index("ix_claude_code_tasks_workspace", "claude_code_tasks", ["workspace"])
+    op.create_index(
+        "ix_claude_code_tasks_group",
+        "claude_code_tasks",
+        ["group_id"],
+        postgresql_where=sa.text("group_id IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_claude_code_tasks_active",
+        "claude_code_tasks",
+        ["status"],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claude_code_tasks_active", table_name="claude_code_tasks")
+    op.drop_index("ix_claude_code_tasks_group", table_name="claude_code_tasks")
+    op.drop_index("ix_claude_code_tasks_workspace", table_name="claude_code_tasks")
+    op.drop_index("ix_claude_code_tasks_parent", table_name="claude_code_tasks")
+    op.drop_index("ix_claude_code_tasks_user_status_created", table_name="claude_code_tasks")
+    op.drop_index("ix_claude_code_tasks_user_created", table_name="claude_code_tasks")
+    op.drop_table("claude_code_tasks")
@@ -4,22 +4,26 @@ from __future__ import annotations
 
 import asyncio
 import io
+import time
 
 import httpx
 import redis.asyncio as aioredis
 import structlog
 import discord
 from discord import Intents
-from minio import Minio
 
 from comms.discord_bot.normalizer import DiscordNormalizer
 from shared.auth import get_service_auth_headers
 from shared.config import Settings
-from shared.file_utils import upload_attachment
+from shared.file_utils import MAX_UPLOAD_SIZE_BYTES, upload_attachment
 from shared.schemas.notifications import Notification
+from shared.storage import get_storage
 
 logger = structlog.get_logger()
 
+# Minimum seconds between status edits driven by streamed token deltas
+_DELTA_EDIT_INTERVAL = 1.0
+
 
 class AgentDiscordBot(discord.Client):
     """Discord bot that routes messages to the orchestrator."""
@@ -32,12 +36,7 @@ class AgentDiscordBot(discord.Client):
 
         self.settings = settings
         self.normalizer = DiscordNormalizer()
-        self.minio = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=False,
-        )
+        self.storage = get_storage(settings)
         self._notification_task: asyncio.Task | None = None
 
     async def on_ready(self):
@@ -122,6 +121,9 @@ class AgentDiscordBot(discord.Client):
         response: AgentResponse | None = None
         status_lines: list[str] = []
         last_edit_text = ""
+        last_edit_at = 0.0
+        # Index of the status line that token deltas are appended to
+        streaming_line: int | None = None
 
         try:
             async with httpx.AsyncClient(
@@ -143,6 +145,8 @@ class AgentDiscordBot(discord.Client):
                             if not event_type:
                                 continue
 
+                            if event_type != "content":
+                                streaming_line = None
                             if event_type == "thinking":
                                 iteration = event_data.get("iteration", 1)
                                 if iteration == 1:
@@ -151,7 +155,16 @@ class AgentDiscordBot(discord.Client):
                                     status_lines.append("🔄 Thinking...")
                             elif event_type == "content":
                                 text = event_data.get("text", "")
-                                if text:
+                                if event_data.get("delta"):
+                                    # Token deltas extend one line; a reset
+                                    # discards what was streamed so far
+                                    if streaming_line is None:
+                                        status_lines.append("")
+                                        streaming_line = len(status_lines) - 1
+                                    if event_data.get("reset"):
+                                        status_lines[streaming_line] = ""
+                                    status_lines[streaming_line] += text
+                                elif text:
                                     status_lines.append(text)
                             elif event_type == "tool_call":
                                 tool = event_data.get("tool", "")
@@ -177,13 +190,20 @@ class AgentDiscordBot(discord.Client):
                                     error=event_data.get("error"),
                                 )
 
-                            # Edit the status message (throttle to avoid rate limits)
+                            # Edit the status message (throttle to avoid rate limits;
+                            # token deltas arrive far faster than Discord allows edits)
                             if event_type in ("thinking", "content", "tool_call", "tool_result"):
+                                if (
+                                    event_data.get("delta")
+                                    and time.monotonic() - last_edit_at < _DELTA_EDIT_INTERVAL
+                                ):
+                                    continue
                                 new_text = "\n".join(status_lines[-15:])  # Keep last 15 lines
                                 if new_text and new_text != last_edit_text:
                                     try:
                                         await status_msg.edit(content=new_text[:2000])
                                         last_edit_text = new_text
+                                        last_edit_at = time.monotonic()
                                     except discord.HTTPException:
                                         pass  # Rate limited, skip this edit
         except Exception as e:
@@ -272,26 +292,25 @@ class AgentDiscordBot(discord.Client):
     async def _ingest_attachments(
         self, message: discord.Message, platform_user_id: str
     ) -> list[dict]:
-        """Download Discord attachments and upload to MinIO."""
-        ingested = []
-        for attachment in message.attachments:
+        """Download Discord attachments and upload to MinIO (concurrently)."""
+
+        async def ingest(attachment: discord.Attachment) -> dict | None:
             try:
+                # Reject before downloading rather than after
+                if attachment.size > MAX_UPLOAD_SIZE_BYTES:
+                    raise ValueError(f"File too large: {attachment.size} bytes")
                 data = await attachment.read()
-                info = upload_attachment(
-                    minio_client=self.minio,
-                    bucket=self.settings.minio_bucket,
-                    public_url_base=self.settings.minio_public_url,
-                    raw_bytes=data,
-                    filename=attachment.filename,
-                )
-                ingested.append(info)
+                return await upload_attachment(self.storage, data, attachment.filename)
             except Exception as e:
                 logger.error(
                     "discord_attachment_ingest_failed",
                     filename=attachment.filename,
                     error=str(e),
                 )
-        return ingested
+                return None
+
+        results = await asyncio.gather(*(ingest(a) for a in message.attachments))
+        return [info for info in results if info]
 
     async def _download_files(self, files: list[dict]) -> list[discord.File]:
         """Download files from MinIO and return as discord.File objects."""
@@ -299,28 +318,22 @@ class AgentDiscordBot(discord.Client):
         if not files:
             return attachments
 
-        public_prefix = self.settings.minio_public_url.rstrip("/") + "/"
-
+        # Resolve MinIO object keys from the public URLs
+        wanted = []
         for f in files:
-            url = f.get("url", "")
-            filename = f.get("filename", "file")
-            try:
-                # Extract the MinIO object key from the public URL
-                if url.startswith(public_prefix):
-                    key = url[len(public_prefix) :]
-                else:
-                    logger.warning("unknown_file_url_format", url=url)
-                    continue
-
-                # Download from MinIO using internal Docker network
-                resp = self.minio.get_object(self.settings.minio_bucket, key)
-                data = resp.read()
-                resp.close()
-                resp.release_conn()
-
-                attachments.append(discord.File(io.BytesIO(data), filename=filename))
-                logger.info("file_attached", filename=filename, size=len(data))
-            except Exception as e:
-                logger.error("file_download_failed", filename=filename, error=str(e))
+            key = self.storage.key_from_public_url(f.get("url", ""))
+            if key is None:
+                logger.warning("unknown_file_url_format", url=f.get("url", ""))
+                continue
+            wanted.append((f.get("filename", "file"), key))
+
+        # Download from MinIO using internal Docker network
+        results = await self.storage.get_many(key for _, key in wanted)
+        for (filename, _), data in zip(wanted, results):
+            if isinstance(data, Exception):
+                logger.error("file_download_failed", filename=filename, error=str(data))
+                continue
+            attachments.append(discord.File(io.BytesIO(data), filename=filename))
+            logger.info("file_attached", filename=filename, size=len(data))
 
         return attachments
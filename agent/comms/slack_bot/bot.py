@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import time
 
 import httpx
 import redis.asyncio as aioredis
 import structlog
 from fastapi import FastAPI, Request
-from minio import Minio
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
 from slack_bolt.oauth.async_oauth_settings import AsyncOAuthSettings
@@ -24,13 +24,17 @@ from comms.slack_bot.oauth_state_store import RedisOAuthStateStore
 from shared.auth import get_service_auth_headers
 from shared.config import Settings
 from shared.database import get_session_factory
-from shared.file_utils import upload_attachment
+from shared.file_utils import upload_attachment_stream
 from shared.models.slack_installation import SlackInstallation
 from shared.schemas.messages import AgentResponse
 from shared.schemas.notifications import Notification
+from shared.storage import get_storage
 
 logger = structlog.get_logger()
 
+# Minimum seconds between status updates driven by streamed token deltas
+_DELTA_UPDATE_INTERVAL = 1.0
+
 
 class _ProxyAwareStateUtils(OAuthStateUtils):
     """Skip cookie-based browser check when behind a reverse proxy.
@@ -50,12 +54,7 @@ class AgentSlackBot:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.normalizer = SlackNormalizer()
-        self.minio = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=False,
-        )
+        self.storage = get_storage(settings)
         self.session_factory = get_session_factory()
         self.redis = aioredis.from_url(settings.redis_url)
 
@@ -250,6 +249,9 @@ class AgentSlackBot:
                     pass
 
             last_streamed_text = ""
+            last_update_at = 0.0
+            # Index of the status line that token deltas are appended to
+            streaming_line: int | None = None
             # For native streaming, track lines already sent so we only
             # send deltas (appendStream APPENDS, doesn't replace).
             lines_sent_count = 0
@@ -273,6 +275,8 @@ class AgentSlackBot:
                                 if not event_type:
                                     continue
 
+                                if event_type != "content":
+                                    streaming_line = None
                                 if event_type == "thinking":
                                     pass  # stream already started
                                 elif event_type == "content":
@@ -281,7 +285,16 @@ class AgentSlackBot:
                                     # Only track for the fallback (chat_update) path.
                                     if not use_native_stream:
                                         text = event_data.get("text", "")
-                                        if text:
+                                        if event_data.get("delta"):
+                                            # Token deltas extend one line; a reset
+                                            # discards what was streamed so far
+                                            if streaming_line is None:
+                                                status_lines.append("")
+                                                streaming_line = len(status_lines) - 1
+                                            if event_data.get("reset"):
+                                                status_lines[streaming_line] = ""
+                                            status_lines[streaming_line] += text
+                                        elif text:
                                             status_lines.append(text)
                                 elif event_type == "tool_call":
                                     tool = event_data.get("tool", "")
@@ -324,9 +337,14 @@ class AgentSlackBot:
                                             except Exception:
                                                 pass
                                     else:
-                                        # chat_update REPLACES — send full text
+                                        # chat_update REPLACES — send full text;
+                                        # token deltas are throttled
                                         new_text = "\n".join(status_lines[-15:])
-                                        if new_text and new_text != last_streamed_text:
+                                        throttled = (
+                                            event_data.get("delta")
+                                            and time.monotonic() - last_update_at < _DELTA_UPDATE_INTERVAL
+                                        )
+                                        if new_text and new_text != last_streamed_text and not throttled:
                                             try:
                                                 await client.chat_update(
                                                     channel=channel_id,
@@ -334,6 +352,7 @@ class AgentSlackBot:
                                                     text=new_text[:3000],
                                                 )
                                                 last_streamed_text = new_text
+                                                last_update_at = time.monotonic()
                                             except Exception:
                                                 pass
             except Exception as e_stream:
@@ -482,49 +501,41 @@ class AgentSlackBot:
             return False
 
     async def _ingest_attachments(self, event: dict, client) -> list[dict]:
-        """Download Slack file attachments and upload to MinIO."""
-        ingested = []
+        """Stream Slack file attachments into MinIO (concurrently)."""
         if "files" not in event:
-            return ingested
+            return []
 
-        for f in event["files"]:
+        # Use the workspace-scoped client token for authorization
+        headers = {"Authorization": f"Bearer {client.token}"}
+
+        async def ingest(http_client: httpx.AsyncClient, f: dict) -> dict | None:
             url = f.get("url_private", "")
             filename = f.get("name", "file")
             if not url:
-                continue
-
+                return None
             try:
-                # Use the workspace-scoped client token for authorization
-                token = client.token
-                async with httpx.AsyncClient(timeout=30.0) as http_client:
-                    resp = await http_client.get(
-                        url,
-                        headers={
-                            "Authorization": f"Bearer {token}"
-                        },
-                    )
+                async with http_client.stream("GET", url, headers=headers) as resp:
                     if resp.status_code != 200:
                         logger.warning(
                             "slack_file_download_failed", status=resp.status_code
                         )
-                        continue
-                    raw_bytes = resp.content
-
-                info = upload_attachment(
-                    minio_client=self.minio,
-                    bucket=self.settings.minio_bucket,
-                    public_url_base=self.settings.minio_public_url,
-                    raw_bytes=raw_bytes,
-                    filename=filename,
-                )
-                ingested.append(info)
+                        return None
+                    return await upload_attachment_stream(
+                        self.storage, resp.aiter_bytes(), filename,
+                    )
             except Exception as e:
                 logger.error(
                     "slack_attachment_ingest_failed",
                     filename=filename,
                     error=str(e),
                 )
-        return ingested
+                return None
+
+        async with httpx.AsyncClient(timeout=30.0) as http_client:
+            results = await asyncio.gather(
+                *(ingest(http_client, f) for f in event["files"])
+            )
+        return [info for info in results if info]
 
     async def _upload_response_file(
         self, client, channel: str, thread_ts: str, f: dict
@@ -532,18 +543,13 @@ class AgentSlackBot:
         """Download a response file from MinIO and upload to Slack."""
         url = f.get("url", "")
         filename = f.get("filename", "file")
-        public_prefix = self.settings.minio_public_url.rstrip("/") + "/"
 
         try:
-            if url.startswith(public_prefix):
-                key = url[len(public_prefix):]
-            else:
+            key = self.storage.key_from_public_url(url)
+            if key is None:
                 return
 
-            resp = self.minio.get_object(self.settings.minio_bucket, key)
-            data = resp.read()
-            resp.close()
-            resp.release_conn()
+            data = await self.storage.get_bytes(key)
 
             await client.files_upload_v2(
                 channel=channel,
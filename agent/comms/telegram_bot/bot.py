@@ -9,7 +9,6 @@ import re
 import httpx
 import redis.asyncio as aioredis
 import structlog
-from minio import Minio
 from telegram import Update
 from telegram.ext import (
     Application,
@@ -25,6 +24,7 @@ from shared.config import Settings
 from shared.file_utils import upload_attachment
 from shared.schemas.messages import AgentResponse
 from shared.schemas.notifications import Notification
+from shared.storage import get_storage
 
 logger = structlog.get_logger()
 
@@ -45,12 +45,7 @@ class AgentTelegramBot:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.normalizer = TelegramNormalizer()
-        self.minio = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=False,
-        )
+        self.storage = get_storage(settings)
         self.app = (
             Application.builder()
             .token(settings.telegram_token)
@@ -207,9 +202,7 @@ class AgentTelegramBot:
             await message.reply_document(document=data, filename=fname)
 
     async def _ingest_attachments(self, message, context) -> list[dict]:
-        """Download Telegram attachments and upload to MinIO."""
-        ingested = []
-
+        """Download Telegram attachments and upload to MinIO (concurrently)."""
         items = []
         if message.document:
             items.append((message.document.file_id, message.document.file_name or "document"))
@@ -217,26 +210,21 @@ class AgentTelegramBot:
             # Largest photo resolution
             items.append((message.photo[-1].file_id, "photo.jpg"))
 
-        for file_id, filename in items:
+        async def ingest(file_id: str, filename: str) -> dict | None:
             try:
                 tg_file = await context.bot.get_file(file_id)
                 buf = await tg_file.download_as_bytearray()
-
-                info = upload_attachment(
-                    minio_client=self.minio,
-                    bucket=self.settings.minio_bucket,
-                    public_url_base=self.settings.minio_public_url,
-                    raw_bytes=bytes(buf),
-                    filename=filename,
-                )
-                ingested.append(info)
+                return await upload_attachment(self.storage, bytes(buf), filename)
             except Exception as e:
                 logger.error(
                     "telegram_attachment_ingest_failed",
                     filename=filename,
                     error=str(e),
                 )
-        return ingested
+                return None
+
+        results = await asyncio.gather(*(ingest(*item) for item in items))
+        return [info for info in results if info]
 
     async def _download_response_files(self, files: list[dict]) -> list[tuple[str, io.BytesIO]]:
         """Download response files from MinIO for sending as Telegram documents."""
@@ -244,22 +232,18 @@ class AgentTelegramBot:
         if not files:
             return result
 
-        public_prefix = self.settings.minio_public_url.rstrip("/") + "/"
+        wanted = []
         for f in files:
-            url = f.get("url", "")
-            filename = f.get("filename", "file")
-            try:
-                if url.startswith(public_prefix):
-                    key = url[len(public_prefix):]
-                else:
-                    continue
-                resp = self.minio.get_object(self.settings.minio_bucket, key)
-                data = resp.read()
-                resp.close()
-                resp.release_conn()
-                result.append((filename, io.BytesIO(data)))
-            except Exception as e:
-                logger.error("telegram_file_download_failed", filename=filename, error=str(e))
+            key = self.storage.key_from_public_url(f.get("url", ""))
+            if key is not None:
+                wanted.append((f.get("filename", "file"), key))
+
+        downloads = await self.storage.get_many(key for _, key in wanted)
+        for (filename, _), data in zip(wanted, downloads):
+            if isinstance(data, Exception):
+                logger.error("telegram_file_download_failed", filename=filename, error=str(data))
+                continue
+            result.append((filename, io.BytesIO(data)))
         return result
 
     def run(self):
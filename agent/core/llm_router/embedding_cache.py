@@ -0,0 +1,124 @@
+"""Content-addressed embedding cache.
+
+Embeddings are keyed by ``sha256(model + text)`` and stored in Redis with
+an in-process LRU in front, so repeated inputs ("yes", "go ahead",
+identical scheduled prompts) never hit the embedding API twice.  The LRU
+is shared by every ``LLMRouter`` in the process, including the per-user
+routers built for users with their own API keys.
+
+Redis errors are logged and treated as misses — the cache never makes an
+embedding call fail.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+
+import structlog
+
+from shared.config import Settings
+from shared.redis import get_redis
+
+logger = structlog.get_logger()
+
+EMBEDDING_CACHE_PREFIX = "embedding:"
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Return the cache key for *text* embedded with *model*."""
+    digest = hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+    return f"{EMBEDDING_CACHE_PREFIX}{model}:{digest}"
+
+
+class EmbeddingCache:
+    """Two-level (in-process LRU + Redis) embedding cache."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lru: OrderedDict[str, list[float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._lru[key] = embedding
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get_many(self, model: str, texts: list[str]) -> list[list[float] | None]:
+        """Look up *texts*; returns one embedding or None per input, in order."""
+        keys = [embedding_key(model, t) for t in texts]
+        found: list[list[float] | None] = [None] * len(texts)
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            cached = self._lru.get(key)
+            if cached is not None:
+                self._lru.move_to_end(key)
+                found[i] = cached
+            else:
+                missing.append(i)
+
+        if missing and self.ttl_seconds > 0:
+            try:
+                redis = await get_redis()
+                values = await redis.mget([keys[i] for i in missing])
+            except Exception as e:
+                logger.warning("embedding_cache_read_failed", error=str(e))
+                values = [None] * len(missing)
+            for i, raw in zip(missing, values):
+                if raw:
+                    found[i] = json.loads(raw)
+                    self._remember(keys[i], found[i])
+
+        hits = sum(1 for f in found if f is not None)
+        self.hits += hits
+        self.misses += len(texts) - hits
+        return found
+
+    async def set_many(
+        self, model: str, texts: list[str], embeddings: list[list[float]],
+    ) -> None:
+        """Store freshly computed embeddings in the LRU and Redis."""
+        if not texts:
+            return
+        keys = [embedding_key(model, t) for t in texts]
+        for key, embedding in zip(keys, embeddings):
+            self._remember(key, embedding)
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for key, embedding in zip(keys, embeddings):
+                pipe.set(key, json.dumps(embedding), ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("embedding_cache_write_failed", error=str(e))
+
+    def stats(self) -> dict:
+        """Hit/miss counters for the process-wide cache."""
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_shared_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache(settings: Settings) -> EmbeddingCache:
+    """Return the process-wide embedding cache (created on first use)."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = EmbeddingCache(
+            max_entries=settings.embedding_cache_max_entries,
+            ttl_seconds=settings.embedding_cache_ttl_seconds,
+        )
+    return _shared_cache
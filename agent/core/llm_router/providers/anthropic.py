@@ -3,12 +3,22 @@
 from __future__ import annotations
 
 import asyncio
-import re
+from typing import AsyncGenerator
 
 import structlog
 from anthropic import AsyncAnthropic, BadRequestError
-
-from core.llm_router.providers.base import LLMProvider, LLMResponse
+from anthropic.types import Usage
+
+from core.llm_router.providers.base import (
+    CACHE_BREAKPOINT,
+    LLMProvider,
+    LLMResponse,
+    PromptTooLongError,
+    ToolCallAssembler,
+    content_delta,
+)
+from core.llm_router.tool_formats import anthropic_tools_for, sanitize_anthropic_tool_name
+from shared.schemas.messages import StreamEvent
 from shared.schemas.tools import ToolCall
 
 logger = structlog.get_logger()
@@ -20,14 +30,17 @@ class AnthropicProvider(LLMProvider):
     def __init__(self, api_key: str):
         self.client = AsyncAnthropic(api_key=api_key)
 
+    async def aclose(self) -> None:
+        await self.client.close()
+
     def _convert_tools(
         self, tools: list[dict] | None
     ) -> tuple[list[dict] | None, dict[str, str]]:
         """
         Convert OpenAI-style tool definitions to Anthropic format.
 
-        The last tool definition receives a ``cache_control`` marker so
-        that the entire system + tools prefix is cached across calls.
+        Uses the payload precomputed by the tool registry when *tools* is
+        one of its ``PrecomputedTools`` lists; see ``core.llm_router.tool_formats``.
 
         Returns:
             Tuple containing:
@@ -36,54 +49,7 @@ class AnthropicProvider(LLMProvider):
         """
         if not tools:
             return None, {}
-
-        anthropic_tools = []
-        name_mapping = {}
-
-        for tool in tools:
-            func = tool.get("function", tool)
-
-            original_name = func["name"]
-            # Anthropic enforces ^[a-zA-Z0-9_-]{1,128}$.
-            # Replace any character that is NOT alphanumeric/underscore/hyphen with an underscore.
-            sanitized_name = re.sub(r"[^a-zA-Z0-9_-]", "_", original_name)
-            # Ensure it doesn't exceed 64 chars (safe limit, though error allows 128)
-            sanitized_name = sanitized_name[:64]
-
-            # Store mapping to restore original name in response
-            name_mapping[sanitized_name] = original_name
-
-            properties = {}
-            required = []
-            for param in func.get("parameters", {}).get("properties", {}):
-                prop = func["parameters"]["properties"][param]
-                properties[param] = {
-                    "type": prop.get("type", "string"),
-                    "description": prop.get("description", ""),
-                }
-                if prop.get("enum"):
-                    properties[param]["enum"] = prop["enum"]
-            if "required" in func.get("parameters", {}):
-                required = func["parameters"]["required"]
-
-            anthropic_tools.append(
-                {
-                    "name": sanitized_name,
-                    "description": func.get("description", ""),
-                    "input_schema": {
-                        "type": "object",
-                        "properties": properties,
-                        "required": required,
-                    },
-                }
-            )
-
-        # Cache breakpoint: mark the last tool so that the entire
-        # system prompt + tool definitions prefix is cached.
-        if anthropic_tools:
-            anthropic_tools[-1]["cache_control"] = {"type": "ephemeral"}
-
-        return anthropic_tools, name_mapping
+        return anthropic_tools_for(tools)
 
     def _convert_messages(
         self, messages: list[dict]
@@ -96,18 +62,25 @@ class AnthropicProvider(LLMProvider):
         prompt would be silently dropped whenever memories or summaries
         were also present.
 
-        The last system block receives a ``cache_control`` marker so the
-        full system prompt prefix is cached across requests.
+        The cached prefix is tiered: tools (breakpoint on the last tool, see
+        ``tool_formats``), then system blocks flagged with
+        ``CACHE_BREAKPOINT`` (the static persona/guidance block), then the
+        volatile system blocks (time, projects, memories), then messages
+        (breakpoint added by ``_add_message_cache_breakpoint``).  Callers
+        that flag nothing get a breakpoint on the last system block.
         """
         system_blocks: list[dict] = []
         converted = []
         for msg in messages:
             if msg["role"] == "system":
-                system_blocks.append({"type": "text", "text": msg["content"]})
+                block = {"type": "text", "text": msg["content"]}
+                if msg.get(CACHE_BREAKPOINT):
+                    block["cache_control"] = {"type": "ephemeral"}
+                system_blocks.append(block)
             elif msg["role"] == "tool_call":
                 # Convert to assistant message with tool_use block
                 tool_name = msg.get("name", "")
-                sanitized_name = re.sub(r"[^a-zA-Z0-9_-]", "_", tool_name)[:64]
+                sanitized_name = sanitize_anthropic_tool_name(tool_name)
 
                 converted.append(
                     {
@@ -144,8 +117,8 @@ class AnthropicProvider(LLMProvider):
                     }
                 )
 
-        # Cache breakpoint on the last system block (persona + memories).
-        if system_blocks:
+        # No tier flagged: cache breakpoint on the last system block.
+        if system_blocks and not any("cache_control" in b for b in system_blocks):
             system_blocks[-1]["cache_control"] = {"type": "ephemeral"}
 
         return system_blocks or None, converted
@@ -173,15 +146,15 @@ class AnthropicProvider(LLMProvider):
             # Already a list of blocks — tag the last block
             content[-1]["cache_control"] = {"type": "ephemeral"}
 
-    async def chat(
+    def _build_request(
         self,
         messages: list[dict],
-        tools: list[dict] | None = None,
-        model: str = "claude-sonnet-4-20250514",
-        max_tokens: int = 4000,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """Send a chat completion to Anthropic with prompt caching."""
+        tools: list[dict] | None,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> tuple[dict, dict[str, str]]:
+        """Return the ``messages.create`` kwargs and the tool name mapping."""
         system, converted_messages = self._convert_messages(messages)
         # Get tools AND the name mapping
         anthropic_tools, tool_name_mapping = self._convert_tools(tools)
@@ -200,16 +173,17 @@ class AnthropicProvider(LLMProvider):
             kwargs["system"] = system
         if anthropic_tools:
             kwargs["tools"] = anthropic_tools
+        return kwargs, tool_name_mapping
 
+    async def _create(self, kwargs: dict):
+        """Call ``messages.create``, retrying transient errors."""
         last_error = None
         for attempt in range(3):
             try:
-                response = await self.client.messages.create(**kwargs)
-                break
+                return await self.client.messages.create(**kwargs)
             except BadRequestError as e:
                 # Detect recoverable "prompt is too long" errors separately
                 if "prompt is too long" in str(e).lower():
-                    from core.llm_router.providers.base import PromptTooLongError
                     raise PromptTooLongError(str(e)) from e
                 raise  # other 400s = bad payload, retrying won't help
             except Exception as e:
@@ -217,8 +191,60 @@ class AnthropicProvider(LLMProvider):
                 logger.warning("anthropic_api_error", attempt=attempt, error=str(e))
                 if attempt < 2:
                     await asyncio.sleep(2**attempt)
-        else:
-            raise last_error  # type: ignore[misc]
+        raise last_error  # type: ignore[misc]
+
+    @staticmethod
+    def _stop_reason(raw: str | None) -> str:
+        if raw in ("tool_use", "max_tokens"):
+            return raw
+        return "end_turn"
+
+    @staticmethod
+    def _response_from(
+        content: str | None,
+        tool_calls: list[ToolCall],
+        usage,
+        output_tokens: int,
+        model: str,
+        stop_reason: str | None,
+    ) -> LLMResponse:
+        """Build the LLMResponse, logging prompt cache metrics from *usage*."""
+        cache_creation = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+
+        if cache_read > 0 or cache_creation > 0:
+            logger.info(
+                "anthropic_cache",
+                cache_read_tokens=cache_read,
+                cache_creation_tokens=cache_creation,
+                input_tokens=usage.input_tokens,
+                model=model,
+            )
+
+        return LLMResponse(
+            content=content,
+            tool_calls=tool_calls,
+            input_tokens=usage.input_tokens,
+            output_tokens=output_tokens,
+            model=model,
+            stop_reason=AnthropicProvider._stop_reason(stop_reason),
+            cache_creation_input_tokens=cache_creation,
+            cache_read_input_tokens=cache_read,
+        )
+
+    async def chat(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str = "claude-sonnet-4-20250514",
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat completion to Anthropic with prompt caching."""
+        kwargs, tool_name_mapping = self._build_request(
+            messages, tools, model, max_tokens, temperature,
+        )
+        response = await self._create(kwargs)
 
         # Parse response
         content = None
@@ -238,34 +264,71 @@ class AnthropicProvider(LLMProvider):
                     )
                 )
 
-        stop_reason = "end_turn"
-        if response.stop_reason == "tool_use":
-            stop_reason = "tool_use"
-        elif response.stop_reason == "max_tokens":
-            stop_reason = "max_tokens"
-
-        # Extract cache metrics from usage
-        cache_creation = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
-        cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
+        return self._response_from(
+            content,
+            tool_calls,
+            response.usage,
+            response.usage.output_tokens,
+            response.model,
+            response.stop_reason,
+        )
 
-        if cache_read > 0 or cache_creation > 0:
-            logger.info(
-                "anthropic_cache",
-                cache_read_tokens=cache_read,
-                cache_creation_tokens=cache_creation,
-                input_tokens=response.usage.input_tokens,
-                model=response.model,
-            )
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str = "claude-sonnet-4-20250514",
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[StreamEvent | LLMResponse, None]:
+        """Stream a chat completion, yielding text deltas as they arrive.
 
-        return LLMResponse(
-            content=content,
-            tool_calls=tool_calls,
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
-            model=response.model,
-            stop_reason=stop_reason,
-            cache_creation_input_tokens=cache_creation,
-            cache_read_input_tokens=cache_read,
+        Tool-use blocks are assembled from their ``input_json_delta``
+        fragments.  Transient errors are retried only when opening the
+        stream, before anything has been yielded.
+        """
+        kwargs, tool_name_mapping = self._build_request(
+            messages, tools, model, max_tokens, temperature,
+        )
+        stream = await self._create({**kwargs, "stream": True})
+
+        text_parts: list[str] = []
+        tools_in_progress = ToolCallAssembler()
+        # Replaced by message_start; kept if the stream ends before it
+        usage = Usage(input_tokens=0, output_tokens=0)
+        started = False
+        output_tokens = 0
+        response_model = model
+        stop_reason = None
+        # Closing the stream releases its connection if the consumer stops early
+        async with stream:
+            async for event in stream:
+                if event.type == "message_start":
+                    started = True
+                    usage = event.message.usage
+                    response_model = event.message.model
+                elif event.type == "content_block_start":
+                    if event.content_block.type == "tool_use":
+                        tools_in_progress.start(event.index, event.content_block.name)
+                elif event.type == "content_block_delta":
+                    if event.delta.type == "text_delta":
+                        text_parts.append(event.delta.text)
+                        yield content_delta(event.delta.text)
+                    elif event.delta.type == "input_json_delta":
+                        tools_in_progress.append(event.index, event.delta.partial_json)
+                elif event.type == "message_delta":
+                    stop_reason = event.delta.stop_reason
+                    output_tokens = event.usage.output_tokens
+
+        if not started:
+            logger.warning("anthropic_stream_missing_message_start", model=model)
+        yield self._response_from(
+            "".join(text_parts) or None,
+            tools_in_progress.finish(tool_name_mapping),
+            usage,
+            output_tokens,
+            response_model,
+            stop_reason,
         )
 
     async def embed(self, text: str, model: str = "") -> list[float]:
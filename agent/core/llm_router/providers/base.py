@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import json
 from abc import ABC, abstractmethod
+from typing import AsyncGenerator
 
 from pydantic import BaseModel
 
+from shared.schemas.messages import StreamEvent
 from shared.schemas.tools import ToolCall
 
+# Set on a system message dict to end a cacheable prompt tier after it.
+# Providers with explicit prompt caching (Anthropic) place a cache
+# breakpoint there; others ignore it.
+CACHE_BREAKPOINT = "cache_breakpoint"
+
 
 class PromptTooLongError(Exception):
     """Raised when the prompt exceeds the model's context window.
@@ -30,6 +38,51 @@ class LLMResponse(BaseModel):
     cache_read_input_tokens: int = 0
 
 
+def content_delta(text: str, reset: bool = False) -> StreamEvent:
+    """A streamed text fragment of the current completion.
+
+    ``reset`` tells consumers to discard the fragments streamed so far for
+    this completion (the router fell back to another model mid-stream).
+    """
+    data: dict = {"text": text, "delta": True}
+    if reset:
+        data["reset"] = True
+    return StreamEvent(event="content", data=data)
+
+
+class ToolCallAssembler:
+    """Builds complete tool calls from streamed name/argument fragments.
+
+    Fragments are keyed by the provider's block or call index, so several
+    tool calls may be streamed interleaved.
+    """
+
+    def __init__(self) -> None:
+        self._names: dict[int, str] = {}
+        self._args: dict[int, list[str]] = {}
+
+    def start(self, key: int, name: str) -> None:
+        self._names[key] = name
+        self._args.setdefault(key, [])
+
+    def append(self, key: int, fragment: str) -> None:
+        self._args.setdefault(key, []).append(fragment)
+
+    def finish(self, name_mapping: dict[str, str]) -> list[ToolCall]:
+        """Return the assembled calls in key order, names mapped back."""
+        calls = []
+        for key in sorted(self._names):
+            raw = "".join(self._args.get(key, [])).strip()
+            name = self._names[key]
+            calls.append(
+                ToolCall(
+                    tool_name=name_mapping.get(name, name),
+                    arguments=json.loads(raw) if raw else {},
+                )
+            )
+        return calls
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
@@ -45,7 +98,44 @@ class LLMProvider(ABC):
         """Send a chat completion request."""
         ...
 
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str = "",
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[StreamEvent | LLMResponse, None]:
+        """Stream a chat completion.
+
+        Yields ``content_delta`` events as text arrives, then the final
+        ``LLMResponse`` (tool calls fully assembled) as the last item.
+        Providers without native streaming yield only the final response.
+        """
+        yield await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+
     @abstractmethod
     async def embed(self, text: str, model: str = "") -> list[float]:
         """Generate an embedding vector for the given text."""
         ...
+
+    async def embed_many(self, texts: list[str], model: str = "") -> list[list[float]]:
+        """Generate embeddings for several texts, preserving order.
+
+        Providers with a native batch endpoint override this; the default
+        embeds one text at a time.
+        """
+        return [await self.embed(text, model) for text in texts]
+
+    async def aclose(self) -> None:
+        """Release the provider's SDK client connections.
+
+        Providers holding a long-lived client override this; the default
+        has nothing to close.
+        """
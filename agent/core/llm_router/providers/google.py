@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+from typing import AsyncGenerator
 
 import structlog
 from google import genai
 from google.genai import types
 
-from core.llm_router.providers.base import LLMProvider, LLMResponse
+from core.llm_router.providers.base import LLMProvider, LLMResponse, content_delta
+from shared.schemas.messages import StreamEvent
 from shared.schemas.tools import ToolCall
 
 logger = structlog.get_logger()
@@ -16,6 +18,9 @@ logger = structlog.get_logger()
 # Maximum retries for MALFORMED_FUNCTION_CALL (known transient issue)
 _MAX_MALFORMED_RETRIES = 2
 
+# Maximum contents per embed_content request (batchEmbedContents limit)
+_EMBED_BATCH_SIZE = 100
+
 
 class GoogleProvider(LLMProvider):
     """Provider for Google Gemini models."""
@@ -23,6 +28,11 @@ class GoogleProvider(LLMProvider):
     def __init__(self, api_key: str):
         self.client = genai.Client(api_key=api_key)
 
+    async def aclose(self) -> None:
+        # Sync calls (run in threads) and aio streams use separate pools
+        self.client.close()
+        await self.client.aio.aclose()
+
     @staticmethod
     def _sanitize_name(name: str) -> str:
         """Google function names must be alphanumeric + underscore. Replace dots."""
@@ -154,6 +164,28 @@ class GoogleProvider(LLMProvider):
         system = "\n\n".join(system_parts) if system_parts else None
         return system, contents
 
+    @staticmethod
+    def _build_config(
+        system: str | None,
+        google_tools: list[types.Tool] | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> types.GenerateContentConfig:
+        config = types.GenerateContentConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if system:
+            config.system_instruction = system
+        if google_tools:
+            config.tools = google_tools
+        return config
+
+    @staticmethod
+    def _is_bad_request(e: Exception) -> bool:
+        status = getattr(e, "status_code", None) or getattr(e, "code", None)
+        return status in (400, "400", "INVALID_ARGUMENT")
+
     async def chat(
         self,
         messages: list[dict],
@@ -165,15 +197,7 @@ class GoogleProvider(LLMProvider):
         """Send a chat completion to Google Gemini."""
         system, contents = self._convert_messages(messages)
         google_tools, name_map = self._convert_tools(tools)
-
-        config = types.GenerateContentConfig(
-            max_output_tokens=max_tokens,
-            temperature=temperature,
-        )
-        if system:
-            config.system_instruction = system
-        if google_tools:
-            config.tools = google_tools
+        config = self._build_config(system, google_tools, max_tokens, temperature)
 
         last_error = None
         for attempt in range(3):
@@ -187,8 +211,7 @@ class GoogleProvider(LLMProvider):
                 break
             except Exception as e:
                 # Don't retry 400-class errors (bad payload won't change)
-                status = getattr(e, "status_code", None) or getattr(e, "code", None)
-                if status in (400, "400", "INVALID_ARGUMENT"):
+                if self._is_bad_request(e):
                     raise
                 last_error = e
                 logger.warning("google_api_error", attempt=attempt, error=str(e))
@@ -206,6 +229,92 @@ class GoogleProvider(LLMProvider):
             config,
         )
 
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str = "gemini-2.0-flash",
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[StreamEvent | LLMResponse, None]:
+        """Stream a Gemini completion, yielding text deltas as they arrive.
+
+        Function calls arrive as whole parts and are collected across
+        chunks.  A MALFORMED_FUNCTION_CALL with no text streamed yet falls
+        back to :meth:`chat`, which retries it.
+        """
+        system, contents = self._convert_messages(messages)
+        google_tools, name_map = self._convert_tools(tools)
+        config = self._build_config(system, google_tools, max_tokens, temperature)
+
+        last_error = None
+        for attempt in range(3):
+            try:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=model,
+                    contents=contents,
+                    config=config,
+                )
+                break
+            except Exception as e:
+                if self._is_bad_request(e):
+                    raise
+                last_error = e
+                logger.warning("google_api_error", attempt=attempt, error=str(e))
+                if attempt < 2:
+                    await asyncio.sleep(2**attempt)
+        else:
+            raise last_error  # type: ignore[misc]
+
+        text_parts: list[str] = []
+        tool_calls: list[ToolCall] = []
+        finish_reason = None
+        usage = None
+        async for chunk in stream:
+            if chunk.usage_metadata:
+                usage = chunk.usage_metadata
+            if not chunk.candidates:
+                continue
+            candidate = chunk.candidates[0]
+            finish_reason = getattr(candidate, "finish_reason", None) or finish_reason
+            parts = getattr(candidate.content, "parts", None) if candidate.content else None
+            for part in parts or []:
+                if part.text:
+                    text_parts.append(part.text)
+                    yield content_delta(part.text)
+                if part.function_call:
+                    raw_name = part.function_call.name
+                    tool_calls.append(
+                        ToolCall(
+                            tool_name=name_map.get(raw_name, raw_name),
+                            arguments=(
+                                dict(part.function_call.args)
+                                if part.function_call.args
+                                else {}
+                            ),
+                        )
+                    )
+
+        fr_str = str(finish_reason) if finish_reason else ""
+        if "MALFORMED_FUNCTION_CALL" in fr_str and not text_parts:
+            logger.warning("gemini_malformed_function_call_stream_fallback")
+            yield await self.chat(messages, tools, model, max_tokens, temperature)
+            return
+        if not text_parts and not tool_calls:
+            logger.error("gemini_empty_response", finish_reason=fr_str, streamed=True)
+            raise RuntimeError(
+                f"Gemini returned an empty response (finish_reason={fr_str})"
+            )
+
+        yield LLMResponse(
+            content="".join(text_parts) or None,
+            tool_calls=tool_calls,
+            input_tokens=(usage.prompt_token_count or 0) if usage else 0,
+            output_tokens=(usage.candidates_token_count or 0) if usage else 0,
+            model=model,
+            stop_reason="tool_use" if tool_calls else "end_turn",
+        )
+
     async def _parse_response(
         self,
         response,
@@ -366,3 +475,39 @@ class GoogleProvider(LLMProvider):
                 if attempt < 2:
                     await asyncio.sleep(2**attempt)
         raise last_error  # type: ignore[misc]
+
+    async def embed_many(
+        self,
+        texts: list[str],
+        model: str = "gemini-embedding-001",
+        dimensions: int = 1536,
+    ) -> list[list[float]]:
+        """Generate embeddings for several texts with batched requests."""
+        config = types.EmbedContentConfig(output_dimensionality=dimensions)
+        embeddings: list[list[float]] = []
+        for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+            batch = texts[start:start + _EMBED_BATCH_SIZE]
+            last_error = None
+            for attempt in range(3):
+                try:
+                    response = await asyncio.to_thread(
+                        self.client.models.embed_content,
+                        model=model,
+                        contents=batch,
+                        config=config,
+                    )
+                    embeddings.extend(list(e.values) for e in response.embeddings)
+                    break
+                except Exception as e:
+                    last_error = e
+                    logger.warning(
+                        "google_embed_error",
+                        attempt=attempt,
+                        batch_size=len(batch),
+                        error=str(e),
+                    )
+                    if attempt < 2:
+                        await asyncio.sleep(2**attempt)
+            else:
+                raise last_error  # type: ignore[misc]
+        return embeddings
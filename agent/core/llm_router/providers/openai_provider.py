@@ -5,15 +5,26 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+from typing import AsyncGenerator
 
 import structlog
 from openai import AsyncOpenAI, BadRequestError
 
-from core.llm_router.providers.base import LLMProvider, LLMResponse
+from core.llm_router.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCallAssembler,
+    content_delta,
+)
+from shared.schemas.messages import StreamEvent
 from shared.schemas.tools import ToolCall
 
 logger = structlog.get_logger()
 
+# Inputs per embeddings request (API limit is 2048; smaller batches keep
+# each request well under the per-request token cap)
+_EMBED_BATCH_SIZE = 512
+
 
 class OpenAIProvider(LLMProvider):
     """Provider for OpenAI models (GPT-4o, etc.)."""
@@ -21,6 +32,9 @@ class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str):
         self.client = AsyncOpenAI(api_key=api_key)
 
+    async def aclose(self) -> None:
+        await self.client.close()
+
     def _sanitize_name(self, name: str) -> str:
         """
         Sanitize tool name to match OpenAI pattern '^[a-zA-Z0-9_-]+$'.
@@ -156,15 +170,15 @@ class OpenAIProvider(LLMProvider):
                 )
         return converted
 
-    async def chat(
+    def _build_request(
         self,
         messages: list[dict],
-        tools: list[dict] | None = None,
-        model: str = "gpt-4o",
-        max_tokens: int = 4000,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """Send a chat completion to OpenAI."""
+        tools: list[dict] | None,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> tuple[dict, dict[str, str]]:
+        """Return the ``chat.completions.create`` kwargs and tool name mapping."""
         converted_messages = self._convert_messages(messages)
         openai_tools, tool_name_mapping = self._convert_tools(tools)
 
@@ -176,12 +190,14 @@ class OpenAIProvider(LLMProvider):
         }
         if openai_tools:
             kwargs["tools"] = openai_tools
+        return kwargs, tool_name_mapping
 
+    async def _create(self, kwargs: dict):
+        """Call ``chat.completions.create``, retrying transient errors."""
         last_error = None
         for attempt in range(3):
             try:
-                response = await self.client.chat.completions.create(**kwargs)
-                break
+                return await self.client.chat.completions.create(**kwargs)
             except BadRequestError:
                 raise  # 400 = bad payload, retrying won't help
             except Exception as e:
@@ -189,8 +205,29 @@ class OpenAIProvider(LLMProvider):
                 logger.warning("openai_api_error", attempt=attempt, error=str(e))
                 if attempt < 2:
                     await asyncio.sleep(2**attempt)
-        else:
-            raise last_error  # type: ignore[misc]
+        raise last_error  # type: ignore[misc]
+
+    @staticmethod
+    def _stop_reason(finish_reason: str | None) -> str:
+        if finish_reason == "tool_calls":
+            return "tool_use"
+        if finish_reason == "length":
+            return "max_tokens"
+        return "end_turn"
+
+    async def chat(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str = "gpt-4o",
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat completion to OpenAI."""
+        kwargs, tool_name_mapping = self._build_request(
+            messages, tools, model, max_tokens, temperature,
+        )
+        response = await self._create(kwargs)
 
         choice = response.choices[0]
         content = choice.message.content
@@ -210,19 +247,70 @@ class OpenAIProvider(LLMProvider):
                     )
                 )
 
-        stop_reason = "end_turn"
-        if choice.finish_reason == "tool_calls":
-            stop_reason = "tool_use"
-        elif choice.finish_reason == "length":
-            stop_reason = "max_tokens"
-
         return LLMResponse(
             content=content,
             tool_calls=tool_calls,
             input_tokens=response.usage.prompt_tokens if response.usage else 0,
             output_tokens=response.usage.completion_tokens if response.usage else 0,
             model=response.model,
-            stop_reason=stop_reason,
+            stop_reason=self._stop_reason(choice.finish_reason),
+        )
+
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str = "gpt-4o",
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[StreamEvent | LLMResponse, None]:
+        """Stream a chat completion, yielding text deltas as they arrive.
+
+        Tool calls arrive as per-index name/argument fragments and are
+        assembled before the final response is yielded.
+        """
+        kwargs, tool_name_mapping = self._build_request(
+            messages, tools, model, max_tokens, temperature,
+        )
+        stream = await self._create({
+            **kwargs,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        })
+
+        text_parts: list[str] = []
+        tools_in_progress = ToolCallAssembler()
+        finish_reason = None
+        usage = None
+        response_model = model
+        # Closing the stream releases its connection if the consumer stops early
+        async with stream:
+            async for chunk in stream:
+                response_model = chunk.model or response_model
+                if chunk.usage:
+                    usage = chunk.usage  # final chunk, no choices
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                delta = choice.delta
+                if delta.content:
+                    text_parts.append(delta.content)
+                    yield content_delta(delta.content)
+                for tc in delta.tool_calls or []:
+                    if tc.function and tc.function.name:
+                        tools_in_progress.start(tc.index, tc.function.name)
+                    if tc.function and tc.function.arguments:
+                        tools_in_progress.append(tc.index, tc.function.arguments)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+        yield LLMResponse(
+            content="".join(text_parts) or None,
+            tool_calls=tools_in_progress.finish(tool_name_mapping),
+            input_tokens=usage.prompt_tokens if usage else 0,
+            output_tokens=usage.completion_tokens if usage else 0,
+            model=response_model,
+            stop_reason=self._stop_reason(finish_reason),
         )
 
     async def embed(
@@ -243,3 +331,34 @@ class OpenAIProvider(LLMProvider):
                 if attempt < 2:
                     await asyncio.sleep(2**attempt)
         raise last_error  # type: ignore[misc]
+
+    async def embed_many(
+        self, texts: list[str], model: str = "text-embedding-3-small"
+    ) -> list[list[float]]:
+        """Generate embeddings for several texts with batched requests."""
+        embeddings: list[list[float]] = []
+        for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+            batch = texts[start:start + _EMBED_BATCH_SIZE]
+            last_error = None
+            for attempt in range(3):
+                try:
+                    response = await self.client.embeddings.create(
+                        input=batch,
+                        model=model,
+                    )
+                    data = sorted(response.data, key=lambda d: d.index)
+                    embeddings.extend(d.embedding for d in data)
+                    break
+                except Exception as e:
+                    last_error = e
+                    logger.warning(
+                        "openai_embed_error",
+                        attempt=attempt,
+                        batch_size=len(batch),
+                        error=str(e),
+                    )
+                    if attempt < 2:
+                        await asyncio.sleep(2**attempt)
+            else:
+                raise last_error  # type: ignore[misc]
+        return embeddings
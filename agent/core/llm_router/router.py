@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+from contextlib import aclosing
+from typing import AsyncGenerator
+
 import structlog
 
-from core.llm_router.providers.base import LLMProvider, LLMResponse, PromptTooLongError
+from core.llm_router.embedding_cache import get_embedding_cache
+from core.llm_router.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    PromptTooLongError,
+    content_delta,
+)
 from shared.config import Settings, parse_list
+from shared.schemas.messages import StreamEvent
 
 logger = structlog.get_logger()
 
@@ -33,6 +43,7 @@ class LLMRouter:
         self.settings = settings
         self.providers: dict[str, LLMProvider] = {}
         self.model_map: dict[str, str] = {}  # model prefix -> provider name
+        self.embedding_cache = get_embedding_cache(settings)
         self._setup_providers()
 
     @classmethod
@@ -159,6 +170,14 @@ class LLMRouter:
 
         raise RuntimeError("No LLM providers configured. Set at least one API key.")
 
+    def _target_model(self, model: str | None, task_type: str | None) -> str:
+        """Model to try first: explicit, then per-task routing, then default."""
+        if model:
+            return model
+        if task_type and task_type in self.settings.model_routing:
+            return self.settings.model_routing[task_type]
+        return self.effective_default_model
+
     async def chat(
         self,
         messages: list[dict],
@@ -175,13 +194,7 @@ class LLMRouter:
         Otherwise use the default model.
         On failure, try the fallback chain.
         """
-        # Determine which model to use
-        if model:
-            target_model = model
-        elif task_type and task_type in self.settings.model_routing:
-            target_model = self.settings.model_routing[task_type]
-        else:
-            target_model = self.effective_default_model
+        target_model = self._target_model(model, task_type)
 
         # Try the target model first
         try:
@@ -236,23 +249,125 @@ class LLMRouter:
 
         raise RuntimeError("All LLM providers failed. Check API keys and service status.")
 
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        model: str | None = None,
+        task_type: str | None = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[StreamEvent | LLMResponse, None]:
+        """Streaming counterpart of :meth:`chat` with the same fallback chain.
+
+        Yields the provider's ``content`` delta events, then the final
+        ``LLMResponse``.  If a model fails after it already streamed text,
+        a ``reset`` delta is yielded before falling back so consumers can
+        drop the partial output.
+        """
+        target_model = self._target_model(model, task_type)
+        candidates = [target_model] + [
+            m for m in parse_list(self.settings.fallback_chain) if m != target_model
+        ]
+
+        for attempt, candidate in enumerate(candidates):
+            streamed = False
+            try:
+                _, provider = self._get_provider_for_model(candidate)
+                # aclosing: a consumer that stops early closes the provider's
+                # stream now rather than whenever the generator is collected
+                async with aclosing(provider.chat_stream(
+                    messages=messages,
+                    tools=tools,
+                    model=candidate,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )) as stream:
+                    async for item in stream:
+                        if isinstance(item, StreamEvent):
+                            streamed = True
+                        yield item
+                if attempt:
+                    logger.info("fallback_succeeded", model=candidate)
+                return
+            except PromptTooLongError:
+                if attempt == 0:
+                    raise  # recoverable — let the agent loop trim and retry
+                logger.warning("fallback_model_failed", model=candidate, error="prompt too long")
+            except Exception as e:
+                if attempt == 0 and _is_bad_request(e):
+                    logger.error("bad_request_no_fallback", model=candidate, error=str(e))
+                    raise
+                logger.warning(
+                    "primary_model_failed" if attempt == 0 else "fallback_model_failed",
+                    model=candidate,
+                    error=str(e),
+                    streamed=streamed,
+                )
+            if streamed:
+                yield content_delta("", reset=True)
+
+        raise RuntimeError("All LLM providers failed. Check API keys and service status.")
+
     async def embed(self, text: str) -> list[float]:
         """Generate an embedding using the configured embedding model."""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for *texts* (order preserved).
+
+        Inputs already in the embedding cache are served from it; the rest
+        are deduplicated and sent to the provider in batched requests.
+        Returned vectors may be shared with the cache — treat as read-only.
+        """
+        if not texts:
+            return []
         model = self.effective_embedding_model
 
         # Try to find a provider that supports embeddings
         try:
             _, provider = self._get_provider_for_model(model)
-            return await provider.embed(text, model)
+            return await self._embed_cached(provider, model, texts)
         except NotImplementedError:
             pass
 
         # Fall back to OpenAI if available (most common embedding provider)
         if "openai" in self.providers:
-            return await self.providers["openai"].embed(text, model)
+            return await self._embed_cached(self.providers["openai"], model, texts)
 
         # Try Google
         if "google" in self.providers:
-            return await self.providers["google"].embed(text, "gemini-embedding-001")
+            return await self._embed_cached(
+                self.providers["google"], "gemini-embedding-001", texts,
+            )
 
         raise RuntimeError("No embedding provider available.")
+
+    async def _embed_cached(
+        self, provider: LLMProvider, model: str, texts: list[str],
+    ) -> list[list[float]]:
+        """Embed *texts* with *provider*, reading through the embedding cache."""
+        unique = list(dict.fromkeys(texts))
+        cached = await self.embedding_cache.get_many(model, unique)
+        by_text = {t: e for t, e in zip(unique, cached) if e is not None}
+        missing = [t for t in unique if t not in by_text]
+        if missing:
+            fresh = await provider.embed_many(missing, model)
+            await self.embedding_cache.set_many(model, missing, fresh)
+            by_text.update(zip(missing, fresh))
+        logger.debug(
+            "embeddings_resolved",
+            model=model,
+            requested=len(texts),
+            cached=len(unique) - len(missing),
+            computed=len(missing),
+        )
+        return [by_text[t] for t in texts]
+
+    async def aclose(self) -> None:
+        """Close every provider's SDK clients and their connection pools."""
+        for name, provider in self.providers.items():
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.warning("llm_provider_close_failed", provider=name, error=str(e))
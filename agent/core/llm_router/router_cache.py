@@ -0,0 +1,169 @@
+"""Process-wide cache of per-user LLM routers for bring-your-own-key users.
+
+Building an ``LLMRouter`` from a user's personal API keys constructs fresh
+``AsyncAnthropic`` / ``AsyncOpenAI`` / ``genai.Client`` instances, each
+with its own connection pool.  Doing that on every message threw the
+pools away and paid a cold TLS handshake per turn.
+
+Routers are keyed by a SHA-256 digest of the user's override set, never
+by the plaintext keys, so identical credentials share one router and any
+change to a user's keys or model preferences yields a new entry.  Entries
+are bounded by count (LRU) and expire ``ttl_seconds`` after creation,
+which also bounds how long retired keys stay in memory.
+
+A router leaving the cache (evicted, expired or replaced) has its provider
+clients closed after ``close_grace_seconds``, so runs still holding it can
+finish first while its connection pools are not leaked.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+
+import structlog
+
+from core.llm_router.router import LLMRouter
+from shared.config import Settings
+
+logger = structlog.get_logger()
+
+# How long a retired router stays open for runs that still hold it
+_CLOSE_GRACE_SECONDS = 600.0
+
+
+def credentials_digest(overrides: dict) -> str:
+    """Return a stable digest of a user's LLM override set."""
+    payload = json.dumps(overrides, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RouterCache:
+    """Bounded LRU + TTL cache of ``LLMRouter`` instances by credential digest."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        close_grace_seconds: float = _CLOSE_GRACE_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.close_grace_seconds = close_grace_seconds
+        self._routers: OrderedDict[str, tuple[LLMRouter, float]] = OrderedDict()
+        self._user_digest: dict[uuid.UUID, str] = {}
+        self._closing: dict[asyncio.Task, LLMRouter] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        base_settings: Settings,
+        user_id: uuid.UUID,
+        overrides: dict,
+    ) -> LLMRouter:
+        """Return a router for *overrides*, building one on a miss."""
+        digest = credentials_digest(overrides)
+        previous = self._user_digest.get(user_id)
+        if previous is not None and previous != digest:
+            # The user's keys or model prefs changed; retire the old router
+            self._drop(previous)
+        self._user_digest[user_id] = digest
+
+        now = time.monotonic()
+        entry = self._routers.get(digest)
+        if entry is not None and entry[1] > now:
+            self._routers.move_to_end(digest)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        if entry is not None:
+            self._retire(entry[0])  # expired
+        router = LLMRouter(base_settings.model_copy(update=overrides))
+        if self.max_entries > 0:
+            self._routers[digest] = (router, now + self.ttl_seconds)
+            self._routers.move_to_end(digest)
+            while len(self._routers) > self.max_entries:
+                _, (evicted, _) = self._routers.popitem(last=False)
+                self._retire(evicted)
+                self.evictions += 1
+            if len(self._user_digest) > 4 * self.max_entries:
+                self._user_digest = {
+                    uid: d for uid, d in self._user_digest.items() if d in self._routers
+                }
+        return router
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop the router last built for *user_id* (e.g. after a key change)."""
+        digest = self._user_digest.pop(user_id, None)
+        if digest is not None:
+            self._drop(digest)
+
+    def _drop(self, digest: str) -> None:
+        entry = self._routers.pop(digest, None)
+        if entry is not None:
+            self._retire(entry[0])
+            self.evictions += 1
+
+    def _retire(self, router: LLMRouter) -> None:
+        """Close *router*'s clients once in-flight runs have had time to finish."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop to close on; the clients go with the last reference
+        task = loop.create_task(self._close_later(router))
+        self._closing[task] = router
+        task.add_done_callback(lambda t: self._closing.pop(t, None))
+
+    async def _close_later(self, router: LLMRouter) -> None:
+        await asyncio.sleep(self.close_grace_seconds)
+        await router.aclose()
+
+    async def aclose(self) -> None:
+        """Close every cached and retired router now (at shutdown)."""
+        routers = [router for router, _ in self._routers.values()]
+        self._routers.clear()
+        self._user_digest.clear()
+        for task, router in list(self._closing.items()):
+            task.cancel()
+            routers.append(router)
+        self._closing.clear()
+        for router in routers:
+            await router.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._routers),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_shared_cache: RouterCache | None = None
+
+
+def get_router_cache(settings: Settings) -> RouterCache:
+    """Return the process-wide router cache (created on first use)."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RouterCache(
+            max_entries=settings.llm_router_cache_max_entries,
+            ttl_seconds=settings.llm_router_cache_ttl_seconds,
+        )
+    return _shared_cache
+
+
+async def close_router_cache() -> None:
+    """Close the process-wide router cache's clients, if it was created."""
+    global _shared_cache
+    if _shared_cache is not None:
+        await _shared_cache.aclose()
+        _shared_cache = None
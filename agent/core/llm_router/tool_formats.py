@@ -0,0 +1,102 @@
+"""Provider-specific tool schema conversion.
+
+Kept free of SDK imports so the tool registry can precompute provider
+payloads once per manifest version.  The registry hands out
+:class:`PrecomputedTools` lists, which carry their Anthropic conversion
+with them through the router, so every user sharing a persona reuses the
+same converted schema instead of re-running the conversion on each request.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# Anthropic enforces ^[a-zA-Z0-9_-]{1,128}$ for tool names.
+_ANTHROPIC_NAME_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
+
+@lru_cache(maxsize=1024)
+def sanitize_anthropic_tool_name(name: str) -> str:
+    """Map ``module.tool`` to a name Anthropic accepts (max 64 chars)."""
+    # Replace any character that is NOT alphanumeric/underscore/hyphen with an underscore.
+    # Ensure it doesn't exceed 64 chars (safe limit, though error allows 128)
+    return _ANTHROPIC_NAME_RE.sub("_", name)[:64]
+
+
+def openai_tools_to_anthropic(
+    tools: list[dict],
+) -> tuple[list[dict], dict[str, str]]:
+    """Convert OpenAI-style tool definitions to Anthropic format.
+
+    The last tool definition receives a ``cache_control`` marker so
+    that the entire system + tools prefix is cached across calls.
+
+    Returns the Anthropic tool list and a mapping of
+    sanitized_name -> original_name.
+    """
+    anthropic_tools = []
+    name_mapping = {}
+
+    for tool in tools:
+        func = tool.get("function", tool)
+
+        original_name = func["name"]
+        sanitized_name = sanitize_anthropic_tool_name(original_name)
+
+        # Store mapping to restore original name in response
+        name_mapping[sanitized_name] = original_name
+
+        properties = {}
+        required = []
+        for param in func.get("parameters", {}).get("properties", {}):
+            prop = func["parameters"]["properties"][param]
+            properties[param] = {
+                "type": prop.get("type", "string"),
+                "description": prop.get("description", ""),
+            }
+            if prop.get("enum"):
+                properties[param]["enum"] = prop["enum"]
+        if "required" in func.get("parameters", {}):
+            required = func["parameters"]["required"]
+
+        anthropic_tools.append(
+            {
+                "name": sanitized_name,
+                "description": func.get("description", ""),
+                "input_schema": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": required,
+                },
+            }
+        )
+
+    # Cache breakpoint: mark the last tool so that the entire
+    # system prompt + tool definitions prefix is cached.
+    if anthropic_tools:
+        anthropic_tools[-1]["cache_control"] = {"type": "ephemeral"}
+
+    return anthropic_tools, name_mapping
+
+
+class PrecomputedTools(list):
+    """OpenAI-format tool list that carries its Anthropic conversion.
+
+    Passed as ``tools`` like any other list; :func:`anthropic_tools_for`
+    returns the payload converted here instead of converting again.
+    Treat it as read-only — the conversion is not redone after a mutation.
+    """
+
+    def __init__(self, tools: list[dict]) -> None:
+        super().__init__(tools)
+        self.anthropic_tools, self.anthropic_name_mapping = openai_tools_to_anthropic(tools)
+
+
+def anthropic_tools_for(
+    tools: list[dict],
+) -> tuple[list[dict], dict[str, str]]:
+    """Return the precomputed Anthropic payload for *tools*, converting plain lists."""
+    if isinstance(tools, PrecomputedTools):
+        return tools.anthropic_tools, tools.anthropic_name_mapping
+    return openai_tools_to_anthropic(tools)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
 import uuid
 
 import structlog
@@ -14,17 +15,21 @@ from shared.auth import require_service_auth
 from sqlalchemy import select
 
 from core.llm_router.router import LLMRouter
+from core.llm_router.router_cache import close_router_cache
 from core.memory.summarizer import ConversationSummarizer
 from core.orchestrator.agent_loop import AgentLoop
 from core.orchestrator.context_builder import ContextBuilder
 from core.orchestrator.tool_registry import ToolRegistry
+from core.orchestrator.vision import get_vision_preprocessor
 from shared.config import get_settings
 from shared.credential_store import CredentialStore
 from shared.database import get_engine, get_session_factory
 from shared.error_capture import capture_error
 from shared.models.persona import Persona
+from shared.project_context import close_project_context
 from shared.redis import close_redis
 from shared.schemas.common import HealthResponse
+from shared.storage import get_storage
 from fastapi.responses import StreamingResponse
 from shared.schemas.messages import AgentResponse, IncomingMessage, StreamEvent
 
@@ -104,6 +109,13 @@ async def startup():
     global llm_router, tool_registry, agent_loop, summarizer, _summarizer_task
 
     logger.info("starting_orchestrator")
+    startup_started = time.monotonic()
+    startup_phases: dict[str, int] = {}
+
+    def _mark(phase: str, since: float) -> float:
+        now = time.monotonic()
+        startup_phases[phase] = int((now - since) * 1000)
+        return now
 
     # Initialize session factory early so it can be passed to tool_registry and agent_loop
     session_factory = get_session_factory()
@@ -113,12 +125,15 @@ async def startup():
 
     # Initialize tool registry and discover modules
     tool_registry = ToolRegistry(settings, session_factory=session_factory)
+    phase_started = time.monotonic()
     await tool_registry.load_from_cache()
+    phase_started = _mark("manifest_cache_ms", phase_started)
     # Try to discover modules (some may not be ready yet)
     try:
         await tool_registry.discover_all()
     except Exception as e:
         logger.warning("initial_discovery_failed", error=str(e))
+    phase_started = _mark("discovery_ms", phase_started)
 
     # If any configured modules are missing, schedule background retry
     expected_modules = set(settings.module_services.keys())
@@ -158,6 +173,8 @@ async def startup():
                 await session.commit()
                 logger.info("updated_default_persona_modules", modules=all_modules)
 
+    phase_started = _mark("default_persona_ms", phase_started)
+
     # Build credential store for per-user LLM key lookups (optional — requires
     # CREDENTIAL_ENCRYPTION_KEY to be set).
     cred_store: CredentialStore | None = None
@@ -169,7 +186,7 @@ async def startup():
             logger.warning("credential_store_init_failed", error=str(e))
 
     # Initialize context builder and agent loop
-    context_builder = ContextBuilder(settings, llm_router)
+    context_builder = ContextBuilder(settings, llm_router, session_factory=session_factory)
     agent_loop = AgentLoop(
         settings=settings,
         llm_router=llm_router,
@@ -191,7 +208,11 @@ async def startup():
         asyncio.create_task(_health_monitor.run())
         logger.info("health_monitor_scheduled")
 
-    logger.info("orchestrator_ready")
+    logger.info(
+        "orchestrator_ready",
+        startup_ms=int((time.monotonic() - startup_started) * 1000),
+        **startup_phases,
+    )
 
 
 @app.on_event("shutdown")
@@ -205,6 +226,11 @@ async def shutdown():
         except asyncio.CancelledError:
             pass
 
+    if tool_registry is not None:
+        await tool_registry.aclose()
+
+    await close_router_cache()
+    await close_project_context()
     await close_redis()
     engine = get_engine()
     await engine.dispose()
@@ -272,6 +298,24 @@ async def health():
     return HealthResponse(status="ok")
 
 
+@app.get("/tool-pool/stats")
+async def tool_pool_stats(_=Depends(require_service_auth)):
+    """Per-module connection pool metrics (in-use, queued, connect latency)."""
+    if tool_registry is None:
+        raise HTTPException(status_code=503, detail="Tool registry not ready")
+    return {"modules": tool_registry.http_pool.stats()}
+
+
+@app.get("/storage/stats")
+async def storage_stats(_=Depends(require_service_auth)):
+    """Object storage transfer metrics and the vision image cache counters."""
+    storage = get_storage(settings)
+    return {
+        "operations": storage.stats(),
+        "vision": get_vision_preprocessor(settings, storage).stats(),
+    }
+
+
 @app.get("/tools")
 async def list_tools(
     permission: str = "owner",
@@ -365,13 +409,17 @@ async def refresh_tools(_=Depends(require_service_auth)):
     return {"status": "ok", "modules": list(tool_registry.manifests.keys())}
 
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class EmbedRequest(BaseModel):
     text: str
 
 
+class EmbedBatchRequest(BaseModel):
+    texts: list[str] = Field(max_length=2048)
+
+
 class ContinueRequest(BaseModel):
     """Request from scheduler to resume a conversation after a background job completes."""
     platform: str
@@ -546,3 +594,17 @@ async def embed(req: EmbedRequest, _=Depends(require_service_auth)):
     except Exception as e:
         logger.error("embed_error", error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal error processing request")
+
+
+@app.post("/embed/batch")
+async def embed_batch(req: EmbedBatchRequest, _=Depends(require_service_auth)):
+    """Generate embeddings for several texts in one call (order preserved)."""
+    if llm_router is None:
+        raise HTTPException(status_code=503, detail="LLM router not ready")
+
+    try:
+        embeddings = await llm_router.embed_many(req.texts)
+        return {"embeddings": embeddings}
+    except Exception as e:
+        logger.error("embed_batch_error", count=len(req.texts), error=str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal error processing request")
@@ -1,8 +1,9 @@
 """MCP bridge server — exposes the agent's tool registry as MCP tools.
 
 Runs as a stdio-based MCP server that the Claude Code CLI spawns.
-On startup it fetches tool definitions from the core orchestrator's
-``/tools`` endpoint, registers them as MCP tools, and proxies calls
+On startup it loads tool definitions (from ``MCP_TOOLS_FILE`` when the
+claude_code module staged one, otherwise from the core orchestrator's
+``/tools`` endpoint), registers them as MCP tools, and proxies calls
 to the ``/execute`` endpoint.
 
 Usage (via Claude CLI --mcp-config):
@@ -35,6 +36,8 @@ SERVICE_AUTH_TOKEN = os.environ.get("SERVICE_AUTH_TOKEN", "")
 MCP_USER_ID = os.environ.get("MCP_USER_ID", "")
 MCP_USER_PERMISSION = os.environ.get("MCP_USER_PERMISSION", "owner")
 MCP_CONVERSATION_ID = os.environ.get("MCP_CONVERSATION_ID", "")
+# Pre-fetched /tools response staged by the chat container pool
+MCP_TOOLS_FILE = os.environ.get("MCP_TOOLS_FILE", "")
 
 # Platform context — injected into scheduler/location/crew tool calls
 # so they can send notifications back to the right channel.
@@ -80,6 +83,19 @@ def _fetch_tools() -> list[dict]:
         return []
 
 
+def _load_tools() -> list[dict]:
+    """Read staged tool definitions, falling back to fetching from core."""
+    if MCP_TOOLS_FILE:
+        try:
+            with open(MCP_TOOLS_FILE) as f:
+                tools = json.load(f).get("tools", [])
+            log.info("Loaded %d tools from %s", len(tools), MCP_TOOLS_FILE)
+            return tools
+        except Exception as e:
+            log.warning("Failed to read %s, fetching instead: %s", MCP_TOOLS_FILE, e)
+    return _fetch_tools()
+
+
 def _call_tool(tool_name: str, arguments: dict) -> str:
     """Execute a tool via core's /execute endpoint (synchronous)."""
     # Inject platform context for scheduler/location/crew tools
@@ -174,7 +190,7 @@ async def {func_name}({params_code}) -> str:
 
 mcp = FastMCP("agent-tools")
 
-_tools = _fetch_tools()
+_tools = _load_tools()
 
 # Filter to allowed modules if specified
 if MCP_ALLOWED_MODULES:
@@ -51,9 +51,12 @@ class ConversationSummarizer:
             )
             conversations = result.scalars().all()
 
+            memories: list[MemorySummary] = []
             for conv in conversations:
                 try:
-                    await self._summarize_conversation(session, conv)
+                    memory = await self._summarize_conversation(session, conv)
+                    if memory is not None:
+                        memories.append(memory)
                     count += 1
                 except Exception as e:
                     logger.error(
@@ -62,6 +65,9 @@ class ConversationSummarizer:
                         error=str(e),
                     )
 
+            # Embed every new summary from this batch in one request
+            await self._embed_summaries(memories)
+
             await session.commit()
         return count
 
@@ -69,8 +75,12 @@ class ConversationSummarizer:
         self,
         session: AsyncSession,
         conversation: Conversation,
-    ) -> None:
-        """Summarize a single conversation and store the summary with embedding."""
+    ) -> MemorySummary | None:
+        """Summarize a single conversation and store the summary.
+
+        Returns the new ``MemorySummary`` (embedding not yet set), or None
+        if the conversation had no messages.
+        """
         # Get all messages in the conversation
         result = await session.execute(
             select(Message)
@@ -81,7 +91,7 @@ class ConversationSummarizer:
 
         if not messages:
             conversation.is_summarized = True
-            return
+            return None
 
         # Build conversation text for summarization
         text_parts = []
@@ -161,20 +171,13 @@ class ConversationSummarizer:
                 + cache_read
             )
 
-        # Generate embedding for the summary
-        embedding = None
-        try:
-            embedding = await self.llm_router.embed(summary_text)
-        except Exception as e:
-            logger.warning("embedding_generation_failed", error=str(e))
-
-        # Store the summary
+        # Store the summary (embedded in bulk by _embed_summaries)
         memory = MemorySummary(
             id=uuid.uuid4(),
             user_id=conversation.user_id,
             conversation_id=conversation.id,
             summary=summary_text,
-            embedding=embedding,
+            embedding=None,
             created_at=datetime.now(timezone.utc),
         )
         session.add(memory)
@@ -187,3 +190,19 @@ class ConversationSummarizer:
             conversation_id=str(conversation.id),
             summary_length=len(summary_text),
         )
+        return memory
+
+    async def _embed_summaries(self, memories: list[MemorySummary]) -> None:
+        """Attach embeddings to *memories* with a single batched call.
+
+        Failures leave ``embedding`` as None; the summaries are still stored.
+        """
+        if not memories:
+            return
+        try:
+            embeddings = await self.llm_router.embed_many([m.summary for m in memories])
+        except Exception as e:
+            logger.warning("embedding_generation_failed", count=len(memories), error=str(e))
+            return
+        for memory, embedding in zip(memories, embeddings):
+            memory.embedding = embedding
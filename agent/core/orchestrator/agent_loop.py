@@ -3,29 +3,31 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import json
+import time
 import traceback
 import uuid
 from datetime import datetime, timedelta, timezone
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.llm_router.providers.base import LLMResponse, PromptTooLongError
 from core.llm_router.router import LLMRouter
+from core.llm_router.router_cache import get_router_cache
 from core.llm_router.token_counter import estimate_cost
 from core.orchestrator.context_builder import ContextBuilder
+from core.orchestrator.persistence import RunLedger
 from core.orchestrator.tool_registry import ToolRegistry
+from core.orchestrator.vision import get_vision_preprocessor
 from shared.config import Settings, parse_list
 from shared.error_capture import capture_error
-from shared.utils.tokens import count_tokens, count_messages_tokens
+from shared.utils.tokens import count_messages_tokens, trim_groups_to_budget
 from shared.llm_settings_resolver import get_user_llm_overrides, get_user_claude_code_oauth
-from shared.models.conversation import Conversation, Message
+from shared.models.conversation import Conversation
 from shared.models.file import FileRecord
 from shared.models.persona import Persona
-from shared.models.token_usage import TokenLog
 from shared.models.user import User, UserPlatformLink
 from shared.schemas.messages import (
     AgentResponse,
@@ -34,6 +36,8 @@ from shared.schemas.messages import (
     ToolCallsMetadata,
     ToolCallSummary,
 )
+from shared.schemas.tools import ToolCall, ToolResult
+from shared.storage import ObjectTooLargeError, get_storage
 from typing import AsyncGenerator
 
 logger = structlog.get_logger()
@@ -57,17 +61,12 @@ class AgentLoop:
         self.context_builder = context_builder
         self.session_factory = session_factory
         self.credential_store = credential_store
+        self._router_cache = get_router_cache(settings)
 
-        # MinIO client for downloading image attachments (vision support)
-        self._minio = None
+        # Image attachment preprocessing for vision (downscale + cache)
+        self._vision = None
         try:
-            from minio import Minio
-            self._minio = Minio(
-                settings.minio_endpoint,
-                access_key=settings.minio_access_key,
-                secret_key=settings.minio_secret_key,
-                secure=False,
-            )
+            self._vision = get_vision_preprocessor(settings, get_storage(settings))
         except Exception as e:
             logger.warning("minio_client_init_failed", error=str(e))
 
@@ -116,22 +115,28 @@ class AgentLoop:
         session: AsyncSession,
         incoming: IncomingMessage,
     ) -> AsyncGenerator[StreamEvent, None]:
+        request_started = time.monotonic()
+
         # 1. Resolve user
         user = await self._resolve_user(session, incoming)
 
         # 2a. Check for user-configured LLM API keys.
-        # If the user has stored personal keys we build a one-off LLMRouter
-        # that uses those keys instead of the global env-var ones.
+        # If the user has stored personal keys we use an LLMRouter built from
+        # those keys instead of the global env-var ones. Routers are cached
+        # by credential digest so SDK connection pools survive across turns.
         user_overrides = await get_user_llm_overrides(
             session, user.id, self.credential_store
         )
         if user_overrides:
-            user_settings = self.settings.model_copy(update=user_overrides)
-            active_router = LLMRouter(user_settings)
+            active_router = self._router_cache.get(
+                self.settings, user.id, user_overrides,
+            )
             user_has_own_keys = True
             using_claude_oauth = False
             logger.info("using_user_llm_keys", user_id=str(user.id))
         else:
+            # Keys removed (or never set): retire any cached personal router
+            self._router_cache.invalidate_user(user.id)
             # 2a-bis. Fall back to Claude Code CLI with OAuth credentials.
             # Users with a Claude Code subscription can use the CLI as
             # the LLM backend without a separate API key.
@@ -181,8 +186,9 @@ class AgentLoop:
 
         # 5. Get available tools
         allowed_modules = json.loads(persona.allowed_modules) if persona else parse_list(self.settings.default_guest_modules)
-        tools = self.tool_registry.get_tools_for_user(user.permission_level, allowed_modules)
-        openai_tools = self.tool_registry.tools_to_openai_format(tools) if tools else None
+        tool_schemas = self.tool_registry.get_tool_schemas(user.permission_level, allowed_modules)
+        tools = tool_schemas.tools
+        openai_tools = tool_schemas.openai_tools or None
 
         logger.info(
             "tools_available",
@@ -201,12 +207,8 @@ class AgentLoop:
             model = persona.default_model if persona and persona.default_model else None
         max_tokens = persona.max_tokens_per_request if persona else 4000
 
-        # 5b. Measure actual tool definition token overhead
-        if openai_tools:
-            tools_json = json.dumps(openai_tools)
-            tool_overhead = int(count_tokens(tools_json, model or self.settings.default_model) * 1.2)
-        else:
-            tool_overhead = 0
+        # 5b. Measured tool definition token overhead (memoized per schema set)
+        tool_overhead = tool_schemas.token_overhead(model or self.settings.default_model)
 
         # 7. Register attachments as FileRecords and enrich content
         message_content: str | list = incoming.content
@@ -233,51 +235,30 @@ class AgentLoop:
             image_atts = [a for a in incoming.attachments if a.get("mime_type") in _IMAGE_MIMES]
             other_atts = [a for a in incoming.attachments if a.get("mime_type") not in _IMAGE_MIMES]
 
-            # Download images and build vision content blocks
+            # Downscale, recompress and cache images for vision (concurrently)
             image_blocks: list[dict] = []
+            fetchable = []
             for att in image_atts:
-                try:
-                    minio_key = att.get("minio_key", "")
-                    if not minio_key or not self._minio:
-                        other_atts.append(att)
-                        continue
-                    # Download from MinIO using authenticated client
-                    resp = self._minio.get_object(
-                        self.settings.minio_bucket, minio_key,
-                    )
-                    try:
-                        img_bytes = resp.read()
-                    finally:
-                        resp.close()
-                        resp.release_conn()
-
-                    # Cap at 20 MB for vision (Anthropic API limit)
-                    if len(img_bytes) > 20 * 1024 * 1024:
-                        logger.info("image_too_large_for_vision", size=len(img_bytes))
-                        other_atts.append(att)
-                        continue
-
-                    b64 = base64.standard_b64encode(img_bytes).decode("ascii")
-                    image_blocks.append({
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": att["mime_type"],
-                            "data": b64,
-                        },
-                    })
-                    logger.info(
-                        "image_attached_for_vision",
-                        filename=att.get("filename"),
-                        size=len(img_bytes),
-                    )
-                except Exception as e:
+                if att.get("minio_key") and self._vision:
+                    fetchable.append(att)
+                else:
+                    other_atts.append(att)
+            prepared = await self._vision.prepare(
+                [att["minio_key"] for att in fetchable]
+            ) if fetchable else []
+            for att, block in zip(fetchable, prepared):
+                if isinstance(block, ObjectTooLargeError):
+                    logger.info("image_too_large_for_vision", filename=att.get("filename"))
+                    other_atts.append(att)
+                elif isinstance(block, Exception):
                     logger.warning(
                         "image_vision_prep_failed",
                         filename=att.get("filename"),
-                        error=str(e),
+                        error=str(block),
                     )
                     other_atts.append(att)
+                else:
+                    image_blocks.append(block)
 
             # Build file context hint for non-image attachments
             file_context = ""
@@ -330,6 +311,7 @@ class AgentLoop:
 
         # 8. Build context — pass the active router so semantic memory embeddings
         # also use the user's own keys when configured.
+        context_metrics: dict = {}
         context = await self.context_builder.build(
             session=session,
             user=user,
@@ -341,6 +323,7 @@ class AgentLoop:
             llm_router=active_router,
             tool_overhead_tokens=tool_overhead,
             is_subscription=using_claude_oauth,
+            metrics=context_metrics,
         )
 
         # Save the incoming user message (text only — images are ephemeral)
@@ -350,14 +333,16 @@ class AgentLoop:
                 b.get("text", "") for b in message_content if b.get("type") == "text"
             )
         )
-        user_msg = Message(
-            id=uuid.uuid4(),
-            conversation_id=conversation.id,
-            role="user",
-            content=stored_content,
-            created_at=datetime.now(timezone.utc),
+        # Rows produced by the run are buffered and written in batches at
+        # checkpoints; nothing stays open on the session across LLM or
+        # tool calls.
+        ledger = RunLedger(
+            user.id, conversation.id, self.settings.agent_persist_batch_rows,
         )
-        session.add(user_msg)
+        ledger.add_message("user", stored_content)
+        # Checkpoint: persist the user message and end the context-building
+        # transaction before the first LLM call
+        await ledger.flush(session)
 
         # 8. Agent loop
         # Pre-compute context budget for in-loop re-trimming
@@ -370,6 +355,7 @@ class AgentLoop:
         files: list[dict] = []
         tool_call_summaries: list[ToolCallSummary] = []
         iteration = 0
+        first_token_at: float | None = None
 
         while iteration < self.settings.max_agent_iterations:
             iteration += 1
@@ -409,6 +395,8 @@ class AgentLoop:
                         max_tokens=max_tokens,
                         max_turns=_cli_max_turns,
                     ):
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
                         if isinstance(event_or_response, StreamEvent):
                             yield event_or_response
                         elif isinstance(event_or_response, LLMResponse):
@@ -424,6 +412,8 @@ class AgentLoop:
                             max_tokens=max_tokens,
                             max_turns=_cli_max_turns,
                         ):
+                            if first_token_at is None:
+                                first_token_at = time.monotonic()
                             if isinstance(event_or_response, StreamEvent):
                                 yield event_or_response
                             elif isinstance(event_or_response, LLMResponse):
@@ -444,28 +434,48 @@ class AgentLoop:
                         user_id=str(user.id),
                     )
 
+            streamed_text = False
             if not _used_cli:
-                # Standard path: non-streaming API call (primary or CLI fallback)
-                try:
-                    llm_response: LLMResponse = await active_router.chat(
-                        messages=context,
-                        tools=openai_tools,
-                        model=model,
-                        max_tokens=max_tokens,
-                    )
-                except PromptTooLongError:
-                    logger.warning(
-                        "prompt_too_long_recovering",
-                        context_messages=len(context),
-                        iteration=iteration,
-                    )
-                    context = self._emergency_trim(context)
-                    llm_response = await active_router.chat(
-                        messages=context,
-                        tools=openai_tools,
-                        model=model,
-                        max_tokens=max_tokens,
-                    )
+                # Standard path: stream tokens from the API (primary or CLI
+                # fallback); text deltas are forwarded as content events
+                for trim_attempt in range(2):
+                    try:
+                        async for event_or_response in active_router.chat_stream(
+                            messages=context,
+                            tools=openai_tools,
+                            model=model,
+                            max_tokens=max_tokens,
+                        ):
+                            if isinstance(event_or_response, LLMResponse):
+                                llm_response = event_or_response
+                                continue
+                            if first_token_at is None:
+                                first_token_at = time.monotonic()
+                            streamed_text = not event_or_response.data.get("reset")
+                            event_or_response.data["iteration"] = iteration
+                            yield event_or_response
+                        break
+                    except PromptTooLongError:
+                        if trim_attempt:
+                            raise
+                        logger.warning(
+                            "prompt_too_long_recovering",
+                            context_messages=len(context),
+                            iteration=iteration,
+                        )
+                        context = self._emergency_trim(context)
+
+            if iteration == 1:
+                # Tool-call-only responses: first token == first full response
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                logger.info(
+                    "time_to_first_token",
+                    ttft_ms=int((first_token_at - request_started) * 1000),
+                    streamed=_used_cli or streamed_text,
+                    user_id=str(user.id),
+                    **context_metrics,
+                )
 
             # Log token usage (including Anthropic prompt cache tokens)
             cache_write = llm_response.cache_creation_input_tokens
@@ -481,24 +491,20 @@ class AgentLoop:
                     cache_read_input_tokens=cache_read,
                 )
             )
-            token_log = TokenLog(
-                id=uuid.uuid4(),
-                user_id=user.id,
-                conversation_id=conversation.id,
+            ledger.add_token_log(
                 model=llm_response.model or model,
                 input_tokens=llm_response.input_tokens,
                 output_tokens=llm_response.output_tokens,
                 cache_creation_input_tokens=cache_write,
                 cache_read_input_tokens=cache_read,
                 cost_estimate=cost,
-                created_at=datetime.now(timezone.utc),
             )
-            session.add(token_log)
 
-            # Update user token usage — skip for Claude Code OAuth users
-            # since their usage is billed to their subscription, not our API.
+            # Update user token usage (applied atomically at the next flush)
+            # — skip for Claude Code OAuth users since their usage is billed
+            # to their subscription, not our API.
             if not using_claude_oauth:
-                user.tokens_used_this_month += (
+                ledger.charge(
                     llm_response.input_tokens
                     + llm_response.output_tokens
                     + cache_write
@@ -509,45 +515,33 @@ class AgentLoop:
             if llm_response.stop_reason != "tool_use" or not llm_response.tool_calls:
                 final_content = llm_response.content or ""
                 # Save assistant message
-                assistant_msg = Message(
-                    id=uuid.uuid4(),
-                    conversation_id=conversation.id,
-                    role="assistant",
-                    content=final_content,
+                ledger.add_message(
+                    "assistant",
+                    final_content,
                     token_count=llm_response.output_tokens,
                     model_used=llm_response.model or model,
-                    created_at=datetime.now(timezone.utc),
                 )
-                session.add(assistant_msg)
                 break
 
             # Handle tool calls
             if llm_response.content:
-                # Some models return text alongside tool calls
+                # Some models return text alongside tool calls (already
+                # delivered as deltas when streamed)
                 final_content = llm_response.content
-                yield StreamEvent(event="content", data={
-                    "text": llm_response.content,
-                    "iteration": iteration,
-                })
+                if not streamed_text:
+                    yield StreamEvent(event="content", data={
+                        "text": llm_response.content,
+                        "iteration": iteration,
+                    })
 
 
+            # Prepare every call up front (ids + context injection) so the
+            # batches below can run independent calls concurrently while
+            # events and persisted rows keep the model's requested order.
+            prepared: list[tuple[ToolCall, str]] = []
             for tool_call in llm_response.tool_calls:
                 tool_use_id = f"tool_{uuid.uuid4().hex[:12]}"
 
-                # Save tool call message
-                tc_msg = Message(
-                    id=uuid.uuid4(),
-                    conversation_id=conversation.id,
-                    role="tool_call",
-                    content=json.dumps({
-                        "name": tool_call.tool_name,
-                        "arguments": tool_call.arguments,
-                        "tool_use_id": tool_use_id,
-                    }),
-                    created_at=datetime.now(timezone.utc),
-                )
-                session.add(tc_msg)
-
                 # Inject user context so modules can associate resources
                 tool_call.user_id = str(user.id)
 
@@ -561,85 +555,92 @@ class AgentLoop:
                     if tool_call.tool_name == "scheduler.add_job":
                         tool_call.arguments["conversation_id"] = str(conversation.id)
 
-                # Emit tool_call event before execution
-                yield StreamEvent(event="tool_call", data={
-                    "tool": tool_call.tool_name,
-                    "arguments": tool_call.arguments,
-                })
+                prepared.append((tool_call, tool_use_id))
+
+            for batch in self._plan_tool_batches(prepared):
+                # Emit tool_call events before execution
+                for tool_call, _ in batch:
+                    yield StreamEvent(event="tool_call", data={
+                        "tool": tool_call.tool_name,
+                        "arguments": tool_call.arguments,
+                    })
 
-                # Execute tool (with server-side permission check)
-                result = await self.tool_registry.execute_tool(
-                    tool_call, user_permission=user.permission_level,
+                # Execute the batch (with server-side permission check)
+                results = await self._execute_tool_batch(
+                    [tc for tc, _ in batch], user.permission_level,
                 )
 
                 # No blind retry — the error is appended to context so the
                 # LLM sees it in the next iteration and can adjust arguments
                 # or try a different approach.
 
-                # Emit tool_result event
-                yield StreamEvent(event="tool_result", data={
-                    "tool": tool_call.tool_name,
-                    "success": result.success,
-                    "error": result.error if not result.success else None,
-                })
-
-                # Track tool call for metadata
-                tool_call_summaries.append(
-                    ToolCallSummary(
-                        name=tool_call.tool_name,
-                        success=result.success,
-                        tool_use_id=tool_use_id,
+                for (tool_call, tool_use_id), result in zip(batch, results):
+                    # Emit tool_result event
+                    yield StreamEvent(event="tool_result", data={
+                        "tool": tool_call.tool_name,
+                        "success": result.success,
+                        "error": result.error if not result.success else None,
+                    })
+
+                    # Track tool call for metadata
+                    tool_call_summaries.append(
+                        ToolCallSummary(
+                            name=tool_call.tool_name,
+                            success=result.success,
+                            tool_use_id=tool_use_id,
+                        )
                     )
-                )
 
-                # Save tool result message
-                result_content = json.dumps({
-                    "name": tool_call.tool_name,
-                    "result": result.result if result.success else None,
-                    "error": result.error,
-                    "tool_use_id": tool_use_id,
-                })
-                tr_msg = Message(
-                    id=uuid.uuid4(),
-                    conversation_id=conversation.id,
-                    role="tool_result",
-                    content=result_content,
-                    created_at=datetime.now(timezone.utc),
-                )
-                session.add(tr_msg)
-
-                # Append to context for the LLM (truncate large results)
-                context.append({
-                    "role": "tool_call",
-                    "name": tool_call.tool_name,
-                    "arguments": tool_call.arguments,
-                    "tool_use_id": tool_use_id,
-                })
-                result_text = str(result.result) if result.success else f"Error: {result.error}"
-                max_chars = self.settings.tool_result_max_chars
-                if len(result_text) > max_chars:
-                    result_text = result_text[:max_chars] + "\n... [truncated — result too large]"
-                context.append({
-                    "role": "tool_result",
-                    "name": tool_call.tool_name,
-                    "content": result_text,
-                    "tool_use_id": tool_use_id,
-                })
-
-                # Check for file URLs in results
-                if result.success and isinstance(result.result, dict):
-                    if "url" in result.result:
-                        files.append({
-                            "filename": result.result.get("filename", "file"),
-                            "url": result.result["url"],
-                        })
-                    # Also handle nested files list (e.g. from code_executor)
-                    for f in result.result.get("files", []):
-                        if isinstance(f, dict) and "url" in f:
+                    # Save tool call + result messages (adjacent, in request order)
+                    ledger.add_message("tool_call", json.dumps({
+                        "name": tool_call.tool_name,
+                        "arguments": tool_call.arguments,
+                        "tool_use_id": tool_use_id,
+                    }))
+                    ledger.add_message("tool_result", json.dumps({
+                        "name": tool_call.tool_name,
+                        "result": result.result if result.success else None,
+                        "error": result.error,
+                        "tool_use_id": tool_use_id,
+                    }))
+
+                    # Append to context for the LLM (truncate large results)
+                    context.append({
+                        "role": "tool_call",
+                        "name": tool_call.tool_name,
+                        "arguments": tool_call.arguments,
+                        "tool_use_id": tool_use_id,
+                    })
+                    result_text = str(result.result) if result.success else f"Error: {result.error}"
+                    max_chars = self.settings.tool_result_max_chars
+                    if len(result_text) > max_chars:
+                        result_text = result_text[:max_chars] + "\n... [truncated — result too large]"
+                    context.append({
+                        "role": "tool_result",
+                        "name": tool_call.tool_name,
+                        "content": result_text,
+                        "tool_use_id": tool_use_id,
+                    })
+
+                    # Check for file URLs in results
+                    if result.success and isinstance(result.result, dict):
+                        if "url" in result.result:
                             files.append({
-                                "filename": f.get("filename", "file"),
-                                "url": f["url"],
+                                "filename": result.result.get("filename", "file"),
+                                "url": result.result["url"],
                             })
+                        # Also handle nested files list (e.g. from code_executor)
+                        for f in result.result.get("files", []):
+                            if isinstance(f, dict) and "url" in f:
+                                files.append({
+                                    "filename": f.get("filename", "file"),
+                                    "url": f["url"],
+                                })
+
+            # Checkpoint: write buffered rows once enough have accumulated
+            # (between tool rounds, never while a call is in flight)
+            if ledger.should_flush:
+                await ledger.flush(session)
 
             # Re-trim context after tool results to prevent exceeding budget
             context = self._retrim_context(context, context_budget, target_model)
@@ -648,18 +649,11 @@ class AgentLoop:
             # Max iterations reached
             if not final_content:
                 final_content = "I wasn't able to complete the task within the allowed number of steps. Here's what I have so far."
-            assistant_msg = Message(
-                id=uuid.uuid4(),
-                conversation_id=conversation.id,
-                role="assistant",
-                content=final_content,
-                created_at=datetime.now(timezone.utc),
-            )
-            session.add(assistant_msg)
+            ledger.add_message("assistant", final_content)
 
-        # Update conversation timestamp
+        # Update conversation timestamp and write the remaining rows
         conversation.last_active_at = datetime.now(timezone.utc)
-        await session.commit()
+        await ledger.flush(session)
 
         # Build tool calls metadata if any tools were called
         tool_metadata = None
@@ -713,16 +707,27 @@ class AgentLoop:
             if incoming.platform_username and link.platform_username != incoming.platform_username:
                 link.platform_username = incoming.platform_username
 
-            # Lock the user row to prevent concurrent budget race conditions
+            # No row lock: usage is added with an atomic UPDATE when the
+            # run's rows are flushed, so concurrent runs can't lose updates
             result = await session.execute(
-                select(User).where(User.id == link.user_id).with_for_update()
+                select(User).where(User.id == link.user_id)
             )
             user = result.scalar_one()
 
-            # Check if budget needs reset (monthly)
-            if user.budget_reset_at < datetime.now(timezone.utc) - timedelta(days=30):
-                user.tokens_used_this_month = 0
-                user.budget_reset_at = datetime.now(timezone.utc)
+            # Check if budget needs reset (monthly). The cutoff is repeated
+            # in the WHERE clause so concurrent runs reset at most once.
+            cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+            if user.budget_reset_at < cutoff:
+                await session.execute(
+                    update(User)
+                    .where(User.id == user.id, User.budget_reset_at < cutoff)
+                    .values(
+                        tokens_used_this_month=0,
+                        budget_reset_at=datetime.now(timezone.utc),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.refresh(user)
 
             return user
 
@@ -753,6 +758,54 @@ class AgentLoop:
         )
         return user
 
+    def _plan_tool_batches(
+        self, prepared: list[tuple[ToolCall, str]],
+    ) -> list[list[tuple[ToolCall, str]]]:
+        """Split tool calls into consecutive batches that may run concurrently.
+
+        Runs of read-only calls share a batch; any other call (including
+        tools whose manifest does not say) gets a batch of its own, so it
+        never overlaps another call and everything the model requested
+        before it has finished.
+        """
+        batches: list[list[tuple[ToolCall, str]]] = []
+        for item in prepared:
+            if self.tool_registry.is_read_only(item[0].tool_name):
+                if not batches:
+                    batches.append([])
+                batches[-1].append(item)
+            else:
+                batches.append([item])
+                batches.append([])
+        return [b for b in batches if b]
+
+    async def _execute_tool_batch(
+        self, tool_calls: list[ToolCall], user_permission: str,
+    ) -> list[ToolResult]:
+        """Execute *tool_calls* concurrently, returning results in input order.
+
+        Concurrency is capped by ``max_parallel_tool_calls``.
+        """
+        if len(tool_calls) == 1:
+            return [await self.tool_registry.execute_tool(
+                tool_calls[0], user_permission=user_permission,
+            )]
+
+        limit = asyncio.Semaphore(max(1, self.settings.max_parallel_tool_calls))
+
+        async def _run(call: ToolCall) -> ToolResult:
+            async with limit:
+                return await self.tool_registry.execute_tool(
+                    call, user_permission=user_permission,
+                )
+
+        logger.info(
+            "parallel_tool_batch",
+            tools=[tc.tool_name for tc in tool_calls],
+            concurrency=self.settings.max_parallel_tool_calls,
+        )
+        return list(await asyncio.gather(*(_run(tc) for tc in tool_calls)))
+
     def _check_budget(self, user: User) -> bool:
         """Check if user has remaining token budget."""
         if user.token_budget_monthly is None:
@@ -780,8 +833,10 @@ class AgentLoop:
         middle = non_system[:-tail_count] if tail_count else non_system
         tail = non_system[-tail_count:] if tail_count else []
 
-        while middle and count_messages_tokens(system + middle + tail, model) > budget:
-            middle.pop(0)
+        # Drop the oldest middle messages, counting each one only once
+        reserved = count_messages_tokens(system + tail, model)
+        kept = trim_groups_to_budget([[m] for m in middle], reserved, budget, model)
+        middle = [g[0] for g in kept]
 
         result = system + middle + tail
         return ContextBuilder._sanitize_tool_pairs(result)
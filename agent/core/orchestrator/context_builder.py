@@ -2,27 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
+import time
 from datetime import datetime, timezone
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.llm_router.providers.base import CACHE_BREAKPOINT
 from shared.models.conversation import Conversation, Message
 from shared.models.memory import MemorySummary
 from shared.models.persona import Persona
 from shared.models.user import User
+from shared.redis import get_redis
 
 try:
     from shared.models.project import Project
     from shared.models.project_phase import ProjectPhase
     from shared.models.project_task import ProjectTask
+    from shared.project_context import (
+        get_cached_project_context,
+        set_cached_project_context,
+    )
     _HAS_PROJECTS = True
 except ImportError:
     _HAS_PROJECTS = False
-from shared.utils.tokens import count_messages_tokens
+from shared.utils.tokens import (
+    count_message_tokens,
+    count_messages_tokens,
+    trim_groups_to_budget,
+)
 
 logger = structlog.get_logger()
 
@@ -65,13 +77,28 @@ _CONTEXTUAL_PATTERNS = re.compile(
 # Minimum word count below which a message is almost certainly a follow-up
 _SHORT_MESSAGE_THRESHOLD = 4
 
+# ---------------------------------------------------------------------------
+# Semantic recall policy
+# ---------------------------------------------------------------------------
+# skip  — no recall (short follow-ups like "ok", "do it" with nothing cached)
+# reuse — serve the conversation's last recall result from Redis
+# run   — embed the message and run the pgvector search
+RECALL_SKIP = "skip"
+RECALL_REUSE = "reuse"
+RECALL_RUN = "run"
+RECALL_CACHE_PREFIX = "recall:"
+
 
 class ContextBuilder:
     """Assembles the LLM context for each request."""
 
-    def __init__(self, settings, llm_router=None):
+    def __init__(self, settings, llm_router=None, session_factory=None):
         self.settings = settings
         self.llm_router = llm_router
+        # When set, each context read (projects, recall, summary, history)
+        # runs on its own session concurrently instead of sequentially on
+        # the request session.
+        self.session_factory = session_factory
 
     def _get_context_budget(self, model: str, is_subscription: bool = False) -> int:
         """Get a percentage of the model's context window.
@@ -97,6 +124,7 @@ class ContextBuilder:
         llm_router=None,
         tool_overhead_tokens: int | None = None,
         is_subscription: bool = False,
+        metrics: dict | None = None,
     ) -> list[dict]:
         """Build the context messages list for an LLM call.
 
@@ -108,12 +136,16 @@ class ContextBuilder:
         with the actual measured token count of the tool definitions.  Pass
         ``None`` to use the config default.
 
+        When a *metrics* dict is passed it is filled with the recall decision
+        and per-stage latencies (used for the agent loop's time-to-first-token
+        log).
+
         Structure:
-        1. System prompt (persona + tools + datetime)
-        2. Relevant semantic memories (max 3)
-        3. Conversation summary (if partially summarized)
-        4. Recent working memory (last N messages)
-        5. New user message
+        1. System prompt (persona + guidance) — static, cache breakpoint
+        2. Active projects, relevant semantic memories (max 3), conversation
+           summary (if partially summarized) and the current time — volatile
+        3. Recent working memory (last N messages)
+        4. New user message
         """
         target_model = model or self.settings.default_model
         # Reserve budget for tool definitions which are sent alongside messages.
@@ -125,18 +157,13 @@ class ContextBuilder:
             tool_overhead = getattr(self.settings, "tool_schema_token_budget", 4000) if tool_count > 0 else 0
         budget = self._get_context_budget(target_model, is_subscription=is_subscription) - tool_overhead
         messages: list[dict] = []
+        build_started = time.monotonic()
 
-        # 1. System prompt
+        # 1. System prompt — static tier, byte-stable across requests for the
+        # same persona/platform, so it ends its own prompt-cache breakpoint
         system_prompt = self._build_system_prompt(persona, platform=conversation.platform)
-        messages.append({"role": "system", "content": system_prompt})
-
-        # 2. Active project summaries
-        project_context = await self._get_active_projects(session, user)
-        if project_context:
-            messages.append({"role": "system", "content": project_context})
+        messages.append({"role": "system", "content": system_prompt, CACHE_BREAKPOINT: True})
 
-        # 3. Semantic memories (if embedding/llm_router is available)
-        # Use the per-request router override when the user has personal API keys.
         # Extract text for embedding query (content blocks may contain images)
         _message_text = (
             incoming_message if isinstance(incoming_message, str)
@@ -144,32 +171,83 @@ class ContextBuilder:
                 b.get("text", "") for b in incoming_message if b.get("type") == "text"
             )
         )
+        # Use the per-request router override when the user has personal API keys.
         _router = llm_router or self.llm_router
-        memories = await self._get_semantic_memories(session, user, _message_text, router=_router)
-        if memories:
+
+        needs_full = self._needs_full_context(_message_text)
+
+        # 2-5. Independent reads, each with its own session, timeout and
+        # fallback.  With a session factory they run concurrently; otherwise
+        # they run one after another, each on a session of its own bound to
+        # the request session's engine.
+        stage_timeout = getattr(self.settings, "context_stage_timeout_seconds", 3.0)
+        history_timeout = getattr(self.settings, "context_history_timeout_seconds", 5.0)
+        timings: dict[str, int] = {}
+
+        async def _no_summary(_session):
+            return None
+
+        stages = [
+            self._run_stage(
+                "projects", lambda s: self._get_active_projects(s, user),
+                session, stage_timeout, None, timings,
+            ),
+            self._run_stage(
+                "recall", lambda s: self._recall_stage(
+                    s, user, conversation, _message_text, _router,
+                ),
+                session, stage_timeout, (RECALL_SKIP, []), timings,
+            ),
+            self._run_stage(
+                "summary",
+                (lambda s: self._get_conversation_summary(s, conversation))
+                if conversation.is_summarized else _no_summary,
+                session, stage_timeout, None, timings,
+            ),
+            self._run_stage(
+                "history", lambda s: self._get_recent_messages(
+                    s, conversation, full=needs_full, is_subscription=is_subscription,
+                ),
+                session, history_timeout, [], timings,
+            ),
+        ]
+        if self.session_factory is not None:
+            results = await asyncio.gather(*stages)
+        else:
+            results = [await stage for stage in stages]
+        project_context, (recall_decision, recalled), summary, recent_messages = results
+
+        # 2. Active project summaries
+        if project_context:
+            messages.append({"role": "system", "content": project_context})
+
+        # 3. Semantic memories (skipped/reused per the recall policy)
+        if recalled:
             memory_text = "Relevant context from past conversations:\n"
-            for mem in memories:
-                memory_text += f"- {mem.summary}\n"
+            for summary_text in recalled:
+                memory_text += f"- {summary_text}\n"
             messages.append({"role": "system", "content": memory_text})
 
         # 4. Conversation summary
-        if conversation.is_summarized:
-            summary = await self._get_conversation_summary(session, conversation)
-            if summary:
-                messages.append({
-                    "role": "system",
-                    "content": f"Summary of earlier conversation:\n{summary}",
-                })
-
-        # 5. Working memory — load adaptively based on message content
-        needs_full = self._needs_full_context(_message_text)
-        recent_messages = await self._get_recent_messages(
-            session, conversation, full=needs_full, is_subscription=is_subscription,
-        )
+        if summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of earlier conversation:\n{summary}",
+            })
+
+        # Volatile tier: the current time changes every minute, so it goes
+        # last among the system blocks where it cannot break the cached prefix
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        messages.append({"role": "system", "content": f"Current date and time: {now}"})
+
+        # 5. Working memory — loaded adaptively based on message content
         logger.info(
             "context_depth",
             full_context=needs_full,
             messages_loaded=len(recent_messages),
+            recall=recall_decision,
+            concurrent=self.session_factory is not None,
+            **timings,
         )
         history_max = getattr(self.settings, "history_tool_result_max_chars", 1500)
         for msg in recent_messages:
@@ -217,11 +295,19 @@ class ContextBuilder:
         # broken history in the DB.
         messages = self._sanitize_tool_pairs(messages)
 
+        if metrics is not None:
+            metrics.update(timings)
+            metrics["recall"] = recall_decision
+            metrics["context_build_ms"] = int((time.monotonic() - build_started) * 1000)
+
         return messages
 
     def _build_system_prompt(self, persona: Persona | None, platform: str = "") -> str:
-        """Build the system prompt from persona configuration."""
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        """Build the static system prompt from persona configuration.
+
+        Must stay byte-identical between requests (no timestamps or other
+        per-request data) — it is the cached prefix for prompt caching.
+        """
 
         # Platform-specific formatting guidance
         _platform_formatting = {
@@ -290,7 +376,6 @@ class ContextBuilder:
         if persona:
             return (
                 f"{persona.system_prompt}\n\n"
-                f"Current date and time: {now}\n"
                 f"You have access to tools. Use them when needed to accomplish tasks."
                 f"{scheduler_guidance}"
                 f"{claude_code_guidance}"
@@ -300,7 +385,6 @@ class ContextBuilder:
         return (
             "You are a helpful AI assistant with access to various tools. "
             "Be concise, accurate, and helpful. If you're unsure about something, say so.\n\n"
-            f"Current date and time: {now}\n"
             "You have access to tools. Use them when needed to accomplish tasks."
             f"{scheduler_guidance}"
             f"{claude_code_guidance}"
@@ -313,39 +397,60 @@ class ContextBuilder:
         session: AsyncSession,
         user: User,
     ) -> str | None:
-        """Build a brief summary of the user's active projects for system context."""
+        """Build a brief summary of the user's active projects for system context.
+
+        The rendered block is cached per user (see ``shared.project_context``)
+        and dropped whenever one of the user's projects or tasks is written,
+        so repeat messages reuse byte-identical text with no DB round-trips.
+        On a miss, task counts come from one aggregated query and in-progress
+        tasks from at most one more.
+        """
         if not _HAS_PROJECTS:
             return None
 
-        try:
-            from sqlalchemy import func
+        cached, generation = await get_cached_project_context(user.id)
+        if cached is not None:
+            return cached or None
 
+        try:
             result = await session.execute(
-                select(Project)
+                select(
+                    Project,
+                    func.count(ProjectTask.id),
+                    func.count(ProjectTask.id).filter(ProjectTask.status == "done"),
+                    func.count(ProjectTask.id).filter(ProjectTask.status == "doing"),
+                    func.count(ProjectTask.id).filter(ProjectTask.status == "in_review"),
+                )
+                .outerjoin(ProjectTask, ProjectTask.project_id == Project.id)
                 .where(Project.user_id == user.id)
                 .where(Project.status.in_(["active", "planning"]))
+                .group_by(Project.id)
                 .order_by(Project.updated_at.desc())
                 .limit(5)
             )
-            projects = list(result.scalars().all())
+            rows = result.all()
 
-            if not projects:
+            if not rows:
+                await set_cached_project_context(user.id, "", generation)
                 return None
 
-            lines = ["Active projects:"]
-            for p in projects:
-                # Get task counts
-                counts_result = await session.execute(
-                    select(ProjectTask.status, func.count(ProjectTask.id))
-                    .where(ProjectTask.project_id == p.id)
-                    .group_by(ProjectTask.status)
+            # In-progress tasks (with claude_task_ids) for every project at once
+            doing_by_project: dict = {}
+            doing_ids = [p.id for p, _total, _done, doing, _review in rows if doing > 0]
+            if doing_ids:
+                doing_result = await session.execute(
+                    select(ProjectTask)
+                    .where(
+                        ProjectTask.project_id.in_(doing_ids),
+                        ProjectTask.status == "doing",
+                    )
+                    .order_by(ProjectTask.project_id, ProjectTask.order_index)
                 )
-                counts = {row[0]: row[1] for row in counts_result.all()}
-                total = sum(counts.values())
-                done = counts.get("done", 0)
-                doing = counts.get("doing", 0)
-                review = counts.get("in_review", 0)
+                for t in doing_result.scalars().all():
+                    doing_by_project.setdefault(t.project_id, []).append(t)
 
+            lines = ["Active projects:"]
+            for p, total, done, doing, review in rows:
                 parts = [f'"{p.name}" ({p.status})']
                 if total > 0:
                     parts.append(f"{done}/{total} tasks done")
@@ -362,22 +467,11 @@ class ContextBuilder:
 
                 # Show in-progress tasks with claude_task_ids so LLM can
                 # use continue_task instead of creating new workspaces
-                if doing > 0:
-                    doing_result = await session.execute(
-                        select(ProjectTask)
-                        .where(
-                            ProjectTask.project_id == p.id,
-                            ProjectTask.status == "doing",
-                        )
-                        .order_by(ProjectTask.order_index)
-                        .limit(5)
-                    )
-                    doing_tasks = list(doing_result.scalars().all())
-                    for t in doing_tasks:
-                        task_info = f'  - Task "{t.title}"'
-                        if t.claude_task_id:
-                            task_info += f" [claude_task_id: {t.claude_task_id}]"
-                        lines.append(task_info)
+                for t in doing_by_project.get(p.id, [])[:5]:
+                    task_info = f'  - Task "{t.title}"'
+                    if t.claude_task_id:
+                        task_info += f" [claude_task_id: {t.claude_task_id}]"
+                    lines.append(task_info)
 
             lines.append(
                 "\nProject execution workflow:"
@@ -419,11 +513,123 @@ class ContextBuilder:
                 "where each task needs individual review."
             )
 
-            return "\n".join(lines)
+            text = "\n".join(lines)
+            await set_cached_project_context(user.id, text, generation)
+            return text
         except Exception as e:
             logger.warning("active_projects_context_failed", error=str(e))
             return None
 
+    def _recall_policy(self, message: str) -> str:
+        """Decide whether *message* is worth a semantic recall round-trip.
+
+        Short follow-ups ("ok", "do it") carry no topic of their own, so an
+        embedding of them only adds latency; contextual messages ("what
+        about the other one?") continue the current topic, so the
+        conversation's last recall result is still the best answer.  Both
+        return ``RECALL_REUSE`` — the caller downgrades it to a skip when
+        nothing is cached.  Standalone queries always run recall.
+        """
+        if not getattr(self.settings, "recall_policy_enabled", True):
+            return RECALL_RUN
+        if not message.strip():
+            return RECALL_SKIP
+        if self._needs_full_context(message):
+            return RECALL_REUSE
+        return RECALL_RUN
+
+    async def _run_stage(
+        self,
+        name: str,
+        fn,
+        session: AsyncSession,
+        timeout: float,
+        fallback,
+        timings: dict[str, int],
+    ):
+        """Run one context read with a timeout, returning *fallback* on failure.
+
+        ``fn(session)`` runs on a fresh session from ``self.session_factory``
+        when one is configured (so stages can overlap), otherwise on a new
+        session bound to *session*'s engine.  The request session itself is
+        never used: a timeout cancels the read partway through, which would
+        leave it in an undefined state for the rest of the request.  The
+        stage's wall time is recorded as ``timings[name_ms]``.
+        """
+        started = time.monotonic()
+
+        def _own_session():
+            if self.session_factory is not None:
+                return self.session_factory()
+            return AsyncSession(bind=session.bind, expire_on_commit=False)
+
+        async def _go():
+            async with _own_session() as own_session:
+                return await fn(own_session)
+
+        try:
+            return await asyncio.wait_for(_go(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("context_stage_timeout", stage=name, timeout=timeout)
+            return fallback
+        except Exception as e:
+            logger.warning("context_stage_failed", stage=name, error=str(e))
+            return fallback
+        finally:
+            timings[f"{name}_ms"] = int((time.monotonic() - started) * 1000)
+
+    async def _recall_stage(
+        self,
+        session: AsyncSession,
+        user: User,
+        conversation: Conversation,
+        query: str,
+        router=None,
+    ) -> tuple[str, list[str]]:
+        """Apply the recall policy and return ``(decision, summaries)``."""
+        decision = self._recall_policy(query)
+        summaries: list[str] = []
+        if decision == RECALL_REUSE:
+            cached = await self._load_cached_recall(conversation)
+            if cached is None:
+                # Nothing to reuse: short follow-ups skip, longer ones search
+                short = len(query.split()) < _SHORT_MESSAGE_THRESHOLD
+                decision = RECALL_SKIP if short else RECALL_RUN
+            else:
+                summaries = cached
+        if decision == RECALL_RUN:
+            memories = await self._get_semantic_memories(
+                session, user, query, router=router,
+            )
+            summaries = [m.summary for m in memories]
+            await self._store_cached_recall(conversation, summaries)
+        return decision, summaries
+
+    async def _load_cached_recall(self, conversation: Conversation) -> list[str] | None:
+        """Return the conversation's last recall result, or None if not cached."""
+        try:
+            redis = await get_redis()
+            raw = await redis.get(f"{RECALL_CACHE_PREFIX}{conversation.id}")
+        except Exception as e:
+            logger.warning("recall_cache_read_failed", error=str(e))
+            return None
+        return json.loads(raw) if raw else None
+
+    async def _store_cached_recall(
+        self, conversation: Conversation, summaries: list[str],
+    ) -> None:
+        """Cache a recall result for reuse by follow-ups in the same conversation."""
+        ttl = getattr(self.settings, "recall_cache_ttl_seconds", 1800)
+        if ttl <= 0:
+            return
+        try:
+            redis = await get_redis()
+            await redis.set(
+                f"{RECALL_CACHE_PREFIX}{conversation.id}", json.dumps(summaries), ex=ttl,
+            )
+        except Exception as e:
+            logger.warning("recall_cache_write_failed", error=str(e))
+
     async def _get_semantic_memories(
         self,
         session: AsyncSession,
@@ -578,11 +784,9 @@ class ContextBuilder:
             else:
                 groups.append([msg])
 
-        # Remove oldest groups until we fit
-        while groups and count_messages_tokens(
-            system_msgs + [m for g in groups for m in g] + [user_msg], model
-        ) > budget:
-            groups.pop(0)
+        # Remove oldest groups until we fit (each group is counted once)
+        reserved = count_messages_tokens(system_msgs, model) + count_message_tokens(user_msg, model)
+        groups = trim_groups_to_budget(groups, reserved, budget, model)
 
         trimmed_middle = [m for g in groups for m in g]
 
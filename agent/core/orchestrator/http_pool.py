@@ -0,0 +1,166 @@
+"""Process-wide pooled HTTP clients for module tool calls.
+
+Each module gets one long-lived ``httpx.AsyncClient`` with keep-alive
+connections, so repeated tool calls reuse TCP (and TLS, when going
+through nginx) instead of opening a fresh socket per call.  Timeouts
+follow the same ``slow_modules`` rule the registry has always used.
+
+Pool activity is tracked per module (in-use and queued requests, TCP
+connect latency) and exposed via :meth:`ModuleClientPool.stats`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import structlog
+
+from shared.auth import get_service_auth_headers
+from shared.config import Settings, parse_list
+
+logger = structlog.get_logger()
+
+try:
+    import h2  # noqa: F401
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
+# Default timeout for modules not listed in ``slow_modules``
+DEFAULT_MODULE_TIMEOUT = 30.0
+
+
+class _ModulePoolStats:
+    """Counters for a single module's connection pool."""
+
+    def __init__(self) -> None:
+        self.in_use = 0
+        self.queued = 0
+        self.requests = 0
+        self.connects = 0
+        self.connect_seconds_total = 0.0
+        self.connect_seconds_max = 0.0
+
+    def record_connect(self, seconds: float) -> None:
+        self.connects += 1
+        self.connect_seconds_total += seconds
+        self.connect_seconds_max = max(self.connect_seconds_max, seconds)
+
+    def as_dict(self) -> dict:
+        avg = self.connect_seconds_total / self.connects if self.connects else 0.0
+        return {
+            "in_use": self.in_use,
+            "queued": self.queued,
+            "requests": self.requests,
+            "connects": self.connects,
+            "connect_ms_avg": round(avg * 1000, 2),
+            "connect_ms_max": round(self.connect_seconds_max * 1000, 2),
+        }
+
+
+class ModuleClientPool:
+    """Lazily-created, long-lived HTTP clients keyed by module name."""
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, _ModulePoolStats] = {}
+        self._slow_modules = set(parse_list(settings.slow_modules))
+        self._http2 = settings.tool_pool_http2 and _HAS_H2
+        if settings.tool_pool_http2 and not _HAS_H2:
+            logger.warning("tool_pool_http2_unavailable", hint="pip install h2")
+
+    def timeout_for(self, module_name: str) -> float:
+        """Return the request timeout (seconds) for *module_name*."""
+        if module_name in self._slow_modules:
+            return float(self.settings.tool_execution_timeout)
+        return DEFAULT_MODULE_TIMEOUT
+
+    def _get_client(self, module_name: str) -> httpx.AsyncClient:
+        client = self._clients.get(module_name)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.settings.tool_pool_max_connections,
+                max_keepalive_connections=self.settings.tool_pool_max_keepalive,
+                keepalive_expiry=self.settings.tool_pool_keepalive_expiry,
+            )
+            client = httpx.AsyncClient(
+                timeout=self.timeout_for(module_name),
+                headers=get_service_auth_headers(),
+                limits=limits,
+                http2=self._http2,
+            )
+            self._clients[module_name] = client
+            self._slots[module_name] = asyncio.Semaphore(
+                self.settings.tool_pool_max_connections
+            )
+            self._stats.setdefault(module_name, _ModulePoolStats())
+        return client
+
+    @asynccontextmanager
+    async def client(self, module_name: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Lease the pooled client for *module_name* for one request.
+
+        Callers beyond ``tool_pool_max_connections`` wait here (counted as
+        ``queued``) rather than inside httpx, so the wait is observable.
+        The wait is bounded by the module's request timeout; past it
+        ``httpx.PoolTimeout`` is raised, like httpx's own pool wait.
+        """
+        client = self._get_client(module_name)
+        slots = self._slots[module_name]
+        stats = self._stats[module_name]
+        timeout = self.timeout_for(module_name)
+
+        stats.queued += 1
+        try:
+            # asyncio.timeout rather than wait_for: a free slot is taken
+            # without first scheduling a separate task
+            async with asyncio.timeout(timeout):
+                await slots.acquire()
+        except TimeoutError:
+            raise httpx.PoolTimeout(
+                f"No free connection to {module_name} within {timeout:.0f}s"
+            ) from None
+        finally:
+            stats.queued -= 1
+        stats.in_use += 1
+        stats.requests += 1
+        try:
+            yield client
+        finally:
+            stats.in_use -= 1
+            slots.release()
+
+    def trace_for(self, module_name: str):
+        """Return an httpcore ``trace`` extension that records connect latency."""
+        stats = self._stats.setdefault(module_name, _ModulePoolStats())
+        started: dict[str, float] = {}
+
+        async def _trace(event_name: str, info: dict) -> None:
+            if event_name == "connection.connect_tcp.started":
+                started["tcp"] = time.monotonic()
+            elif event_name == "connection.connect_tcp.complete" and "tcp" in started:
+                stats.record_connect(time.monotonic() - started.pop("tcp"))
+
+        return _trace
+
+    def stats(self) -> dict[str, dict]:
+        """Snapshot of per-module pool counters."""
+        return {name: s.as_dict() for name, s in self._stats.items()}
+
+    async def aclose(self) -> None:
+        """Close every pooled client. Safe to call more than once."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._slots.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("tool_pool_close_failed", error=str(e))
+        logger.info("tool_pool_closed", modules=len(clients))
@@ -0,0 +1,153 @@
+"""Buffered persistence for the rows an agent run produces.
+
+Every loop iteration used to ``session.add()`` a ``TokenLog`` plus one
+``Message`` per tool call and result, and to bump the ORM user object's
+``tokens_used_this_month``.  That kept a transaction (and a pooled
+connection) open across every LLM and tool call, and the final
+read-modify-write of the user row could lose a concurrent run's usage.
+
+:class:`RunLedger` collects those rows in memory instead.  At
+checkpoints the loop calls :meth:`RunLedger.flush`, which writes them
+in one short transaction:
+
+* all buffered ``messages`` rows in a single multi-row INSERT,
+* all buffered ``token_logs`` rows in a single multi-row INSERT,
+* the accumulated usage as one atomic
+  ``UPDATE users SET tokens_used_this_month = tokens_used_this_month + :n``.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+import structlog
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models.conversation import Message
+from shared.models.token_usage import TokenLog
+from shared.models.user import User
+
+logger = structlog.get_logger()
+
+
+def charge_tokens_stmt(user_id: uuid.UUID, tokens: int):
+    """Atomic increment of a user's monthly token counter.
+
+    The arithmetic happens in the database, so concurrent runs for the
+    same user never overwrite each other's usage and no row lock is held
+    beyond the statement itself.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(tokens_used_this_month=User.tokens_used_this_month + tokens)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class RunLedger:
+    """In-memory buffer of one agent run's messages, token logs and usage."""
+
+    def __init__(
+        self,
+        user_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        batch_rows: int = 24,
+    ) -> None:
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.batch_rows = max(1, batch_rows)
+        self._messages: list[dict[str, Any]] = []
+        self._token_logs: list[dict[str, Any]] = []
+        self._tokens = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._messages) + len(self._token_logs)
+
+    @property
+    def should_flush(self) -> bool:
+        """True once enough rows are buffered to be worth a mid-run write."""
+        return self.pending_rows >= self.batch_rows
+
+    def add_message(
+        self,
+        role: str,
+        content: str,
+        token_count: int | None = None,
+        model_used: str | None = None,
+    ) -> uuid.UUID:
+        """Buffer a ``messages`` row, stamped now to keep history order."""
+        message_id = uuid.uuid4()
+        self._messages.append({
+            "id": message_id,
+            "conversation_id": self.conversation_id,
+            "role": role,
+            "content": content,
+            "token_count": token_count,
+            "model_used": model_used,
+            "created_at": datetime.now(timezone.utc),
+        })
+        return message_id
+
+    def add_token_log(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cache_creation_input_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+        cost_estimate: float | None = None,
+    ) -> None:
+        """Buffer a ``token_logs`` row for one LLM call."""
+        self._token_logs.append({
+            "id": uuid.uuid4(),
+            "user_id": self.user_id,
+            "conversation_id": self.conversation_id,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": cache_creation_input_tokens,
+            "cache_read_input_tokens": cache_read_input_tokens,
+            "cost_estimate": cost_estimate,
+            "created_at": datetime.now(timezone.utc),
+        })
+
+    def charge(self, tokens: int) -> None:
+        """Add tokens to the usage applied to the user's budget at the next flush."""
+        self._tokens += tokens
+
+    async def flush(self, session: AsyncSession) -> None:
+        """Write everything buffered so far and commit.
+
+        Also commits any other pending changes on *session* (e.g. the
+        conversation's ``last_active_at``).  On failure the buffer is
+        kept and the exception propagates.
+        """
+        if self._messages:
+            await session.execute(insert(Message), self._messages)
+        if self._token_logs:
+            await session.execute(insert(TokenLog), self._token_logs)
+        if self._tokens:
+            await session.execute(charge_tokens_stmt(self.user_id, self._tokens))
+        await session.commit()
+
+        written = self.pending_rows
+        if written or self._tokens:
+            self.flushes += 1
+            self.rows_written += written
+            logger.debug(
+                "run_ledger_flushed",
+                conversation_id=str(self.conversation_id),
+                messages=len(self._messages),
+                token_logs=len(self._token_logs),
+                tokens_charged=self._tokens,
+            )
+        self._messages = []
+        self._token_logs = []
+        self._tokens = 0
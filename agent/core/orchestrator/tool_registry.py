@@ -4,21 +4,62 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
+from dataclasses import dataclass, field
 
 import httpx
 import structlog
 
+from core.llm_router.tool_formats import PrecomputedTools
+from core.orchestrator.http_pool import ModuleClientPool
 from shared.auth import get_service_auth_headers
-from shared.config import Settings, parse_list
+from shared.config import Settings
 from shared.error_capture import capture_error
 from shared.redis import get_redis
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolDefinition, ToolResult
+from shared.utils.tokens import count_tokens
 
 logger = structlog.get_logger()
 
 # Permission hierarchy (higher index = more privileged)
 PERMISSION_LEVELS = ["guest", "user", "admin", "owner"]
 
+# Manifest discovery / Redis cache
+DISCOVERY_TIMEOUT_SECONDS = 10.0
+MANIFEST_CACHE_PREFIX = "module_manifest:"
+MANIFEST_ETAG_PREFIX = "module_manifest_etag:"
+MANIFEST_CACHE_TTL = 3600  # 1 hour
+
+# Safety margin applied to the measured token cost of tool definitions
+TOOL_OVERHEAD_MARGIN = 1.2
+
+
+@dataclass
+class ToolSchemaBundle:
+    """Tool payloads for one (permission, allowed_modules) key.
+
+    Built once per manifest version and shared by every request with the
+    same key.  Treat all fields as read-only.
+    """
+
+    version: int
+    tools: list[ToolDefinition]
+    # Also carries the Anthropic payload, which providers pick up from the
+    # ``tools`` argument the router passes through
+    openai_tools: PrecomputedTools
+    _overhead_by_model: dict[str, int] = field(default_factory=dict)
+
+    def token_overhead(self, model: str) -> int:
+        """Measured token cost of the tool definitions for *model* (with margin)."""
+        if not self.openai_tools:
+            return 0
+        overhead = self._overhead_by_model.get(model)
+        if overhead is None:
+            tools_json = json.dumps(self.openai_tools)
+            overhead = int(count_tokens(tools_json, model) * TOOL_OVERHEAD_MARGIN)
+            self._overhead_by_model[model] = overhead
+        return overhead
+
 
 class ToolRegistry:
     """Discovers, caches, and routes tool calls to modules."""
@@ -27,49 +68,137 @@ class ToolRegistry:
         self.settings = settings
         self.session_factory = session_factory
         self.manifests: dict[str, ModuleManifest] = {}
+        self.http_pool = ModuleClientPool(settings)
+        # Bumped whenever any manifest changes; invalidates _schema_cache
+        self.manifest_version = 0
+        self._schema_cache: dict[tuple[str, frozenset[str]], ToolSchemaBundle] = {}
+        # Last ETag seen per module (sent as If-None-Match on rediscovery)
+        self._manifest_etags: dict[str, str] = {}
+
+    def _store_manifest(self, module_name: str, manifest: ModuleManifest) -> bool:
+        """Store *manifest*, bumping the manifest version if it changed."""
+        current = self.manifests.get(module_name)
+        if current is not None and current == manifest:
+            return False
+        self.manifests[module_name] = manifest
+        self.manifest_version += 1
+        self._schema_cache.clear()
+        return True
 
     async def discover_all(self) -> None:
-        """Query all configured modules for their manifests and cache them."""
-        redis = await get_redis()
+        """Query all configured modules for their manifests and cache them.
+
+        Modules are queried concurrently, so one hung module costs at most
+        its own timeout.  Requests carry ``If-None-Match`` with the last
+        seen ETag; unchanged manifests are neither re-parsed nor rewritten
+        to Redis (only their TTL is refreshed).  Redis writes are pipelined.
+        """
+        started = time.monotonic()
         auth_headers = get_service_auth_headers()
-        async with httpx.AsyncClient(timeout=10.0, headers=auth_headers) as client:
-            for module_name, url in self.settings.module_services.items():
-                try:
-                    resp = await client.get(f"{url}/manifest")
-                    if resp.status_code == 200:
-                        manifest = ModuleManifest(**resp.json())
-                        self.manifests[module_name] = manifest
-                        # Cache in Redis
-                        await redis.set(
-                            f"module_manifest:{module_name}",
-                            manifest.model_dump_json(),
-                            ex=3600,  # 1 hour TTL
-                        )
-                        logger.info(
-                            "module_discovered",
-                            module=module_name,
-                            tools=len(manifest.tools),
-                        )
-                    else:
-                        logger.warning(
-                            "module_manifest_error",
-                            module=module_name,
-                            status=resp.status_code,
-                        )
-                except Exception as e:
-                    logger.warning(
-                        "module_unreachable",
-                        module=module_name,
-                        error=str(e),
-                    )
+        async with httpx.AsyncClient(
+            timeout=DISCOVERY_TIMEOUT_SECONDS, headers=auth_headers,
+        ) as client:
+            outcomes = await asyncio.gather(*(
+                self._fetch_manifest(client, module_name, url)
+                for module_name, url in self.settings.module_services.items()
+            ))
+
+        redis = await get_redis()
+        pipe = redis.pipeline(transaction=False)
+        changed: list[str] = []
+        unchanged: list[str] = []
+        for module_name, manifest, etag in outcomes:
+            if manifest is None and etag is None:
+                continue  # unreachable or error — already logged
+            if manifest is None:
+                unchanged.append(module_name)
+                pipe.expire(f"{MANIFEST_CACHE_PREFIX}{module_name}", MANIFEST_CACHE_TTL)
+                pipe.expire(f"{MANIFEST_ETAG_PREFIX}{module_name}", MANIFEST_CACHE_TTL)
+                continue
+            self._store_manifest(module_name, manifest)
+            changed.append(module_name)
+            pipe.set(
+                f"{MANIFEST_CACHE_PREFIX}{module_name}",
+                manifest.model_dump_json(),
+                ex=MANIFEST_CACHE_TTL,
+            )
+            if etag:
+                self._manifest_etags[module_name] = etag
+                pipe.set(f"{MANIFEST_ETAG_PREFIX}{module_name}", etag, ex=MANIFEST_CACHE_TTL)
+        if changed or unchanged:
+            await pipe.execute()
+
+        logger.info(
+            "module_discovery_complete",
+            changed=changed,
+            unchanged=unchanged,
+            duration_ms=int((time.monotonic() - started) * 1000),
+        )
+
+    async def _fetch_manifest(
+        self, client: httpx.AsyncClient, module_name: str, url: str,
+    ) -> tuple[str, ModuleManifest | None, str | None]:
+        """GET one module's manifest.
+
+        Returns ``(module_name, manifest, etag)``: *manifest* is None when
+        the module answered 304 (or the same ETag); both are None on error.
+        """
+        known_etag = self._manifest_etags.get(module_name)
+        headers = {"If-None-Match": known_etag} if known_etag else None
+        try:
+            resp = await client.get(f"{url}/manifest", headers=headers)
+        except Exception as e:
+            logger.warning(
+                "module_unreachable",
+                module=module_name,
+                error=str(e),
+            )
+            return module_name, None, None
+
+        etag = resp.headers.get("etag")
+        if resp.status_code == 304 or (
+            resp.status_code == 200 and etag and etag == known_etag
+            and module_name in self.manifests
+        ):
+            return module_name, None, known_etag
+        if resp.status_code != 200:
+            logger.warning(
+                "module_manifest_error",
+                module=module_name,
+                status=resp.status_code,
+            )
+            return module_name, None, None
+        try:
+            manifest = ModuleManifest(**resp.json())
+        except Exception as e:
+            logger.warning(
+                "module_manifest_invalid",
+                module=module_name,
+                error=str(e),
+            )
+            return module_name, None, None
+        logger.info(
+            "module_discovered",
+            module=module_name,
+            tools=len(manifest.tools),
+        )
+        return module_name, manifest, etag or ""
 
     async def load_from_cache(self) -> None:
-        """Load manifests from Redis cache."""
+        """Load manifests (and their ETags) from Redis cache in one round-trip."""
         redis = await get_redis()
-        for module_name in self.settings.module_services:
-            cached = await redis.get(f"module_manifest:{module_name}")
+        module_names = list(self.settings.module_services)
+        if not module_names:
+            return
+        keys = [f"{MANIFEST_CACHE_PREFIX}{m}" for m in module_names]
+        keys += [f"{MANIFEST_ETAG_PREFIX}{m}" for m in module_names]
+        values = await redis.mget(keys)
+        manifests, etags = values[:len(module_names)], values[len(module_names):]
+        for module_name, cached, etag in zip(module_names, manifests, etags):
             if cached:
-                self.manifests[module_name] = ModuleManifest(**json.loads(cached))
+                self._store_manifest(module_name, ModuleManifest(**json.loads(cached)))
+                if etag:
+                    self._manifest_etags[module_name] = etag
 
     def get_tools_for_user(
         self,
@@ -88,6 +217,38 @@ class ToolRegistry:
                     tools.append(tool)
         return tools
 
+    def get_tool_schemas(
+        self,
+        user_permission: str,
+        allowed_modules: list[str],
+    ) -> ToolSchemaBundle:
+        """Return the memoized tool payloads for this permission/module set.
+
+        The filtered tool list, OpenAI and Anthropic payloads are built once
+        per manifest version; ``discover_all``/``load_from_cache`` drop the
+        cache when a manifest changes.
+        """
+        key = (user_permission, frozenset(allowed_modules))
+        bundle = self._schema_cache.get(key)
+        if bundle is not None:
+            return bundle
+
+        tools = self.get_tools_for_user(user_permission, allowed_modules)
+        bundle = ToolSchemaBundle(
+            version=self.manifest_version,
+            tools=tools,
+            openai_tools=PrecomputedTools(self.tools_to_openai_format(tools)),
+        )
+        self._schema_cache[key] = bundle
+        logger.info(
+            "tool_schema_cache_built",
+            permission=user_permission,
+            modules=len(allowed_modules),
+            tools=len(tools),
+            version=self.manifest_version,
+        )
+        return bundle
+
     def tools_to_openai_format(self, tools: list[ToolDefinition]) -> list[dict]:
         """Convert tool definitions to OpenAI function calling format."""
         openai_tools = []
@@ -153,6 +314,17 @@ class ToolRegistry:
                 return None
         return None
 
+    def is_read_only(self, tool_name: str) -> bool:
+        """Return True if *tool_name* declares it may run alongside other reads."""
+        module_name = tool_name.split(".", 1)[0]
+        manifest = self.manifests.get(module_name)
+        if not manifest:
+            return False
+        for tool in manifest.tools:
+            if tool.name == tool_name:
+                return tool.read_only
+        return False
+
     def _fire_capture(
         self,
         *,
@@ -229,18 +401,21 @@ class ToolRegistry:
             )
 
         url = self.settings.module_services[module_name]
-        slow_modules = parse_list(self.settings.slow_modules)
-        timeout = float(self.settings.tool_execution_timeout) if module_name in slow_modules else 30.0
-        auth_headers = get_service_auth_headers()
-        async with httpx.AsyncClient(timeout=timeout, headers=auth_headers) as client:
-            try:
+        timeout = self.http_pool.timeout_for(module_name)
+        try:
+            # Waiting for a free pool slot counts against the same timeout
+            async with self.http_pool.client(module_name) as client:
                 payload = {
                     "tool_name": tool_call.tool_name,
                     "arguments": tool_call.arguments,
                 }
                 if tool_call.user_id:
                     payload["user_id"] = tool_call.user_id
-                resp = await client.post(f"{url}/execute", json=payload)
+                resp = await client.post(
+                    f"{url}/execute",
+                    json=payload,
+                    extensions={"trace": self.http_pool.trace_for(module_name)},
+                )
                 if resp.status_code == 200:
                     result = ToolResult(**resp.json())
                     if not result.success:
@@ -264,29 +439,33 @@ class ToolRegistry:
                         success=False,
                         error=error_msg,
                     )
-            except httpx.TimeoutException:
-                error_msg = f"Tool execution timed out ({timeout:.0f}s)."
-                self._fire_capture(
-                    service=module_name,
-                    error_type="tool_execution",
-                    error_message=error_msg,
-                    tool_call=tool_call,
-                )
-                return ToolResult(
-                    tool_name=tool_call.tool_name,
-                    success=False,
-                    error=error_msg,
-                )
-            except Exception as e:
-                error_msg = f"Tool execution error: {str(e)}"
-                self._fire_capture(
-                    service=module_name,
-                    error_type="tool_execution",
-                    error_message=error_msg,
-                    tool_call=tool_call,
-                )
-                return ToolResult(
-                    tool_name=tool_call.tool_name,
-                    success=False,
-                    error=error_msg,
-                )
+        except httpx.TimeoutException:
+            error_msg = f"Tool execution timed out ({timeout:.0f}s)."
+            self._fire_capture(
+                service=module_name,
+                error_type="tool_execution",
+                error_message=error_msg,
+                tool_call=tool_call,
+            )
+            return ToolResult(
+                tool_name=tool_call.tool_name,
+                success=False,
+                error=error_msg,
+            )
+        except Exception as e:
+            error_msg = f"Tool execution error: {str(e)}"
+            self._fire_capture(
+                service=module_name,
+                error_type="tool_execution",
+                error_message=error_msg,
+                tool_call=tool_call,
+            )
+            return ToolResult(
+                tool_name=tool_call.tool_name,
+                success=False,
+                error=error_msg,
+            )
+
+    async def aclose(self) -> None:
+        """Release pooled module connections (called from the shutdown hook)."""
+        await self.http_pool.aclose()
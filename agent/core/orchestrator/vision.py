@@ -0,0 +1,276 @@
+"""Vision input preprocessing: downscale, recompress and cache images.
+
+Attached images used to be base64-encoded at full size (up to 20 MB) into
+every multimodal request.  Providers downscale anything larger than roughly
+1.15 megapixels / a 1568 px long edge before the model sees it, so the extra
+pixels only cost upload bytes, latency and input tokens.
+
+:class:`VisionPreprocessor` resizes each image to that envelope (which fits
+Anthropic, OpenAI and Gemini alike, so one encoding serves every provider in
+a fallback chain), recompresses it, and caches the encoded result:
+
+- by ``sha256(raw bytes)`` — identical images re-attached under a new MinIO
+  key are encoded once,
+- by MinIO key — a retried turn skips even the download.
+
+Both live in an in-process LRU (bounded by bytes) in front of Redis.  Redis
+errors are logged and treated as misses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+from collections import OrderedDict
+
+import structlog
+from PIL import Image, ImageOps
+
+from shared.config import Settings
+from shared.redis import get_redis
+from shared.storage import ObjectStorage
+
+logger = structlog.get_logger()
+
+VISION_CACHE_PREFIX = "vision:"
+# Bump when the encoding pipeline changes so old variants are not reused
+_PIPELINE_VERSION = 1
+
+
+def _target_size(width: int, height: int, max_edge: int, max_pixels: int) -> tuple[int, int]:
+    """Largest size within *max_edge* and *max_pixels* keeping aspect ratio."""
+    scale = min(1.0, max_edge / max(width, height), (max_pixels / (width * height)) ** 0.5)
+    # The epsilon keeps float error from rounding an exact fit down a pixel
+    return max(1, int(width * scale + 1e-6)), max(1, int(height * scale + 1e-6))
+
+
+def encode_image(
+    raw: bytes,
+    max_edge: int,
+    max_pixels: int,
+    jpeg_quality: int,
+) -> dict:
+    """Downscale and recompress one image (blocking — run off the event loop).
+
+    PNG/GIF sources and anything with transparency become optimized PNG
+    (screenshots stay crisp); photos become JPEG.  Animated images keep
+    their first frame.  If the source already fits and is smaller than the
+    re-encoded result, it is passed through unchanged.
+
+    Returns ``{media_type, data (bytes), width, height}``.
+    Raises ``PIL.UnidentifiedImageError`` / ``OSError`` for undecodable input.
+    """
+    with Image.open(io.BytesIO(raw)) as img:
+        source_format = img.format
+        animated = getattr(img, "is_animated", False)
+        width, height = img.size
+        target = _target_size(width, height, max_edge, max_pixels)
+        if source_format == "JPEG" and target != (width, height):
+            # Let libjpeg decode at a reduced scale — far cheaper than a full decode
+            img.draft("RGB", target)
+        img = ImageOps.exif_transpose(img)
+        # exif_transpose may swap the axes
+        target = _target_size(*img.size, max_edge, max_pixels)
+
+        has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+        lossless = has_alpha or source_format in ("PNG", "GIF")
+        if lossless:
+            img = img.convert("RGBA" if has_alpha else "RGB")
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        if img.size != target:
+            img = img.resize(target, Image.LANCZOS, reducing_gap=3.0)
+
+        out = io.BytesIO()
+        if lossless:
+            img.save(out, format="PNG", optimize=True)
+            media_type = "image/png"
+        else:
+            img.save(out, format="JPEG", quality=jpeg_quality, optimize=True)
+            media_type = "image/jpeg"
+        encoded = out.getvalue()
+
+    passthrough = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+    unchanged = target == (width, height) and not animated
+    if unchanged and source_format in passthrough and len(raw) <= len(encoded):
+        return {
+            "media_type": passthrough[source_format],
+            "data": raw,
+            "width": width,
+            "height": height,
+        }
+    return {"media_type": media_type, "data": encoded, "width": target[0], "height": target[1]}
+
+
+class VisionPreprocessor:
+    """Turns image attachments into cached, provider-sized vision blocks."""
+
+    def __init__(self, settings: Settings, storage: ObjectStorage):
+        self.storage = storage
+        self.max_edge = settings.vision_max_edge_px
+        self.max_pixels = settings.vision_max_pixels
+        self.jpeg_quality = settings.vision_jpeg_quality
+        self.max_source_bytes = settings.vision_max_source_bytes
+        self.max_cache_bytes = settings.vision_cache_max_bytes
+        self.ttl_seconds = settings.vision_cache_ttl_seconds
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._lru_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    # -- cache --------------------------------------------------------------
+
+    def _variant(self) -> str:
+        return f"{_PIPELINE_VERSION}:{self.max_edge}:{self.max_pixels}:{self.jpeg_quality}"
+
+    def _content_key(self, digest: str) -> str:
+        return f"{VISION_CACHE_PREFIX}{self._variant()}:{digest}"
+
+    def _source_key(self, minio_key: str) -> str:
+        return f"{VISION_CACHE_PREFIX}src:{minio_key}"
+
+    def _remember(self, key: str, value: str) -> None:
+        if key in self._lru:
+            self._lru_bytes -= len(self._lru.pop(key))
+        if len(value) > self.max_cache_bytes:
+            return
+        self._lru[key] = value
+        self._lru_bytes += len(value)
+        while self._lru_bytes > self.max_cache_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._lru_bytes -= len(evicted)
+
+    async def _get(self, key: str) -> str | None:
+        value = self._lru.get(key)
+        if value is not None:
+            self._lru.move_to_end(key)
+            return value
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            redis = await get_redis()
+            value = await redis.get(key)
+        except Exception as e:
+            logger.warning("vision_cache_read_failed", error=str(e))
+            return None
+        if value:
+            self._remember(key, value)
+        return value or None
+
+    async def _set(self, items: dict[str, str]) -> None:
+        for key, value in items.items():
+            self._remember(key, value)
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(key, value, ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("vision_cache_write_failed", error=str(e))
+
+    async def _cached_block(self, minio_key: str) -> dict | None:
+        digest = await self._get(self._source_key(minio_key))
+        if not digest:
+            return None
+        encoded = await self._get(self._content_key(digest))
+        return json.loads(encoded) if encoded else None
+
+    # -- pipeline -------------------------------------------------------------
+
+    async def _encode(self, minio_key: str, raw: bytes) -> dict:
+        digest = hashlib.sha256(raw).hexdigest()
+        content_key = self._content_key(digest)
+        cached = await self._get(content_key)
+        if cached:
+            self.hits += 1
+            await self._set({self._source_key(minio_key): digest})
+            return json.loads(cached)
+
+        self.misses += 1
+        image = await asyncio.to_thread(
+            encode_image, raw, self.max_edge, self.max_pixels, self.jpeg_quality,
+        )
+        block = {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": image["media_type"],
+                "data": base64.standard_b64encode(image["data"]).decode("ascii"),
+            },
+        }
+        self.bytes_in += len(raw)
+        self.bytes_out += len(image["data"])
+        logger.info(
+            "image_prepared_for_vision",
+            minio_key=minio_key,
+            bytes_in=len(raw),
+            bytes_out=len(image["data"]),
+            width=image["width"],
+            height=image["height"],
+        )
+        await self._set({
+            content_key: json.dumps(block),
+            self._source_key(minio_key): digest,
+        })
+        return block
+
+    async def prepare(self, minio_keys: list[str]) -> list[dict | Exception]:
+        """Return one vision block (or the failure) per MinIO key, in order.
+
+        Cached keys skip the download; the rest are fetched concurrently and
+        encoded off the event loop.  Objects over ``vision_max_source_bytes``
+        fail with ObjectTooLargeError without being fully downloaded.
+        """
+        results: list[dict | Exception | None] = [
+            await self._cached_block(key) for key in minio_keys
+        ]
+        missing = [i for i, block in enumerate(results) if block is None]
+        self.hits += len(minio_keys) - len(missing)
+        if not missing:
+            return results
+
+        downloads = await self.storage.get_many(
+            (minio_keys[i] for i in missing), max_bytes=self.max_source_bytes,
+        )
+
+        async def encode(i: int, raw: bytes | Exception) -> None:
+            if isinstance(raw, Exception):
+                results[i] = raw
+                return
+            try:
+                results[i] = await self._encode(minio_keys[i], raw)
+            except Exception as e:
+                results[i] = e
+
+        await asyncio.gather(*(encode(i, raw) for i, raw in zip(missing, downloads)))
+        return results
+
+    def stats(self) -> dict:
+        """Cache hit/miss counters and bytes saved by downscaling."""
+        return {
+            "entries": len(self._lru),
+            "cached_bytes": self._lru_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+_preprocessor: VisionPreprocessor | None = None
+
+
+def get_vision_preprocessor(settings: Settings, storage: ObjectStorage) -> VisionPreprocessor:
+    """Return the process-wide preprocessor (created on first use)."""
+    global _preprocessor
+    if _preprocessor is None:
+        _preprocessor = VisionPreprocessor(settings, storage)
+    return _preprocessor
@@ -9,7 +9,7 @@ from __future__ import annotations
 import uuid
 
 import structlog
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 
 from modules.atlassian.manifest import MANIFEST
 from modules.atlassian.tools import AtlassianTools
@@ -18,6 +18,7 @@ from shared.credential_store import CredentialStore
 from shared.database import get_session_factory
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -110,9 +111,9 @@ async def startup():
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)):
+async def manifest(request: Request, _=Depends(require_service_auth)):
     """Return the module manifest."""
-    return MANIFEST
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
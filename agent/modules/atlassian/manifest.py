@@ -29,6 +29,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="atlassian.jira_get_issue",
@@ -45,6 +46,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="atlassian.jira_create_issue",
@@ -177,6 +179,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="atlassian.confluence_get_page",
@@ -205,6 +208,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="atlassian.confluence_create_page",
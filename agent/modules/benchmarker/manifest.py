@@ -26,6 +26,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.send_downlink",
@@ -70,6 +71,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.site_overview",
@@ -99,6 +101,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.silent_devices",
@@ -139,6 +142,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.low_battery_devices",
@@ -168,6 +172,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.device_issues",
@@ -190,6 +195,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.org_issues_summary",
@@ -205,6 +211,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.provision_organisation",
@@ -256,6 +263,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.user_lookup",
@@ -272,6 +280,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.user_permissions",
@@ -289,6 +298,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="benchmarker.assign_device_organisation",
@@ -354,6 +364,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
     ],
 )
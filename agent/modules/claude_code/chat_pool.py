@@ -0,0 +1,412 @@
+"""Pre-warmed worker containers for orchestrator chat turns.
+
+Every OAuth chat turn used to ``mkdtemp`` a staging directory, write the
+credentials to the host, and ``docker run --rm`` the worker image whose
+entrypoint copied and ``chown -R``'d files before the CLI booted.  That
+is several seconds of fixed cost before the first token.
+
+:class:`ChatContainerPool` keeps idle containers of one image running
+(``sleep infinity``) and hands them out per turn:
+
+* A lease prefers an idle container the same user had last (session
+  affinity), then a fresh never-leased one.  Containers that served
+  another user are never handed over; at capacity the least recently
+  used one is retired instead.
+* Per-turn files (credentials, MCP config, prompt, tool definitions) are
+  streamed in over ``docker exec`` stdin, so nothing is written to the host.
+* On release the container is scrubbed: every ``claude`` process is
+  killed and the home/workspace/tmp state is wiped.  A failed scrub, or
+  reaching ``CHAT_POOL_MAX_LEASES``, retires the container.
+* :meth:`ChatContainerPool.reap` removes containers idle for longer than
+  ``CHAT_POOL_IDLE_SECONDS`` and tops fresh containers back up to
+  ``CHAT_POOL_MIN_IDLE``.
+
+Phase timings (lease, staging, MCP ready, first event) are recorded per
+warm/cold lease and exposed by :meth:`ChatContainerPool.stats`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+CHAT_POOL_MAX_SIZE = int(os.environ.get("CHAT_POOL_MAX_SIZE", "8"))  # 0 disables pooling
+CHAT_POOL_MIN_IDLE = int(os.environ.get("CHAT_POOL_MIN_IDLE", "2"))
+CHAT_POOL_IDLE_SECONDS = int(os.environ.get("CHAT_POOL_IDLE_SECONDS", "900"))
+CHAT_POOL_MAX_LEASES = int(os.environ.get("CHAT_POOL_MAX_LEASES", "50"))
+CORE_URL = os.environ.get("CORE_URL", "http://core:8000")
+
+POOL_LABEL = "my_agent.chat_pool"
+CONTAINER_HOME = "/home/claude"
+CONTAINER_WORKSPACE = "/workspace"
+_TOOL_DEFS_TTL = 60.0  # seconds a /tools listing is reused per permission level
+_DOCKER_TIMEOUT = 60.0
+
+# Runs as root when the container starts, then idles until leased
+_IDLE_CMD = (
+    f"mkdir -p {CONTAINER_WORKSPACE} {CONTAINER_HOME}/.claude && "
+    f"chown claude:claude {CONTAINER_WORKSPACE} {CONTAINER_HOME}/.claude && "
+    "exec sleep infinity"
+)
+
+# Runs as root between leases; exits non-zero if anything survived
+_SCRUB_CMD = (
+    "pkill -KILL -u claude 2>/dev/null; "
+    "for i in 1 2 3 4 5 6 7 8 9 10; do pgrep -u claude >/dev/null || break; sleep 0.1; done; "
+    f"rm -rf {CONTAINER_WORKSPACE}/* {CONTAINER_WORKSPACE}/.[!.]* {CONTAINER_WORKSPACE}/..?* "
+    f"{CONTAINER_HOME}/.claude {CONTAINER_HOME}/.claude.json {CONTAINER_HOME}/.config "
+    f"{CONTAINER_HOME}/.cache {CONTAINER_HOME}/.npm /tmp/* /tmp/.[!.]* 2>/dev/null; "
+    f"mkdir -p {CONTAINER_HOME}/.claude && "
+    f"chown claude:claude {CONTAINER_WORKSPACE} {CONTAINER_HOME}/.claude && "
+    "! pgrep -u claude >/dev/null"
+)
+
+# Runs as the claude user; writes the files sent as JSON on stdin
+_STAGE_SCRIPT = (
+    "import json, os, sys\n"
+    "for path, body, mode in json.load(sys.stdin):\n"
+    "    os.makedirs(os.path.dirname(path), exist_ok=True)\n"
+    "    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)\n"
+    "    with os.fdopen(fd, 'w') as f:\n"
+    "        f.write(body)\n"
+)
+
+DockerRunner = Callable[..., Awaitable[tuple[int, str]]]
+
+
+async def run_docker(*args: str, stdin: bytes | None = None,
+                     timeout: float = _DOCKER_TIMEOUT) -> tuple[int, str]:
+    """Run a ``docker`` CLI command; returns (exit code, combined output)."""
+    proc = await asyncio.create_subprocess_exec(
+        "docker", *args,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(stdin), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return -1, f"docker {args[0]} timed out after {timeout:.0f}s"
+    return proc.returncode, out.decode("utf-8", errors="replace").strip()
+
+
+@dataclass
+class PooledContainer:
+    """A worker container owned by the pool (or a one-off burst container)."""
+
+    name: str
+    pooled: bool = True
+    owner: str | None = None  # user the container last served
+    leases: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class _PhaseStats:
+    """Running count/avg/max of per-turn startup phases in milliseconds."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._totals: dict[str, float] = {}
+        self._max: dict[str, float] = {}
+
+    def record(self, phases: dict[str, float]) -> None:
+        self.count += 1
+        for name, ms in phases.items():
+            self._totals[name] = self._totals.get(name, 0.0) + ms
+            self._max[name] = max(self._max.get(name, 0.0), ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "turns": self.count,
+            "avg_ms": {k: round(v / self.count, 1) for k, v in self._totals.items()},
+            "max_ms": {k: round(v, 1) for k, v in self._max.items()},
+        }
+
+
+class ChatContainerPool:
+    """Bounded pool of warm orchestrator-chat containers for one image."""
+
+    def __init__(
+        self,
+        image: str,
+        network: str,
+        max_size: int = CHAT_POOL_MAX_SIZE,
+        min_idle: int = CHAT_POOL_MIN_IDLE,
+        idle_seconds: int = CHAT_POOL_IDLE_SECONDS,
+        max_leases: int = CHAT_POOL_MAX_LEASES,
+        runner: DockerRunner = run_docker,
+    ) -> None:
+        self.image = image
+        self.network = network
+        self.max_size = max(0, max_size)
+        self.min_idle = max(0, min(min_idle, self.max_size))
+        self.idle_seconds = idle_seconds
+        self.max_leases = max(1, max_leases)
+        self._run = runner
+        self._idle: list[PooledContainer] = []
+        self._leased: dict[str, PooledContainer] = {}
+        self._starting = 0
+        self._lock = asyncio.Lock()
+        self._background: set[asyncio.Task] = set()
+        self._tool_defs: dict[str, tuple[float, list[dict]]] = {}
+        self._closed = False
+        self.phases = {"warm": _PhaseStats(), "cold": _PhaseStats()}
+        self.warm_leases = 0
+        self.cold_leases = 0
+        self.started = 0
+        self.removed = 0
+        self.scrub_failures = 0
+
+    # -- lifecycle -------------------------------------------------------
+
+    async def start(self) -> None:
+        """Remove containers left by a previous process, then pre-warm."""
+        code, out = await self._run(
+            "ps", "-aq", "--filter", f"label={POOL_LABEL}={self.image}",
+        )
+        stale = out.split() if code == 0 else []
+        if stale:
+            await self._run("rm", "-f", *stale)
+            logger.info("chat_pool_orphans_removed", image=self.image, count=len(stale))
+        await self.top_up()
+
+    async def close(self) -> None:
+        self._closed = True
+        async with self._lock:
+            doomed = self._idle + list(self._leased.values())
+            self._idle, self._leased = [], {}
+        for container in doomed:
+            await self._remove(container)
+
+    async def top_up(self) -> None:
+        """Start fresh containers until ``min_idle`` unleased ones are ready."""
+        while not self._closed:
+            async with self._lock:
+                fresh = sum(1 for c in self._idle if c.owner is None)
+                if fresh + self._starting >= self.min_idle or self._total() >= self.max_size:
+                    return
+                self._starting += 1
+            container = None
+            try:
+                container = await self._start_container(pooled=True)
+            except Exception as e:
+                logger.warning("chat_pool_prewarm_failed", image=self.image, error=str(e))
+                return
+            finally:
+                async with self._lock:
+                    self._starting -= 1
+                    if container is not None:
+                        self._idle.append(container)
+
+    async def reap(self) -> int:
+        """Retire containers idle past ``idle_seconds``; returns how many."""
+        cutoff = time.monotonic() - self.idle_seconds
+        async with self._lock:
+            expired = [c for c in self._idle if c.last_used < cutoff and c.owner is not None]
+            fresh = [c for c in self._idle if c.owner is None]
+            # Fresh containers beyond min_idle expire too (e.g. after a burst)
+            fresh.sort(key=lambda c: c.last_used, reverse=True)
+            expired += [c for c in fresh[self.min_idle:] if c.last_used < cutoff]
+            self._idle = [c for c in self._idle if c not in expired]
+        for container in expired:
+            await self._remove(container)
+        if expired:
+            logger.info("chat_pool_reaped", image=self.image, count=len(expired))
+        await self.top_up()
+        return len(expired)
+
+    # -- leasing ---------------------------------------------------------
+
+    async def acquire(self, user_id: str) -> tuple[PooledContainer, bool]:
+        """Lease a container for *user_id*; returns (container, was_warm)."""
+        victim = None
+        async with self._lock:
+            container = self._take_idle(user_id)
+            if container is not None:
+                container.owner = user_id
+                container.leases += 1
+                self._leased[container.name] = container
+                self.warm_leases += 1
+                self._spawn(self.top_up())
+                return container, True
+            pooled = self._total() < self.max_size
+            if not pooled and self._idle:
+                # At capacity and only other users' containers are idle:
+                # retire the least recently used one to make room
+                victim = min(self._idle, key=lambda c: c.last_used)
+                self._idle.remove(victim)
+                pooled = True
+            if pooled:
+                self._starting += 1
+        if victim is not None:
+            self._spawn(self._remove(victim))
+
+        container = None
+        try:
+            container = await self._start_container(pooled=pooled)
+        finally:
+            if pooled:
+                async with self._lock:
+                    self._starting -= 1
+                    if container is not None:
+                        self._leased[container.name] = container
+        container.owner = user_id
+        container.leases = 1
+        self.cold_leases += 1
+        return container, False
+
+    def release(self, container: PooledContainer, reusable: bool = True) -> None:
+        """Return a leased container; scrubbing happens in the background."""
+        self._spawn(self._release(container, reusable))
+
+    async def _release(self, container: PooledContainer, reusable: bool) -> None:
+        async with self._lock:
+            self._leased.pop(container.name, None)
+        if (
+            self._closed
+            or not reusable
+            or not container.pooled
+            or container.leases >= self.max_leases
+        ):
+            await self._remove(container)
+            return
+        code, out = await self._run("exec", "-u", "root", container.name, "sh", "-c", _SCRUB_CMD)
+        if code != 0:
+            self.scrub_failures += 1
+            logger.warning("chat_pool_scrub_failed", container=container.name, output=out[:500])
+            await self._remove(container)
+            return
+        container.last_used = time.monotonic()
+        async with self._lock:
+            if self._closed:
+                doomed = True
+            else:
+                doomed = False
+                self._idle.append(container)
+        if doomed:
+            await self._remove(container)
+
+    def _take_idle(self, user_id: str) -> PooledContainer | None:
+        own = [c for c in self._idle if c.owner == user_id]
+        candidates = own or [c for c in self._idle if c.owner is None]
+        if not candidates:
+            return None
+        container = max(candidates, key=lambda c: c.last_used)
+        self._idle.remove(container)
+        return container
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._leased) + self._starting
+
+    # -- per-turn helpers ------------------------------------------------
+
+    async def stage(self, container: PooledContainer, files: list[tuple[str, str, int]]) -> None:
+        """Write ``(path, content, mode)`` files into the container as ``claude``."""
+        payload = json.dumps(files).encode()
+        code, out = await self._run(
+            "exec", "-i", "-u", "claude", "-e", f"HOME={CONTAINER_HOME}",
+            container.name, "python3", "-c", _STAGE_SCRIPT,
+            stdin=payload,
+        )
+        if code != 0:
+            raise RuntimeError(f"Failed to stage chat files in {container.name}: {out[:300]}")
+
+    @staticmethod
+    def exec_cmd(container: PooledContainer, shell: str) -> list[str]:
+        """``docker exec`` argv running *shell* as ``claude`` in the workspace."""
+        return [
+            "docker", "exec",
+            "-u", "claude",
+            "-e", f"HOME={CONTAINER_HOME}",
+            "-e", "LANG=C.UTF-8",
+            "-e", "TERM=xterm-256color",
+            "-w", CONTAINER_WORKSPACE,
+            container.name,
+            "sh", "-c", shell,
+        ]
+
+    async def tool_defs(self, permission: str) -> list[dict] | None:
+        """Core's ``/tools`` listing for *permission*, cached briefly.
+
+        Lets the MCP bridge start from a file instead of fetching the
+        registry synchronously on every turn.  Returns None on failure
+        (the bridge then fetches for itself).
+        """
+        cached = self._tool_defs.get(permission)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+        token = os.environ.get("SERVICE_AUTH_TOKEN", "")
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                resp = await client.get(
+                    f"{CORE_URL}/tools", params={"permission": permission}, headers=headers,
+                )
+                resp.raise_for_status()
+                tools = resp.json().get("tools", [])
+        except Exception as e:
+            logger.warning("chat_pool_tool_defs_failed", permission=permission, error=str(e))
+            return None
+        self._tool_defs[permission] = (now + _TOOL_DEFS_TTL, tools)
+        return tools
+
+    def record_phases(self, warm: bool, phases: dict[str, float]) -> None:
+        self.phases["warm" if warm else "cold"].record(phases)
+
+    def stats(self) -> dict:
+        return {
+            "image": self.image,
+            "max_size": self.max_size,
+            "min_idle": self.min_idle,
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "starting": self._starting,
+            "warm_leases": self.warm_leases,
+            "cold_leases": self.cold_leases,
+            "containers_started": self.started,
+            "containers_removed": self.removed,
+            "scrub_failures": self.scrub_failures,
+            "phases": {k: v.snapshot() for k, v in self.phases.items()},
+        }
+
+    # -- docker ----------------------------------------------------------
+
+    async def _start_container(self, pooled: bool) -> PooledContainer:
+        name = f"chatpool-{uuid.uuid4().hex[:12]}"
+        code, out = await self._run(
+            "run", "-d", "--init",
+            "--name", name,
+            f"--network={self.network}",
+            "--label", f"{POOL_LABEL}={self.image}",
+            "-w", CONTAINER_WORKSPACE,
+            self.image,
+            "sh", "-c", _IDLE_CMD,
+        )
+        if code != 0:
+            await self._run("rm", "-f", name)
+            raise RuntimeError(f"Failed to start chat container: {out[:300]}")
+        self.started += 1
+        return PooledContainer(name=name, pooled=pooled)
+
+    async def _remove(self, container: PooledContainer) -> None:
+        await self._run("rm", "-f", container.name)
+        self.removed += 1
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
@@ -0,0 +1,168 @@
+"""Push channel for task progress: Redis Streams plus an SSE reader.
+
+``_stream_to_log`` already parses every stream-json event the CLI prints.
+:class:`TaskEventPublisher` turns the interesting ones (turns with context
+usage, tool uses, the final result) and task status changes into
+:class:`~shared.schemas.task_events.TaskEvent` entries:
+
+* Each task has a capped stream (``claude_code:task_events:<task_id>``)
+  that expires ``TASK_EVENTS_TTL`` seconds after its last event.  Readers
+  resume from any stream ID, so a reconnecting client misses nothing.
+* Terminal status events are also added to ``claude_code:task_completions``,
+  which the scheduler watches to re-check ``task_status`` poll jobs as
+  soon as a task finishes.
+
+:meth:`TaskEventPublisher.publish` never blocks the caller: events are
+queued and written in pipelined batches by one background drain task, which
+also keeps them in order.  Redis being unavailable only costs the push
+channel; ``task_status``/``task_logs`` polling keeps working.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import AsyncGenerator, Awaitable, Callable
+
+import structlog
+
+from shared.redis import get_redis
+from shared.schemas.task_events import (
+    TASK_COMPLETIONS_STREAM,
+    TERMINAL_TASK_STATUSES,
+    TaskEvent,
+    task_event_stream,
+)
+
+logger = structlog.get_logger()
+
+TASK_EVENTS_MAXLEN = int(os.environ.get("TASK_EVENTS_MAXLEN", "2000"))
+TASK_EVENTS_TTL = int(os.environ.get("TASK_EVENTS_TTL", str(24 * 3600)))
+TASK_COMPLETIONS_MAXLEN = 10_000
+SSE_KEEPALIVE_SECONDS = 15
+
+RedisFactory = Callable[[], Awaitable[object]]
+
+
+class TaskEventPublisher:
+    """Batched, ordered publisher of task events to Redis Streams."""
+
+    def __init__(
+        self,
+        redis_factory: RedisFactory = get_redis,
+        maxlen: int = TASK_EVENTS_MAXLEN,
+        ttl: int = TASK_EVENTS_TTL,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self._pending: list[TaskEvent] = []
+        self._drainer: asyncio.Task | None = None
+        self.published = 0
+        self.failures = 0
+
+    def publish(
+        self, task_id: str, type: str, status: str | None = None, **data,
+    ) -> None:
+        """Queue an event; it is written by the background drain task."""
+        self._pending.append(TaskEvent(task_id=task_id, type=type, status=status, data=data))
+        if self._drainer is None or self._drainer.done():
+            try:
+                self._drainer = asyncio.get_running_loop().create_task(self._drain())
+            except RuntimeError:
+                # No event loop (e.g. startup code) — nothing to stream to yet
+                self._pending.clear()
+
+    async def _drain(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                redis = await self._redis_factory()
+                pipe = redis.pipeline(transaction=False)
+                for event in batch:
+                    stream = task_event_stream(event.task_id)
+                    fields = {"event": event.model_dump_json()}
+                    pipe.xadd(stream, fields, maxlen=self.maxlen, approximate=True)
+                    pipe.expire(stream, self.ttl)
+                    if event.terminal:
+                        pipe.xadd(
+                            TASK_COMPLETIONS_STREAM, fields,
+                            maxlen=TASK_COMPLETIONS_MAXLEN, approximate=True,
+                        )
+                await pipe.execute()
+                self.published += len(batch)
+            except Exception as e:
+                self.failures += len(batch)
+                logger.warning("task_events_publish_failed", count=len(batch), error=str(e))
+
+    async def flush(self) -> None:
+        """Wait until every queued event has been written (or dropped)."""
+        while self._drainer is not None and not self._drainer.done():
+            await self._drainer
+
+    async def read(
+        self, task_id: str, last_id: str = "0", block_ms: int = 0, count: int = 100,
+    ) -> list[tuple[str, TaskEvent]]:
+        """Events after *last_id*, waiting up to *block_ms* for new ones."""
+        redis = await self._redis_factory()
+        response = await redis.xread(
+            {task_event_stream(task_id): last_id},
+            count=count,
+            block=block_ms or None,
+        )
+        events: list[tuple[str, TaskEvent]] = []
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                events.append((entry_id, TaskEvent.model_validate_json(fields["event"])))
+        return events
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "failures": self.failures,
+            "pending": len(self._pending),
+        }
+
+
+def format_sse(event: TaskEvent, event_id: str | None = None) -> str:
+    """Serialise *event* as one ``text/event-stream`` message."""
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event.type}\ndata: {event.model_dump_json()}\n\n"
+
+
+async def sse_task_events(
+    publisher: TaskEventPublisher,
+    task_id: str,
+    last_id: str,
+    current_status: Callable[[], Awaitable[str | None]],
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncGenerator[str, None]:
+    """Yield SSE messages for *task_id* from *last_id* until the run ends.
+
+    *current_status* returns the task's registry status; it lets a client
+    that subscribes after the stream expired (or while Redis is down) still
+    learn that the task is already finished.
+    """
+    cursor = last_id
+    while not await is_disconnected():
+        try:
+            entries = await publisher.read(
+                task_id, cursor, block_ms=SSE_KEEPALIVE_SECONDS * 1000,
+            )
+        except Exception as e:
+            logger.warning("task_events_read_failed", task_id=task_id, error=str(e))
+            entries = []
+            await asyncio.sleep(1)
+        for entry_id, event in entries:
+            cursor = entry_id
+            yield format_sse(event, entry_id)
+            if event.terminal:
+                return
+        if entries:
+            continue
+        status = await current_status()
+        if status is None or status in TERMINAL_TASK_STATUSES:
+            yield format_sse(TaskEvent(task_id=task_id, type="status", status=status or "unknown"))
+            return
+        yield ": keepalive\n\n"
+
@@ -0,0 +1,316 @@
+"""Shared bare-mirror cache for task workspace clones.
+
+Every new ``run_task`` used to ``git clone "$REPO_URL" .`` from scratch.
+:class:`GitMirrorCache` keeps one bare mirror per repository URL under
+``TASK_BASE_DIR/.git_mirrors/<sha256>.git``:
+
+* Before a task starts, :meth:`GitMirrorCache.prepare` runs an
+  incremental ``git fetch`` into the mirror with the *requesting user's*
+  credentials (so the fetch also proves that user can read the repo).
+  A per-repo lock keeps concurrent tasks from fetching the same mirror
+  at once.
+* The task container mounts that single mirror read-only at the same
+  path and clones with ``--reference-if-able``.  The workspace borrows
+  the mirror's objects through ``.git/objects/info/alternates``, so the
+  clone only transfers and stores what the mirror lacks.
+* Any later container that runs git in that workspace mounts the mirrors
+  listed in its alternates file (:meth:`GitMirrorCache.mount_args`).
+* :meth:`GitMirrorCache.evict` removes mirrors idle for longer than
+  ``GIT_MIRROR_MAX_IDLE_DAYS``, then the least recently used ones while
+  the cache is over ``GIT_MIRROR_MAX_BYTES``.  Workspaces that still
+  borrow from a mirror are first made standalone (``git repack -a -d``
+  and the alternates file removed).  If that fails, the mirror is kept.
+
+Mirrors are fetched with ``--no-prune`` and ``gc.auto=0``, so objects that
+workspaces borrow are never deleted from under them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Awaitable, Callable
+
+import structlog
+
+logger = structlog.get_logger()
+
+GIT_MIRROR_ENABLED = os.environ.get("GIT_MIRROR_ENABLED", "true").lower() in ("1", "true", "yes")
+GIT_MIRROR_MAX_BYTES = int(os.environ.get("GIT_MIRROR_MAX_BYTES", str(20 * 1024**3)))
+GIT_MIRROR_MAX_IDLE_DAYS = float(os.environ.get("GIT_MIRROR_MAX_IDLE_DAYS", "14"))
+GIT_MIRROR_FETCH_TIMEOUT = int(os.environ.get("GIT_MIRROR_FETCH_TIMEOUT", "900"))
+# Mirrors used this recently are never evicted (a task may be cloning from it)
+_IN_USE_GRACE_SECONDS = 3600
+INDEX_FILE = "index.json"
+
+# Runs as the claude user in a worker container with the mirror mounted
+# read-write at $MIRROR_PATH.  The URL is passed on the command line, not
+# stored in the mirror's config.
+FETCH_SCRIPT = (
+    'if [ ! -d "$MIRROR_PATH/objects" ]; then\n'
+    '    git init --bare -q "$MIRROR_PATH"\n'
+    '    git -C "$MIRROR_PATH" config gc.auto 0\n'
+    'fi\n'
+    'git -C "$MIRROR_PATH" fetch --quiet --no-prune --no-auto-gc --no-write-fetch-head '
+    '"$REPO_URL" "+refs/heads/*:refs/heads/*" "+refs/tags/*:refs/tags/*"\n'
+)
+
+# Runs in a workspace to stop borrowing objects from its mirror
+DISSOCIATE_SCRIPT = (
+    'if [ -f .git/objects/info/alternates ]; then\n'
+    '    git repack -a -d -q && rm -f .git/objects/info/alternates\n'
+    'fi\n'
+)
+
+# (script, workdir, volumes [(host, container, mode)], extra env, user mounts, timeout)
+GitRunner = Callable[..., Awaitable[tuple[str, str, int]]]
+
+
+def mirror_key(repo_url: str) -> str:
+    """Stable directory name for *repo_url* (never contains the URL itself)."""
+    return hashlib.sha256(repo_url.strip().encode()).hexdigest()[:32]
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class GitMirrorCache:
+    """Per-repository bare mirrors shared by task workspaces."""
+
+    def __init__(
+        self,
+        base_dir: str,
+        host_base_dir: str,
+        runner: GitRunner,
+        max_bytes: int = GIT_MIRROR_MAX_BYTES,
+        max_idle_days: float = GIT_MIRROR_MAX_IDLE_DAYS,
+        fetch_timeout: int = GIT_MIRROR_FETCH_TIMEOUT,
+        enabled: bool = GIT_MIRROR_ENABLED,
+    ) -> None:
+        # base_dir is the path in this container *and* in task containers;
+        # host_base_dir is the same directory on the Docker host
+        self.base_dir = base_dir
+        self.host_base_dir = host_base_dir
+        self._run = runner
+        self.max_bytes = max_bytes
+        self.max_idle_seconds = max_idle_days * 86400
+        self.fetch_timeout = fetch_timeout
+        self.enabled = enabled and bool(host_base_dir)
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._index: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.fetch_failures = 0
+        if self.enabled:
+            os.makedirs(self.base_dir, exist_ok=True)
+            self._index = self._load_index()
+
+    # -- paths -----------------------------------------------------------
+
+    def mirror_path(self, key: str) -> str:
+        return os.path.join(self.base_dir, f"{key}.git")
+
+    def host_mirror_path(self, key: str) -> str:
+        return os.path.join(self.host_base_dir, f"{key}.git")
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    # -- index (last use per mirror) ---------------------------------------
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            with open(os.path.join(self.base_dir, INDEX_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self) -> None:
+        path = os.path.join(self.base_dir, INDEX_FILE)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, path)
+
+    def _touch(self, key: str) -> None:
+        self._index.setdefault(key, {})["last_used"] = time.time()
+        self._save_index()
+
+    # -- prepare / mount ---------------------------------------------------
+
+    async def prepare(self, repo_url: str, user_mounts: dict[str, str] | None = None) -> str | None:
+        """Fetch *repo_url* into its mirror; return the mirror path or None.
+
+        None means "clone without a reference" (cache disabled, or the
+        fetch failed, e.g. because this user can't read the repository).
+        """
+        if not self.enabled or not repo_url:
+            return None
+        key = mirror_key(repo_url)
+        path = self.mirror_path(key)
+        async with self._lock(key):
+            existed = os.path.isdir(os.path.join(path, "objects"))
+            os.makedirs(path, exist_ok=True)
+            started = time.monotonic()
+            try:
+                _out, err, code = await self._run(
+                    FETCH_SCRIPT,
+                    workdir=path,
+                    volumes=[(self.host_mirror_path(key), path, "rw")],
+                    env={"MIRROR_PATH": path, "REPO_URL": repo_url},
+                    user_mounts=user_mounts,
+                    timeout=self.fetch_timeout,
+                )
+            except Exception as e:
+                code, err = -1, str(e)
+            if code != 0:
+                self.fetch_failures += 1
+                logger.warning("git_mirror_fetch_failed", mirror=key, error=err[-500:])
+                if not existed:
+                    shutil.rmtree(path, ignore_errors=True)
+                return None
+            if existed:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._touch(key)
+            logger.info(
+                "git_mirror_ready",
+                mirror=key,
+                created=not existed,
+                fetch_ms=int((time.monotonic() - started) * 1000),
+            )
+        return path
+
+    def mirrors_for_workspace(self, workspace: str) -> list[str]:
+        """Mirror keys listed in *workspace*'s alternates file."""
+        alternates = os.path.join(workspace, ".git", "objects", "info", "alternates")
+        try:
+            with open(alternates) as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+        prefix = self.base_dir.rstrip("/") + "/"
+        keys = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith(prefix) and line.endswith(".git/objects"):
+                keys.append(line[len(prefix):-len(".git/objects")])
+        return keys
+
+    def mirror_volumes(
+        self, workspace: str, extra_key: str | None = None,
+    ) -> list[tuple[str, str, str]]:
+        """``(host, container, "ro")`` mounts for the mirrors *workspace* uses."""
+        if not self.enabled:
+            return []
+        keys = self.mirrors_for_workspace(workspace)
+        if extra_key and extra_key not in keys:
+            keys.append(extra_key)
+        return [(self.host_mirror_path(k), self.mirror_path(k), "ro") for k in keys]
+
+    def mount_args(self, workspace: str, extra_key: str | None = None) -> list[str]:
+        """``docker run -v`` args mounting (read-only) the mirrors *workspace* uses."""
+        args: list[str] = []
+        for host, container, mode in self.mirror_volumes(workspace, extra_key):
+            args += ["-v", f"{host}:{container}:{mode}"]
+        return args
+
+    # -- eviction ----------------------------------------------------------
+
+    def _workspaces_using(self, key: str, workspace_root: str) -> list[str]:
+        users = []
+        try:
+            entries = os.listdir(workspace_root)
+        except OSError:
+            return users
+        for name in entries:
+            ws = os.path.join(workspace_root, name)
+            if name.startswith(".") or not os.path.isdir(ws):
+                continue
+            if key in self.mirrors_for_workspace(ws):
+                users.append(ws)
+        return users
+
+    async def evict(self, workspace_root: str) -> dict:
+        """Apply the idle-time and size limits; returns what was removed."""
+        if not self.enabled:
+            return {"removed": [], "total_bytes": 0}
+        now = time.time()
+        keys = [
+            name[:-4] for name in os.listdir(self.base_dir)
+            if name.endswith(".git") and os.path.isdir(os.path.join(self.base_dir, name))
+        ]
+        sizes = dict(zip(keys, await asyncio.gather(*(
+            asyncio.to_thread(_dir_size, self.mirror_path(k)) for k in keys
+        ))))
+        last_used = {k: self._index.get(k, {}).get("last_used", 0.0) for k in keys}
+        total = sum(sizes.values())
+
+        candidates = sorted(keys, key=lambda k: last_used[k])  # LRU first
+        removed: list[str] = []
+        for key in candidates:
+            idle = now - last_used[key]
+            if idle < _IN_USE_GRACE_SECONDS:
+                continue
+            if idle < self.max_idle_seconds and total <= self.max_bytes:
+                continue
+            async with self._lock(key):
+                # A prepare() may have fetched it while we waited for the lock
+                if now - self._index.get(key, {}).get("last_used", 0.0) < _IN_USE_GRACE_SECONDS:
+                    continue
+                if not await self._dissociate_all(key, workspace_root):
+                    logger.warning("git_mirror_evict_skipped", mirror=key)
+                    continue
+                shutil.rmtree(self.mirror_path(key), ignore_errors=True)
+                self._index.pop(key, None)
+            total -= sizes[key]
+            removed.append(key)
+
+        if removed:
+            self._save_index()
+            logger.info("git_mirrors_evicted", removed=removed, total_bytes=total)
+        return {"removed": removed, "total_bytes": total}
+
+    async def _dissociate_all(self, key: str, workspace_root: str) -> bool:
+        for ws in self._workspaces_using(key, workspace_root):
+            host_ws = os.path.join(os.path.dirname(self.host_base_dir), os.path.basename(ws))
+            try:
+                _out, err, code = await self._run(
+                    DISSOCIATE_SCRIPT,
+                    workdir=ws,
+                    volumes=[
+                        (host_ws, ws, "rw"),
+                        (self.host_mirror_path(key), self.mirror_path(key), "ro"),
+                    ],
+                    env={},
+                    user_mounts=None,
+                    timeout=self.fetch_timeout,
+                )
+            except Exception as e:
+                code, err = -1, str(e)
+            if code != 0:
+                logger.warning("git_mirror_dissociate_failed", workspace=ws, error=err[-300:])
+                return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "mirrors": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "fetch_failures": self.fetch_failures,
+        }
@@ -0,0 +1,319 @@
+"""Append-only task log files with a line-offset index.
+
+A task log is a set of files in the task workspace:
+
+* ``task_<id>.log`` — the active segment, plain text, one record per line.
+* ``task_<id>.log.<n>`` / ``task_<id>.log.<n>.gz`` — rotated segments
+  (gzip-compressed when ``TASK_LOG_COMPRESS`` is on).
+* ``task_<id>.log.idx`` — the index: one fixed-size ``(segment, byte
+  offset)`` entry per line.  Line *k* is entry *k*, so ``total_lines`` is
+  the index size divided by the entry size and any line (or the tail) is
+  found with a single seek.
+
+:class:`TaskLogWriter` buffers lines in memory and flushes them every
+``TASK_LOG_FLUSH_INTERVAL`` seconds (or once ``TASK_LOG_FLUSH_BYTES`` are
+pending).  Log data is written before its index entries, so readers never
+see an index entry for a line that is not on disk.  Files are reopened on
+every flush rather than held open: the worker entrypoint moves the log
+aside while it clones into the workspace.
+
+:func:`read_lines` serves ``task_logs`` without reading the whole log.
+Logs written before the index existed are indexed on first read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import shutil
+import struct
+
+import structlog
+
+logger = structlog.get_logger()
+
+LOG_FLUSH_INTERVAL = float(os.environ.get("TASK_LOG_FLUSH_INTERVAL", "0.5"))
+LOG_FLUSH_BYTES = int(os.environ.get("TASK_LOG_FLUSH_BYTES", str(64 * 1024)))
+LOG_SEGMENT_BYTES = int(os.environ.get("TASK_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+LOG_COMPRESS = os.environ.get("TASK_LOG_COMPRESS", "true").lower() in ("1", "true", "yes")
+
+_ENTRY = struct.Struct("<IQ")  # (segment number, byte offset in segment)
+
+
+def index_path(log_path: str) -> str:
+    return f"{log_path}.idx"
+
+
+def is_log_file(name: str) -> bool:
+    """True for a task log, its index or a rotated segment (by file name)."""
+    return name.startswith("task_") and (name.endswith(".log") or ".log." in name)
+
+
+def _segment_path(log_path: str, segment: int) -> str:
+    return f"{log_path}.{segment}"
+
+
+def _rotated_count(log_path: str) -> int:
+    """Number of rotated segments on disk (they are numbered from 0)."""
+    n = 0
+    while os.path.exists(_segment_path(log_path, n)) or os.path.exists(
+        _segment_path(log_path, n) + ".gz"
+    ):
+        n += 1
+    return n
+
+
+def _open_segment(log_path: str, segment: int, active: int):
+    """Open *segment* for binary reading, wherever it currently lives."""
+    if segment >= active:
+        return open(log_path, "rb")
+    plain = _segment_path(log_path, segment)
+    if os.path.exists(plain + ".gz"):
+        return gzip.open(plain + ".gz", "rb")
+    try:
+        return open(plain, "rb")
+    except FileNotFoundError:
+        # Compressed (and the plain copy removed) since we checked
+        return gzip.open(plain + ".gz", "rb")
+
+
+def _scan_offsets(f, segment: int, start: int = 0) -> tuple[bytes, bool]:
+    """Index entries for every line in *f* starting at byte *start*.
+
+    Returns the packed entries and whether the data ends mid-line.
+    """
+    f.seek(start)
+    entries = bytearray()
+    pos = start
+    ends_with_newline = True
+    for line in f:
+        entries += _ENTRY.pack(segment, pos)
+        pos += len(line)
+        ends_with_newline = line.endswith(b"\n")
+    return bytes(entries), not ends_with_newline
+
+
+def _rebuild_index(log_path: str) -> bool:
+    """(Re)create the index from the log files; returns whether the last line is partial."""
+    active = _rotated_count(log_path)
+    entries = bytearray()
+    partial = False
+    for segment in range(active + 1):
+        if segment == active and not os.path.exists(log_path):
+            break
+        with _open_segment(log_path, segment, active) as f:
+            seg_entries, partial = _scan_offsets(f, segment)
+        entries += seg_entries
+    tmp = index_path(log_path) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(entries)
+    os.replace(tmp, index_path(log_path))
+    return partial
+
+
+def _compress_segment(path: str) -> None:
+    tmp = f"{path}.gz.tmp"
+    with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp, f"{path}.gz")
+    os.remove(path)
+
+
+class TaskLogWriter:
+    """Buffered, indexed appender for one task log."""
+
+    def __init__(
+        self,
+        log_path: str,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        flush_bytes: int = LOG_FLUSH_BYTES,
+        segment_bytes: int = LOG_SEGMENT_BYTES,
+        compress: bool = LOG_COMPRESS,
+    ) -> None:
+        self.log_path = log_path
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.segment_bytes = segment_bytes
+        self.compress = compress
+        self._buf: list[bytes] = []
+        self._buf_bytes = 0
+        self._flusher: asyncio.Task | None = None
+        self._compressions: set[asyncio.Task] = set()
+        self._segment = _rotated_count(log_path)
+        self._size = 0
+        self._needs_newline = self._reconcile()
+
+    # -- setup -------------------------------------------------------------
+
+    def _reconcile(self) -> bool:
+        """Make the index cover everything in the active segment.
+
+        Indexes lines appended without an index (older logs, or a crash
+        between writing data and its index entries).  Returns whether the
+        active segment ends mid-line.
+        """
+        try:
+            self._size = os.path.getsize(self.log_path)
+        except OSError:
+            self._size = 0
+        idx = index_path(self.log_path)
+        if not os.path.exists(idx):
+            if self._size or self._segment:
+                return _rebuild_index(self.log_path)
+            return False
+        with open(idx, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            whole = f.tell() - f.tell() % _ENTRY.size
+            f.truncate(whole)
+            last = None
+            if whole:
+                f.seek(whole - _ENTRY.size)
+                last = _ENTRY.unpack(f.read(_ENTRY.size))
+            if not self._size:
+                return False
+            if last is None or last[0] != self._segment:
+                start, skip = 0, 0
+            else:
+                start, skip = last[1], 1
+            with open(self.log_path, "rb") as log:
+                entries, partial = _scan_offsets(log, self._segment, start)
+            f.seek(whole)
+            f.write(entries[skip * _ENTRY.size:])
+        return partial
+
+    # -- writing -------------------------------------------------------------
+
+    def write(self, text: str) -> None:
+        """Queue *text*; each line of it gets its own index entry."""
+        if text.endswith("\n"):
+            text = text[:-1]
+        for line in text.split("\n"):
+            data = (line + "\n").encode("utf-8", errors="replace")
+            self._buf.append(data)
+            self._buf_bytes += len(data)
+        if self._buf_bytes >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append pending lines to the log, then their index entries."""
+        if not self._buf:
+            return
+        lines, self._buf, self._buf_bytes = self._buf, [], 0
+        if self._size and self._size + sum(map(len, lines)) > self.segment_bytes:
+            self._rotate()
+        try:
+            with open(self.log_path, "ab") as f:
+                # Offsets come from the file itself: it may have been moved
+                # aside and restored since the last flush
+                pos = f.tell()
+                if self._needs_newline and pos:
+                    f.write(b"\n")
+                    pos += 1
+                self._needs_newline = False
+                entries = bytearray()
+                for data in lines:
+                    entries += _ENTRY.pack(self._segment, pos)
+                    pos += len(data)
+                f.write(b"".join(lines))
+            with open(index_path(self.log_path), "ab") as f:
+                f.write(entries)
+        except OSError as e:
+            logger.warning("task_log_write_failed", path=self.log_path, error=str(e))
+            return
+        self._size = pos
+
+    def _rotate(self) -> None:
+        rotated = _segment_path(self.log_path, self._segment)
+        try:
+            os.replace(self.log_path, rotated)
+        except OSError as e:
+            logger.warning("task_log_rotate_failed", path=self.log_path, error=str(e))
+            return
+        self._segment += 1
+        self._size = 0
+        if not self.compress:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(
+                asyncio.to_thread(_compress_segment, rotated)
+            )
+        except RuntimeError:
+            _compress_segment(rotated)
+            return
+        self._compressions.add(task)
+        task.add_done_callback(self._compressions.discard)
+
+    # -- lifecycle -----------------------------------------------------------
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def start(self) -> None:
+        """Flush periodically until :meth:`aclose`."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def __aenter__(self) -> TaskLogWriter:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        self.flush()
+        if self._compressions:
+            await asyncio.gather(*self._compressions, return_exceptions=True)
+
+
+def append_lines(log_path: str, lines: list[str]) -> None:
+    """Append *lines* to a task log outside of a running writer."""
+    writer = TaskLogWriter(log_path, flush_bytes=1 << 62)
+    for line in lines:
+        writer.write(line)
+    writer.flush()
+
+
+def read_lines(log_path: str, start: int | None, count: int) -> tuple[list[str], int, int]:
+    """Read *count* lines from line *start* (``None`` = the last *count* lines).
+
+    Returns ``(lines, total_lines, first_line_number)``.  Only the index
+    entries for the requested range and the lines themselves are read.
+    """
+    idx = index_path(log_path)
+    if not os.path.exists(idx):
+        if not os.path.exists(log_path):
+            return [], 0, 0
+        _rebuild_index(log_path)
+    with open(idx, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        total = f.tell() // _ENTRY.size
+        first = max(0, total - count) if start is None else min(max(0, start), total)
+        last = min(total, first + max(0, count))
+        f.seek(first * _ENTRY.size)
+        raw = f.read((last - first) * _ENTRY.size)
+    entries = [_ENTRY.unpack_from(raw, i * _ENTRY.size) for i in range(len(raw) // _ENTRY.size)]
+    if not entries:
+        return [], total, first
+
+    active = _rotated_count(log_path)
+    lines: list[str] = []
+    i = 0
+    while i < len(entries):
+        segment, offset = entries[i]
+        n = 1
+        while i + n < len(entries) and entries[i + n][0] == segment:
+            n += 1
+        with _open_segment(log_path, segment, active) as f:
+            f.seek(offset)
+            for _ in range(n):
+                lines.append(f.readline().decode("utf-8", errors="replace").rstrip("\n"))
+        i += n
+    return lines, total, first
+
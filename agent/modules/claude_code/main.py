@@ -6,17 +6,19 @@ import asyncio
 import json
 
 import structlog
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from modules.claude_code.events import sse_task_events
 from modules.claude_code.manifest import MANIFEST
-from modules.claude_code.tools import ClaudeCodeTools
+from modules.claude_code.tools import TASK_BASE_DIR, ClaudeCodeTools
 from shared.config import get_settings
 from shared.credential_store import CredentialStore
 from shared.database import get_session_factory
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -34,7 +36,7 @@ _credential_store: CredentialStore | None = None
 
 
 async def cleanup_terminal_containers_loop() -> None:
-    """Background task to cleanup idle terminal containers every hour."""
+    """Hourly cleanup of idle terminal containers and stale git mirrors."""
     while True:
         try:
             await asyncio.sleep(3600)  # 1 hour
@@ -47,10 +49,22 @@ async def cleanup_terminal_containers_loop() -> None:
                         containers=result["removed"],
                         errors=result.get("errors", []),
                     )
+                await tools.git_cache.evict(TASK_BASE_DIR)
         except Exception as e:
             logger.error("cleanup_loop_error", error=str(e))
 
 
+async def chat_pool_maintenance_loop() -> None:
+    """Retire idle chat containers and keep fresh ones warm."""
+    while True:
+        try:
+            await asyncio.sleep(60)
+            if tools and tools.chat_pool:
+                await tools.chat_pool.reap()
+        except Exception as e:
+            logger.error("chat_pool_maintenance_error", error=str(e))
+
+
 @app.on_event("startup")
 async def startup() -> None:
     global tools, _credential_store
@@ -66,10 +80,20 @@ async def startup() -> None:
     # Start background cleanup task
     asyncio.create_task(cleanup_terminal_containers_loop())
     logger.info("terminal_cleanup_loop_started")
+    asyncio.create_task(chat_pool_maintenance_loop())
 
     logger.info("claude_code_module_ready")
 
 
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    if tools and tools.chat_pool:
+        await tools.chat_pool.close()
+    if tools:
+        await tools.events.flush()
+        await tools.store.flush()
+
+
 async def _get_user_credentials(user_id: str) -> dict[str, dict[str, str]]:
     """Look up per-user credentials for claude_code and github services."""
     if not _credential_store:
@@ -99,8 +123,8 @@ async def _get_user_credentials(user_id: str) -> dict[str, dict[str, str]]:
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)) -> ModuleManifest:
-    return MANIFEST
+async def manifest(request: Request, _=Depends(require_service_auth)):
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
@@ -132,6 +156,8 @@ async def execute(call: ToolCall, _=Depends(require_service_auth)) -> ToolResult
             result = await tools.cancel_task(**args)
         elif tool_name == "list_tasks":
             result = await tools.list_tasks(**args)
+        elif tool_name == "count_tasks":
+            result = await tools.count_tasks(**args)
         elif tool_name == "get_task_chain":
             result = await tools.get_task_chain(**args)
         elif tool_name == "delete_workspace":
@@ -166,6 +192,77 @@ async def execute(call: ToolCall, _=Depends(require_service_auth)) -> ToolResult
         return ToolResult(tool_name=call.tool_name, success=False, error=str(e))
 
 
+@app.get("/chat-pool/stats")
+async def chat_pool_stats(_=Depends(require_service_auth)) -> dict:
+    """Warm chat container pool occupancy and per-phase startup timings."""
+    if tools is None or tools.chat_pool is None:
+        return {"enabled": False}
+    return tools.chat_pool.stats()
+
+
+@app.get("/git-cache/stats")
+async def git_cache_stats(_=Depends(require_service_auth)) -> dict:
+    """Shared git mirror cache hit/miss counters."""
+    if tools is None:
+        return {"enabled": False}
+    return tools.git_cache.stats()
+
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(
+    task_id: str,
+    request: Request,
+    user_id: str | None = None,
+    last_id: str = "0",
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    _=Depends(require_service_auth),
+):
+    """Live task events (SSE) from the task's Redis stream.
+
+    Replays from *last_id* (or the ``Last-Event-ID`` header on reconnect)
+    and ends after the event that finishes the run.
+    """
+    if tools is None:
+        raise HTTPException(status_code=503, detail="Module not ready")
+    try:
+        await tools._get_task(task_id, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def current_status() -> str | None:
+        task = await tools.store.get(task_id)
+        return task.status if task else None
+
+    return StreamingResponse(
+        sse_task_events(
+            tools.events, task_id, last_event_id or last_id,
+            current_status, request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.get("/task-events/stats")
+async def task_events_stats(_=Depends(require_service_auth)) -> dict:
+    """Task event publisher counters."""
+    if tools is None:
+        return {"enabled": False}
+    return tools.events.stats()
+
+
+@app.get("/task-store/stats")
+async def task_store_stats(_=Depends(require_service_auth)) -> dict:
+    """Task registry write-behind counters."""
+    if tools is None:
+        return {"enabled": False}
+    return tools.store.stats()
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse(status="ok")
@@ -201,8 +298,9 @@ async def orchestrator_chat_stream(
     """Run a Claude CLI chat in an isolated Docker container (SSE stream).
 
     Used by the core's ClaudeCodeCLIProvider to isolate each user's
-    CLI session. Each request gets its own ephemeral container with
-    no access to host secrets or other users' data.
+    CLI session. Each request leases a warm container from the chat pool
+    (never one that served another user); it is scrubbed of credentials,
+    files and processes before its next lease.
     """
     if tools is None:
         return StreamingResponse(
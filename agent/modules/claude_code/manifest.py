@@ -143,6 +143,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.task_logs",
@@ -172,6 +173,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.cancel_task",
@@ -207,8 +209,35 @@ MANIFEST = ModuleManifest(
                     description="When true, return only the latest task from each task chain instead of all chain members.",
                     required=False,
                 ),
+                ToolParameter(
+                    name="limit",
+                    type="integer",
+                    description="Maximum number of tasks to return, newest first (default 50).",
+                    required=False,
+                ),
+                ToolParameter(
+                    name="offset",
+                    type="integer",
+                    description="Number of tasks to skip, for paging through older tasks.",
+                    required=False,
+                ),
+            ],
+            required_permission="admin",
+            read_only=True,
+        ),
+        ToolDefinition(
+            name="claude_code.count_tasks",
+            description="Count Claude Code tasks, optionally only those in the given statuses.",
+            parameters=[
+                ToolParameter(
+                    name="statuses",
+                    type="array",
+                    description="Statuses to count, e.g. ['queued', 'running']. Omit to count all tasks.",
+                    required=False,
+                ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.get_task_chain",
@@ -225,6 +254,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.browse_workspace",
@@ -247,6 +277,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.read_workspace_file",
@@ -266,6 +297,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.get_task_container",
@@ -283,6 +315,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.git_status",
@@ -301,6 +334,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="claude_code.git_push",
@@ -412,6 +446,7 @@ MANIFEST = ModuleManifest(
             ),
             parameters=[],  # user_id is injected automatically
             required_permission="admin",
+            read_only=True,
         ),
     ],
 )
@@ -0,0 +1,516 @@
+"""Task registry backed by the ``claude_code_tasks`` table.
+
+Tasks used to live in one in-memory dict, rebuilt at startup by reading
+every ``task_meta_<id>.json`` under ``TASK_BASE_DIR`` and persisted by
+rewriting those files.  :class:`TaskStore` keeps only the tasks this
+process is running in memory; everything else is read from the database
+on demand:
+
+* :meth:`TaskStore.save` never blocks the caller.  Changed tasks are
+  queued and upserted in batches by one background writer, so repeated
+  saves of a task coalesce into a single row write.  A failed write stays
+  queued and is retried by the next save or query.
+* :meth:`TaskStore.heartbeat` updates only the heartbeat and context
+  tracking columns of a running task.
+* Listing, workspace counting and chain lookups are indexed queries
+  (flushing queued writes first), so they no longer scan every task
+  ever run.
+
+On first start :meth:`TaskStore.recover` imports the old metadata files;
+a marker file in ``TASK_BASE_DIR`` keeps it from running again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable
+
+import structlog
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from shared.models.claude_code_task import ClaudeCodeTask
+
+logger = structlog.get_logger()
+
+TASK_LIST_DEFAULT_LIMIT = 50
+TASK_LIST_MAX_LIMIT = 500
+LEGACY_META_FILE = "task_meta.json"  # pre per-task metadata file name
+IMPORT_MARKER = ".task_registry_imported"
+_IMPORT_BATCH = 500
+
+
+# ---------------------------------------------------------------------------
+# Task data model
+# ---------------------------------------------------------------------------
+@dataclass
+class Task:
+    id: str
+    prompt: str
+    repo_url: str | None = None
+    branch: str | None = None
+    source_branch: str | None = None
+    workspace: str = ""
+    status: str = "queued"  # queued | running | completed | failed | timed_out | cancelled | awaiting_input
+    mode: str = "execute"  # "execute" or "plan"
+    auto_push: bool = False  # automatically push branch to remote after successful completion
+    parent_task_id: str | None = None  # links tasks in a planning chain (points to chain root)
+    group_id: str | None = None  # groups related tasks (e.g. project workflow phases)
+    continue_session: bool = False  # whether to use --continue for CLI session resumption
+    user_id: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    heartbeat: datetime | None = None
+    result: dict | None = None
+    error: str | None = None
+    _asyncio_task: asyncio.Task | None = field(default=None, repr=False)
+
+    # Context tracking (updated live during streaming)
+    peak_context_tokens: int = 0
+    latest_context_tokens: int = 0
+    num_compactions: int = 0
+    num_turns_tracked: int = 0
+    num_continuations: int = 0
+    context_model: str | None = None
+
+    @property
+    def log_file(self) -> str:
+        return os.path.join(self.workspace, f"task_{self.id}.log")
+
+    @property
+    def container_name(self) -> str:
+        """Get the Docker container name for this task.
+
+        The container name includes the continuation count to handle
+        auto-continuations that spawn new containers.
+        """
+        return f"claude-task-{self.id}-{self.num_continuations}"
+
+    def to_dict(self) -> dict:
+        return {
+            "task_id": self.id,
+            "prompt": self.prompt,
+            "repo_url": self.repo_url,
+            "branch": self.branch,
+            "source_branch": self.source_branch,
+            "workspace": self.workspace,
+            "log_file": self.log_file,
+            "container_name": self.container_name,
+            "status": self.status,
+            "mode": self.mode,
+            "auto_push": self.auto_push,
+            "parent_task_id": self.parent_task_id,
+            "group_id": self.group_id,
+            "user_id": self.user_id,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "heartbeat": self.heartbeat.isoformat() if self.heartbeat else None,
+            "elapsed_seconds": self._elapsed(),
+            "result": self.result,
+            "error": self.error,
+            "context_tracking": {
+                "peak_context_tokens": self.peak_context_tokens,
+                "latest_context_tokens": self.latest_context_tokens,
+                "num_compactions": self.num_compactions,
+                "num_turns": self.num_turns_tracked,
+                "num_continuations": self.num_continuations,
+                "context_model": self.context_model,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Task:
+        """Reconstruct a Task from a persisted metadata dict."""
+        def _parse_dt(val: str | None) -> datetime | None:
+            if not val:
+                return None
+            return datetime.fromisoformat(val)
+
+        ct = data.get("context_tracking", {})
+        return cls(
+            id=data["task_id"],
+            prompt=data.get("prompt", ""),
+            repo_url=data.get("repo_url"),
+            branch=data.get("branch"),
+            source_branch=data.get("source_branch"),
+            workspace=data.get("workspace", ""),
+            status=data.get("status", "unknown"),
+            mode=data.get("mode", "execute"),
+            auto_push=data.get("auto_push", False),
+            parent_task_id=data.get("parent_task_id"),
+            group_id=data.get("group_id"),
+            user_id=data.get("user_id"),
+            created_at=_parse_dt(data.get("created_at")) or datetime.now(timezone.utc),
+            started_at=_parse_dt(data.get("started_at")),
+            completed_at=_parse_dt(data.get("completed_at")),
+            heartbeat=_parse_dt(data.get("heartbeat")),
+            result=data.get("result"),
+            error=data.get("error"),
+            peak_context_tokens=ct.get("peak_context_tokens", 0),
+            latest_context_tokens=ct.get("latest_context_tokens", 0),
+            num_compactions=ct.get("num_compactions", 0),
+            num_turns_tracked=ct.get("num_turns", 0),
+            num_continuations=ct.get("num_continuations", 0),
+            context_model=ct.get("context_model"),
+        )
+
+    def _elapsed(self) -> float | None:
+        if not self.started_at:
+            return None
+        end = self.completed_at or datetime.now(timezone.utc)
+        return round((end - self.started_at).total_seconds(), 1)
+
+
+# Task fields and table columns share names
+_COLUMNS = tuple(c.name for c in ClaudeCodeTask.__table__.columns)
+_HEARTBEAT_COLUMNS = (
+    "heartbeat",
+    "peak_context_tokens",
+    "latest_context_tokens",
+    "num_compactions",
+    "num_turns_tracked",
+    "num_continuations",
+    "context_model",
+)
+
+
+def _row(task: Task) -> dict:
+    return {name: getattr(task, name) for name in _COLUMNS}
+
+
+def _task_from_row(row: ClaudeCodeTask) -> Task:
+    return Task(**{name: getattr(row, name) for name in _COLUMNS})
+
+
+def _upsert_stmt(tasks: Iterable[Task]):
+    stmt = pg_insert(ClaudeCodeTask).values([_row(t) for t in tasks])
+    return stmt.on_conflict_do_update(
+        index_elements=[ClaudeCodeTask.id],
+        set_={name: stmt.excluded[name] for name in _COLUMNS if name != "id"},
+    )
+
+
+def _chain_key():
+    return func.coalesce(ClaudeCodeTask.parent_task_id, ClaudeCodeTask.id)
+
+
+def _list_query(user_id: str, status: str | None = None, latest_per_chain: bool = False):
+    """Tasks of *user_id* (unordered, unpaged); see :meth:`TaskStore.list`."""
+    filters = [ClaudeCodeTask.user_id == user_id]
+    if status:
+        filters.append(ClaudeCodeTask.status == status)
+    if not latest_per_chain:
+        return select(ClaudeCodeTask).where(*filters)
+    ranked = (
+        select(
+            ClaudeCodeTask.id,
+            func.row_number().over(
+                partition_by=_chain_key(),
+                order_by=ClaudeCodeTask.created_at.desc(),
+            ).label("rank"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+    return (
+        select(ClaudeCodeTask)
+        .join(ranked, ranked.c.id == ClaudeCodeTask.id)
+        .where(ranked.c.rank == 1)
+    )
+
+
+def _count_query(user_id: str, statuses: Iterable[str] | None = None):
+    """Tasks of *user_id*, optionally only those in *statuses*, as one COUNT."""
+    query = select(func.count()).select_from(ClaudeCodeTask).where(
+        ClaudeCodeTask.user_id == user_id
+    )
+    if statuses:
+        query = query.where(ClaudeCodeTask.status.in_(list(statuses)))
+    return query
+
+
+def _workspace_count_query(user_id: str):
+    """Workspaces owned by *user_id*: a task chain counts once."""
+    return select(func.count(func.distinct(_chain_key()))).where(
+        ClaudeCodeTask.user_id == user_id
+    )
+
+
+def _chain_query(chain_root: str, workspace: str | None = None, group_id: str | None = None):
+    """Tasks linked to *chain_root* by parent, shared workspace or group."""
+    links = [ClaudeCodeTask.id == chain_root, ClaudeCodeTask.parent_task_id == chain_root]
+    if workspace:
+        links.append(ClaudeCodeTask.workspace == workspace)
+    if group_id:
+        links.append(ClaudeCodeTask.group_id == group_id)
+    return select(ClaudeCodeTask).where(or_(*links)).order_by(ClaudeCodeTask.created_at)
+
+
+def _interrupted_stmt(now: datetime):
+    """Fail tasks left queued/running by a previous process."""
+    return (
+        update(ClaudeCodeTask)
+        .where(ClaudeCodeTask.status.in_(("queued", "running")))
+        .values(
+            status="failed",
+            error=func.coalesce(ClaudeCodeTask.error, "Interrupted by module restart"),
+            completed_at=func.coalesce(ClaudeCodeTask.completed_at, now),
+        )
+    )
+
+
+def read_meta_files(base_dir: str) -> list[Task]:
+    """Parse the pre-registry metadata files in every workspace under *base_dir*.
+
+    Reads ``task_meta_<id>.json`` (current format) and, for workspaces
+    without any, the legacy single ``task_meta.json``.
+    """
+    tasks: dict[str, Task] = {}
+    try:
+        entries = list(os.scandir(base_dir))
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        meta_files: list[str] = []
+        try:
+            for f in os.scandir(entry.path):
+                if f.is_file() and f.name.startswith("task_meta") and f.name.endswith(".json"):
+                    meta_files.append(f.path)
+        except OSError:
+            continue
+        legacy = os.path.join(entry.path, LEGACY_META_FILE)
+        if not meta_files and os.path.isfile(legacy):
+            meta_files.append(legacy)
+
+        for meta_path in meta_files:
+            try:
+                with open(meta_path) as fh:
+                    task = Task.from_dict(json.load(fh))
+            except Exception as exc:
+                logger.warning("skip_persisted_task", path=meta_path, error=str(exc))
+                continue
+            tasks.setdefault(task.id, task)
+    return list(tasks.values())
+
+
+class TaskStore:
+    """Database-backed task registry with write-behind saves."""
+
+    def __init__(self, session_factory=None) -> None:
+        self._session_factory = session_factory
+        self._live: dict[str, Task] = {}  # tasks running in this process
+        self._dirty: dict[str, Task] = {}  # saved but not yet written
+        self._writing: dict[str, Task] = {}  # batch being written
+        self._deleted: set[str] = set()  # deleted while their run was still going
+        self._writer: asyncio.Task | None = None
+        self.writes = 0
+        self.failures = 0
+
+    def _sessions(self):
+        if self._session_factory is None:
+            from shared.database import get_session_factory
+
+            self._session_factory = get_session_factory()
+        return self._session_factory()
+
+    # -- writes ---------------------------------------------------------------
+
+    def add(self, task: Task) -> None:
+        """Register a new task this process runs and queue its first write."""
+        self._live[task.id] = task
+        self.save(task)
+
+    def release(self, task: Task) -> None:
+        """Stop serving *task* from memory once its run is over."""
+        self._live.pop(task.id, None)
+        # Its final save has been made; a tombstone is no longer needed
+        self._deleted.discard(task.id)
+
+    def save(self, task: Task) -> None:
+        """Queue a full write of *task*; repeated saves coalesce."""
+        if task.id in self._deleted:
+            # A cancelled run finishing after its workspace was deleted
+            return
+        self._dirty[task.id] = task
+        if self._writer is None or self._writer.done():
+            try:
+                self._writer = asyncio.get_running_loop().create_task(self._drain())
+            except RuntimeError:
+                # No event loop yet — written by the next flush()
+                pass
+
+    async def _drain(self) -> None:
+        while self._dirty:
+            batch, self._dirty = self._dirty, {}
+            self._writing = batch
+            try:
+                async with self._sessions() as session:
+                    await session.execute(_upsert_stmt(batch.values()))
+                    await session.commit()
+                self.writes += len(batch)
+            except Exception as e:
+                self.failures += 1
+                logger.warning("task_store_write_failed", count=len(batch), error=str(e))
+                # Keep them queued (behind any newer saves) for the next attempt
+                for task_id, task in batch.items():
+                    if task_id not in self._deleted:
+                        self._dirty.setdefault(task_id, task)
+                return
+            finally:
+                self._writing = {}
+
+    async def flush(self) -> None:
+        """Make one attempt to write every queued save."""
+        if self._dirty and (self._writer is None or self._writer.done()):
+            self._writer = asyncio.create_task(self._drain())
+        if self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    async def heartbeat(self, task: Task) -> None:
+        """Persist a running task's heartbeat and context tracking columns."""
+        if task.id in self._dirty:
+            # A full write of the same object is already queued
+            return
+        values = {name: getattr(task, name) for name in _HEARTBEAT_COLUMNS}
+        try:
+            async with self._sessions() as session:
+                result = await session.execute(
+                    update(ClaudeCodeTask).where(ClaudeCodeTask.id == task.id).values(**values)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning("task_heartbeat_write_failed", task_id=task.id, error=str(e))
+            return
+        if result.rowcount == 0:
+            # Its first write has not landed yet
+            self.save(task)
+
+    async def delete(self, task_ids: Iterable[str]) -> None:
+        ids = list(task_ids)
+        if not ids:
+            return
+        self._deleted.update(ids)
+        running = set()
+        for task_id in ids:
+            if self._live.pop(task_id, None) is not None:
+                running.add(task_id)
+            self._dirty.pop(task_id, None)
+        # Let an in-flight write of these rows land before deleting them
+        await self.flush()
+        async with self._sessions() as session:
+            await session.execute(delete(ClaudeCodeTask).where(ClaudeCodeTask.id.in_(ids)))
+            await session.commit()
+        # Runs still finishing keep their tombstone until release()
+        self._deleted.difference_update(set(ids) - running)
+
+    # -- reads ----------------------------------------------------------------
+
+    def _cached(self, task_id: str) -> Task | None:
+        """The in-memory copy of a task, if it is running or not yet written."""
+        return (
+            self._live.get(task_id)
+            or self._dirty.get(task_id)
+            or self._writing.get(task_id)
+        )
+
+    def _hydrate(self, row: ClaudeCodeTask) -> Task:
+        return self._cached(row.id) or _task_from_row(row)
+
+    async def _fetch(self, stmt) -> list[Task]:
+        await self.flush()
+        async with self._sessions() as session:
+            rows = (await session.execute(stmt)).scalars().all()
+        return [self._hydrate(row) for row in rows]
+
+    async def get(self, task_id: str) -> Task | None:
+        task = self._cached(task_id)
+        if task is not None:
+            return task
+        async with self._sessions() as session:
+            row = await session.get(ClaudeCodeTask, task_id)
+        return _task_from_row(row) if row is not None else None
+
+    async def list_page(
+        self,
+        user_id: str,
+        status: str | None = None,
+        latest_per_chain: bool = False,
+        limit: int | None = TASK_LIST_DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> tuple[list[Task], int]:
+        """One page of *user_id*'s tasks, newest first, and the total count.
+
+        With *latest_per_chain* only the most recent task of each chain
+        (tasks sharing a chain root) is returned.  A *limit* of ``None``
+        returns every task from *offset* on.
+        """
+        query = _list_query(user_id, status, latest_per_chain)
+        page = query.order_by(ClaudeCodeTask.created_at.desc(), ClaudeCodeTask.id)
+        if limit is not None:
+            page = page.limit(max(1, min(limit, TASK_LIST_MAX_LIMIT)))
+        page = page.offset(max(0, offset))
+        tasks = await self._fetch(page)
+        async with self._sessions() as session:
+            total = (
+                await session.execute(select(func.count()).select_from(query.subquery()))
+            ).scalar_one()
+        return tasks, total
+
+    async def count(self, user_id: str, statuses: Iterable[str] | None = None) -> int:
+        """Number of *user_id*'s tasks, optionally only those in *statuses*."""
+        await self.flush()
+        async with self._sessions() as session:
+            return (await session.execute(_count_query(user_id, statuses))).scalar_one()
+
+    async def count_workspaces(self, user_id: str) -> int:
+        await self.flush()
+        async with self._sessions() as session:
+            return (await session.execute(_workspace_count_query(user_id))).scalar_one()
+
+    async def chain(
+        self, chain_root: str, workspace: str | None = None, group_id: str | None = None,
+    ) -> list[Task]:
+        """Tasks linked to *chain_root*, oldest first."""
+        return await self._fetch(_chain_query(chain_root, workspace, group_id))
+
+    async def for_user(self, user_id: str) -> list[Task]:
+        return await self._fetch(_list_query(user_id).order_by(ClaudeCodeTask.created_at))
+
+    # -- startup --------------------------------------------------------------
+
+    async def recover(self, base_dir: str) -> None:
+        """Import pre-registry metadata files once, then fail interrupted runs."""
+        marker = os.path.join(base_dir, IMPORT_MARKER)
+        if not os.path.exists(marker):
+            tasks = await asyncio.to_thread(read_meta_files, base_dir)
+            async with self._sessions() as session:
+                for i in range(0, len(tasks), _IMPORT_BATCH):
+                    batch = tasks[i:i + _IMPORT_BATCH]
+                    stmt = pg_insert(ClaudeCodeTask).values([_row(t) for t in batch])
+                    await session.execute(stmt.on_conflict_do_nothing(index_elements=["id"]))
+                await session.commit()
+            with open(marker, "w") as f:
+                f.write(datetime.now(timezone.utc).isoformat())
+            logger.info("task_meta_files_imported", count=len(tasks))
+
+        async with self._sessions() as session:
+            result = await session.execute(_interrupted_stmt(datetime.now(timezone.utc)))
+            await session.commit()
+        if result.rowcount:
+            logger.info("interrupted_tasks_failed", count=result.rowcount)
+
+    def stats(self) -> dict:
+        return {
+            "live": len(self._live),
+            "pending_writes": len(self._dirty),
+            "writes": self.writes,
+            "failures": self.failures,
+        }
@@ -6,17 +6,28 @@ import asyncio
 import json
 import os
 import re
+import shlex
 import shutil
-import tempfile
 import time
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import AsyncGenerator
 
 import httpx
 import structlog
 
+from shared.schemas.task_events import TERMINAL_TASK_STATUSES
+
+from modules.claude_code.chat_pool import (
+    CONTAINER_HOME,
+    CONTAINER_WORKSPACE,
+    ChatContainerPool,
+)
+from modules.claude_code.events import TaskEventPublisher
+from modules.claude_code.git_cache import GitMirrorCache, mirror_key
+from modules.claude_code.log_store import TaskLogWriter, append_lines, is_log_file, read_lines
+from modules.claude_code.task_store import TASK_LIST_DEFAULT_LIMIT, Task, TaskStore
+
 logger = structlog.get_logger()
 
 # ---------------------------------------------------------------------------
@@ -51,9 +62,9 @@ def _get_model_context_limit(model: str | None) -> int:
     if model and "gemini" in model.lower():
         return 1_000_000
     return 200_000
-TASK_META_FILE = "task_meta.json"  # persisted in each task workspace
 GIT_CMD_TIMEOUT = 60  # seconds for git operations (push, status, etc.)
 USER_CREDS_DIR = os.path.join(TASK_BASE_DIR, ".user_creds")  # per-user credentials
+GIT_MIRRORS_DIR = os.path.join(TASK_BASE_DIR, ".git_mirrors")  # shared bare mirrors
 MAX_WORKSPACES_PER_USER = 10  # maximum number of workspaces a user can have
 
 _GIT_REF_PATTERN = re.compile(r"^[a-zA-Z0-9._/:\-]+$")
@@ -193,140 +204,6 @@ async def _maybe_refresh_credentials(user_id: str, credentials_json: str) -> str
     )
 
 
-# ---------------------------------------------------------------------------
-# Task data model
-# ---------------------------------------------------------------------------
-@dataclass
-class Task:
-    id: str
-    prompt: str
-    repo_url: str | None = None
-    branch: str | None = None
-    source_branch: str | None = None
-    workspace: str = ""
-    status: str = "queued"  # queued | running | completed | failed | timed_out | cancelled | awaiting_input
-    mode: str = "execute"  # "execute" or "plan"
-    auto_push: bool = False  # automatically push branch to remote after successful completion
-    parent_task_id: str | None = None  # links tasks in a planning chain (points to chain root)
-    group_id: str | None = None  # groups related tasks (e.g. project workflow phases)
-    continue_session: bool = False  # whether to use --continue for CLI session resumption
-    user_id: str | None = None
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    started_at: datetime | None = None
-    completed_at: datetime | None = None
-    heartbeat: datetime | None = None
-    result: dict | None = None
-    error: str | None = None
-    _asyncio_task: asyncio.Task | None = field(default=None, repr=False)
-
-    # Context tracking (updated live during streaming)
-    peak_context_tokens: int = 0
-    latest_context_tokens: int = 0
-    num_compactions: int = 0
-    num_turns_tracked: int = 0
-    num_continuations: int = 0
-    context_model: str | None = None
-
-    @property
-    def log_file(self) -> str:
-        return os.path.join(self.workspace, f"task_{self.id}.log")
-
-    @property
-    def meta_file(self) -> str:
-        return os.path.join(self.workspace, f"task_meta_{self.id}.json")
-
-    @property
-    def container_name(self) -> str:
-        """Get the Docker container name for this task.
-
-        The container name includes the continuation count to handle
-        auto-continuations that spawn new containers.
-        """
-        return f"claude-task-{self.id}-{self.num_continuations}"
-
-    def to_dict(self) -> dict:
-        return {
-            "task_id": self.id,
-            "prompt": self.prompt,
-            "repo_url": self.repo_url,
-            "branch": self.branch,
-            "source_branch": self.source_branch,
-            "workspace": self.workspace,
-            "log_file": self.log_file,
-            "container_name": self.container_name,
-            "status": self.status,
-            "mode": self.mode,
-            "auto_push": self.auto_push,
-            "parent_task_id": self.parent_task_id,
-            "group_id": self.group_id,
-            "user_id": self.user_id,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "heartbeat": self.heartbeat.isoformat() if self.heartbeat else None,
-            "elapsed_seconds": self._elapsed(),
-            "result": self.result,
-            "error": self.error,
-            "context_tracking": {
-                "peak_context_tokens": self.peak_context_tokens,
-                "latest_context_tokens": self.latest_context_tokens,
-                "num_compactions": self.num_compactions,
-                "num_turns": self.num_turns_tracked,
-                "num_continuations": self.num_continuations,
-                "context_model": self.context_model,
-            },
-        }
-
-    def save(self) -> None:
-        """Persist task metadata to disk so it survives restarts."""
-        try:
-            with open(self.meta_file, "w") as f:
-                json.dump(self.to_dict(), f, indent=2)
-        except OSError:
-            pass
-
-    @classmethod
-    def from_dict(cls, data: dict) -> Task:
-        """Reconstruct a Task from a persisted metadata dict."""
-        def _parse_dt(val: str | None) -> datetime | None:
-            if not val:
-                return None
-            return datetime.fromisoformat(val)
-
-        ct = data.get("context_tracking", {})
-        return cls(
-            id=data["task_id"],
-            prompt=data.get("prompt", ""),
-            repo_url=data.get("repo_url"),
-            branch=data.get("branch"),
-            source_branch=data.get("source_branch"),
-            workspace=data.get("workspace", ""),
-            status=data.get("status", "unknown"),
-            mode=data.get("mode", "execute"),
-            auto_push=data.get("auto_push", False),
-            parent_task_id=data.get("parent_task_id"),
-            group_id=data.get("group_id"),
-            user_id=data.get("user_id"),
-            created_at=_parse_dt(data.get("created_at")) or datetime.now(timezone.utc),
-            started_at=_parse_dt(data.get("started_at")),
-            completed_at=_parse_dt(data.get("completed_at")),
-            result=data.get("result"),
-            error=data.get("error"),
-            peak_context_tokens=ct.get("peak_context_tokens", 0),
-            latest_context_tokens=ct.get("latest_context_tokens", 0),
-            num_compactions=ct.get("num_compactions", 0),
-            num_turns_tracked=ct.get("num_turns", 0),
-            num_continuations=ct.get("num_continuations", 0),
-            context_model=ct.get("context_model"),
-        )
-
-    def _elapsed(self) -> float | None:
-        if not self.started_at:
-            return None
-        end = self.completed_at or datetime.now(timezone.utc)
-        return round((end - self.started_at).total_seconds(), 1)
-
-
 # ---------------------------------------------------------------------------
 # Tool class
 # ---------------------------------------------------------------------------
@@ -334,10 +211,17 @@ class ClaudeCodeTools:
     """Tool implementations for Claude Code task execution."""
 
     def __init__(self) -> None:
-        self.tasks: dict[str, Task] = {}
+        self.store = TaskStore()
         self._worker_network: str = WORKER_NETWORK
+        self.chat_pool: ChatContainerPool | None = None
+        self.events = TaskEventPublisher()
         os.makedirs(TASK_BASE_DIR, exist_ok=True)
-        self._load_persisted_tasks()
+        # Mirrors are bind-mounted from the host, so they need TASK_VOLUME
+        self.git_cache = GitMirrorCache(
+            GIT_MIRRORS_DIR,
+            os.path.join(TASK_VOLUME, ".git_mirrors") if TASK_VOLUME else "",
+            runner=self._run_git_container,
+        )
         if not TASK_VOLUME:
             logger.warning(
                 "CLAUDE_TASK_VOLUME not set — worker containers need the "
@@ -345,9 +229,22 @@ class ClaudeCodeTools:
             )
 
     async def async_init(self) -> None:
-        """Resolve Docker network names (must be called after __init__)."""
+        """Load the task registry and resolve Docker network names (must be called after __init__)."""
+        try:
+            await self.store.recover(TASK_BASE_DIR)
+        except Exception as e:
+            # Retried on the next start; new tasks still run meanwhile
+            logger.error("task_registry_recover_failed", error=str(e))
         self._worker_network = await _resolve_network_name(WORKER_NETWORK)
         self._agent_network = await _resolve_network_name("agent-net")
+        # Warm containers for orchestrator chat turns (on the agent network
+        # so the MCP bridge can reach core)
+        self.chat_pool = ChatContainerPool(CLAUDE_CODE_IMAGE, self._agent_network)
+        try:
+            await self.chat_pool.start()
+        except Exception as e:
+            # Leases still work; containers are started on demand
+            logger.warning("chat_pool_prewarm_failed", error=str(e))
         logger.info(
             "resolved_networks",
             worker=self._worker_network,
@@ -377,7 +274,8 @@ class ClaudeCodeTools:
         """Run a Claude CLI chat in an isolated Docker container.
 
         Yields JSON event dicts (stream-json format) as the CLI produces
-        output.  The container is ephemeral and destroyed after completion.
+        output.  The container is leased from the warm chat pool and
+        scrubbed (credentials, workspace, processes) when the turn ends.
 
         The orchestrator container only does LLM reasoning and tool calls
         via MCP.  Built-in CLI tools (Bash, Read, Write, etc.) are disabled.
@@ -385,25 +283,17 @@ class ClaudeCodeTools:
         spins up its own persistent workspace containers.
         """
         chat_id = uuid.uuid4().hex[:12]
-        container_name = f"chat-{chat_id}"
-        workspace = tempfile.mkdtemp(dir=TASK_BASE_DIR, prefix="chat_")
-        workspace_dir = os.path.basename(workspace)
-        host_workspace = os.path.join(TASK_VOLUME, workspace_dir) if TASK_VOLUME else workspace
-        # Mount workspace at /workspace inside container (the worker's default WORKDIR)
-        container_workspace = "/workspace"
+        pool = self.chat_pool
+        started = time.monotonic()
+        container, warm = await pool.acquire(user_id)
+        phases = {"lease_ms": (time.monotonic() - started) * 1000}
+        reusable = True
 
         try:
-            # Write OAuth credentials to staging directory
-            creds_dir = os.path.join(workspace, ".claude_creds")
-            claude_dir = os.path.join(creds_dir, ".claude")
-            os.makedirs(claude_dir, exist_ok=True)
-            creds_file = os.path.join(claude_dir, ".credentials.json")
-            with open(creds_file, "w") as f:
-                f.write(credentials_json)
-            os.chmod(creds_file, 0o600)
-
-            # Build MCP config for the container
+            # Build MCP config for the container. The tool listing is
+            # staged as a file so the bridge doesn't fetch it on startup.
             service_token = os.environ.get("SERVICE_AUTH_TOKEN", "")
+            tool_defs = await pool.tool_defs(user_permission)
             mcp_config = {
                 "mcpServers": {
                     "agent-tools": {
@@ -420,69 +310,50 @@ class ClaudeCodeTools:
                             "MCP_PLATFORM_THREAD_ID": platform_thread_id or "",
                             "MCP_PLATFORM_SERVER_ID": platform_server_id or "",
                             "MCP_ALLOWED_MODULES": ",".join(allowed_modules) if allowed_modules else "",
+                            **({"MCP_TOOLS_FILE": f"{CONTAINER_WORKSPACE}/tools.json"} if tool_defs is not None else {}),
                             **({"SERVICE_AUTH_TOKEN": service_token} if service_token else {}),
                         },
                     }
                 }
             }
-            mcp_config_path = os.path.join(workspace, "mcp_config.json")
-            with open(mcp_config_path, "w") as f:
-                json.dump(mcp_config, f)
-
-            # Write prompt to file — env vars and shell args have size limits
-            # that silently truncate large prompts
-            prompt_path = os.path.join(workspace, "prompt.txt")
-            with open(prompt_path, "w") as f:
-                f.write(prompt)
-
-            # Build entrypoint script — copies OAuth credentials from
-            # read-only staging, then drops to the claude user.
+
+            # Stream credentials, MCP config and prompt into the leased
+            # container (as the claude user) — nothing touches the host.
+            # The prompt goes in a file: env vars and shell args have size
+            # limits that silently truncate large prompts.
+            files = [
+                (f"{CONTAINER_HOME}/.claude/.credentials.json", credentials_json, 0o600),
+                (f"{CONTAINER_WORKSPACE}/mcp_config.json", json.dumps(mcp_config), 0o600),
+                (f"{CONTAINER_WORKSPACE}/prompt.txt", prompt, 0o600),
+            ]
+            if tool_defs is not None:
+                files.append((f"{CONTAINER_WORKSPACE}/tools.json", json.dumps({"tools": tool_defs}), 0o600))
+            stage_started = time.monotonic()
+            try:
+                await pool.stage(container, files)
+            except Exception:
+                reusable = False
+                raise
+            phases["stage_ms"] = (time.monotonic() - stage_started) * 1000
+
             # No git/SSH setup needed: the orchestrator container only
             # does LLM reasoning + tool calls via MCP. Repo operations
             # go through claude_code.run_task which has its own containers.
-            entrypoint = (
-                'set -e\n'
-                'CLAUDE_HOME=/home/claude\n'
-                'if [ -d /tmp/.claude-ro ]; then\n'
-                '    mkdir -p "$CLAUDE_HOME/.claude"\n'
-                '    cp -a /tmp/.claude-ro/. "$CLAUDE_HOME/.claude/"\n'
-                '    chown -R claude:claude "$CLAUDE_HOME/.claude"\n'
-                'fi\n'
-                f'chown -R claude:claude {container_workspace}\n'
-                'cat > /tmp/run_chat.sh << \'INNER\'\n'
-                '#!/bin/sh\n'
-                'set -e\n'
-                'export HOME=/home/claude\n'
-                f'PROMPT=$(cat {container_workspace}/prompt.txt)\n'
-                f'claude -p "$PROMPT" --output-format stream-json --verbose '
-                f'--model {model} --max-turns {max_turns} '
+            chat_cmd = (
+                f'claude -p "$(cat {CONTAINER_WORKSPACE}/prompt.txt)" '
+                '--output-format stream-json --verbose '
+                f'--model {shlex.quote(model)} --max-turns {int(max_turns)} '
                 '--allowedTools "mcp__agent-tools__*,ToolSearch" '
-                f'--mcp-config {container_workspace}/mcp_config.json '
-                '--dangerously-skip-permissions\n'
-                'INNER\n'
-                'chmod +x /tmp/run_chat.sh\n'
-                'exec su -p claude -c /tmp/run_chat.sh\n'
+                f'--mcp-config {CONTAINER_WORKSPACE}/mcp_config.json '
+                '--dangerously-skip-permissions'
             )
-
-            # Host path for credential staging
-            host_creds = os.path.join(host_workspace, ".claude_creds", ".claude")
-
-            cmd = [
-                "docker", "run", "--rm", "--init",
-                "--name", container_name,
-                f"--network={self._agent_network}",
-                "-v", f"{host_creds}:/tmp/.claude-ro:ro",
-                "-v", f"{host_workspace}:{container_workspace}",
-                "-w", container_workspace,
-                "-e", "LANG=C.UTF-8",
-                "-e", "TERM=xterm-256color",
-                CLAUDE_CODE_IMAGE,
-                "sh", "-c", entrypoint,
-            ]
+            cmd = pool.exec_cmd(container, chat_cmd)
 
             logger.info(
                 "orchestrator_chat_starting",
                 chat_id=chat_id,
+                container=container.name,
+                warm=warm,
                 user_id=user_id,
                 user_permission=user_permission,
                 model=model,
@@ -490,6 +361,7 @@ class ClaudeCodeTools:
                 has_tools=bool(tools),
             )
 
+            exec_started = time.monotonic()
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
@@ -519,11 +391,20 @@ class ClaudeCodeTools:
 
                     try:
                         obj = json.loads(line_str)
-                        yield obj
                     except json.JSONDecodeError:
                         continue
-
-            except Exception:
+                    if isinstance(obj, dict):
+                        # The CLI's init event is emitted once MCP servers
+                        # have connected; the next event is model output.
+                        if obj.get("type") == "system" and obj.get("subtype") == "init":
+                            phases.setdefault("mcp_ready_ms", (time.monotonic() - exec_started) * 1000)
+                        elif "first_event_ms" not in phases:
+                            phases["first_event_ms"] = (time.monotonic() - started) * 1000
+                    yield obj
+
+            except BaseException:
+                # Includes client disconnects (GeneratorExit); the CLI left
+                # running in the container is killed by the release scrub
                 proc.kill()
                 await proc.wait()
                 raise
@@ -558,101 +439,40 @@ class ClaudeCodeTools:
             )
 
         finally:
-            # Clean up ephemeral workspace + credentials
-            try:
-                import shutil
-                shutil.rmtree(workspace, ignore_errors=True)
-            except Exception:
-                pass
-            # Force-remove container if still running
-            try:
-                rm_proc = await asyncio.create_subprocess_exec(
-                    "docker", "rm", "-f", container_name,
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
-                )
-                await rm_proc.wait()
-            except Exception:
-                pass
-
-    # ------------------------------------------------------------------
-    # Persistence
-    # ------------------------------------------------------------------
-
-    def _load_persisted_tasks(self) -> None:
-        """Reload task metadata from disk on startup.
-
-        Scans for ``task_meta_<id>.json`` files (current format) and the
-        legacy ``task_meta.json`` (old format) within each workspace
-        directory.
-        """
-        loaded = 0
-        for entry in os.scandir(TASK_BASE_DIR):
-            if not entry.is_dir():
-                continue
-
-            # Collect all meta files: new per-task format + legacy single file
-            meta_files: list[str] = []
-            try:
-                for f in os.scandir(entry.path):
-                    if f.is_file() and f.name.startswith("task_meta") and f.name.endswith(".json"):
-                        meta_files.append(f.path)
-            except OSError:
-                continue
-
-            # Fallback: legacy task_meta.json
-            legacy = os.path.join(entry.path, TASK_META_FILE)
-            if not meta_files and os.path.isfile(legacy):
-                meta_files.append(legacy)
+            # Scrub (or retire) the container in the background
+            pool.release(container, reusable=reusable)
+            pool.record_phases(warm, phases)
+            logger.info(
+                "orchestrator_chat_phases",
+                chat_id=chat_id,
+                warm=warm,
+                **{k: round(v, 1) for k, v in phases.items()},
+            )
 
-            for meta_path in meta_files:
-                try:
-                    with open(meta_path) as fh:
-                        data = json.load(fh)
-                    task = Task.from_dict(data)
-                    if task.id in self.tasks:
-                        continue
-                    # Tasks that were running when we crashed are now dead
-                    if task.status in ("queued", "running"):
-                        task.status = "failed"
-                        task.error = task.error or "Interrupted by module restart"
-                        task.completed_at = task.completed_at or datetime.now(timezone.utc)
-                        task.save()
-                    self.tasks[task.id] = task
-                    loaded += 1
-                except Exception as exc:
-                    logger.warning("skip_persisted_task", path=meta_path, error=str(exc))
-        if loaded:
-            logger.info("loaded_persisted_tasks", count=loaded)
+    def _publish_status(self, task: Task, **data) -> None:
+        """Push the task's current status onto its event stream."""
+        self.events.publish(task.id, "status", task.status, **data)
 
     # ------------------------------------------------------------------
     # Ownership helper
     # ------------------------------------------------------------------
 
-    def _get_task(self, task_id: str, user_id: str | None = None) -> Task:
+    async def _get_task(self, task_id: str, user_id: str | None = None) -> Task:
         """Look up a task, always enforcing ownership when user_id is provided."""
-        task = self.tasks.get(task_id)
+        task = await self.store.get(task_id)
         if not task:
             raise ValueError(f"Task not found: {task_id}")
         if user_id and task.user_id and task.user_id != user_id:
             raise ValueError(f"Task not found: {task_id}")
         return task
 
-    def _count_user_workspaces(self, user_id: str) -> int:
+    async def _count_user_workspaces(self, user_id: str) -> int:
         """Count unique workspaces owned by a user.
 
         Task chains (multiple tasks sharing the same workspace via parent_task_id)
         count as a single workspace.
         """
-        user_tasks = [t for t in self.tasks.values() if t.user_id == user_id]
-
-        # Group by chain root to count unique workspaces
-        unique_chain_roots = set()
-        for task in user_tasks:
-            chain_root = task.parent_task_id or task.id
-            unique_chain_roots.add(chain_root)
-
-        return len(unique_chain_roots)
+        return await self.store.count_workspaces(user_id)
 
     # ------------------------------------------------------------------
     # Public tools (called by orchestrator)
@@ -682,7 +502,7 @@ class ClaudeCodeTools:
 
         # Check workspace limit for user
         if user_id:
-            current_workspace_count = self._count_user_workspaces(user_id)
+            current_workspace_count = await self._count_user_workspaces(user_id)
             if current_workspace_count >= MAX_WORKSPACES_PER_USER:
                 raise ValueError(
                     f"Workspace limit reached. You have {current_workspace_count} active workspaces "
@@ -710,8 +530,7 @@ class ClaudeCodeTools:
             source_branch=source_branch, workspace=workspace, mode=mode,
             auto_push=auto_push, group_id=group_id, user_id=user_id,
         )
-        self.tasks[task_id] = task
-        task.save()
+        self.store.add(task)
 
         # Fire-and-forget background execution
         task._asyncio_task = asyncio.create_task(
@@ -757,7 +576,7 @@ class ClaudeCodeTools:
         ``mode`` can be set to override the parent task's mode (e.g. switch
         from ``"plan"`` to ``"execute"`` when approving a plan).
         """
-        original = self._get_task(task_id, user_id)
+        original = await self._get_task(task_id, user_id)
         if original.status in ("queued", "running"):
             raise ValueError(
                 f"Task {task_id} is still {original.status} — wait for it "
@@ -790,11 +609,7 @@ class ClaudeCodeTools:
             continue_session=True,
             user_id=user_id,
         )
-        self.tasks[new_id] = task
-
-        # Persist metadata under the shared workspace with a task-specific name
-        # so it doesn't clobber the original task_meta.json
-        task.save()
+        self.store.add(task)
 
         # Build context-enriched prompt with workspace file listing
         tree = self._workspace_tree(new_workspace)
@@ -837,7 +652,7 @@ class ClaudeCodeTools:
 
     async def task_status(self, task_id: str, user_id: str | None = None) -> dict:
         """Return the current status of a task."""
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
         return task.to_dict()
 
     async def task_logs(
@@ -848,10 +663,13 @@ class ClaudeCodeTools:
         user_id: str | None = None,
     ) -> dict:
         """Return recent lines from a task's live log file."""
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
 
         log_path = task.log_file
-        if not os.path.exists(log_path):
+        selected, total, first = await asyncio.to_thread(
+            read_lines, log_path, offset or None, tail,
+        )
+        if not total:
             return {
                 "task_id": task_id,
                 "status": task.status,
@@ -860,28 +678,18 @@ class ClaudeCodeTools:
                 "message": "No log output yet.",
             }
 
-        with open(log_path) as f:
-            all_lines = f.readlines()
-
-        total = len(all_lines)
-        if offset:
-            selected = all_lines[offset : offset + tail]
-        else:
-            # Default: return the last `tail` lines
-            selected = all_lines[-tail:] if tail < total else all_lines
-
         return {
             "task_id": task_id,
             "status": task.status,
             "log_file": log_path,
             "total_lines": total,
-            "showing_from": max(0, total - tail) if not offset else offset,
-            "lines": [l.rstrip("\n") for l in selected],
+            "showing_from": first,
+            "lines": selected,
         }
 
     async def cancel_task(self, task_id: str, user_id: str | None = None) -> dict:
         """Cancel a running or queued task by killing its Docker container."""
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
 
         if task.status in ("completed", "failed", "timed_out"):
             return {
@@ -901,7 +709,8 @@ class ClaudeCodeTools:
         task.status = "failed"
         task.error = "Cancelled by user"
         task.completed_at = datetime.now(timezone.utc)
-        task.save()
+        self.store.save(task)
+        self._publish_status(task, error=task.error)
 
         logger.info("task_cancelled", task_id=task_id)
         return {
@@ -914,33 +723,39 @@ class ClaudeCodeTools:
         self,
         status_filter: str | None = None,
         latest_per_chain: bool = False,
+        limit: int | None = TASK_LIST_DEFAULT_LIMIT,
+        offset: int = 0,
         user_id: str | None = None,
     ) -> dict:
-        """List tasks for the given user, optionally filtered by status."""
+        """List tasks for the given user (newest first), optionally filtered by status.
+
+        ``total`` counts every matching task; ``limit``/``offset`` select
+        the page returned in ``tasks`` (``limit=None`` returns all of them).
+        """
         if not user_id:
             return {"tasks": [], "total": 0}
-        tasks = [t for t in self.tasks.values() if t.user_id == user_id]
-        if status_filter:
-            tasks = [t for t in tasks if t.status == status_filter]
-
-        if latest_per_chain:
-            # Group by chain root, keep only the most recent task per chain
-            chains: dict[str, Task] = {}
-            for t in tasks:
-                chain_key = t.parent_task_id or t.id
-                existing = chains.get(chain_key)
-                if existing is None or t.created_at > existing.created_at:
-                    chains[chain_key] = t
-            tasks = list(chains.values())
-
+        tasks, total = await self.store.list_page(
+            user_id, status_filter, latest_per_chain,
+            int(limit) if limit is not None else None, int(offset),
+        )
         return {
             "tasks": [t.to_dict() for t in tasks],
-            "total": len(tasks),
+            "total": total,
+            "offset": int(offset),
+            "has_more": int(offset) + len(tasks) < total,
         }
 
+    async def count_tasks(
+        self, statuses: list[str] | None = None, user_id: str | None = None,
+    ) -> dict:
+        """Count the given user's tasks, optionally only those in *statuses*."""
+        if not user_id:
+            return {"count": 0}
+        return {"count": await self.store.count(user_id, statuses)}
+
     async def delete_workspace(self, task_id: str, user_id: str | None = None) -> dict:
-        """Delete a task's workspace directory and remove all tasks in the chain from memory."""
-        task = self._get_task(task_id, user_id)
+        """Delete a task's workspace directory and remove all tasks in the chain from the registry."""
+        task = await self._get_task(task_id, user_id)
 
         if task.status in ("queued", "running"):
             raise ValueError(f"Task {task_id} is still {task.status} — cancel it first.")
@@ -948,15 +763,12 @@ class ClaudeCodeTools:
         # Find all tasks sharing this workspace (chain siblings)
         workspace = task.workspace
         chain_root = task.parent_task_id or task.id
-        related_ids = [
-            t.id for t in self.tasks.values()
-            if t.workspace == workspace or t.id == chain_root or t.parent_task_id == chain_root
-        ]
+        related = await self.store.chain(chain_root, workspace)
+        related_ids = [t.id for t in related]
 
         # Cancel any that are still running
-        for tid in related_ids:
-            t = self.tasks.get(tid)
-            if t and t.status in ("queued", "running"):
+        for t in related:
+            if t.status in ("queued", "running"):
                 if t._asyncio_task and not t._asyncio_task.done():
                     t._asyncio_task.cancel()
                 container_name = f"claude-task-{t.id}"
@@ -968,9 +780,7 @@ class ClaudeCodeTools:
             shutil.rmtree(workspace, ignore_errors=True)
             deleted_dir = True
 
-        # Remove from in-memory registry
-        for tid in related_ids:
-            self.tasks.pop(tid, None)
+        await self.store.delete(related_ids)
 
         logger.info("workspace_deleted", task_id=task_id, workspace=workspace, related_tasks=len(related_ids))
         return {
@@ -987,20 +797,13 @@ class ClaudeCodeTools:
         Matches tasks by parent_task_id linkage, shared workspace, or
         shared group_id (e.g. project workflow phases).
         """
-        root_task = self._get_task(task_id, user_id)
+        root_task = await self._get_task(task_id, user_id)
 
         chain_root = root_task.parent_task_id or root_task.id
         workspace = root_task.workspace
         group_id = root_task.group_id
 
-        chain = [
-            t.to_dict() for t in self.tasks.values()
-            if t.id == chain_root
-            or t.parent_task_id == chain_root
-            or (workspace and t.workspace == workspace)
-            or (group_id and t.group_id == group_id)
-        ]
-        chain.sort(key=lambda t: t["created_at"])
+        chain = [t.to_dict() for t in await self.store.chain(chain_root, workspace, group_id)]
 
         return {"chain_root": chain_root, "tasks": chain, "total": len(chain)}
 
@@ -1014,7 +817,7 @@ class ClaudeCodeTools:
             raise ValueError("user_id is required for delete_all_workspaces (safety check)")
 
         # Get all tasks for this user
-        user_tasks = [t for t in self.tasks.values() if t.user_id == user_id]
+        user_tasks = await self.store.for_user(user_id)
 
         if not user_tasks:
             return {
@@ -1030,9 +833,9 @@ class ClaudeCodeTools:
             if chain_root not in workspaces:
                 workspaces[chain_root] = {
                     "workspace": task.workspace,
-                    "task_ids": [],
+                    "tasks": [],
                 }
-            workspaces[chain_root]["task_ids"].append(task.id)
+            workspaces[chain_root]["tasks"].append(task)
 
         # Delete each workspace
         deleted_workspaces = 0
@@ -1040,9 +843,8 @@ class ClaudeCodeTools:
 
         for chain_root, info in workspaces.items():
             # Cancel any running tasks first
-            for tid in info["task_ids"]:
-                t = self.tasks.get(tid)
-                if t and t.status in ("queued", "running"):
+            for t in info["tasks"]:
+                if t.status in ("queued", "running"):
                     if t._asyncio_task and not t._asyncio_task.done():
                         t._asyncio_task.cancel()
                     container_name = f"claude-task-{t.id}"
@@ -1053,10 +855,8 @@ class ClaudeCodeTools:
                 shutil.rmtree(info["workspace"], ignore_errors=True)
                 deleted_workspaces += 1
 
-            # Remove tasks from in-memory registry
-            for tid in info["task_ids"]:
-                self.tasks.pop(tid, None)
-                deleted_tasks += 1
+            await self.store.delete(t.id for t in info["tasks"])
+            deleted_tasks += len(info["tasks"])
 
         logger.info(
             "all_workspaces_deleted",
@@ -1093,7 +893,7 @@ class ClaudeCodeTools:
                 files = [
                     f for f in files
                     if not (f.startswith("task_meta") and f.endswith(".json"))
-                    and not (f.startswith("task_") and f.endswith(".log"))
+                    and not is_log_file(f)
                 ]
 
             for fname in sorted(files):
@@ -1154,7 +954,7 @@ class ClaudeCodeTools:
         user_id: str | None = None,
     ) -> dict:
         """List files and directories in a task's workspace."""
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
 
         base = os.path.realpath(task.workspace)
         target = os.path.realpath(os.path.join(base, path))
@@ -1173,7 +973,7 @@ class ClaudeCodeTools:
             # Skip internal task metadata / log files at workspace root
             if target == base and (
                 entry.name.startswith("task_meta") and entry.name.endswith(".json")
-                or entry.name.startswith("task_") and entry.name.endswith(".log")
+                or is_log_file(entry.name)
             ):
                 continue
             try:
@@ -1202,7 +1002,7 @@ class ClaudeCodeTools:
         user_id: str | None = None,
     ) -> dict:
         """Read a file from a task's workspace."""
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
 
         base = os.path.realpath(task.workspace)
         target = os.path.realpath(os.path.join(base, path))
@@ -1247,7 +1047,7 @@ class ClaudeCodeTools:
         Returns the container ID, name, workspace path, and running status.
         The container ID can be used to attach a terminal session.
         """
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
         container_name = task.container_name
 
         # Check if container exists and get its ID and status
@@ -1339,7 +1139,7 @@ class ClaudeCodeTools:
         container_name = f"claude-terminal-{task_id}"
 
         # Check if terminal container already exists BEFORE looking up
-        # task metadata — the container may outlive the in-memory task dict.
+        # task metadata — the container may outlive the task record.
         try:
             proc = await asyncio.create_subprocess_exec(
                 "docker", "inspect",
@@ -1357,7 +1157,7 @@ class ClaudeCodeTools:
                 if container_status == "running":
                     # Container already running — derive workspace from task
                     # if available, otherwise use the container's working dir
-                    task = self.tasks.get(task_id)
+                    task = await self.store.get(task_id)
                     workspace = task.workspace if task else os.path.join(TASK_BASE_DIR, task_id)
                     logger.info(
                         "terminal_container_exists",
@@ -1390,7 +1190,7 @@ class ClaudeCodeTools:
             # Container doesn't exist, continue to create
 
         # Need task metadata to create a new container (for workspace paths)
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
 
         # Create new terminal container
         logger.info("creating_terminal_container", task_id=task_id)
@@ -1410,6 +1210,7 @@ class ClaudeCodeTools:
             "--name", container_name,
             "--network=none",
             "-v", f"{host_workspace}:{container_workspace}",
+            *self.git_cache.mount_args(task.workspace),
             "-w", task.workspace,
             "-e", "TERM=xterm-256color",
             "--label", f"user_id={user_id or 'unknown'}",
@@ -1474,7 +1275,7 @@ class ClaudeCodeTools:
                 "message": str
             }
         """
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
         container_name = f"claude-terminal-{task_id}"
 
         try:
@@ -1574,7 +1375,7 @@ class ClaudeCodeTools:
                 # Get workspace from task
                 workspace = ""
                 try:
-                    task = self.tasks.get(task_id)
+                    task = await self.store.get(task_id)
                     if task:
                         workspace = task.workspace
                 except Exception:
@@ -1702,7 +1503,8 @@ class ClaudeCodeTools:
         task.status = "running"
         task.started_at = datetime.now(timezone.utc)
         task.heartbeat = task.started_at
-        task.save()
+        self.store.save(task)
+        self._publish_status(task)
 
         # Prepare per-user credential mounts if provided
         user_mounts: dict[str, str] | None = None
@@ -1781,6 +1583,11 @@ class ClaudeCodeTools:
                     break
 
                 task.num_continuations += 1
+                self.events.publish(
+                    task.id, "continuation", task.status,
+                    num_continuations=task.num_continuations,
+                    peak_context_tokens=task.peak_context_tokens,
+                )
                 logger.info(
                     "auto_continuation",
                     task_id=task.id,
@@ -1801,7 +1608,7 @@ class ClaudeCodeTools:
                     f"been done, then continue working on any remaining items from the "
                     f"original task. Do NOT redo work that is already complete."
                 )
-                task.save()
+                self.store.save(task)
 
             # Auto-push on final exit — also runs on "failed" so that work
             # committed before a push failure can still be recovered by the
@@ -1815,9 +1622,13 @@ class ClaudeCodeTools:
             task.error = str(e)
         finally:
             task.completed_at = datetime.now(timezone.utc)
-            task.save()
+            self.store.save(task)
+            self.store.release(task)
             if heartbeat_handle:
                 heartbeat_handle.cancel()
+            # A cancelled run is still "running" here; cancel_task publishes it
+            if task.status in TERMINAL_TASK_STATUSES:
+                self._publish_status(task, error=task.error)
 
             # Clean up decrypted credentials from disk — they should not
             # persist between tasks.  Workspace itself is kept for browsing.
@@ -1871,7 +1682,14 @@ class ClaudeCodeTools:
             auto_push=False,  # only push on final exit
             user_id=task.user_id,
         )
-        cmd = self._build_docker_cmd(run_task, container_name, prompt, user_mounts=user_mounts)
+        # Refresh the shared mirror so the clone only transfers what it lacks
+        mirror_path = None
+        if run_task.repo_url and not run_task.continue_session:
+            mirror_path = await self.git_cache.prepare(run_task.repo_url, user_mounts)
+        cmd = self._build_docker_cmd(
+            run_task, container_name, prompt,
+            user_mounts=user_mounts, mirror_path=mirror_path,
+        )
         logger.info(
             "container_starting",
             task_id=task.id,
@@ -1892,7 +1710,9 @@ class ClaudeCodeTools:
                 limit=1024 * 1024,
             )
 
-            log_lock = asyncio.Lock()
+            # Reconciling the index of an existing log may scan its tail
+            log = await asyncio.to_thread(TaskLogWriter, task.log_file)
+            log.start()
             _prev_input_tokens = 0
 
             async def _stream_to_log(
@@ -1912,13 +1732,7 @@ class ClaudeCodeTools:
                     line = line_bytes.decode("utf-8", errors="replace")
                     buf.append(line)
                     ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
-                    log_line = f"[{ts}] [{prefix}] {line}"
-                    try:
-                        async with log_lock:
-                            with open(task.log_file, "a") as f:
-                                f.write(log_line)
-                    except OSError:
-                        pass
+                    log.write(f"[{ts}] [{prefix}] {line}")
 
                     # Real-time context tracking from stdout JSON events
                     if prefix == "stdout":
@@ -1940,6 +1754,13 @@ class ClaudeCodeTools:
                                         task.latest_context_tokens = context_t
                                         if context_t > task.peak_context_tokens:
                                             task.peak_context_tokens = context_t
+                                        self.events.publish(
+                                            task.id, "turn", task.status,
+                                            turn=task.num_turns_tracked,
+                                            context_tokens=context_t,
+                                            peak_context_tokens=task.peak_context_tokens,
+                                            model=msg.get("model"),
+                                        )
                                         # Detect compaction: context drops >50K
                                         if _prev_input_tokens > 0 and (_prev_input_tokens - context_t) > 50_000:
                                             task.num_compactions += 1
@@ -1964,7 +1785,23 @@ class ClaudeCodeTools:
                                         _prev_input_tokens = context_t
                                     if not task.context_model:
                                         task.context_model = msg.get("model")
-                        except (json.JSONDecodeError, KeyError, TypeError):
+                                for block in msg.get("content") or []:
+                                    if isinstance(block, dict) and block.get("type") == "tool_use":
+                                        self.events.publish(
+                                            task.id, "tool_use", task.status,
+                                            name=block.get("name"),
+                                            tool_use_id=block.get("id"),
+                                        )
+                            elif obj.get("type") == "result":
+                                self.events.publish(
+                                    task.id, "result", task.status,
+                                    subtype=obj.get("subtype"),
+                                    is_error=obj.get("is_error"),
+                                    num_turns=obj.get("num_turns"),
+                                    duration_ms=obj.get("duration_ms"),
+                                    total_cost_usd=obj.get("total_cost_usd"),
+                                )
+                        except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
                             pass
 
             # Monitor for context threshold — stops container gracefully
@@ -1999,6 +1836,7 @@ class ClaudeCodeTools:
                 return "timed_out"
             finally:
                 monitor_handle.cancel()
+                await log.aclose()
 
             stdout = "".join(stdout_buf)[:MAX_OUTPUT]
             stderr = "".join(stderr_buf)[:MAX_OUTPUT]
@@ -2017,12 +1855,11 @@ class ClaudeCodeTools:
                 # Write continuation marker to log
                 ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
                 try:
-                    with open(task.log_file, "a") as f:
-                        f.write(
-                            f"[{ts}] [system] === AUTO-CONTINUATION "
-                            f"#{task.num_continuations + 1} — context at "
-                            f"{task.latest_context_tokens:,} tokens ===\n"
-                        )
+                    append_lines(task.log_file, [
+                        f"[{ts}] [system] === AUTO-CONTINUATION "
+                        f"#{task.num_continuations + 1} — context at "
+                        f"{task.latest_context_tokens:,} tokens ===",
+                    ])
                 except OSError:
                     pass
 
@@ -2181,8 +2018,13 @@ class ClaudeCodeTools:
     def _build_docker_cmd(
         self, task: Task, container_name: str, prompt: str,
         user_mounts: dict[str, str] | None = None,
+        mirror_path: str | None = None,
     ) -> list[str]:
-        """Assemble the ``docker run`` argument list."""
+        """Assemble the ``docker run`` argument list.
+
+        *mirror_path* is a prepared git mirror (see :class:`GitMirrorCache`)
+        that the entrypoint clones ``--reference-if-able``.
+        """
         # Mount only this task's workspace — NOT the entire TASK_VOLUME.
         # This prevents cross-user workspace access.
         # For continuation tasks, workspace may belong to the parent task,
@@ -2206,6 +2048,12 @@ class ClaudeCodeTools:
 
         if task.repo_url:
             cmd.extend(["-e", f"REPO_URL={task.repo_url}"])
+        if mirror_path:
+            cmd.extend(["-e", f"REPO_REFERENCE={mirror_path}"])
+        # Read-only mirrors: the one being cloned from plus any the
+        # existing workspace already borrows objects from
+        extra_key = mirror_key(task.repo_url) if mirror_path and task.repo_url else None
+        cmd.extend(self.git_cache.mount_args(task.workspace, extra_key))
         if task.source_branch:
             cmd.extend(["-e", f"SOURCE_BRANCH={task.source_branch}"])
         if task.branch:
@@ -2261,6 +2109,8 @@ class ClaudeCodeTools:
         Environment variables used:
         - ``PROMPT``: The prompt to send to Claude Code CLI.
         - ``REPO_URL`` / ``SOURCE_BRANCH`` / ``BRANCH``: Optional git clone parameters.
+        - ``REPO_REFERENCE``: Optional read-only bare mirror of ``REPO_URL``;
+          the clone borrows its objects via ``--reference-if-able``.
         - ``CONTINUE_SESSION``: When set to ``1``, uses ``--continue`` to
           resume the most recent Claude CLI session in the workspace and
           restores persisted session data from ``.claude_sessions/``.
@@ -2334,8 +2184,12 @@ class ClaudeCodeTools:
             'if [ -n "$REPO_URL" ] && [ "$CONTINUE_SESSION" != "1" ]; then\n'
             '    # Move task metadata aside so git clone into . succeeds\n'
             '    mkdir -p /tmp/_task_meta\n'
-            '    mv task_meta_* task_*.log /tmp/_task_meta/ 2>/dev/null || true\n'
-            '    git clone "$REPO_URL" . 2>&1\n'
+            '    mv task_meta_* task_*.log* /tmp/_task_meta/ 2>/dev/null || true\n'
+            '    if [ -n "$REPO_REFERENCE" ]; then\n'
+            '        git clone --reference-if-able "$REPO_REFERENCE" "$REPO_URL" . 2>&1\n'
+            '    else\n'
+            '        git clone "$REPO_URL" . 2>&1\n'
+            '    fi\n'
             '    # Restore metadata files\n'
             '    mv /tmp/_task_meta/* . 2>/dev/null || true\n'
             '    rm -rf /tmp/_task_meta\n'
@@ -2451,14 +2305,14 @@ class ClaudeCodeTools:
     async def _heartbeat_loop(self, task: Task) -> None:
         """Update heartbeat timestamp every 30 s while the task runs.
 
-        Also persists task metadata so live context tracking data is
-        available via ``task_status`` during execution.
+        Also persists the live context tracking counters, so they survive
+        a module restart.
         """
         try:
             while True:
                 await asyncio.sleep(30)
                 task.heartbeat = datetime.now(timezone.utc)
-                task.save()
+                await self.store.heartbeat(task)
         except asyncio.CancelledError:
             pass
 
@@ -2541,7 +2395,7 @@ class ClaudeCodeTools:
             # nothing new to commit (e.g. the agent already committed everything).
             commit_cmd = (
                 # Exclude task system files from git staging
-                "{ echo 'task_meta_*.json'; echo 'task_*.log'; echo '.claude_sessions/'; } "
+                "{ echo 'task_meta_*.json'; echo 'task_*.log*'; echo '.claude_sessions/'; } "
                 ">> .git/info/exclude && "
                 "git add -A && "
                 "if ! git diff --cached --quiet; then "
@@ -2599,10 +2453,9 @@ class ClaudeCodeTools:
             # Append to task log
             ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
             status_label = "SUCCESS" if exit_code == 0 else "FAILED"
-            log_line = f"[{ts}] [auto_push] {status_label}: {output[:500]}\n"
+            log_line = f"[{ts}] [auto_push] {status_label}: {output[:500]}"
             try:
-                with open(task.log_file, "a") as f:
-                    f.write(log_line)
+                append_lines(task.log_file, [log_line])
             except OSError:
                 pass
 
@@ -2616,9 +2469,9 @@ class ClaudeCodeTools:
     # Git helpers
     # ------------------------------------------------------------------
 
-    def _validate_git_workspace(self, task_id: str, user_id: str | None = None) -> Task:
+    async def _validate_git_workspace(self, task_id: str, user_id: str | None = None) -> Task:
         """Validate task exists, belongs to user, and has a git repository."""
-        task = self._get_task(task_id, user_id)
+        task = await self._get_task(task_id, user_id)
         if not os.path.isdir(task.workspace):
             raise ValueError(f"Workspace no longer exists: {task.workspace}")
         git_dir = os.path.join(task.workspace, ".git")
@@ -2641,7 +2494,38 @@ class ClaudeCodeTools:
         Uses the same image and credential mounting pattern as task containers.
         Returns ``(stdout, stderr, exit_code)``.
         """
-        container_name = f"claude-git-{task.id}-{uuid.uuid4().hex[:6]}"
+        # Mount only this task's workspace for git operations.
+        # For continuation tasks, task.workspace is the *parent's* directory
+        # (named after the parent task.id), so derive the dir name from the
+        # workspace path rather than from task.id (which differs on continuations).
+        workspace_dir_name = os.path.basename(task.workspace)
+        host_workspace = os.path.join(TASK_VOLUME, workspace_dir_name)
+        return await self._run_git_container(
+            git_command,
+            workdir=task.workspace,
+            volumes=[(host_workspace, task.workspace, "rw")],
+            user_mounts=user_mounts,
+            timeout=timeout,
+            name_hint=task.id,
+        )
+
+    async def _run_git_container(
+        self,
+        script: str,
+        workdir: str,
+        volumes: list[tuple[str, str, str]],
+        env: dict[str, str] | None = None,
+        user_mounts: dict[str, str] | None = None,
+        timeout: int = GIT_CMD_TIMEOUT,
+        name_hint: str = "mirror",
+    ) -> tuple[str, str, int]:
+        """Run *script* as the claude user in a short-lived worker container.
+
+        *volumes* are ``(host_path, container_path, mode)`` bind mounts.
+        Mirrors borrowed by a mounted workspace (via its alternates file)
+        are mounted read-only as well.  Returns ``(stdout, stderr, exit_code)``.
+        """
+        container_name = f"claude-git-{name_hint}-{uuid.uuid4().hex[:6]}"
 
         entrypoint = (
             'set -e\n'
@@ -2658,6 +2542,10 @@ class ClaudeCodeTools:
             '    cp /tmp/.gitconfig-ro "$CLAUDE_HOME/.gitconfig"\n'
             'fi\n'
             'chown -R claude:claude "$CLAUDE_HOME"\n'
+            '# A new mirror directory is created by the module (as root)\n'
+            'if [ -n "$MIRROR_PATH" ]; then\n'
+            '    chown claude:claude "$MIRROR_PATH"\n'
+            'fi\n'
             '\n'
             '# Write inner script and run as claude user\n'
             'cat > /tmp/git_run.sh << \'INNER\'\n'
@@ -2674,22 +2562,27 @@ class ClaudeCodeTools:
             'exec su -p claude -c /tmp/git_run.sh\n'
         )
 
-        # Mount only this task's workspace for git operations.
-        # For continuation tasks, task.workspace is the *parent's* directory
-        # (named after the parent task.id), so derive the dir name from the
-        # workspace path rather than from task.id (which differs on continuations).
-        workspace_dir_name = os.path.basename(task.workspace)
-        host_workspace = os.path.join(TASK_VOLUME, workspace_dir_name)
-        container_workspace = task.workspace
-
         cmd: list[str] = [
             "docker", "run", "--rm", "--init",
             "--name", container_name,
             f"--network={self._worker_network}",
-            "-v", f"{host_workspace}:{container_workspace}",
-            "-w", task.workspace,
-            "-e", f"GIT_CMD={git_command}",
         ]
+        # Workspaces cloned with --reference need their mirrors to stay readable
+        volumes = list(volumes)
+        mounted = {container for _host, container, _mode in volumes}
+        for _host, container, _mode in list(volumes):
+            for vol in self.git_cache.mirror_volumes(container):
+                if vol[1] not in mounted:
+                    volumes.append(vol)
+                    mounted.add(vol[1])
+        for host, container, mode in volumes:
+            cmd.extend(["-v", f"{host}:{container}" + (":ro" if mode == "ro" else "")])
+        cmd.extend([
+            "-w", workdir,
+            "-e", f"GIT_CMD={script}",
+        ])
+        for key, value in (env or {}).items():
+            cmd.extend(["-e", f"{key}={value}"])
 
         # Mount credentials (read-only) — per-user overrides global
         um = user_mounts or {}
@@ -2742,7 +2635,7 @@ class ClaudeCodeTools:
 
     async def git_status(self, task_id: str, user_id: str | None = None) -> dict:
         """Return comprehensive git status for a task's workspace."""
-        task = self._validate_git_workspace(task_id, user_id)
+        task = await self._validate_git_workspace(task_id, user_id)
 
         git_script = (
             'echo "===BRANCH==="\n'
@@ -2841,7 +2734,7 @@ class ClaudeCodeTools:
         user_id: str | None = None,
     ) -> dict:
         """Push the task workspace's branch to a remote."""
-        task = self._validate_git_workspace(task_id, user_id)
+        task = await self._validate_git_workspace(task_id, user_id)
 
         if not SSH_KEY_PATH and not GITHUB_TOKEN:
             raise ValueError(
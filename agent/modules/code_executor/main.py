@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import structlog
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 
 from modules.code_executor.manifest import MANIFEST
 from modules.code_executor.tools import CodeExecutorTools
@@ -11,6 +11,7 @@ from shared.config import get_settings
 from shared.database import get_session_factory
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -36,9 +37,9 @@ async def startup():
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)):
+async def manifest(request: Request, _=Depends(require_service_auth)):
     """Return the module manifest."""
-    return MANIFEST
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
@@ -1,8 +1,9 @@
 """Crew module — multi-agent collaboration via coordinated Claude Code sessions."""
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from modules.crew.manifest import MANIFEST
 from modules.crew.tools import CrewTools
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 from shared.schemas.common import HealthResponse
 
@@ -17,8 +18,8 @@ async def startup():
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest():
-    return MANIFEST
+async def manifest(request: Request):
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
@@ -74,6 +74,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="crew.list_sessions",
@@ -87,6 +88,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="crew.pause_session",
@@ -170,6 +172,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="crew.advance_session",
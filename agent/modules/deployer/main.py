@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import structlog
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 
 from modules.deployer.manifest import MANIFEST
 from modules.deployer.tools import DeployerTools
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -33,8 +34,8 @@ async def startup() -> None:
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)) -> ModuleManifest:
-    return MANIFEST
+async def manifest(request: Request, _=Depends(require_service_auth)):
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
@@ -90,6 +90,7 @@ MANIFEST = ModuleManifest(
             description="List all active deployments with their URLs, status, services, and ports.",
             parameters=[],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="deployer.teardown",
@@ -134,6 +135,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="deployer.get_services",
@@ -149,6 +151,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="deployer.get_service_logs",
@@ -174,6 +177,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="deployer.get_env_vars",
@@ -187,6 +191,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="deployer.update_env_vars",
@@ -41,6 +41,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="error_manager.error_summary",
@@ -51,6 +52,7 @@ MANIFEST = ModuleManifest(
             ),
             parameters=[],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="error_manager.get_error",
@@ -67,6 +69,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="admin",
+            read_only=True,
         ),
         ToolDefinition(
             name="error_manager.dismiss_error",
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import structlog
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 
 from modules.file_manager.manifest import MANIFEST
 from modules.file_manager.tools import FileManagerTools
@@ -11,6 +11,7 @@ from shared.config import get_settings
 from shared.database import get_session_factory
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -32,13 +33,15 @@ async def startup():
     global tools
     session_factory = get_session_factory()
     tools = FileManagerTools(settings, session_factory)
+    # Ensure bucket exists (private — no public access policy)
+    await tools.storage.ensure_bucket()
     logger.info("file_manager_ready")
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)):
+async def manifest(request: Request, _=Depends(require_service_auth)):
     """Return the module manifest."""
-    return MANIFEST
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
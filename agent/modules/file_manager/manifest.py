@@ -44,12 +44,14 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="file_id", type="string", description="The file record ID"),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="file_manager.list_files",
             description="List all stored files for the current user.",
             parameters=[],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="file_manager.get_file_link",
@@ -58,6 +60,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="file_id", type="string", description="The file record ID"),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="file_manager.delete_file",
@@ -3,19 +3,21 @@
 from __future__ import annotations
 
 import base64
-import io
 import uuid
 from datetime import datetime, timezone
 
 import structlog
-from minio import Minio
 from sqlalchemy import select
 
 from shared.config import Settings
 from shared.models.file import FileRecord
+from shared.storage import get_storage
 
 logger = structlog.get_logger()
 
+# read_document returns at most this many characters
+_READ_MAX_CHARS = 10000
+
 MIME_TYPES = {
     # Text formats
     "md": "text/markdown",
@@ -55,16 +57,7 @@ class FileManagerTools:
     def __init__(self, settings: Settings, session_factory):
         self.settings = settings
         self.session_factory = session_factory
-        self.minio = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=False,
-        )
-        # Ensure bucket exists (private — no public access policy)
-        bucket = settings.minio_bucket
-        if not self.minio.bucket_exists(bucket):
-            self.minio.make_bucket(bucket)
+        self.storage = get_storage(settings)
 
     async def create_document(
         self,
@@ -88,15 +81,9 @@ class FileManagerTools:
 
         # Upload to MinIO
         data = content.encode("utf-8")
-        self.minio.put_object(
-            self.settings.minio_bucket,
-            minio_key,
-            io.BytesIO(data),
-            length=len(data),
-            content_type=mime_type,
-        )
+        await self.storage.put_bytes(minio_key, data, mime_type)
 
-        public_url = f"{self.settings.minio_public_url}/{minio_key}"
+        public_url = self.storage.public_url(minio_key)
 
         # Resolve user_id — require it for ownership tracking
         if not user_id:
@@ -144,15 +131,9 @@ class FileManagerTools:
 
         minio_key = f"uploads/{uuid.uuid4().hex[:8]}_{safe_name}"
 
-        self.minio.put_object(
-            self.settings.minio_bucket,
-            minio_key,
-            io.BytesIO(raw),
-            length=len(raw),
-            content_type=mime_type,
-        )
+        await self.storage.put_bytes(minio_key, raw, mime_type)
 
-        public_url = f"{self.settings.minio_public_url}/{minio_key}"
+        public_url = self.storage.public_url(minio_key)
         if not user_id:
             raise ValueError("user_id is required to upload files")
         uid = uuid.UUID(user_id)
@@ -195,17 +176,18 @@ class FileManagerTools:
             if not record:
                 raise ValueError(f"File not found: {file_id}")
 
-            # Download from MinIO
-            response = self.minio.get_object(self.settings.minio_bucket, record.minio_key)
-            try:
-                content = response.read().decode("utf-8")
-            finally:
-                response.close()
-                response.release_conn()
+            # Download from MinIO — only as many bytes as can survive the
+            # truncation below (a UTF-8 character is at most 4 bytes)
+            data = await self.storage.get_bytes(
+                record.minio_key, length=_READ_MAX_CHARS * 4,
+            )
+            partial = len(data) == _READ_MAX_CHARS * 4
+            # A partial read may end mid-character
+            content = data.decode("utf-8", errors="ignore" if partial else "strict")
 
             # Truncate very large files to avoid blowing up context
-            if len(content) > 10000:
-                content = content[:10000] + "\n... [truncated at 10000 chars]"
+            if len(content) > _READ_MAX_CHARS:
+                content = content[:_READ_MAX_CHARS] + "\n... [truncated at 10000 chars]"
 
             return {
                 "file_id": str(record.id),
@@ -276,7 +258,7 @@ class FileManagerTools:
 
             # Delete from MinIO
             try:
-                self.minio.remove_object(self.settings.minio_bucket, record.minio_key)
+                await self.storage.remove(record.minio_key)
             except Exception as e:
                 logger.warning("minio_delete_error", error=str(e))
 
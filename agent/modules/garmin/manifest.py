@@ -22,6 +22,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="garmin.get_heart_rate",
@@ -38,6 +39,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="garmin.get_sleep",
@@ -55,6 +57,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="garmin.get_body_composition",
@@ -78,6 +81,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="garmin.get_activities",
@@ -100,6 +104,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="garmin.get_stress",
@@ -117,6 +122,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="garmin.get_steps",
@@ -139,6 +145,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
     ],
 )
@@ -24,6 +24,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="search", type="string", description="Filter repos by name.", required=False),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.create_repo",
@@ -41,6 +42,7 @@ MANIFEST = ModuleManifest(
             description="Get repository metadata including description, default branch, language, stars, and fork count.",
             parameters=[_OWNER, _REPO],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.list_branches",
@@ -51,6 +53,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="per_page", type="integer", description="Max branches to return (default 30).", required=False),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.delete_branch",
@@ -72,6 +75,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="ref", type="string", description="Branch, tag, or commit SHA (defaults to the repo's default branch).", required=False),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         # ---- Issues ----
         ToolDefinition(
@@ -85,6 +89,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="per_page", type="integer", description="Max issues to return (default 20).", required=False),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.get_issue",
@@ -95,6 +100,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="issue_number", type="integer", description="Issue number."),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.create_issue",
@@ -131,6 +137,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="per_page", type="integer", description="Max PRs to return (default 20).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.get_pull_request",
@@ -141,6 +148,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="pr_number", type="integer", description="Pull request number."),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.create_pull_request",
@@ -188,6 +196,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="ref", type="string", description="Branch name, tag, or commit SHA to check."),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="git_platform.list_workflow_runs",
@@ -216,6 +225,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
     ],
 )
@@ -28,6 +28,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.get_price",
@@ -43,6 +44,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.get_orderbook",
@@ -61,6 +63,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         # ── Account & Subaccount ─────────────────────────────────────────
         ToolDefinition(
@@ -75,18 +78,21 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="owner",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.get_portfolio",
             description="Get an aggregated portfolio overview: bank balances, subaccount balances, and positions summary.",
             parameters=[],
             required_permission="owner",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.get_subaccounts",
             description="List all subaccounts and their balances.",
             parameters=[],
             required_permission="owner",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.subaccount_transfer",
@@ -202,6 +208,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="owner",
+            read_only=True,
         ),
         # ── Derivative / Perp Trading ────────────────────────────────────
         ToolDefinition(
@@ -306,6 +313,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="owner",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.get_positions",
@@ -328,6 +336,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="owner",
+            read_only=True,
         ),
         ToolDefinition(
             name="injective.close_position",
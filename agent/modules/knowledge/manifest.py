@@ -28,6 +28,28 @@ MANIFEST = ModuleManifest(
             ],
             required_permission="guest",
         ),
+        ToolDefinition(
+            name="knowledge.remember_many",
+            description=(
+                "Store several facts for the user at once. "
+                "Use this instead of repeated knowledge.remember calls when the user "
+                "shares a list of things worth retaining."
+            ),
+            parameters=[
+                ToolParameter(
+                    name="facts",
+                    type="array",
+                    description="The facts to remember, one string per fact",
+                ),
+                ToolParameter(
+                    name="user_id",
+                    type="string",
+                    description="The user ID (injected by orchestrator)",
+                    required=False,
+                ),
+            ],
+            required_permission="guest",
+        ),
         ToolDefinition(
             name="knowledge.recall",
             description=(
@@ -55,6 +77,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="knowledge.list_memories",
@@ -80,6 +103,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="knowledge.forget",
@@ -16,6 +16,9 @@ from shared.models.memory import MemorySummary
 
 logger = structlog.get_logger()
 
+# Memories without an embedding re-embedded per recall (one /embed/batch call)
+_BACKFILL_BATCH_SIZE = 32
+
 
 class KnowledgeTools:
     """Tools for user-facing knowledge storage and retrieval."""
@@ -38,6 +41,43 @@ class KnowledgeTools:
             logger.warning("embedding_request_failed", error=str(e))
         return None
 
+    async def _get_embeddings(self, texts: list[str]) -> list[list[float]] | None:
+        """Embed several texts with one call to core's batch endpoint (order preserved)."""
+        try:
+            async with httpx.AsyncClient(timeout=30.0, headers=get_service_auth_headers()) as client:
+                resp = await client.post(
+                    f"{self.settings.orchestrator_url}/embed/batch",
+                    json={"texts": texts},
+                )
+                if resp.status_code == 200:
+                    return resp.json().get("embeddings")
+        except Exception as e:
+            logger.warning("embedding_batch_request_failed", count=len(texts), error=str(e))
+        return None
+
+    async def _backfill_embeddings(self, session: AsyncSession, uid: uuid.UUID) -> None:
+        """Embed the user's memories stored without one (embedding was unavailable).
+
+        Until then semantic recall cannot find them.
+        """
+        result = await session.execute(
+            select(MemorySummary)
+            .where(MemorySummary.user_id == uid)
+            .where(MemorySummary.embedding.is_(None))
+            .order_by(MemorySummary.created_at.desc())
+            .limit(_BACKFILL_BATCH_SIZE)
+        )
+        missing = list(result.scalars().all())
+        if not missing:
+            return
+        embeddings = await self._get_embeddings([m.summary for m in missing])
+        if not embeddings:
+            return
+        for memory, embedding in zip(missing, embeddings):
+            memory.embedding = embedding
+        await session.commit()
+        logger.info("knowledge_embeddings_backfilled", user_id=str(uid), count=len(missing))
+
     async def remember(self, content: str, user_id: str | None = None) -> dict:
         """Store a fact with its embedding for later semantic recall."""
         if not user_id:
@@ -65,6 +105,44 @@ class KnowledgeTools:
             "stored": True,
         }
 
+    async def remember_many(self, facts: list[str], user_id: str | None = None) -> dict:
+        """Store several facts, embedding them all in one batch call."""
+        if not user_id:
+            raise ValueError("user_id is required")
+        facts = [f for f in facts if f and f.strip()]
+        if not facts:
+            raise ValueError("facts must contain at least one non-empty entry")
+
+        uid = uuid.UUID(user_id)
+        embeddings = await self._get_embeddings(facts) or [None] * len(facts)
+
+        now = datetime.now(timezone.utc)
+        memories = [
+            MemorySummary(
+                id=uuid.uuid4(),
+                user_id=uid,
+                conversation_id=None,
+                summary=content,
+                embedding=embedding,
+                created_at=now,
+            )
+            for content, embedding in zip(facts, embeddings)
+        ]
+        async with self.session_factory() as session:
+            session.add_all(memories)
+            await session.commit()
+
+        logger.info(
+            "knowledge_stored_many",
+            user_id=user_id,
+            count=len(memories),
+            has_embedding=embeddings[0] is not None,
+        )
+        return {
+            "memory_ids": [str(m.id) for m in memories],
+            "stored": len(memories),
+        }
+
     async def recall(self, query: str, max_results: int = 5, user_id: str | None = None) -> list[dict]:
         """Semantic search over the user's stored knowledge."""
         if not user_id:
@@ -75,6 +153,8 @@ class KnowledgeTools:
 
         async with self.session_factory() as session:
             if embedding:
+                # The embedding service is up: catch up on memories stored while it wasn't
+                await self._backfill_embeddings(session, uid)
                 # Semantic search via pgvector cosine distance
                 result = await session.execute(
                     select(MemorySummary)
@@ -81,6 +81,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="location.disable_reminder",
@@ -123,6 +124,7 @@ MANIFEST = ModuleManifest(
             description="Get the user's last known location and reverse-geocoded address.",
             parameters=[],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="location.set_named_place",
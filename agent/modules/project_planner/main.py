@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import structlog
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 
 from modules.project_planner.manifest import MANIFEST
 from modules.project_planner.tools import ProjectPlannerTools
 from shared.database import get_session_factory
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -45,8 +46,8 @@ _ALLOWED_TOOLS = {
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)):
-    return MANIFEST
+async def manifest(request: Request, _=Depends(require_service_auth)):
+    return manifest_response(MANIFEST, request)
 
 
 @app.post("/execute", response_model=ToolResult)
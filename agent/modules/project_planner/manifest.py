@@ -71,6 +71,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="project_planner.list_projects",
@@ -84,6 +85,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="project_planner.delete_project",
@@ -188,6 +190,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ── Execution helpers ───────────────────────────────────────────
         ToolDefinition(
@@ -198,6 +201,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="project_planner.get_next_task",
@@ -212,6 +216,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ── Batch execution ──────────────────────────────────────────────
         ToolDefinition(
@@ -244,6 +249,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="project_planner.bulk_update_tasks",
@@ -296,6 +302,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ── Sequential Phase Execution ──────────────────────────────────
         ToolDefinition(
@@ -23,6 +23,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="renpho_biometrics.get_latest",
@@ -34,6 +35,7 @@ MANIFEST = ModuleManifest(
             ),
             parameters=[],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="renpho_biometrics.get_trend",
@@ -51,6 +53,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
     ],
 )
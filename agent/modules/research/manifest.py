@@ -19,6 +19,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="research.news_search",
@@ -33,6 +34,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="research.fetch_webpage",
@@ -41,6 +43,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="url", type="string", description="The URL to fetch"),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="research.summarize_text",
@@ -55,6 +58,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
     ],
 )
@@ -0,0 +1,278 @@
+"""Long-lived pooled HTTP clients for the scheduler worker.
+
+Poll checks and conversation resumes reuse keep-alive connections instead of
+opening a new ``httpx.AsyncClient`` per evaluation.  There is one client per
+target — each module service, the core orchestrator, and a generic client for
+``poll_url`` jobs (which never sends the service auth header).
+
+Concurrent requests are capped per host, so a burst of due jobs polling the
+same module queues here instead of flooding it, and request latency is
+tracked per job type and exposed via :meth:`SchedulerHttpClients.stats`.
+
+Identical checks can be coalesced: callers pass a ``coalesce_key`` and
+concurrent requests with the same key share one HTTP call, whose response is
+then reused for ``scheduler_poll_result_ttl_seconds``.  Each job still
+evaluates its own success condition against the shared response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.cookiejar
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Hashable
+
+import httpx
+import structlog
+
+from shared.auth import get_service_auth_headers
+from shared.config import Settings, get_settings
+
+logger = structlog.get_logger()
+
+# Target key for the unauthenticated client used by poll_url jobs
+EXTERNAL_TARGET = "external"
+# Target key for calls back into the core orchestrator
+ORCHESTRATOR_TARGET = "orchestrator"
+
+# Keep idle connections longer than the default 30s poll interval
+_KEEPALIVE_EXPIRY = 60.0
+
+
+class _NoCookiePolicy(http.cookiejar.DefaultCookiePolicy):
+    """Reject every ``Set-Cookie`` so a pooled client never carries session state."""
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+
+class _LatencyStats:
+    """Request counters for one job type."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+
+    def record(self, seconds: float, error: bool) -> None:
+        self.requests += 1
+        self.errors += int(error)
+        self.seconds_total += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
+
+    def as_dict(self) -> dict:
+        avg = self.seconds_total / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms_avg": round(avg * 1000, 2),
+            "latency_ms_max": round(self.seconds_max * 1000, 2),
+        }
+
+
+class _HostSlots:
+    """Concurrency cap and queue depth for one host."""
+
+    def __init__(self, limit: int) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_use = 0
+        self.queued = 0
+
+
+class _LeaderCancelled(Exception):
+    """The request a coalesced call was waiting on was cancelled by its caller."""
+
+
+class _Coalescer:
+    """Single-flight plus a short TTL cache, keyed by check identity."""
+
+    # Expired entries are swept once the cache grows past this many keys
+    _SWEEP_THRESHOLD = 1024
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._results: dict[Hashable, tuple[float, httpx.Response]] = {}
+        self.calls = 0
+        self.shared = 0
+        self.cache_hits = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        while True:
+            now = time.monotonic()
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > now:
+                self.cache_hits += 1
+                return cached[1]
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.shared += 1
+            try:
+                return await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # The leader's own caller gave up; this caller still wants
+                # the result, so retry (one waiter becomes the new leader)
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting on a failed call; don't warn about it at GC
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.calls += 1
+        try:
+            resp = await fetch()
+        except BaseException as e:
+            # Cancellation belongs to the leader's caller only; never pass
+            # CancelledError on to unrelated waiters
+            if isinstance(e, asyncio.CancelledError):
+                future.set_exception(_LeaderCancelled())
+            else:
+                future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(resp)
+        if self.ttl_seconds > 0:
+            if len(self._results) >= self._SWEEP_THRESHOLD:
+                self._results = {k: v for k, v in self._results.items() if v[0] > now}
+            self._results[key] = (time.monotonic() + self.ttl_seconds, resp)
+        return resp
+
+    def as_dict(self) -> dict:
+        return {"calls": self.calls, "shared": self.shared, "cache_hits": self.cache_hits}
+
+
+class SchedulerHttpClients:
+    """Pooled clients keyed by target, with per-host caps and latency stats."""
+
+    def __init__(self, settings: Settings, transport: httpx.AsyncBaseTransport | None = None):
+        self.max_per_host = max(1, settings.scheduler_http_max_per_host)
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._hosts: dict[str, _HostSlots] = {}
+        self._latency: dict[str, _LatencyStats] = {}
+        self._coalescer = _Coalescer(settings.scheduler_poll_result_ttl_seconds)
+
+    def _get_client(self, target: str) -> httpx.AsyncClient:
+        client = self._clients.get(target)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers={} if target == EXTERNAL_TARGET else get_service_auth_headers(),
+                limits=httpx.Limits(
+                    max_connections=None,  # capped per host by _HostSlots
+                    max_keepalive_connections=self.max_per_host,
+                    keepalive_expiry=_KEEPALIVE_EXPIRY,
+                ),
+                # Clients are shared by every user's jobs; a cookie set by one
+                # job's target must not be replayed on another job's request
+                cookies=http.cookiejar.CookieJar(policy=_NoCookiePolicy()),
+                transport=self._transport,
+            )
+            self._clients[target] = client
+        return client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        parsed = httpx.URL(url)
+        host = f"{parsed.host}:{parsed.port}" if parsed.port else parsed.host
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = _HostSlots(self.max_per_host)
+
+        slots.queued += 1
+        try:
+            await slots.semaphore.acquire()
+        finally:
+            slots.queued -= 1
+        slots.in_use += 1
+        try:
+            yield
+        finally:
+            slots.in_use -= 1
+            slots.semaphore.release()
+
+    async def request(
+        self,
+        target: str,
+        method: str,
+        url: str,
+        *,
+        job_type: str,
+        timeout: float,
+        coalesce_key: Hashable | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send one request through *target*'s pooled client.
+
+        Latency is recorded under *job_type* and includes time spent waiting
+        for a host slot, since that is part of how late the check runs.
+        With a *coalesce_key*, identical concurrent or recent requests reuse
+        one response (only read-only checks should pass a key).
+        """
+        if coalesce_key is not None:
+            return await self._coalescer.run(
+                coalesce_key,
+                lambda: self.request(
+                    target, method, url, job_type=job_type, timeout=timeout, **kwargs,
+                ),
+            )
+
+        client = self._get_client(target)
+        stats = self._latency.setdefault(job_type, _LatencyStats())
+        started = time.monotonic()
+        error = True
+        try:
+            async with self._host_slot(url):
+                if method.upper() == "POST":
+                    resp = await client.post(url, timeout=timeout, **kwargs)
+                else:
+                    resp = await client.get(url, timeout=timeout, **kwargs)
+            error = resp.status_code >= 500
+            return resp
+        finally:
+            stats.record(time.monotonic() - started, error)
+
+    def stats(self) -> dict:
+        """Snapshot of per-job-type latency, per-host slot usage and coalescing."""
+        return {
+            "job_types": {name: s.as_dict() for name, s in self._latency.items()},
+            "coalesced": self._coalescer.as_dict(),
+            "hosts": {
+                host: {"in_use": s.in_use, "queued": s.queued}
+                for host, s in self._hosts.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled client. Safe to call more than once."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("scheduler_http_close_failed", error=str(e))
+
+
+@asynccontextmanager
+async def clients_or_temporary(
+    http: SchedulerHttpClients | None,
+) -> AsyncIterator[SchedulerHttpClients]:
+    """Yield *http*, or a short-lived instance for callers outside the worker loop."""
+    if http is not None:
+        yield http
+        return
+    temporary = SchedulerHttpClients(get_settings())
+    try:
+        yield temporary
+    finally:
+        await temporary.aclose()
@@ -9,6 +9,7 @@ import structlog
 from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from pydantic import BaseModel
 
+from modules.scheduler.http_clients import SchedulerHttpClients
 from modules.scheduler.manifest import MANIFEST
 from modules.scheduler.tools import SchedulerTools
 from modules.scheduler.worker import scheduler_loop, validate_webhook_signature
@@ -16,6 +17,7 @@ from shared.config import get_settings
 from shared.database import get_session_factory
 from shared.schemas.common import HealthResponse
 from shared.auth import require_service_auth
+from shared.manifest import manifest_response
 from shared.schemas.tools import ModuleManifest, ToolCall, ToolResult
 
 structlog.configure(
@@ -29,19 +31,21 @@ logger = structlog.get_logger()
 app = FastAPI(title="Scheduler Module", version="2.0.0")
 
 tools: SchedulerTools | None = None
+http_clients: SchedulerHttpClients | None = None
 _worker_task: asyncio.Task | None = None
 
 
 @app.on_event("startup")
 async def startup():
-    global tools, _worker_task
+    global tools, http_clients, _worker_task
     settings = get_settings()
     session_factory = get_session_factory()
     tools = SchedulerTools(session_factory, settings)
+    http_clients = SchedulerHttpClients(settings)
 
     # Start the background worker loop
     _worker_task = asyncio.create_task(
-        scheduler_loop(session_factory, settings, settings.redis_url)
+        scheduler_loop(session_factory, settings, settings.redis_url, http_clients)
     )
     logger.info("scheduler_module_ready")
 
@@ -55,13 +59,23 @@ async def shutdown():
             await _worker_task
         except asyncio.CancelledError:
             pass
+    if http_clients is not None:
+        await http_clients.aclose()
     logger.info("scheduler_module_shutdown")
 
 
 @app.get("/manifest", response_model=ModuleManifest)
-async def manifest(_=Depends(require_service_auth)):
+async def manifest(request: Request, _=Depends(require_service_auth)):
     """Return the module manifest."""
-    return MANIFEST
+    return manifest_response(MANIFEST, request)
+
+
+@app.get("/http-pool/stats")
+async def http_pool_stats(_=Depends(require_service_auth)):
+    """Worker HTTP latency per job type and per-host slot usage."""
+    if http_clients is None:
+        raise HTTPException(status_code=503, detail="Module not ready")
+    return http_clients.stats()
 
 
 @app.post("/execute", response_model=ToolResult)
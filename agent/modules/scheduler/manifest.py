@@ -185,6 +185,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ------------------------------------------------------------------
         # cancel_job
@@ -283,6 +284,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ------------------------------------------------------------------
         # list_workflows
@@ -306,6 +308,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="user",
+            read_only=True,
         ),
     ],
 )
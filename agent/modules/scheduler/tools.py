@@ -10,6 +10,8 @@ from croniter import croniter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from modules.scheduler.wakeup import notify_scheduler
+from modules.scheduler.worker import WEBHOOK_TRIGGER_KEY
 from shared.config import Settings
 from shared.models.scheduled_job import ScheduledJob
 from shared.models.scheduled_workflow import ScheduledWorkflow
@@ -122,6 +124,8 @@ class SchedulerTools:
             session.add(job)
             await session.commit()
 
+        await notify_scheduler(first_run_utc)
+
         logger.info(
             "job_scheduled",
             job_id=str(job_id),
@@ -500,15 +504,26 @@ class SchedulerTools:
                 if not hmac_mod.compare_digest(expected, signature):
                     raise ValueError("Invalid webhook signature")
 
-            job.status = "completed"
-            job.completed_at = now
-            if payload:
-                job.last_result = payload
+            if (job.last_result or {}).get(WEBHOOK_TRIGGER_KEY):
+                return {
+                    "job_id": job_id,
+                    "status": "triggered",
+                    "message": "Webhook already received; the job is completing.",
+                }
+
+            # Hand completion to the worker so the job's notification or
+            # conversation resume runs exactly like any other job type
+            job.last_result = {
+                WEBHOOK_TRIGGER_KEY: {"triggered_at": now.isoformat(), "payload": payload},
+            }
+            job.next_run_at = now
             await session.commit()
 
+        await notify_scheduler(now)
+
         logger.info("webhook_job_triggered", job_id=job_id, user_id=user_id)
         return {
             "job_id": job_id,
-            "status": "completed",
+            "status": "triggered",
             "message": "Webhook job triggered successfully.",
         }
@@ -0,0 +1,217 @@
+"""Event-driven wakeups for the scheduler worker.
+
+Instead of polling on a fixed interval, the worker sleeps until the earliest
+known ``next_run_at``.  Candidate times come from three places:
+
+- the database (the earliest active, unleased job after every pass),
+- jobs this worker just evaluated (their rescheduled ``next_run_at``),
+- ``scheduler:wakeup`` Redis messages published when a job is created or a
+  webhook fires, so new work is picked up without waiting for a timer.
+
+``poll_module`` jobs watching a claude_code task are also made due as soon
+as the task finishes: :func:`listen_for_task_completions` follows the
+``claude_code:task_completions`` stream instead of waiting for the job's
+next poll interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timezone
+
+import redis.asyncio as aioredis
+import structlog
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.models.scheduled_job import ScheduledJob
+from shared.redis import get_redis
+from shared.schemas.task_events import TASK_COMPLETIONS_STREAM, TaskEvent
+
+logger = structlog.get_logger()
+
+WAKEUP_CHANNEL = "scheduler:wakeup"
+
+# Shortest timer-driven sleep, so an overdue job that keeps failing to be
+# claimed cannot turn the loop into a busy spin
+MIN_SLEEP_SECONDS = 0.25
+
+
+class WakeupTimer:
+    """Min-heap of upcoming due times plus an early-wake event."""
+
+    def __init__(self) -> None:
+        self._heap: list[datetime] = []
+        self._event = asyncio.Event()
+        self._forced = False
+
+    def push(self, when: datetime | None) -> None:
+        """Register a due time; wakes the sleeper if it is earlier than the current one."""
+        if when is None:
+            return
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        if not self._heap or when < self._heap[0]:
+            self._event.set()
+        heapq.heappush(self._heap, when)
+
+    def wake(self) -> None:
+        """End the current (or next) wait immediately."""
+        self._forced = True
+        self._event.set()
+
+    def next_due(self) -> datetime | None:
+        return self._heap[0] if self._heap else None
+
+    def _pop_due(self, now: datetime) -> bool:
+        due = False
+        while self._heap and self._heap[0] <= now:
+            heapq.heappop(self._heap)
+            due = True
+        return due
+
+    async def wait(self, max_seconds: float, min_seconds: float = MIN_SLEEP_SECONDS) -> None:
+        """Sleep until the earliest due time, a wake(), or *max_seconds*.
+
+        Unless woken explicitly, sleeps at least *min_seconds* even when a
+        due time has already passed.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + max_seconds
+        earliest = started + min(min_seconds, max_seconds)
+        while True:
+            self._event.clear()
+            if self._forced:
+                self._forced = False
+                return
+            now = datetime.now(timezone.utc)
+            timeout = deadline - loop.time()
+            if self._heap:
+                timeout = min(timeout, (self._heap[0] - now).total_seconds())
+            timeout = max(timeout, earliest - loop.time())
+            if timeout <= 0:
+                self._pop_due(now)
+                return
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def notify_scheduler(when: datetime | None = None) -> None:
+    """Tell scheduler workers a job became due at *when* (default: now).
+
+    Best-effort: a lost message only delays the job until the worker's next
+    timer or its maximum sleep.
+    """
+    when = when or datetime.now(timezone.utc)
+    try:
+        redis = await get_redis()
+        await redis.publish(WAKEUP_CHANNEL, when.isoformat())
+    except Exception as e:
+        logger.warning("scheduler_wakeup_publish_failed", error=str(e))
+
+
+async def listen_for_wakeups(redis_url: str, timer: WakeupTimer) -> None:
+    """Feed ``scheduler:wakeup`` messages into *timer*, reconnecting with backoff."""
+    backoff = 5
+    while True:
+        try:
+            r = aioredis.from_url(redis_url)
+            pubsub = r.pubsub()
+            await pubsub.subscribe(WAKEUP_CHANNEL)
+            logger.info("scheduler_wakeup_listener_started")
+            backoff = 5  # reset on successful connection
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode()
+                try:
+                    timer.push(datetime.fromisoformat(data))
+                except ValueError:
+                    timer.wake()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("scheduler_wakeup_listener_failed", error=str(e), retry_in=backoff)
+            # Don't rely on a possibly missed message — re-scan the table
+            timer.wake()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+
+async def expedite_task_polls(
+    session_factory: async_sessionmaker[AsyncSession], task_ids: list[str],
+) -> int:
+    """Make active claude_code poll jobs watching *task_ids* due now.
+
+    Returns the number of jobs updated.  The normal poll evaluation then
+    reads the final ``task_status``, so completion handling is unchanged.
+    """
+    if not task_ids:
+        return 0
+    now = datetime.now(timezone.utc)
+    config = ScheduledJob.check_config
+    # Same argument-key aliases _check_poll_module accepts
+    watched = or_(*(
+        config[key]["task_id"].as_string().in_(task_ids)
+        for key in ("args", "params", "arguments")
+    ))
+    async with session_factory() as session:
+        result = await session.execute(
+            update(ScheduledJob)
+            .where(
+                ScheduledJob.status == "active",
+                ScheduledJob.job_type == "poll_module",
+                ScheduledJob.next_run_at > now,
+                config["module"].as_string() == "claude_code",
+                watched,
+            )
+            .values(next_run_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+async def listen_for_task_completions(
+    redis_url: str,
+    session_factory: async_sessionmaker[AsyncSession],
+    timer: WakeupTimer,
+) -> None:
+    """Expedite poll jobs for tasks reported on the completions stream.
+
+    Every replica follows the stream; the update is idempotent.  The read
+    position survives reconnects so completions published meanwhile are
+    still seen.
+    """
+    cursor = "$"
+    backoff = 5
+    while True:
+        try:
+            r = aioredis.from_url(redis_url, decode_responses=True)
+            logger.info("scheduler_task_completion_listener_started")
+            backoff = 5
+            while True:
+                response = await r.xread({TASK_COMPLETIONS_STREAM: cursor}, block=30_000, count=100)
+                task_ids: list[str] = []
+                for _stream, entries in response or []:
+                    for entry_id, fields in entries:
+                        cursor = entry_id
+                        try:
+                            task_ids.append(TaskEvent.model_validate_json(fields["event"]).task_id)
+                        except (KeyError, ValueError):
+                            continue
+                if await expedite_task_polls(session_factory, task_ids):
+                    timer.wake()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("scheduler_task_completion_listener_failed", error=str(e), retry_in=backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
@@ -5,18 +5,29 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import hmac
+import json
 import re
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import httpx
 import redis.asyncio as aioredis
 import structlog
 from croniter import croniter
-from sqlalchemy import select
+from sqlalchemy import case, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from shared.auth import get_service_auth_headers
+from modules.scheduler.http_clients import (
+    EXTERNAL_TARGET,
+    ORCHESTRATOR_TARGET,
+    SchedulerHttpClients,
+    clients_or_temporary,
+)
+from modules.scheduler.wakeup import (
+    WakeupTimer,
+    listen_for_task_completions,
+    listen_for_wakeups,
+)
 from shared.config import Settings
 from shared.models.scheduled_job import ScheduledJob
 from shared.schemas.notifications import Notification
@@ -24,8 +35,11 @@ from shared.schemas.tools import ToolCall, ToolResult
 
 logger = structlog.get_logger()
 
-# How often the main loop wakes up to check for due jobs
-LOOP_INTERVAL_SECONDS = 10
+# Run the stale-job sweep roughly this often (seconds)
+_STALE_CLEANUP_INTERVAL_SECONDS = 1000
+
+# Key under which trigger_webhook records a delivery in job.last_result
+WEBHOOK_TRIGGER_KEY = "webhook_trigger"
 
 # Maximum backoff cap for transient errors (seconds)
 _MAX_BACKOFF_SECONDS = 300
@@ -42,30 +56,313 @@ async def scheduler_loop(
     session_factory: async_sessionmaker[AsyncSession],
     settings: Settings,
     redis_url: str,
+    http: SchedulerHttpClients | None = None,
 ) -> None:
-    """Background loop that processes active scheduled jobs."""
+    """Background loop that processes active scheduled jobs.
+
+    Several scheduler replicas may run this loop against the same database:
+    due jobs are claimed with ``FOR UPDATE SKIP LOCKED`` and leased to one
+    worker, so each firing happens exactly once.  Between passes the loop
+    sleeps until the earliest known ``next_run_at`` (see ``wakeup.py``).
+
+    *http* is owned by the caller (the module exposes its stats); a private
+    instance is created and closed here when it is omitted.
+    """
     redis = aioredis.from_url(redis_url)
-    logger.info("scheduler_worker_started")
+    owns_http = http is None
+    if http is None:
+        http = SchedulerHttpClients(settings)
+    timer = WakeupTimer()
+    pool = _EvaluatorPool(settings.scheduler_max_concurrent_jobs, on_result=timer.push)
+    listener = asyncio.create_task(listen_for_wakeups(redis_url, timer))
+    completions = asyncio.create_task(
+        listen_for_task_completions(redis_url, session_factory, timer)
+    )
+    logger.info("scheduler_worker_started", max_concurrent_jobs=pool.size)
 
-    loop_count = 0
-    # Run stale cleanup every ~100 iterations (~17 minutes at 10s interval)
-    _STALE_CLEANUP_INTERVAL = 100
+    loop = asyncio.get_running_loop()
+    last_cleanup = loop.time()
 
     try:
         while True:
-            loop_count += 1
             try:
-                await _process_due_jobs(session_factory, settings, redis)
-                if loop_count % _STALE_CLEANUP_INTERVAL == 0:
+                await _process_due_jobs(session_factory, settings, redis, pool, http)
+                if loop.time() - last_cleanup >= _STALE_CLEANUP_INTERVAL_SECONDS:
+                    last_cleanup = loop.time()
                     await _cleanup_stale_jobs(session_factory, settings, redis)
+                timer.push(await _next_due_at(session_factory))
             except Exception as e:
                 logger.error("scheduler_loop_error", error=str(e))
 
-            await asyncio.sleep(LOOP_INTERVAL_SECONDS)
+            await timer.wait(settings.scheduler_max_sleep_seconds)
     finally:
+        listener.cancel()
+        completions.cancel()
+        # Leases on interrupted jobs expire and another replica picks them up
+        pool.cancel_all()
+        if owns_http:
+            await http.aclose()
         await redis.aclose()
 
 
+class _EvaluatorPool:
+    """Bounded set of in-flight job evaluations owned by one worker.
+
+    Evaluations outlive a single loop tick, so a slow ``poll_module`` check or
+    ``_resume_conversation`` call only occupies one slot instead of stalling
+    every other due job.
+    """
+
+    def __init__(self, size: int, on_result=None) -> None:
+        self.size = max(1, size)
+        self._tasks: set[asyncio.Task] = set()
+        # Called with each evaluation's return value (the job's next due time)
+        self._on_result = on_result
+
+    @property
+    def free(self) -> int:
+        return self.size - len(self._tasks)
+
+    def spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._on_result and not task.cancelled() and task.exception() is None:
+            self._on_result(task.result())
+
+    async def wait_for_slot(self) -> None:
+        if self.free > 0 or not self._tasks:
+            return
+        await asyncio.wait(set(self._tasks), return_when=asyncio.FIRST_COMPLETED)
+
+    async def drain(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def cancel_all(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+
+def _unleased(now: datetime):
+    """Filter for jobs no live worker currently holds."""
+    return or_(
+        ScheduledJob.lease_expires_at.is_(None),
+        ScheduledJob.lease_expires_at < now,
+    )
+
+
+# The due-job scans read only these columns so Postgres can answer them from
+# ix_scheduled_jobs_active_next_run without touching the JSON-heavy rows.
+def _claim_due_jobs_query(now: datetime, limit: int):
+    """Lock up to *limit* due, unleased jobs, skipping rows another worker holds."""
+    return (
+        select(ScheduledJob.id, ScheduledJob.next_run_at)
+        .where(
+            ScheduledJob.status == "active",
+            ScheduledJob.next_run_at <= now,
+            _unleased(now),
+        )
+        .order_by(ScheduledJob.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+async def _claim_due_jobs(
+    session_factory: async_sessionmaker[AsyncSession],
+    settings: Settings,
+    limit: int,
+) -> list[tuple[uuid.UUID, datetime, datetime]]:
+    """Lease up to *limit* due jobs to this worker.
+
+    Returns (id, next_run_at, lease_expires_at) triples.  The row locks are
+    only held for this short transaction — the lease column keeps other
+    replicas away while the job is evaluated.
+    """
+    now = datetime.now(timezone.utc)
+    lease_expires_at = now + timedelta(seconds=settings.scheduler_lease_seconds)
+    async with session_factory() as session:
+        result = await session.execute(_claim_due_jobs_query(now, limit))
+        claimed = [(row[0], row[1], lease_expires_at) for row in result.all()]
+        if claimed:
+            await session.execute(
+                update(ScheduledJob)
+                .where(ScheduledJob.id.in_([job_id for job_id, _, _ in claimed]))
+                .values(lease_expires_at=lease_expires_at)
+            )
+        await session.commit()
+    return claimed
+
+
+class _Lease:
+    """This worker's lease on one claimed job, renewed while it is evaluated.
+
+    Used as ``async with``: every third of ``scheduler_lease_seconds`` the
+    lease is pushed out again, so a slow evaluation never lets it expire and
+    another replica fire the job a second time.  Each renewal and the final
+    write-back only match while ``lease_expires_at`` still holds the value
+    this worker last set; a zero row count means the lease was lost.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        job_id: uuid.UUID,
+        expires_at: datetime,
+        seconds: int,
+    ) -> None:
+        self.job_id = job_id
+        self.expires_at = expires_at
+        self.lost = False
+        self._session_factory = session_factory
+        self._seconds = seconds
+        self._stop = asyncio.Event()
+        self._renewer: asyncio.Task | None = None
+
+    def held(self):
+        """Filter matching the job only while this worker still holds its lease."""
+        return ScheduledJob.lease_expires_at == self.expires_at
+
+    async def __aenter__(self) -> _Lease:
+        self._renewer = asyncio.create_task(self._renew_periodically())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Let an in-flight renewal finish rather than cancelling it mid-commit,
+        # so expires_at is known to match the row for the write-back
+        self._stop.set()
+        await self._renewer
+
+    async def _renew_periodically(self) -> None:
+        while not self.lost:
+            try:
+                await asyncio.wait_for(self._stop.wait(), self._seconds / 3)
+                return
+            except asyncio.TimeoutError:
+                await self.renew()
+
+    async def renew(self) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self._seconds)
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    update(ScheduledJob)
+                    .where(ScheduledJob.id == self.job_id, self.held())
+                    .values(lease_expires_at=expires_at)
+                    .returning(ScheduledJob.id)
+                )
+                renewed = result.one_or_none() is not None
+                await session.commit()
+        except Exception as e:
+            # Retried on the next tick; the lease has time to spare until then
+            logger.warning("job_lease_renew_failed", job_id=str(self.job_id), error=str(e))
+            return
+        if renewed:
+            self.expires_at = expires_at
+        else:
+            self.lost = True
+            logger.warning("job_lease_lost", job_id=str(self.job_id))
+
+
+async def _next_due_at(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> datetime | None:
+    """Earliest ``next_run_at`` among active jobs no worker holds, if any."""
+    async with session_factory() as session:
+        result = await session.execute(_next_due_query(datetime.now(timezone.utc)))
+        return result.scalar_one_or_none()
+
+
+def _next_due_query(now: datetime):
+    return (
+        select(ScheduledJob.next_run_at)
+        .where(ScheduledJob.status == "active", _unleased(now))
+        .order_by(ScheduledJob.next_run_at)
+        .limit(1)
+    )
+
+
+def _stale_jobs_query(now: datetime, threshold: datetime):
+    """Lock stale active jobs, fetching only what the cancellation notice needs."""
+    return (
+        select(
+            ScheduledJob.id,
+            ScheduledJob.user_id,
+            ScheduledJob.platform,
+            ScheduledJob.platform_channel_id,
+            ScheduledJob.platform_thread_id,
+            ScheduledJob.platform_server_id,
+        )
+        .where(
+            ScheduledJob.status == "active",
+            ScheduledJob.created_at < threshold,
+            # Cron jobs are intentionally long-lived — don't cancel them
+            ScheduledJob.job_type != "cron",
+            # Leave jobs that are mid-evaluation on another worker alone
+            _unleased(now),
+        )
+        .with_for_update(skip_locked=True)
+    )
+
+
+def _unless_moved(claimed_next_run_at: datetime | None, value: datetime):
+    """``next_run_at = value`` unless it changed since the job was claimed.
+
+    A webhook delivery or task-completion expedite that lands while the job
+    is being evaluated makes it due now; the evaluation's own reschedule
+    must not push it back out.
+    """
+    if claimed_next_run_at is None:
+        return value
+    return case(
+        (ScheduledJob.next_run_at == claimed_next_run_at, value),
+        else_=ScheduledJob.next_run_at,
+    )
+
+
+def _crash_backoff_seconds(interval_seconds: int | None, consecutive_failures: int) -> float:
+    if interval_seconds is None:
+        return _MAX_BACKOFF_SECONDS
+    return min(interval_seconds * (2 ** (consecutive_failures + 1)), _MAX_BACKOFF_SECONDS)
+
+
+async def _release_lease(
+    session_factory: async_sessionmaker[AsyncSession],
+    job_id: uuid.UUID,
+    retry_in: float = _MAX_BACKOFF_SECONDS,
+    claimed_next_run_at: datetime | None = None,
+    lease: _Lease | None = None,
+) -> None:
+    """Make a job reclaimable after its evaluation crashed, *retry_in* seconds from now.
+
+    Without the delay the job would still be overdue, so the worker would
+    claim it again straight away and hammer a failing target in a loop.
+    With *lease*, nothing is written once another worker has reclaimed the job.
+    """
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=retry_in)
+    where = [ScheduledJob.id == job_id]
+    if lease is not None:
+        where.append(lease.held())
+    try:
+        async with session_factory() as session:
+            await session.execute(
+                update(ScheduledJob)
+                .where(*where)
+                .values(
+                    lease_expires_at=None,
+                    next_run_at=_unless_moved(claimed_next_run_at, retry_at),
+                    consecutive_failures=ScheduledJob.consecutive_failures + 1,
+                )
+            )
+            await session.commit()
+    except Exception as e:
+        logger.warning("job_lease_release_failed", job_id=str(job_id), error=str(e))
+
+
 async def _cleanup_stale_jobs(
     session_factory: async_sessionmaker[AsyncSession],
     settings: Settings,
@@ -73,27 +370,21 @@ async def _cleanup_stale_jobs(
 ) -> None:
     """Cancel non-cron jobs that have been active too long without completing."""
     threshold_hours = getattr(settings, "stale_job_threshold_hours", 24)
-    threshold = datetime.now(timezone.utc) - timedelta(hours=threshold_hours)
+    now = datetime.now(timezone.utc)
+    threshold = now - timedelta(hours=threshold_hours)
 
     async with session_factory() as session:
-        result = await session.execute(
-            select(ScheduledJob).where(
-                ScheduledJob.status == "active",
-                ScheduledJob.created_at < threshold,
-                # Cron jobs are intentionally long-lived — don't cancel them
-                ScheduledJob.job_type != "cron",
-            )
-        )
-        stale_jobs = list(result.scalars().all())
+        result = await session.execute(_stale_jobs_query(now, threshold))
+        stale_jobs = list(result.all())
 
         if not stale_jobs:
             return
 
-        now = datetime.now(timezone.utc)
-        for job in stale_jobs:
-            job.status = "cancelled"
-            job.completed_at = now
-
+        await session.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.id.in_([job.id for job in stale_jobs]))
+            .values(status="cancelled", completed_at=now)
+        )
         await session.commit()
 
     # Notify users outside the DB session
@@ -115,59 +406,158 @@ async def _process_due_jobs(
     session_factory: async_sessionmaker[AsyncSession],
     settings: Settings,
     redis: aioredis.Redis,
-) -> None:
-    """Query and evaluate all jobs that are due for checking."""
-    now = datetime.now(timezone.utc)
-
-    async with session_factory() as session:
-        result = await session.execute(
-            select(ScheduledJob).where(
-                ScheduledJob.status == "active",
-                ScheduledJob.next_run_at <= now,
-            )
+    pool: _EvaluatorPool | None = None,
+    http: SchedulerHttpClients | None = None,
+) -> int:
+    """Claim due jobs and hand them to the evaluator pool; returns the number claimed.
+
+    Claims only as many jobs as the pool has free slots and keeps claiming
+    while slots free up, so a backlog drains at ``scheduler_max_concurrent_jobs``
+    without one worker hoarding jobs another replica could run.  Without an
+    explicit *pool* a temporary one is used and drained before returning.
+    """
+    owns_pool = pool is None
+    if pool is None:
+        pool = _EvaluatorPool(settings.scheduler_max_concurrent_jobs)
+
+    claimed_total = 0
+    max_lag = 0.0
+    while True:
+        await pool.wait_for_slot()
+        requested = pool.free
+        claimed = await _claim_due_jobs(session_factory, settings, requested)
+        now = datetime.now(timezone.utc)
+        for job_id, due_at, lease_expires_at in claimed:
+            max_lag = max(max_lag, (now - due_at).total_seconds())
+            pool.spawn(_run_claimed_job(
+                job_id, session_factory, settings, redis, http,
+                lease_expires_at=lease_expires_at,
+            ))
+        claimed_total += len(claimed)
+        if len(claimed) < requested:
+            break
+
+    if claimed_total:
+        logger.info(
+            "processing_due_jobs",
+            count=claimed_total,
+            max_lag_ms=round(max_lag * 1000),
         )
-        due_jobs = list(result.scalars().all())
-
-    if not due_jobs:
-        return
 
-    logger.info("processing_due_jobs", count=len(due_jobs))
+    if owns_pool:
+        await pool.drain()
+    return claimed_total
+
+
+# Columns _evaluate_job may change; only the ones it actually changed are
+# written back, so concurrent edits to the others (cancel_job, a webhook
+# delivery) are not overwritten with the values read at claim time.
+_EVALUATED_FIELDS = (
+    "status",
+    "attempts",
+    "consecutive_failures",
+    "runs_completed",
+    "last_result",
+    "next_run_at",
+    "completed_at",
+)
 
-    for job in due_jobs:
-        try:
-            async with session_factory() as session:
-                # Re-fetch within this session so changes are tracked
-                result = await session.execute(
-                    select(ScheduledJob).where(ScheduledJob.id == job.id)
-                )
-                job = result.scalar_one_or_none()
-                if not job or job.status != "active":
-                    continue
 
-                await _evaluate_job(job, session, settings, redis)
-                await session.commit()
-        except Exception as e:
-            logger.error(
-                "job_evaluation_error",
-                job_id=str(job.id),
-                error=str(e),
+async def _run_claimed_job(
+    job_id: uuid.UUID,
+    session_factory: async_sessionmaker[AsyncSession],
+    settings: Settings,
+    redis: aioredis.Redis,
+    http: SchedulerHttpClients | None = None,
+    *,
+    lease_expires_at: datetime,
+) -> datetime | None:
+    """Evaluate one leased job and clear the lease.
+
+    The job is loaded in one short session and its changes are written in
+    another; no connection is held while the check and completion actions
+    make their network calls (up to minutes for ``/continue``), so the
+    evaluator pool cannot exhaust the database connection pool.  The lease
+    claimed as *lease_expires_at* is renewed meanwhile, and the changes are
+    dropped if it was lost.
+
+    Returns the job's next due time if it is still active afterwards.
+    """
+    before: dict[str, Any] = {}
+    lease = _Lease(session_factory, job_id, lease_expires_at, settings.scheduler_lease_seconds)
+    try:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(ScheduledJob).where(ScheduledJob.id == job_id)
+            )
+            job = result.scalar_one_or_none()
+        if not job:
+            return None
+        before = {name: getattr(job, name) for name in _EVALUATED_FIELDS}
+        before["interval_seconds"] = job.interval_seconds
+        if job.status == "active":
+            async with lease:
+                await _evaluate_job(job, settings, redis, http)
+        changes = {
+            name: getattr(job, name)
+            for name in _EVALUATED_FIELDS
+            if getattr(job, name) != before[name]
+        }
+        if "next_run_at" in changes:
+            changes["next_run_at"] = _unless_moved(before["next_run_at"], job.next_run_at)
+
+        async with session_factory() as session:
+            result = await session.execute(
+                update(ScheduledJob)
+                .where(ScheduledJob.id == job_id, lease.held())
+                .values(**changes, lease_expires_at=None)
+                .returning(ScheduledJob.status, ScheduledJob.next_run_at)
             )
+            row = result.one_or_none()
+            if row is None:
+                # Another worker reclaimed the job (or it was deleted); its
+                # evaluation owns the row now
+                logger.warning("job_lease_lost", job_id=str(job_id))
+                return None
+            if changes.get("status") == "failed":
+                # Auto-cancel sibling jobs in the same workflow so they don't keep polling
+                await _cancel_workflow_siblings(job, session, job.completed_at)
+            await session.commit()
+        if row.status != "active":
+            return None
+        return row.next_run_at
+    except Exception as e:
+        logger.error(
+            "job_evaluation_error",
+            job_id=str(job_id),
+            error=str(e),
+        )
+        await _release_lease(
+            session_factory,
+            job_id,
+            _crash_backoff_seconds(
+                before.get("interval_seconds"), before.get("consecutive_failures") or 0,
+            ),
+            before.get("next_run_at"),
+            lease,
+        )
+        return None
 
 
 async def _evaluate_job(
     job: ScheduledJob,
-    session: AsyncSession,
     settings: Settings,
     redis: aioredis.Redis,
+    http: SchedulerHttpClients | None = None,
 ) -> None:
-    """Evaluate a single job and update its state."""
+    """Evaluate a single (detached) job and update its attributes in place."""
     job.attempts += 1
     now = datetime.now(timezone.utc)
 
     # Check wall-clock expiry (alternative to max_attempts)
     if job.expires_at and now >= job.expires_at:
         logger.info("job_expired", job_id=str(job.id))
-        await _mark_failed(job, now, redis, settings, session=session, reason="expired")
+        await _mark_failed(job, now, redis, settings, reason="expired", http=http)
         return
 
     logger.info(
@@ -185,21 +575,23 @@ async def _evaluate_job(
     try:
         if job.job_type == "poll_module":
             condition_met, task_failed, result_data = await _check_poll_module(
-                job, settings
+                job, settings, http
             )
         elif job.job_type == "delay":
             condition_met = _check_delay(job, now)
         elif job.job_type == "poll_url":
-            condition_met, result_data = await _check_poll_url(job)
+            condition_met, result_data = await _check_poll_url(job, http)
         elif job.job_type == "cron":
             # Cron jobs always fire on schedule
             condition_met = True
         elif job.job_type == "webhook":
             # Webhook jobs are triggered externally via POST /webhook/{job_id}.
-            # The worker periodically checks whether the webhook has already fired
-            # by inspecting job.last_result; normally the endpoint marks the job
-            # directly, so here we just reschedule the heartbeat.
-            condition_met = False
+            # trigger_webhook records the delivery in last_result, makes the job
+            # due and wakes the worker; otherwise this is the expiry heartbeat.
+            trigger = (job.last_result or {}).get(WEBHOOK_TRIGGER_KEY)
+            if trigger:
+                condition_met = True
+                result_data = trigger.get("payload")
         else:
             logger.warning("unknown_job_type", job_type=job.job_type, job_id=str(job.id))
             job.status = "failed"
@@ -217,7 +609,7 @@ async def _evaluate_job(
             attempt=job.attempts,
             error=str(e),
         )
-        await _mark_failed(job, now, redis, settings, session=session)
+        await _mark_failed(job, now, redis, settings, http=http)
         return
     except Exception as e:
         # Transient error — don't fail the job, just back off
@@ -235,7 +627,7 @@ async def _evaluate_job(
             error=str(e),
         )
         if job.attempts >= job.max_attempts:
-            await _mark_failed(job, now, redis, settings, session=session)
+            await _mark_failed(job, now, redis, settings, http=http)
         else:
             job.next_run_at = now + timedelta(seconds=backoff)
         return
@@ -248,7 +640,7 @@ async def _evaluate_job(
                 job.on_success_message, result_data, str(job.id), str(job.workflow_id) if job.workflow_id else None
             )
             if job.on_complete == "resume_conversation":
-                await _resume_conversation(job, message, result_data, settings, redis)
+                await _resume_conversation(job, message, result_data, settings, redis, http)
             else:
                 await _publish_notification(job, message, redis)
 
@@ -294,7 +686,7 @@ async def _evaluate_job(
 
             # Decide completion action
             if job.on_complete == "resume_conversation" and not task_failed:
-                await _resume_conversation(job, message, result_data, settings, redis)
+                await _resume_conversation(job, message, result_data, settings, redis, http)
             else:
                 # For task failures or notify mode, just send a notification
                 await _publish_notification(job, message, redis)
@@ -307,7 +699,7 @@ async def _evaluate_job(
             )
 
     elif job.attempts >= job.max_attempts:
-        await _mark_failed(job, now, redis, settings, session=session)
+        await _mark_failed(job, now, redis, settings, http=http)
 
     else:
         # Not done yet, schedule next check
@@ -450,6 +842,7 @@ def _evaluate_condition(field_value: Any, operator: str, target: Any) -> bool:
 async def _check_poll_module(
     job: ScheduledJob,
     settings: Settings,
+    http: SchedulerHttpClients | None = None,
 ) -> tuple[bool, bool, dict | None]:
     """Poll a module tool and check if the success condition is met.
 
@@ -511,17 +904,25 @@ async def _check_poll_module(
         user_id=str(job.user_id),
     )
 
-    headers = get_service_auth_headers()
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.post(
+    async with clients_or_temporary(http) as clients:
+        resp = await clients.request(
+            module,
+            "POST",
             f"{module_url}/execute",
+            job_type="poll_module",
+            timeout=30.0,
+            # Tool results can depend on the caller, so only the same user's
+            # jobs (e.g. workflow steps watching one task) share a call
+            coalesce_key=(
+                "poll_module", module, tool, call.user_id,
+                json.dumps(args, sort_keys=True, default=str),
+            ),
             json=call.model_dump(),
-            headers=headers,
         )
-        # HTTP 4xx (excluding 429) are permanent errors — the resource is gone
-        if resp.status_code in (404, 410):
-            raise _PermanentCheckError(f"Module returned HTTP {resp.status_code}")
-        resp.raise_for_status()
+    # HTTP 4xx (excluding 429) are permanent errors — the resource is gone
+    if resp.status_code in (404, 410):
+        raise _PermanentCheckError(f"Module returned HTTP {resp.status_code}")
+    resp.raise_for_status()
 
     tool_result = ToolResult(**resp.json())
 
@@ -565,7 +966,10 @@ def _check_delay(job: ScheduledJob, now: datetime) -> bool:
     return elapsed >= delay_seconds
 
 
-async def _check_poll_url(job: ScheduledJob) -> tuple[bool, dict | None]:
+async def _check_poll_url(
+    job: ScheduledJob,
+    http: SchedulerHttpClients | None = None,
+) -> tuple[bool, dict | None]:
     """Check if an HTTP endpoint returns the expected status code and/or body.
 
     check_config fields:
@@ -584,11 +988,12 @@ async def _check_poll_url(job: ScheduledJob) -> tuple[bool, dict | None]:
     response_value = config.get("response_value")
     response_operator = config.get("response_operator", "eq")
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        if method == "POST":
-            resp = await client.post(url)
-        else:
-            resp = await client.get(url)
+    async with clients_or_temporary(http) as clients:
+        resp = await clients.request(
+            EXTERNAL_TARGET, method, url, job_type="poll_url", timeout=15.0,
+            # Sent without credentials, so any user's identical GET can share it
+            coalesce_key=("poll_url", url) if method == "GET" else None,
+        )
 
     status_ok = resp.status_code == expected_status
     result_data: dict | None = None
@@ -620,6 +1025,7 @@ async def _resume_conversation(
     result_data: dict | None,
     settings: Settings,
     redis: aioredis.Redis,
+    http: SchedulerHttpClients | None = None,
 ) -> None:
     """Re-enter the agent loop via core /continue endpoint."""
     payload = {
@@ -634,15 +1040,17 @@ async def _resume_conversation(
     }
 
     try:
-        headers = get_service_auth_headers()
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            resp = await client.post(
+        async with clients_or_temporary(http) as clients:
+            resp = await clients.request(
+                ORCHESTRATOR_TARGET,
+                "POST",
                 f"{settings.orchestrator_url}/continue",
+                job_type="resume_conversation",
+                timeout=180.0,
                 json=payload,
-                headers=headers,
             )
-            resp.raise_for_status()
-            response_data = resp.json()
+        resp.raise_for_status()
+        response_data = resp.json()
 
         agent_content = response_data.get("content", "")
         if agent_content:
@@ -695,17 +1103,16 @@ async def _mark_failed(
     now: datetime,
     redis: aioredis.Redis,
     settings: Settings,
-    session: AsyncSession | None = None,
     reason: str = "max_attempts",
+    http: SchedulerHttpClients | None = None,
 ) -> None:
-    """Mark a job as failed, cancel workflow siblings, and send failure notification."""
+    """Mark a job as failed and send the failure notification.
+
+    Workflow siblings are cancelled when the result is written.
+    """
     job.status = "failed"
     job.completed_at = now
 
-    # Auto-cancel sibling jobs in the same workflow so they don't keep polling
-    if session is not None:
-        await _cancel_workflow_siblings(job, session, now)
-
     if reason == "expired":
         default_msg = (
             f"Scheduled job expired after {int((now - job.created_at).total_seconds() // 60)} minutes."
@@ -720,7 +1127,7 @@ async def _mark_failed(
 
     if job.on_complete == "resume_conversation":
         fail_message = f"[WORKFLOW FAILED] {message}"
-        await _resume_conversation(job, fail_message, None, settings, redis)
+        await _resume_conversation(job, fail_message, None, settings, redis, http)
     else:
         await _publish_notification(job, message, redis)
 
@@ -70,6 +70,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="skills_modules.get_skill",
@@ -79,6 +80,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         ToolDefinition(
             name="skills_modules.update_skill",
@@ -137,6 +139,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ── Task skill attachment ───────────────────────────────────────
         ToolDefinition(
@@ -167,6 +170,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
         # ── Template rendering ──────────────────────────────────────────
         ToolDefinition(
@@ -186,6 +190,7 @@ MANIFEST = ModuleManifest(
                 ToolParameter(name="user_id", type="string", description="User ID (injected by orchestrator).", required=False),
             ],
             required_permission="user",
+            read_only=True,
         ),
     ],
 )
@@ -27,6 +27,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="weather.weather_forecast",
@@ -55,6 +56,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="weather.weather_hourly",
@@ -83,6 +85,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
         ToolDefinition(
             name="weather.weather_alerts",
@@ -100,6 +103,7 @@ MANIFEST = ModuleManifest(
                 ),
             ],
             required_permission="guest",
+            read_only=True,
         ),
     ],
 )
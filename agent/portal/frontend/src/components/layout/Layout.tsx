@@ -90,13 +90,8 @@ export default function Layout({ children }: { children: React.ReactNode }) {
 
   // Fetch active task count (running + queued)
   const fetchActiveTaskCount = useCallback(() => {
-    api<{ tasks: { status: string }[] }>("/api/tasks")
-      .then((data) => {
-        const count = (data.tasks || []).filter(
-          (t) => t.status === "running" || t.status === "queued"
-        ).length;
-        setActiveTaskCount(count);
-      })
+    api<{ count: number }>("/api/tasks/count?status=running&status=queued")
+      .then((data) => setActiveTaskCount(data.count || 0))
       .catch(() => {});
   }, []);
 
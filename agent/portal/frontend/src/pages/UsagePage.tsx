@@ -18,12 +18,19 @@ interface UsageSummary {
   this_month: TokenStats;
 }
 
+interface PromptCacheStats {
+  cache_read_tokens: number;
+  cache_creation_tokens: number;
+  hit_ratio: number;
+}
+
 interface TokenStats {
   input_tokens: number;
   output_tokens: number;
   total_tokens: number;
   cost: number;
   requests: number;
+  prompt_cache: PromptCacheStats;
 }
 
 interface DailyUsage {
@@ -39,6 +46,7 @@ interface ModelUsage {
   total_tokens: number;
   total_cost: number;
   requests: number;
+  prompt_cache: PromptCacheStats;
 }
 
 interface UsageHistory {
@@ -189,6 +197,9 @@ function ModelBreakdown({ models }: { models: ModelUsage[] }) {
               <span className="text-gray-400">
                 {formatNumber(m.total_tokens)} tokens &middot;{" "}
                 {formatCost(m.total_cost)} &middot; {m.requests} req
+                {m.prompt_cache.cache_read_tokens > 0 && (
+                  <> &middot; {Math.round(m.prompt_cache.hit_ratio * 100)}% cached</>
+                )}
               </span>
             </div>
             <div className="w-full bg-gray-200 dark:bg-surface rounded-full h-1.5">
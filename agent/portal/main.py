@@ -17,6 +17,7 @@ from portal.services.terminal_service import get_terminal_service
 from shared.config import get_settings
 from shared.database import get_session_factory
 from shared.models.conversation import Conversation
+from shared.project_context import close_project_context
 from shared.schemas.notifications import Notification
 from sqlalchemy import select
 
@@ -137,6 +138,7 @@ async def shutdown() -> None:
             await _notification_task
         except asyncio.CancelledError:
             pass
+    await close_project_context()
 
 
 @app.websocket("/ws/notifications")
@@ -24,6 +24,7 @@ from shared.models.project import Project
 from shared.models.project_phase import ProjectPhase
 from shared.models.project_task import ProjectTask
 from shared.models.token_usage import TokenLog
+from shared.project_context import invalidate_project_context
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/api/projects", tags=["projects"])
@@ -319,6 +320,8 @@ async def clear_phases(
             )
         )
         await session.commit()
+    # Bulk deletes bypass the ORM listeners that drop the cached block
+    await invalidate_project_context(uid)
 
     logger.info("phases_cleared", project_id=project_id)
     return {"project_id": project_id, "message": "All phases and tasks cleared"}
@@ -484,6 +487,8 @@ async def apply_plan(
             )
         )
         await session.commit()
+    # Bulk updates bypass the ORM listeners; updated_at orders the cached block
+    await invalidate_project_context(uid)
 
     try:
         # 3. Get plan content
@@ -666,6 +671,7 @@ Rules:
                 )
             )
             await session.commit()
+        await invalidate_project_context(uid)
 
         logger.info(
             "plan_applied",
@@ -697,6 +703,7 @@ Rules:
                 )
             )
             await session.commit()
+        await invalidate_project_context(uid)
         logger.error("plan_apply_failed", project_id=project_id, error=str(e))
         raise
 
@@ -28,6 +28,10 @@ from portal.git_oauth import (
 from shared.config import get_settings
 from shared.credential_store import CredentialStore
 from shared.database import get_session_factory
+from shared.llm_settings_resolver import (
+    LLM_SETTINGS_SERVICES,
+    invalidate_user_llm_settings,
+)
 from shared.models.user import User, UserPlatformLink
 
 logger = structlog.get_logger()
@@ -178,6 +182,8 @@ async def upsert_credentials(
     factory = get_session_factory()
     async with factory() as session:
         await store.set_many(session, user.user_id, service, to_store)
+    if service in LLM_SETTINGS_SERVICES:
+        await invalidate_user_llm_settings(user.user_id)
 
     logger.info(
         "credentials_updated",
@@ -198,6 +204,8 @@ async def delete_service_credentials(
     factory = get_session_factory()
     async with factory() as session:
         count = await store.delete(session, user.user_id, service)
+    if service in LLM_SETTINGS_SERVICES:
+        await invalidate_user_llm_settings(user.user_id)
     return {"status": "ok", "deleted": count}
 
 
@@ -212,6 +220,8 @@ async def delete_credential_key(
     factory = get_session_factory()
     async with factory() as session:
         count = await store.delete(session, user.user_id, service, key)
+    if service in LLM_SETTINGS_SERVICES:
+        await invalidate_user_llm_settings(user.user_id)
     return {"status": "ok", "deleted": count}
 
 
@@ -104,10 +104,16 @@ class ContinueTaskRequest(BaseModel):
 async def list_tasks(
     status: str | None = Query(None, alias="status"),
     latest_per_chain: bool = Query(True),
+    limit: int | None = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     user: PortalUser = Depends(require_auth),
 ) -> dict:
-    """List all Claude Code tasks, optionally filtered by status."""
-    args: dict = {}
+    """List Claude Code tasks (newest first), optionally filtered by status.
+
+    Without *limit* every task is returned; pass it to page with ``offset``
+    and the response's ``has_more``.
+    """
+    args: dict = {"limit": limit, "offset": offset}
     if status:
         args["status_filter"] = status
     if latest_per_chain:
@@ -122,6 +128,25 @@ async def list_tasks(
     return result.get("result", {})
 
 
+@router.get("/count")
+async def count_tasks(
+    status: list[str] | None = Query(None),
+    user: PortalUser = Depends(require_auth),
+) -> dict:
+    """Count Claude Code tasks, optionally only those in the given statuses."""
+    args: dict = {}
+    if status:
+        args["statuses"] = status
+    result = await call_tool(
+        module="claude_code",
+        tool_name="claude_code.count_tasks",
+        arguments=args,
+        user_id=str(user.user_id),
+        timeout=15.0,
+    )
+    return result.get("result", {"count": 0})
+
+
 @router.post("")
 async def create_task(
     body: NewTaskRequest,
@@ -26,6 +26,20 @@ logger = structlog.get_logger()
 router = APIRouter(prefix="/api/usage", tags=["usage"])
 
 
+def _prompt_cache_stats(input_tokens: int, cache_read: int, cache_write: int) -> dict:
+    """Prompt-cache totals and hit ratio.
+
+    ``input_tokens`` excludes cached tokens (Anthropic usage semantics), so
+    the ratio is cache reads over all prompt tokens sent.
+    """
+    prompt_tokens = input_tokens + cache_read + cache_write
+    return {
+        "cache_read_tokens": cache_read,
+        "cache_creation_tokens": cache_write,
+        "hit_ratio": round(cache_read / prompt_tokens, 4) if prompt_tokens else 0.0,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Summary
 # ---------------------------------------------------------------------------
@@ -53,6 +67,8 @@ async def usage_summary(user: PortalUser = Depends(require_auth)) -> dict:
                 func.coalesce(func.sum(TokenLog.output_tokens), 0),
                 func.coalesce(func.sum(TokenLog.cost_estimate), 0.0),
                 func.count(TokenLog.id),
+                func.coalesce(func.sum(TokenLog.cache_read_input_tokens), 0),
+                func.coalesce(func.sum(TokenLog.cache_creation_input_tokens), 0),
             ).where(TokenLog.user_id == user.user_id)
         )
         at = all_time.one()
@@ -64,6 +80,8 @@ async def usage_summary(user: PortalUser = Depends(require_auth)) -> dict:
                 func.coalesce(func.sum(TokenLog.output_tokens), 0),
                 func.coalesce(func.sum(TokenLog.cost_estimate), 0.0),
                 func.count(TokenLog.id),
+                func.coalesce(func.sum(TokenLog.cache_read_input_tokens), 0),
+                func.coalesce(func.sum(TokenLog.cache_creation_input_tokens), 0),
             ).where(
                 TokenLog.user_id == user.user_id,
                 TokenLog.created_at >= month_start,
@@ -83,6 +101,7 @@ async def usage_summary(user: PortalUser = Depends(require_auth)) -> dict:
             "total_tokens": at[0] + at[1],
             "cost": round(at[2], 4),
             "requests": at[3],
+            "prompt_cache": _prompt_cache_stats(at[0], at[4], at[5]),
         },
         "this_month": {
             "input_tokens": tm[0],
@@ -90,6 +109,7 @@ async def usage_summary(user: PortalUser = Depends(require_auth)) -> dict:
             "total_tokens": tm[0] + tm[1],
             "cost": round(tm[2], 4),
             "requests": tm[3],
+            "prompt_cache": _prompt_cache_stats(tm[0], tm[4], tm[5]),
         },
     }
 
@@ -131,6 +151,9 @@ async def usage_history(user: PortalUser = Depends(require_auth)) -> dict:
                 ),
                 func.sum(TokenLog.cost_estimate).label("total_cost"),
                 func.count(TokenLog.id).label("requests"),
+                func.sum(TokenLog.input_tokens).label("input_tokens"),
+                func.sum(TokenLog.cache_read_input_tokens).label("cache_read"),
+                func.sum(TokenLog.cache_creation_input_tokens).label("cache_write"),
             )
             .where(
                 TokenLog.user_id == user.user_id,
@@ -158,6 +181,9 @@ async def usage_history(user: PortalUser = Depends(require_auth)) -> dict:
                 "total_tokens": row.total_tokens or 0,
                 "total_cost": round(row.total_cost or 0, 4),
                 "requests": row.requests or 0,
+                "prompt_cache": _prompt_cache_stats(
+                    row.input_tokens or 0, row.cache_read or 0, row.cache_write or 0,
+                ),
             }
             for row in model_rows
         ],
@@ -44,6 +44,9 @@ class Settings(BaseSettings):
     service_auth_token: str = ""
     minio_bucket: str = "agent-files"
     minio_public_url: str = "https://yourdomain.com/files"
+    # Concurrent object transfers per process (the MinIO SDK is blocking, so
+    # each transfer occupies one storage thread)
+    storage_max_concurrent_transfers: int = 8
 
     # LLM API Keys
     anthropic_api_key: str = ""
@@ -54,6 +57,20 @@ class Settings(BaseSettings):
     default_model: str = "claude-sonnet-4-20250514"
     summarization_model: str = "gpt-4o-mini"
     embedding_model: str = "text-embedding-3-small"
+    # Embedding cache keyed by sha256(model + text): in-process LRU size and
+    # Redis TTL (0 disables the Redis layer)
+    embedding_cache_max_entries: int = 2048
+    embedding_cache_ttl_seconds: int = 604800  # 7 days
+    # Vision preprocessing: images are downscaled to fit both limits (the
+    # envelope every provider resizes to anyway) and recompressed
+    vision_max_edge_px: int = 1568
+    vision_max_pixels: int = 1_150_000
+    vision_jpeg_quality: int = 85
+    # Larger source images are skipped without being fully downloaded
+    vision_max_source_bytes: int = 20 * 1024 * 1024
+    # Encoded-image cache: in-process LRU budget and Redis TTL (0 disables Redis)
+    vision_cache_max_bytes: int = 64 * 1024 * 1024
+    vision_cache_ttl_seconds: int = 86400
 
     # Platform tokens
     discord_token: str = ""
@@ -81,9 +98,42 @@ class Settings(BaseSettings):
     # Modules that need extra time (Selenium, long-running tasks)
     # uses tool_execution_timeout; all others use 30s default
     slow_modules: str = "garmin,renpho_biometrics,claude_code,deployer"
+    # Max tool calls from a single LLM response executed concurrently
+    # (only tools declaring read_only=True share a batch; others run alone)
+    max_parallel_tool_calls: int = 4
+    # Buffered message/token-log rows that trigger a mid-run database write
+    # (rows are always written before the first LLM call and at the end)
+    agent_persist_batch_rows: int = 24
+    # Pooled keep-alive HTTP clients for module tool calls (one pool per module)
+    tool_pool_max_connections: int = 20
+    tool_pool_max_keepalive: int = 10
+    tool_pool_keepalive_expiry: float = 30.0
+    # Negotiate HTTP/2 with modules that support it (requires the h2 package)
+    tool_pool_http2: bool = False
+    # Per-user LLM routers for users with their own API keys, reused across
+    # messages so provider SDK connection pools stay warm
+    llm_router_cache_max_entries: int = 64
+    llm_router_cache_ttl_seconds: int = 1800
+    # How long decrypted per-user LLM overrides are reused in-process; the
+    # portal bumps a Redis version key on change so edits apply immediately
+    llm_overrides_cache_ttl_seconds: int = 300
 
     # Hours after which an active (non-cron) job with no progress is stale
     stale_job_threshold_hours: int = 24
+    # Max jobs a single scheduler worker evaluates concurrently
+    scheduler_max_concurrent_jobs: int = 32
+    # How long a claimed job stays leased to one worker; the worker renews it
+    # every third of this while the job is evaluated
+    scheduler_lease_seconds: int = 300
+    # Longest the worker sleeps between due-job scans; it normally wakes at the
+    # next job's next_run_at or on a scheduler:wakeup message
+    scheduler_max_sleep_seconds: int = 60
+    # Max concurrent worker HTTP requests per target host (modules, core, poll_url
+    # targets), so a burst of due jobs can't overwhelm a single service
+    scheduler_http_max_per_host: int = 10
+    # Identical poll checks (same module tool + args + user, or same URL) due
+    # together share one call; its response is reused for this many seconds
+    scheduler_poll_result_ttl_seconds: float = 5.0
 
     # Health monitor — check module /health endpoints every N seconds (0 = disabled)
     health_check_interval_seconds: int = 300
@@ -99,6 +149,14 @@ class Settings(BaseSettings):
     # Cosine distance threshold for semantic memories (0.0 = identical, 2.0 = opposite)
     # Memories with distance above this are too irrelevant to include
     memory_relevance_threshold: float = 0.75
+    # Skip or reuse semantic recall for short/contextual follow-ups instead of
+    # embedding every message; the last recall per conversation is kept this long
+    recall_policy_enabled: bool = True
+    recall_cache_ttl_seconds: int = 1800
+    # Per-stage timeouts for context assembly; a stage that times out or fails
+    # is dropped from the prompt (history falls back to no prior messages)
+    context_stage_timeout_seconds: float = 3.0
+    context_history_timeout_seconds: float = 5.0
     # Estimated tokens consumed by tool definitions (subtracted from context budget)
     tool_schema_token_budget: int = 4000
 
@@ -25,6 +25,9 @@ def create_engine(database_url: str | None = None):
 
 def create_session_factory(engine=None) -> async_sessionmaker[AsyncSession]:
     """Create an async session factory."""
+    from shared.project_context import register_project_context_listeners
+
+    register_project_context_listeners()
     if engine is None:
         engine = create_engine()
     return async_sessionmaker(engine, expire_on_commit=False)
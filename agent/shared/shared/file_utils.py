@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import io
 import uuid
+from typing import AsyncIterator
 
 import structlog
-from minio import Minio
+
+from shared.storage import ObjectStorage, ObjectTooLargeError
 
 logger = structlog.get_logger()
 
@@ -40,10 +41,40 @@ MIME_MAP = {
 }
 
 
-def upload_attachment(
-    minio_client: Minio,
-    bucket: str,
-    public_url_base: str,
+def _attachment_key(filename: str) -> tuple[str, str, str]:
+    """Return (safe_name, minio_key, mime_type) for a new attachment."""
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "bin"
+    mime_type = MIME_MAP.get(ext, "application/octet-stream")
+
+    safe_name = "".join(c if c.isalnum() or c in "-_. " else "" for c in filename)
+    safe_name = safe_name.strip().replace(" ", "_") or "file"
+
+    minio_key = f"attachments/{uuid.uuid4().hex[:8]}_{safe_name}"
+    return safe_name, minio_key, mime_type
+
+
+def _attachment_info(storage: ObjectStorage, safe_name: str, minio_key: str,
+                     mime_type: str, size: int) -> dict:
+    logger.info("attachment_uploaded", filename=safe_name, size=size)
+    return {
+        "filename": safe_name,
+        "url": storage.public_url(minio_key),
+        "minio_key": minio_key,
+        "mime_type": mime_type,
+        "size_bytes": size,
+    }
+
+
+def _too_large(size: int | None = None) -> ValueError:
+    got = f"{size} bytes" if size is not None else "stream exceeded limit"
+    return ValueError(
+        f"File too large: {got} "
+        f"(max {MAX_UPLOAD_SIZE_BYTES // (1024 * 1024)} MB)"
+    )
+
+
+async def upload_attachment(
+    storage: ObjectStorage,
     raw_bytes: bytes,
     filename: str,
 ) -> dict:
@@ -55,35 +86,28 @@ def upload_attachment(
     Raises ValueError if file exceeds MAX_UPLOAD_SIZE_BYTES.
     """
     if len(raw_bytes) > MAX_UPLOAD_SIZE_BYTES:
-        raise ValueError(
-            f"File too large: {len(raw_bytes)} bytes "
-            f"(max {MAX_UPLOAD_SIZE_BYTES // (1024 * 1024)} MB)"
-        )
-
-    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "bin"
-    mime_type = MIME_MAP.get(ext, "application/octet-stream")
+        raise _too_large(len(raw_bytes))
 
-    safe_name = "".join(c if c.isalnum() or c in "-_. " else "" for c in filename)
-    safe_name = safe_name.strip().replace(" ", "_") or "file"
+    safe_name, minio_key, mime_type = _attachment_key(filename)
+    await storage.put_bytes(minio_key, raw_bytes, mime_type)
+    return _attachment_info(storage, safe_name, minio_key, mime_type, len(raw_bytes))
 
-    minio_key = f"attachments/{uuid.uuid4().hex[:8]}_{safe_name}"
-
-    # Upload to MinIO
-    minio_client.put_object(
-        bucket,
-        minio_key,
-        io.BytesIO(raw_bytes),
-        length=len(raw_bytes),
-        content_type=mime_type,
-    )
 
-    public_url = f"{public_url_base}/{minio_key}"
+async def upload_attachment_stream(
+    storage: ObjectStorage,
+    chunks: AsyncIterator[bytes],
+    filename: str,
+) -> dict:
+    """Like :func:`upload_attachment`, but streams from an async chunk iterator.
 
-    logger.info("attachment_uploaded", filename=safe_name, size=len(raw_bytes))
-    return {
-        "filename": safe_name,
-        "url": public_url,
-        "minio_key": minio_key,
-        "mime_type": mime_type,
-        "size_bytes": len(raw_bytes),
-    }
+    The file is never held in memory as a whole; the upload is aborted as
+    soon as it passes MAX_UPLOAD_SIZE_BYTES.
+    """
+    safe_name, minio_key, mime_type = _attachment_key(filename)
+    try:
+        size = await storage.put_stream(
+            minio_key, chunks, mime_type, max_bytes=MAX_UPLOAD_SIZE_BYTES,
+        )
+    except ObjectTooLargeError:
+        raise _too_large() from None
+    return _attachment_info(storage, safe_name, minio_key, mime_type, size)
@@ -2,14 +2,54 @@
 
 Used by the core orchestrator's AgentLoop to check whether a user has configured
 their own provider keys before falling back to the global env-var credentials.
+
+Decrypted overrides are cached in-process (never in Redis) for
+``llm_overrides_cache_ttl_seconds``.  Each entry remembers the user's
+settings version from Redis; the portal calls
+:func:`invalidate_user_llm_settings` on every credential change, which bumps
+that version so the next lookup in any process reloads from the database.
 """
 
 from __future__ import annotations
 
+import time
 import uuid
+from collections import OrderedDict
 
+import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from shared.config import get_settings
+from shared.redis import get_redis
+
+logger = structlog.get_logger()
+
+LLM_SETTINGS_VERSION_PREFIX = "llm_settings:version:"
+
+# Services whose credentials feed get_user_llm_overrides
+LLM_SETTINGS_SERVICES = frozenset({"llm_settings"})
+
+_OVERRIDES_CACHE_MAX_ENTRIES = 1024
+
+# user_id -> (settings version, expires_at, overrides)
+_overrides_cache: OrderedDict[uuid.UUID, tuple[str | None, float, dict | None]] = OrderedDict()
+
+
+async def _settings_version(user_id: uuid.UUID) -> str | None:
+    redis = await get_redis()
+    return await redis.get(f"{LLM_SETTINGS_VERSION_PREFIX}{user_id}")
+
+
+async def invalidate_user_llm_settings(user_id: uuid.UUID) -> None:
+    """Mark a user's cached LLM overrides stale in every process."""
+    _overrides_cache.pop(user_id, None)
+    try:
+        redis = await get_redis()
+        await redis.incr(f"{LLM_SETTINGS_VERSION_PREFIX}{user_id}")
+    except Exception as e:
+        # Other processes fall back to the TTL
+        logger.warning("llm_settings_invalidate_failed", user_id=str(user_id), error=str(e))
+
 
 async def get_user_llm_overrides(
     session: AsyncSession,
@@ -34,6 +74,35 @@ async def get_user_llm_overrides(
     if credential_store is None:
         return None
 
+    ttl = get_settings().llm_overrides_cache_ttl_seconds
+    if ttl <= 0:
+        return await _load_user_llm_overrides(session, user_id, credential_store)
+
+    try:
+        version = await _settings_version(user_id)
+    except Exception as e:
+        logger.warning("llm_settings_version_unavailable", error=str(e))
+        return await _load_user_llm_overrides(session, user_id, credential_store)
+
+    cached = _overrides_cache.get(user_id)
+    if cached is not None and cached[0] == version and cached[1] > time.monotonic():
+        _overrides_cache.move_to_end(user_id)
+        return dict(cached[2]) if cached[2] is not None else None
+
+    overrides = await _load_user_llm_overrides(session, user_id, credential_store)
+    _overrides_cache[user_id] = (version, time.monotonic() + ttl, overrides)
+    _overrides_cache.move_to_end(user_id)
+    while len(_overrides_cache) > _OVERRIDES_CACHE_MAX_ENTRIES:
+        _overrides_cache.popitem(last=False)
+    return dict(overrides) if overrides is not None else None
+
+
+async def _load_user_llm_overrides(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    credential_store,
+) -> dict | None:
+    """Decrypt the user's ``llm_settings`` credentials into overrides."""
     creds = await credential_store.get_all(session, user_id, "llm_settings")
     if not creds:
         return None
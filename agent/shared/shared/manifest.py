@@ -0,0 +1,49 @@
+"""ETag-aware ``/manifest`` responses for module services.
+
+Every module serves its static ``MANIFEST`` with a content-hash ETag so
+the orchestrator can send ``If-None-Match`` during discovery and skip
+re-parsing (and re-caching) manifests that have not changed.
+
+Usage in a module's FastAPI app::
+
+    from shared.manifest import manifest_response
+
+    @app.get("/manifest", response_model=ModuleManifest)
+    async def manifest(request: Request, _=Depends(require_service_auth)):
+        return manifest_response(MANIFEST, request)
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response
+
+from shared.schemas.tools import ModuleManifest
+
+# id(manifest) -> (manifest, body, etag). Manifests are module-level
+# constants, so this holds one entry per process in practice.
+_encoded: dict[int, tuple[ModuleManifest, bytes, str]] = {}
+
+
+def manifest_etag(manifest: ModuleManifest) -> str:
+    """Return the quoted content-hash ETag for *manifest*."""
+    return _encode(manifest)[1]
+
+
+def _encode(manifest: ModuleManifest) -> tuple[bytes, str]:
+    hit = _encoded.get(id(manifest))
+    if hit is not None and hit[0] is manifest:
+        return hit[1], hit[2]
+    body = manifest.model_dump_json().encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    _encoded[id(manifest)] = (manifest, body, etag)
+    return body, etag
+
+
+def manifest_response(manifest: ModuleManifest, request: Request) -> Response:
+    """Serve *manifest*, answering 304 when the caller already has it."""
+    body, etag = _encode(manifest)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
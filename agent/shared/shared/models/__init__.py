@@ -1,6 +1,7 @@
 """SQLAlchemy models."""
 
 from shared.models.base import Base
+from shared.models.claude_code_task import ClaudeCodeTask
 from shared.models.conversation import Conversation, Message
 from shared.models.crew_context_entry import CrewContextEntry
 from shared.models.crew_member import CrewMember
@@ -28,6 +29,7 @@ from shared.models.user_skill import UserSkill
 
 __all__ = [
     "Base",
+    "ClaudeCodeTask",
     "Conversation",
     "CrewContextEntry",
     "CrewMember",
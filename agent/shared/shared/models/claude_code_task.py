@@ -0,0 +1,70 @@
+"""Claude Code task registry model."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, JSON, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.models.base import Base
+
+
+class ClaudeCodeTask(Base):
+    """One claude_code task run (column names match the module's ``Task`` fields)."""
+
+    __tablename__ = "claude_code_tasks"
+    __table_args__ = (
+        # list_tasks: newest first per user, with and without a status filter
+        Index("ix_claude_code_tasks_user_created", "user_id", "created_at"),
+        Index("ix_claude_code_tasks_user_status_created", "user_id", "status", "created_at"),
+        # Chain / workspace / group lookups (get_task_chain, delete_workspace)
+        Index("ix_claude_code_tasks_parent", "parent_task_id"),
+        Index("ix_claude_code_tasks_workspace", "workspace"),
+        Index(
+            "ix_claude_code_tasks_group",
+            "group_id",
+            postgresql_where=text("group_id IS NOT NULL"),
+        ),
+        # Startup sweep of runs interrupted by a restart
+        Index(
+            "ix_claude_code_tasks_active",
+            "status",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    # Short hex id generated by the module (also used in container names)
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    # User id as passed by core — not a foreign key, tasks may have no user
+    user_id: Mapped[str | None] = mapped_column(String, default=None)
+
+    prompt: Mapped[str] = mapped_column(Text)
+    repo_url: Mapped[str | None] = mapped_column(String, default=None)
+    branch: Mapped[str | None] = mapped_column(String, default=None)
+    source_branch: Mapped[str | None] = mapped_column(String, default=None)
+    workspace: Mapped[str] = mapped_column(String, default="")
+    status: Mapped[str] = mapped_column(String, default="queued")
+    mode: Mapped[str] = mapped_column(String, default="execute")
+    auto_push: Mapped[bool] = mapped_column(Boolean, default=False)
+    parent_task_id: Mapped[str | None] = mapped_column(String, default=None)
+    group_id: Mapped[str | None] = mapped_column(String, default=None)
+    continue_session: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    heartbeat: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+
+    result: Mapped[dict | None] = mapped_column(JSON, default=None)
+    error: Mapped[str | None] = mapped_column(Text, default=None)
+
+    # Context tracking (updated by the heartbeat while the task runs)
+    peak_context_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    latest_context_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    num_compactions: Mapped[int] = mapped_column(Integer, default=0)
+    num_turns_tracked: Mapped[int] = mapped_column(Integer, default=0)
+    num_continuations: Mapped[int] = mapped_column(Integer, default=0)
+    context_model: Mapped[str | None] = mapped_column(String, default=None)
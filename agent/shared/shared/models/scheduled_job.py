@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shared.models.base import Base
@@ -13,6 +13,29 @@ from shared.models.base import Base
 
 class ScheduledJob(Base):
     __tablename__ = "scheduled_jobs"
+    __table_args__ = (
+        # Partial indexes cover only active rows, so the worker's scans stay
+        # small no matter how many completed/failed/cancelled jobs accumulate.
+        # Due-job claim and next-wakeup lookup
+        Index(
+            "ix_scheduled_jobs_active_next_run",
+            "next_run_at",
+            postgresql_where=text("status = 'active'"),
+            postgresql_include=["id", "lease_expires_at"],
+        ),
+        # Stale-job sweep (cron jobs are never stale)
+        Index(
+            "ix_scheduled_jobs_active_created",
+            "created_at",
+            postgresql_where=text("status = 'active' AND job_type <> 'cron'"),
+        ),
+        # Workflow sibling cancellation
+        Index(
+            "ix_scheduled_jobs_active_workflow",
+            "workflow_id",
+            postgresql_where=text("status = 'active' AND workflow_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
@@ -74,3 +97,10 @@ class ScheduledJob(Base):
     completed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), default=None
     )
+
+    # Worker lease — set when a scheduler replica claims the job (via
+    # SELECT ... FOR UPDATE SKIP LOCKED) and cleared once it is evaluated.
+    # An expired lease means the worker died and the job may be reclaimed.
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=None
+    )
@@ -0,0 +1,171 @@
+"""Per-user cache of the rendered "Active projects" context block.
+
+The core context builder renders a short summary of each user's active
+projects into every prompt.  The rendered text is cached in Redis per user
+so it is byte-stable between messages (prompt-cache friendly) and costs no
+database round-trips until a project or task changes.
+
+Invalidation is automatic for ORM writes: SQLAlchemy session listeners
+collect the ``user_id`` of every flushed ``Project``/``ProjectTask`` and
+drop those users' entries after the transaction commits.  Code that
+modifies these tables with bulk ``update()``/``delete()`` statements must
+call :func:`invalidate_project_context` itself.
+
+Invalidation also bumps a per-user generation counter.  A reader passes
+the generation it saw on its cache miss back to
+:func:`set_cached_project_context`, which only stores the block if no
+invalidation happened in between — otherwise a build that read the
+database before a write could re-cache the stale text after it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from itertools import chain
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from shared.models.project import Project
+from shared.models.project_task import ProjectTask
+from shared.redis import get_redis
+
+logger = structlog.get_logger()
+
+PROJECT_CONTEXT_PREFIX = "project_context:"
+PROJECT_CONTEXT_GENERATION_PREFIX = "project_context_gen:"
+# Safety net only — entries are normally dropped on write
+PROJECT_CONTEXT_TTL = 3600
+
+# SET the block only if the generation still matches the one read on the
+# miss (KEYS: block, generation; ARGV: text, expected generation, ttl)
+_SET_IF_GENERATION_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current ~= ARGV[2] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+_SESSION_INFO_KEY = "project_context_users"
+_listeners_registered = False
+# After-commit invalidations still running; referenced so they are not GC'd
+_pending_invalidations: set[asyncio.Task] = set()
+
+
+def project_context_key(user_id: uuid.UUID | str) -> str:
+    return f"{PROJECT_CONTEXT_PREFIX}{user_id}"
+
+
+def project_context_generation_key(user_id: uuid.UUID | str) -> str:
+    return f"{PROJECT_CONTEXT_GENERATION_PREFIX}{user_id}"
+
+
+async def get_cached_project_context(
+    user_id: uuid.UUID | str,
+) -> tuple[str | None, str]:
+    """Return ``(block, generation)``; block is None on a miss.
+
+    A cached "" means "no active projects".  Pass *generation* to
+    :func:`set_cached_project_context` when storing a freshly built block.
+    """
+    try:
+        redis = await get_redis()
+        text, generation = await redis.mget(
+            project_context_key(user_id), project_context_generation_key(user_id),
+        )
+        return text, generation or ""
+    except Exception as e:
+        logger.warning("project_context_cache_read_failed", error=str(e))
+        # The empty generation also guards the write if Redis comes back
+        return None, ""
+
+
+async def set_cached_project_context(
+    user_id: uuid.UUID | str, text: str, generation: str,
+) -> None:
+    """Store *text* unless the user's context was invalidated since *generation*."""
+    try:
+        redis = await get_redis()
+        stored = await redis.eval(
+            _SET_IF_GENERATION_SCRIPT,
+            2,
+            project_context_key(user_id),
+            project_context_generation_key(user_id),
+            text,
+            generation,
+            PROJECT_CONTEXT_TTL,
+        )
+        if not stored:
+            logger.debug("project_context_cache_write_skipped", user_id=str(user_id))
+    except Exception as e:
+        logger.warning("project_context_cache_write_failed", error=str(e))
+
+
+async def invalidate_project_context(*user_ids: uuid.UUID | str) -> None:
+    """Drop the cached project block for *user_ids* and bump their generations."""
+    if not user_ids:
+        return
+    try:
+        redis = await get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for u in user_ids:
+            # Bump before deleting: a build racing this write either stores
+            # first (and is deleted) or sees the new generation and skips
+            pipe.incr(project_context_generation_key(u))
+            # Outlives any in-flight build; expiring keeps idle users' keys tidy
+            pipe.expire(project_context_generation_key(u), PROJECT_CONTEXT_TTL)
+        pipe.delete(*(project_context_key(u) for u in user_ids))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("project_context_invalidate_failed", error=str(e))
+
+
+def _collect_touched_users(session: Session, flush_context) -> None:
+    touched: set = session.info.setdefault(_SESSION_INFO_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Project, ProjectTask)) and obj.user_id is not None:
+            touched.add(obj.user_id)
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    touched = session.info.pop(_SESSION_INFO_KEY, None)
+    if not touched:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # sync caller (e.g. migrations) — TTL covers it
+    task = loop.create_task(invalidate_project_context(*touched))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_invalidation_done)
+    # Users touched by a rolled-back flush stay in session.info and are
+    # invalidated (harmlessly) on the next commit.
+
+
+def _invalidation_done(task: asyncio.Task) -> None:
+    _pending_invalidations.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("project_context_invalidate_failed", error=str(task.exception()))
+
+
+async def close_project_context(timeout: float = 2.0) -> None:
+    """Give pending after-commit invalidations *timeout* seconds, then cancel them."""
+    if not _pending_invalidations:
+        return
+    _, unfinished = await asyncio.wait(set(_pending_invalidations), timeout=timeout)
+    for task in unfinished:
+        task.cancel()
+
+
+def register_project_context_listeners() -> None:
+    """Install the session listeners (idempotent; called by the session factory)."""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "after_flush", _collect_touched_users)
+    event.listen(Session, "after_commit", _invalidate_after_commit)
+    _listeners_registered = True
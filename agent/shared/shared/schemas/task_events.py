@@ -0,0 +1,38 @@
+"""Claude Code task progress events, published to Redis Streams.
+
+Each task has its own stream (:func:`task_event_stream`); events that end a
+run are also appended to :data:`TASK_COMPLETIONS_STREAM` so services that
+watch many tasks (the scheduler) need only one subscription.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+TASK_EVENTS_PREFIX = "claude_code:task_events:"
+TASK_COMPLETIONS_STREAM = "claude_code:task_completions"
+
+# Statuses after which a run produces no further events
+TERMINAL_TASK_STATUSES = frozenset(
+    {"completed", "failed", "timed_out", "cancelled", "awaiting_input"}
+)
+
+
+def task_event_stream(task_id: str) -> str:
+    return f"{TASK_EVENTS_PREFIX}{task_id}"
+
+
+class TaskEvent(BaseModel):
+    """One parsed progress event for a claude_code task."""
+
+    task_id: str
+    type: str  # "status" | "turn" | "tool_use" | "result" | "continuation"
+    status: str | None = None  # task status when the event was published
+    data: dict = Field(default_factory=dict)
+    ts: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def terminal(self) -> bool:
+        return self.type == "status" and self.status in TERMINAL_TASK_STATUSES
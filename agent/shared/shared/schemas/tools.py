@@ -24,6 +24,9 @@ class ToolDefinition(BaseModel):
     description: str
     parameters: list[ToolParameter]
     required_permission: str = "guest"  # minimum permission level
+    # Only read-only tools may run concurrently with other read-only calls in
+    # the same agent iteration; every other call runs on its own, in order.
+    read_only: bool = False
 
 
 class ModuleManifest(BaseModel):
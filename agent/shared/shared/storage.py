@@ -0,0 +1,316 @@
+"""Async object storage (MinIO) shared by core, the comms bots and modules.
+
+The ``minio`` SDK is blocking, and calling it from an ``async def`` stalls
+the whole event loop for the length of the transfer (a 20 MB vision image
+froze every other conversation in core).  :class:`ObjectStorage` runs each
+SDK call on a small dedicated thread pool instead, and exposes:
+
+- whole-object reads/writes for small payloads (with a hard size cap),
+- chunked streaming reads and writes that keep memory bounded,
+- concurrent multi-object downloads,
+- per-operation transfer throughput via :meth:`ObjectStorage.stats`.
+
+Use :func:`get_storage` for the process-wide instance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable
+
+import structlog
+from minio import Minio
+
+from shared.config import Settings
+
+logger = structlog.get_logger()
+
+# Chunk size for streaming reads
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Multipart part size for streaming writes of unknown length (MinIO minimum)
+STREAM_PART_SIZE = 5 * 1024 * 1024
+# Chunks buffered between an async producer and the upload thread
+_WRITE_QUEUE_CHUNKS = 4
+# How often a blocked producer checks whether the upload thread died
+_FEED_POLL_SECONDS = 1.0
+
+_EOF = object()
+
+
+class ObjectTooLargeError(ValueError):
+    """Raised when an object exceeds the caller's ``max_bytes``."""
+
+    def __init__(self, key: str, max_bytes: int):
+        super().__init__(f"Object {key!r} is larger than {max_bytes} bytes")
+        self.key = key
+        self.max_bytes = max_bytes
+
+
+class _TransferStats:
+    """Byte and time counters for one operation type."""
+
+    def __init__(self) -> None:
+        self.transfers = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def record(self, nbytes: int, seconds: float, error: bool = False) -> None:
+        self.transfers += 1
+        self.errors += int(error)
+        self.bytes += nbytes
+        self.seconds += seconds
+
+    def as_dict(self) -> dict:
+        mbps = self.bytes / self.seconds / (1024 * 1024) if self.seconds else 0.0
+        return {
+            "transfers": self.transfers,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "throughput_mb_s": round(mbps, 2),
+        }
+
+
+class _QueueReader(io.RawIOBase):
+    """File-like reader fed chunk by chunk from the event loop."""
+
+    def __init__(self, chunks: queue.Queue) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            chunk = self._chunks.get()
+            if chunk is _EOF:
+                self._done = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class ObjectStorage:
+    """Non-blocking wrapper around a ``Minio`` client for one bucket."""
+
+    def __init__(self, settings: Settings, client: Minio | None = None):
+        self.bucket = settings.minio_bucket
+        self.public_url_base = settings.minio_public_url.rstrip("/")
+        self.client = client or Minio(
+            settings.minio_endpoint,
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            secure=False,
+        )
+        limit = max(1, settings.storage_max_concurrent_transfers)
+        # One spare thread so metadata calls aren't stuck behind transfers
+        self._executor = ThreadPoolExecutor(max_workers=limit + 1, thread_name_prefix="storage")
+        self._transfer_slots = asyncio.Semaphore(limit)
+        self._stats: dict[str, _TransferStats] = {}
+
+    # -- helpers -----------------------------------------------------------
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    def _record(self, op: str, key: str, nbytes: int, started: float, error: bool = False) -> None:
+        seconds = time.monotonic() - started
+        self._stats.setdefault(op, _TransferStats()).record(nbytes, seconds, error)
+        logger.debug(
+            "storage_transfer",
+            op=op,
+            key=key,
+            bytes=nbytes,
+            ms=round(seconds * 1000, 1),
+            error=error,
+        )
+
+    def public_url(self, key: str) -> str:
+        return f"{self.public_url_base}/{key}"
+
+    def key_from_public_url(self, url: str) -> str | None:
+        """Return the object key for a URL produced by :meth:`public_url`."""
+        prefix = self.public_url_base + "/"
+        return url[len(prefix):] if url.startswith(prefix) else None
+
+    # -- bucket / metadata ------------------------------------------------
+
+    async def ensure_bucket(self) -> None:
+        """Create the bucket if it does not exist (private — no public policy)."""
+        if not await self._run(self.client.bucket_exists, self.bucket):
+            await self._run(self.client.make_bucket, self.bucket)
+
+    async def size(self, key: str) -> int:
+        stat = await self._run(self.client.stat_object, self.bucket, key)
+        return stat.size
+
+    async def remove(self, key: str) -> None:
+        await self._run(self.client.remove_object, self.bucket, key)
+
+    # -- writes -------------------------------------------------------------
+
+    async def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        started = time.monotonic()
+        try:
+            async with self._transfer_slots:
+                await self._run(
+                    self.client.put_object,
+                    self.bucket, key, io.BytesIO(data),
+                    length=len(data), content_type=content_type,
+                )
+        except Exception:
+            self._record("put", key, 0, started, error=True)
+            raise
+        self._record("put", key, len(data), started)
+
+    async def put_stream(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        max_bytes: int | None = None,
+    ) -> int:
+        """Upload from an async chunk iterator without holding the whole object.
+
+        Memory stays around one multipart part plus a few queued chunks.
+        Returns the number of bytes written; raises ObjectTooLargeError (and
+        aborts the upload) once *max_bytes* is exceeded.
+        """
+        started = time.monotonic()
+        written = 0
+        async with self._transfer_slots:
+            pending: queue.Queue = queue.Queue(maxsize=_WRITE_QUEUE_CHUNKS)
+            upload = asyncio.ensure_future(self._run(
+                self.client.put_object,
+                self.bucket, key, _QueueReader(pending),
+                length=-1, part_size=STREAM_PART_SIZE, content_type=content_type,
+            ))
+            try:
+                try:
+                    async for chunk in chunks:
+                        written += len(chunk)
+                        if max_bytes is not None and written > max_bytes:
+                            raise ObjectTooLargeError(key, max_bytes)
+                        await self._feed(pending, chunk, upload)
+                finally:
+                    # Always end the reader so the upload thread finishes
+                    with contextlib.suppress(Exception):
+                        await self._feed(pending, _EOF, upload)
+                await upload
+            except BaseException:
+                self._record("put", key, written, started, error=True)
+                # A truncated object may have been committed — drop it
+                with contextlib.suppress(BaseException):
+                    await upload
+                with contextlib.suppress(Exception):
+                    await self.remove(key)
+                raise
+        self._record("put", key, written, started)
+        return written
+
+    @staticmethod
+    async def _feed(pending: queue.Queue, chunk, upload: asyncio.Future) -> None:
+        """Hand *chunk* to the upload thread, surfacing its failure if it died."""
+        while True:
+            try:
+                # Runs on the default executor, not the transfer pool, so a
+                # full transfer pool can never starve its own producers
+                await asyncio.to_thread(pending.put, chunk, timeout=_FEED_POLL_SECONDS)
+                return
+            except queue.Full:
+                if upload.done():
+                    await upload
+                    raise RuntimeError("Upload finished before the stream ended")
+
+    # -- reads --------------------------------------------------------------
+
+    async def iter_object(
+        self,
+        key: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield an object's bytes in chunks (optionally only the first *length*)."""
+        started = time.monotonic()
+        read = 0
+        kwargs = {"length": length} if length else {}
+        resp = await self._run(self.client.get_object, self.bucket, key, **kwargs)
+        error = True
+        try:
+            stream = resp.stream(chunk_size)
+            while True:
+                chunk = await self._run(next, stream, None)
+                if chunk is None:
+                    break
+                read += len(chunk)
+                yield chunk
+            error = False
+        finally:
+            resp.close()
+            resp.release_conn()
+            self._record("get", key, read, started, error=error)
+
+    async def get_bytes(
+        self,
+        key: str,
+        max_bytes: int | None = None,
+        length: int | None = None,
+    ) -> bytes:
+        """Read an object into memory.
+
+        With *max_bytes* the read stops (ObjectTooLargeError) as soon as the
+        object turns out to be larger, so an oversized object never
+        materialises.  *length* reads only a prefix.
+        """
+        parts: list[bytes] = []
+        total = 0
+        async with self._transfer_slots, contextlib.aclosing(
+            self.iter_object(key, length=length)
+        ) as stream:
+            async for chunk in stream:
+                total += len(chunk)
+                if max_bytes is not None and total > max_bytes:
+                    raise ObjectTooLargeError(key, max_bytes)
+                parts.append(chunk)
+        return b"".join(parts)
+
+    async def get_many(
+        self,
+        keys: Iterable[str],
+        max_bytes: int | None = None,
+    ) -> list[bytes | Exception]:
+        """Download several objects concurrently; failures are returned in place."""
+        return await asyncio.gather(
+            *(self.get_bytes(key, max_bytes=max_bytes) for key in keys),
+            return_exceptions=True,
+        )
+
+    # -- observability ----------------------------------------------------
+
+    def stats(self) -> dict[str, dict]:
+        """Per-operation transfer counts, bytes and throughput."""
+        return {op: s.as_dict() for op, s in self._stats.items()}
+
+
+_storage: ObjectStorage | None = None
+
+
+def get_storage(settings: Settings) -> ObjectStorage:
+    """Return the process-wide ObjectStorage (created on first use)."""
+    global _storage
+    if _storage is None:
+        _storage = ObjectStorage(settings)
+    return _storage
@@ -1,9 +1,51 @@
-"""Token counting utilities."""
+"""Token counting utilities.
+
+Encoders are cached per model and per-text counts are memoized in a
+bounded LRU keyed by a BLAKE2b digest of the text plus the encoding, so
+identical content is encoded once per process without the cache keeping
+large prompts alive.  Context trimming should count each message once with
+:func:`count_message_tokens` and then subtract cached counts — see
+:func:`trim_groups_to_budget` — instead of re-counting the whole list
+after every removal.
+"""
 
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
 import tiktoken
 
+# ~4 tokens overhead per message for role, separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_COUNT_CACHE_MAX_ENTRIES = 8192
+# (text digest, encoding name) -> token count, least recently used first
+_counts: OrderedDict[tuple[bytes, str], int] = OrderedDict()
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Return the tiktoken encoder for *model* (cached for the process)."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_text(text: str, encoding_name: str) -> int:
+    key = (hashlib.blake2b(text.encode(), digest_size=16).digest(), encoding_name)
+    cached = _counts.get(key)
+    if cached is not None:
+        _counts.move_to_end(key)
+        return cached
+    count = len(tiktoken.get_encoding(encoding_name).encode(text))
+    _counts[key] = count
+    if len(_counts) > _COUNT_CACHE_MAX_ENTRIES:
+        _counts.popitem(last=False)
+    return count
+
 
 def count_tokens(text: str, model: str = "gpt-4o") -> int:
     """Count tokens in text using tiktoken.
@@ -11,25 +53,45 @@ def count_tokens(text: str, model: str = "gpt-4o") -> int:
     Uses cl100k_base encoding as a reasonable approximation for most models.
     For Anthropic models, this gives a close-enough estimate.
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
-    return len(encoding.encode(text))
+    return _count_text(text, _get_encoding(model).name)
+
+
+def count_message_tokens(msg: dict, model: str = "gpt-4o") -> int:
+    """Estimate token count for a single chat message."""
+    total = MESSAGE_OVERHEAD_TOKENS
+    content = msg.get("content", "")
+    if isinstance(content, str):
+        total += count_tokens(content, model)
+    elif isinstance(content, list):
+        # Handle multimodal content blocks
+        for block in content:
+            if isinstance(block, dict) and "text" in block:
+                total += count_tokens(block["text"], model)
+    return total
 
 
 def count_messages_tokens(messages: list[dict], model: str = "gpt-4o") -> int:
     """Estimate token count for a list of chat messages."""
-    total = 0
-    for msg in messages:
-        # ~4 tokens overhead per message for role, separators
-        total += 4
-        content = msg.get("content", "")
-        if isinstance(content, str):
-            total += count_tokens(content, model)
-        elif isinstance(content, list):
-            # Handle multimodal content blocks
-            for block in content:
-                if isinstance(block, dict) and "text" in block:
-                    total += count_tokens(block["text"], model)
-    return total
+    return sum(count_message_tokens(msg, model) for msg in messages)
+
+
+def trim_groups_to_budget(
+    groups: list[list[dict]],
+    reserved_tokens: int,
+    budget: int,
+    model: str = "gpt-4o",
+) -> list[list[dict]]:
+    """Drop the oldest *groups* until they fit in *budget*.
+
+    *reserved_tokens* is the cost of the messages that are always kept
+    (system prompt, latest user message, ...).  Each group is counted once
+    and its cost subtracted as it is dropped, so trimming is a single
+    linear pass over the history.
+    """
+    costs = [sum(count_message_tokens(m, model) for m in g) for g in groups]
+    total = reserved_tokens + sum(costs)
+    start = 0
+    while start < len(groups) and total > budget:
+        total -= costs[start]
+        start += 1
+    return groups[start:]
@@ -0,0 +1,102 @@
+"""Benchmark: context trimming time for 50/200/1000-message conversations.
+
+Compares the previous trimming strategy (re-count the whole context after
+every removed group) with the single-pass trim in ``shared.utils.tokens``.
+
+Run from the ``agent/`` directory::
+
+    python -m tests.benchmarks.bench_context_trim
+
+Not collected by pytest (file name does not start with ``test_``).
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared"))
+
+from shared.utils import tokens  # noqa: E402
+from shared.utils.tokens import (  # noqa: E402
+    count_message_tokens,
+    count_messages_tokens,
+    trim_groups_to_budget,
+)
+
+MODEL = "gpt-4o"
+SIZES = (50, 200, 1000)
+REPEATS = 5
+
+
+def _make_conversation(n: int) -> list[list[dict]]:
+    """Build *n* messages of mixed length, grouped like ContextBuilder does."""
+    rng = random.Random(n)
+    words = "the agent called a tool and returned some output for the user".split()
+    groups: list[list[dict]] = []
+    i = 0
+    while i < n:
+        if rng.random() < 0.3 and i + 1 < n:
+            tid = f"tool_{i}"
+            groups.append([
+                {"role": "tool_call", "name": "research.web_search", "arguments": {}, "tool_use_id": tid},
+                {"role": "tool_result", "name": "research.web_search", "tool_use_id": tid,
+                 "content": " ".join(rng.choices(words, k=rng.randint(50, 400)))},
+            ])
+            i += 2
+        else:
+            role = "user" if i % 2 == 0 else "assistant"
+            groups.append([{"role": role, "content": " ".join(rng.choices(words, k=rng.randint(5, 200)))}])
+            i += 1
+    return groups
+
+
+def _legacy_trim(system: list[dict], groups: list[list[dict]], user: dict, budget: int) -> list[list[dict]]:
+    groups = list(groups)
+    while groups and count_messages_tokens(
+        system + [m for g in groups for m in g] + [user], MODEL
+    ) > budget:
+        groups.pop(0)
+    return groups
+
+
+def _single_pass_trim(system: list[dict], groups: list[list[dict]], user: dict, budget: int) -> list[list[dict]]:
+    reserved = count_messages_tokens(system, MODEL) + count_message_tokens(user, MODEL)
+    return trim_groups_to_budget(groups, reserved, budget, MODEL)
+
+
+def _time(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    system = [{"role": "system", "content": "You are a helpful assistant. " * 50}]
+    user = {"role": "user", "content": "What happened earlier?"}
+
+    print(f"{'messages':>8}  {'legacy ms':>10}  {'single-pass ms':>14}  {'speedup':>8}")
+    for n in SIZES:
+        groups = _make_conversation(n)
+        total = count_messages_tokens(system + [m for g in groups for m in g] + [user], MODEL)
+        # Keep roughly the newest 10% so trimming has real work to do
+        budget = total // 10
+
+        # Start each strategy with a cold per-text cache; best-of-N then
+        # reflects the warm steady state of a long-running process.
+        tokens._counts.clear()
+        legacy = _time(_legacy_trim, system, groups, user, budget)
+        tokens._counts.clear()
+        single = _time(_single_pass_trim, system, groups, user, budget)
+
+        assert _legacy_trim(system, groups, user, budget) == _single_pass_trim(system, groups, user, budget)
+        print(f"{n:>8}  {legacy:>10.2f}  {single:>14.2f}  {legacy / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
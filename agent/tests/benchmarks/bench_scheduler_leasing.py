@@ -0,0 +1,126 @@
+"""Load test: firing latency for 10k due scheduler jobs.
+
+Every job becomes due at the same instant (the worst case — e.g. after a
+deploy or an outage) and each evaluation sleeps for a simulated check
+latency: mostly fast module polls, some slow ones, and a few
+``_resume_conversation``-sized stalls.
+
+The legacy worker evaluated due jobs one at a time, so job *i* fired after
+the sum of every earlier evaluation; its column is computed from the same
+latency samples rather than slept through.  The leased rows run the real
+``_process_due_jobs`` claim loop and evaluator pool against an in-memory
+lease store with SKIP LOCKED semantics (claims are atomic on the event
+loop), with 1, 2 and 4 replicas sharing the queue.  Each run also asserts
+that no job fired twice.
+
+Run from the ``agent/`` directory::
+
+    python -m tests.benchmarks.bench_scheduler_leasing
+
+Not collected by pytest (file name does not start with ``test_``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import structlog
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared"))
+
+from modules.scheduler import worker  # noqa: E402
+from shared.config import Settings  # noqa: E402
+
+JOBS = 10_000
+CONCURRENCY = 32
+REPLICAS = (1, 2, 4)
+# (probability, seconds) — fast polls, slow polls, resume-sized stalls
+LATENCY_MIX = ((0.90, 0.01), (0.09, 0.1), (0.01, 2.0))
+
+
+def _sample_latencies(n: int) -> list[float]:
+    rng = random.Random(n)
+    weights, values = zip(*LATENCY_MIX)
+    return rng.choices(values, weights=weights, k=n)
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float, float, float]:
+    q = statistics.quantiles(samples, n=100)
+    return q[49], q[94], q[98], max(samples)
+
+
+def _legacy_firing_latency(latencies: list[float]) -> list[float]:
+    fired, elapsed = [], 0.0
+    for latency in latencies:
+        fired.append(elapsed)
+        elapsed += latency
+    return fired
+
+
+class _LeaseStore:
+    """All jobs due at ``due_at``; a claimed job is never handed out again."""
+
+    def __init__(self, latencies: list[float]) -> None:
+        self.due_at = datetime.now(timezone.utc)
+        self.latency = {uuid.uuid4(): latency for latency in latencies}
+        self.queue = list(self.latency)
+        self.started: dict[uuid.UUID, float] = {}
+        self.fired: Counter = Counter()
+
+    async def claim(self, session_factory, settings, limit):
+        await asyncio.sleep(0.002)  # one claim round-trip
+        claimed, self.queue = self.queue[:limit], self.queue[limit:]
+        lease = self.due_at + timedelta(seconds=settings.scheduler_lease_seconds)
+        return [(job_id, self.due_at, lease) for job_id in claimed]
+
+    async def run(self, job_id, session_factory, settings, redis, http=None, *, lease_expires_at):
+        self.started[job_id] = time.monotonic()
+        self.fired[job_id] += 1
+        await asyncio.sleep(self.latency[job_id])
+
+
+async def _run_replicas(latencies: list[float], replicas: int) -> tuple[list[float], float]:
+    store = _LeaseStore(latencies)
+    worker._claim_due_jobs = store.claim
+    worker._run_claimed_job = store.run
+    settings = Settings(scheduler_max_concurrent_jobs=CONCURRENCY)
+
+    start = time.monotonic()
+    await asyncio.gather(*(
+        worker._process_due_jobs(None, settings, None) for _ in range(replicas)
+    ))
+    wall = time.monotonic() - start
+
+    assert len(store.fired) == len(latencies)
+    assert max(store.fired.values()) == 1, "a job fired twice"
+    return [t - start for t in store.started.values()], wall
+
+
+def main() -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    latencies = _sample_latencies(JOBS)
+    print(f"{JOBS} jobs due at once, {CONCURRENCY} evaluators per replica\n")
+    print(f"{'worker':>16}  {'p50 s':>8}  {'p95 s':>8}  {'p99 s':>8}  {'max s':>8}  {'drain s':>8}")
+
+    legacy = _legacy_firing_latency(latencies)
+    p50, p95, p99, worst = _percentiles(legacy)
+    print(f"{'legacy serial':>16}  {p50:>8.2f}  {p95:>8.2f}  {p99:>8.2f}  {worst:>8.2f}  {sum(latencies):>8.2f}")
+
+    for replicas in REPLICAS:
+        fired, wall = asyncio.run(_run_replicas(latencies, replicas))
+        p50, p95, p99, worst = _percentiles(fired)
+        label = f"leased x{replicas}"
+        print(f"{label:>16}  {p50:>8.2f}  {p95:>8.2f}  {p99:>8.2f}  {worst:>8.2f}  {wall:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
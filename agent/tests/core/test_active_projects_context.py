@@ -0,0 +1,209 @@
+"""Tests for the aggregated, per-user cached "Active projects" context block."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.orchestrator.context_builder import ContextBuilder
+from shared import project_context
+from shared.config import Settings
+from shared.models.project import Project
+from shared.models.project_task import ProjectTask
+
+
+class _FakeRedis:
+    """Dict-backed Redis with the calls project_context makes."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    async def mget(self, *keys):
+        return [self.store.get(k) for k in keys]
+
+    async def eval(self, script, numkeys, key, generation_key, text, generation, ttl):
+        if self.store.get(generation_key, "") != generation:
+            return 0
+        self.store[key] = text
+        return 1
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    def incr(self, key):
+        self.ops.append(lambda s: s.__setitem__(key, str(int(s.get(key, "0")) + 1)))
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, *keys):
+        self.ops.append(lambda s: [s.pop(k, None) for k in keys])
+
+    async def execute(self):
+        for op in self.ops:
+            op(self.redis.store)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(project_context, "get_redis", AsyncMock(return_value=redis))
+    return redis.store
+
+
+def _project(name: str, **kw) -> Project:
+    return Project(
+        id=uuid.uuid4(), name=name, status="active",
+        repo_owner=kw.get("repo_owner"), repo_name=kw.get("repo_name"),
+        project_branch=kw.get("project_branch"),
+    )
+
+
+def _session(rows, doing_tasks=()):
+    session = AsyncMock()
+    aggregated = MagicMock()
+    aggregated.all.return_value = rows
+    doing = MagicMock()
+    doing.scalars.return_value.all.return_value = list(doing_tasks)
+    session.execute = AsyncMock(side_effect=[aggregated, doing])
+    return session
+
+
+def _user():
+    return SimpleNamespace(id=uuid.uuid4())
+
+
+class TestActiveProjectsQuery:
+    async def test_counts_come_from_one_query(self, fake_redis):
+        rows = [(_project("api", repo_owner="o", repo_name="r"), 4, 2, 0, 1)]
+        session = _session(rows)
+        text = await ContextBuilder(Settings())._get_active_projects(session, _user())
+
+        assert session.execute.await_count == 1
+        assert '- "api" (active), 2/4 tasks done, 1 in review, repo: o/r' in text
+
+    async def test_doing_tasks_fetched_in_one_extra_query(self, fake_redis):
+        a, b = _project("a"), _project("b")
+        tasks = [
+            ProjectTask(project_id=a.id, title="wire db", claude_task_id="t1"),
+            ProjectTask(project_id=b.id, title="write docs", claude_task_id=None),
+        ]
+        session = _session([(a, 3, 0, 1, 0), (b, 2, 1, 1, 0)], tasks)
+        text = await ContextBuilder(Settings())._get_active_projects(session, _user())
+
+        assert session.execute.await_count == 2
+        assert '  - Task "wire db" [claude_task_id: t1]' in text
+        assert '  - Task "write docs"' in text
+        assert text.index("wire db") < text.index('"b"')
+
+    async def test_aggregate_compiles_for_postgres(self, fake_redis):
+        session = _session([])
+        await ContextBuilder(Settings())._get_active_projects(session, _user())
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "FILTER (WHERE project_tasks.status" in sql
+        assert "GROUP BY projects.id" in sql
+
+
+class TestProjectContextCache:
+    async def test_second_build_is_served_from_cache(self, fake_redis):
+        user = _user()
+        builder = ContextBuilder(Settings())
+        first = await builder._get_active_projects(_session([(_project("api"), 0, 0, 0, 0)]), user)
+
+        session = _session([])
+        assert await builder._get_active_projects(session, user) == first
+        session.execute.assert_not_awaited()
+
+    async def test_no_projects_is_cached_too(self, fake_redis):
+        user = _user()
+        builder = ContextBuilder(Settings())
+        assert await builder._get_active_projects(_session([]), user) is None
+
+        session = _session([])
+        assert await builder._get_active_projects(session, user) is None
+        session.execute.assert_not_awaited()
+
+    async def test_build_racing_an_invalidation_is_not_cached(self, fake_redis):
+        user = _user()
+        builder = ContextBuilder(Settings())
+        session = _session([(_project("before the write"), 0, 0, 0, 0)])
+        query = session.execute.side_effect
+
+        async def read_then_write_lands(*args, **kwargs):
+            result = query.pop(0)
+            # The project changes after this build read it, before it caches
+            await project_context.invalidate_project_context(user.id)
+            return result
+
+        session.execute = AsyncMock(side_effect=read_then_write_lands)
+        await builder._get_active_projects(session, user)
+
+        assert project_context.project_context_key(user.id) not in fake_redis
+        fresh = await builder._get_active_projects(
+            _session([(_project("after the write"), 0, 0, 0, 0)]), user,
+        )
+        assert "after the write" in fresh
+        assert fake_redis[project_context.project_context_key(user.id)] == fresh
+
+    async def test_orm_write_invalidates_after_commit(self, fake_redis):
+        user_id = uuid.uuid4()
+        fake_redis[project_context.project_context_key(user_id)] = "stale"
+        session = SimpleNamespace(
+            info={}, new=[ProjectTask(user_id=user_id)], dirty=[], deleted=[],
+        )
+        project_context._collect_touched_users(session, None)
+        project_context._invalidate_after_commit(session)
+        await asyncio.sleep(0)
+
+        assert project_context.project_context_key(user_id) not in fake_redis
+        assert session.info == {}
+
+    async def test_failed_invalidation_is_logged(self, fake_redis, monkeypatch):
+        async def broken(*user_ids):
+            raise RuntimeError("boom")
+
+        warnings = []
+        monkeypatch.setattr(project_context, "invalidate_project_context", broken)
+        monkeypatch.setattr(
+            project_context.logger, "warning", lambda event, **kw: warnings.append(event),
+        )
+        session = SimpleNamespace(info={project_context._SESSION_INFO_KEY: {uuid.uuid4()}})
+        project_context._invalidate_after_commit(session)
+        (task,) = project_context._pending_invalidations
+        await asyncio.wait({task})
+        await asyncio.sleep(0)  # done callbacks run on the next loop pass
+
+        assert warnings == ["project_context_invalidate_failed"]
+        assert not project_context._pending_invalidations
+
+    async def test_shutdown_cancels_stuck_invalidations(self, monkeypatch):
+        async def stuck(*user_ids):
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(project_context, "invalidate_project_context", stuck)
+        session = SimpleNamespace(info={project_context._SESSION_INFO_KEY: {uuid.uuid4()}})
+        project_context._invalidate_after_commit(session)
+        (task,) = project_context._pending_invalidations
+
+        await project_context.close_project_context(timeout=0.01)
+        await asyncio.wait({task})
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert not project_context._pending_invalidations
+
+    def test_listeners_register_once(self):
+        project_context.register_project_context_listeners()
+        project_context.register_project_context_listeners()
+        assert project_context._listeners_registered
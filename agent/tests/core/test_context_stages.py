@@ -0,0 +1,164 @@
+"""Tests for concurrent, timeout-bounded context assembly in ContextBuilder."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.orchestrator import context_builder as cb_mod
+from core.orchestrator.context_builder import RECALL_RUN, ContextBuilder
+from shared.config import Settings
+
+STAGE_DELAY = 0.1
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    redis = AsyncMock()
+    redis.get = AsyncMock(return_value=None)
+    monkeypatch.setattr(cb_mod, "get_redis", AsyncMock(return_value=redis))
+    return redis
+
+
+def _make_builder(session_factory=None, **overrides) -> tuple[ContextBuilder, list]:
+    builder = ContextBuilder(Settings(**overrides), llm_router=object(), session_factory=session_factory)
+    sessions_used: list = []
+
+    async def projects(session, user):
+        sessions_used.append(session)
+        await asyncio.sleep(STAGE_DELAY)
+        return "Active projects:\n- demo"
+
+    async def memories(session, user, query, router=None):
+        sessions_used.append(session)
+        await asyncio.sleep(STAGE_DELAY)
+        return [SimpleNamespace(summary="remembered")]
+
+    async def summary(session, conversation):
+        sessions_used.append(session)
+        await asyncio.sleep(STAGE_DELAY)
+        return "earlier summary"
+
+    async def recent(session, conversation, full=True, is_subscription=False):
+        sessions_used.append(session)
+        await asyncio.sleep(STAGE_DELAY)
+        return [SimpleNamespace(role="assistant", content="previous reply")]
+
+    builder._get_active_projects = projects
+    builder._get_semantic_memories = memories
+    builder._get_conversation_summary = summary
+    builder._get_recent_messages = recent
+    builder._trim_to_budget = lambda messages, budget, model: messages  # no tiktoken
+    return builder, sessions_used
+
+
+def _session_factory():
+    created: list = []
+
+    @asynccontextmanager
+    async def factory():
+        session = AsyncMock()
+        created.append(session)
+        yield session
+
+    return factory, created
+
+
+async def _build(builder: ContextBuilder, metrics: dict | None = None) -> list[dict]:
+    return await builder.build(
+        session=AsyncMock(),
+        user=SimpleNamespace(id=uuid.uuid4()),
+        conversation=SimpleNamespace(id=uuid.uuid4(), platform="web", is_summarized=True),
+        persona=None,
+        incoming_message="what is the weather in amsterdam",
+        model="gpt-4o",
+        metrics=metrics,
+    )
+
+
+class TestConcurrentStages:
+    async def test_stages_run_concurrently_on_own_sessions(self):
+        factory, created = _session_factory()
+        builder, sessions_used = _make_builder(factory)
+
+        started = time.monotonic()
+        messages = await _build(builder)
+        elapsed = time.monotonic() - started
+
+        assert elapsed < STAGE_DELAY * 2
+        assert len(set(map(id, sessions_used))) == 4
+        assert all(s in created for s in sessions_used)
+        contents = [m["content"] for m in messages]
+        # Prompt order: projects, memories, summary, time, history, user
+        assert contents[1].startswith("Active projects")
+        assert "remembered" in contents[2]
+        assert "earlier summary" in contents[3]
+        assert contents[4].startswith("Current date and time")
+        assert contents[5] == "previous reply"
+        assert contents[-1] == "what is the weather in amsterdam"
+
+    async def test_without_session_factory_runs_sequentially(self):
+        builder, sessions_used = _make_builder()
+        started = time.monotonic()
+        await _build(builder)
+        assert time.monotonic() - started >= STAGE_DELAY * 4
+        assert len(set(map(id, sessions_used))) == 4
+
+    async def test_timeout_never_cancels_work_on_the_request_session(self):
+        builder, sessions_used = _make_builder(context_stage_timeout_seconds=0.05)
+        request_session = AsyncMock()
+        await builder.build(
+            session=request_session,
+            user=SimpleNamespace(id=uuid.uuid4()),
+            conversation=SimpleNamespace(id=uuid.uuid4(), platform="web", is_summarized=True),
+            persona=None,
+            incoming_message="hello there, how are you",
+            model="gpt-4o",
+        )
+        assert sessions_used and request_session not in sessions_used
+        assert all(s.bind is request_session.bind for s in sessions_used)
+
+    async def test_metrics_include_per_stage_latency(self):
+        factory, _ = _session_factory()
+        builder, _ = _make_builder(factory)
+        metrics: dict = {}
+        await _build(builder, metrics)
+        assert metrics["recall"] == RECALL_RUN
+        for stage in ("projects", "recall", "summary", "history"):
+            assert metrics[f"{stage}_ms"] >= STAGE_DELAY * 1000 * 0.9
+        assert metrics["context_build_ms"] < STAGE_DELAY * 2 * 1000
+
+
+class TestStageFallbacks:
+    async def test_slow_stage_is_dropped_after_timeout(self):
+        factory, _ = _session_factory()
+        builder, _ = _make_builder(factory, context_stage_timeout_seconds=0.05)
+
+        async def hung_projects(session, user):
+            await asyncio.sleep(10)
+
+        builder._get_active_projects = hung_projects
+        builder._get_conversation_summary = AsyncMock(return_value=None)
+        builder._get_semantic_memories = AsyncMock(return_value=[])
+
+        started = time.monotonic()
+        messages = await _build(builder)
+        assert time.monotonic() - started < 1
+        assert not any("Active projects" in m["content"] for m in messages)
+        assert messages[-2]["content"] == "previous reply"
+
+    async def test_failing_stage_degrades_gracefully(self):
+        factory, _ = _session_factory()
+        builder, _ = _make_builder(factory)
+        builder._get_recent_messages = AsyncMock(side_effect=RuntimeError("db down"))
+
+        messages = await _build(builder)
+        assert messages[-1]["role"] == "user"
+        assert not any(m["content"] == "previous reply" for m in messages)
+        assert any("Active projects" in m["content"] for m in messages)
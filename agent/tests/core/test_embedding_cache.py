@@ -0,0 +1,111 @@
+"""Tests for LLMRouter.embed_many and the content-hash embedding cache."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.llm_router import embedding_cache as cache_mod
+from core.llm_router.embedding_cache import EmbeddingCache, embedding_key
+from core.llm_router.providers.base import LLMProvider, LLMResponse
+from core.llm_router.router import LLMRouter
+from shared.config import Settings
+
+
+class FakeEmbedProvider(LLMProvider):
+    """Provider returning deterministic vectors and recording batch calls."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    async def chat(self, messages, tools=None, model="", max_tokens=4000, temperature=0.7):
+        return LLMResponse()
+
+    async def embed(self, text: str, model: str = "") -> list[float]:
+        return (await self.embed_many([text], model))[0]
+
+    async def embed_many(self, texts: list[str], model: str = "") -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(t)), float(i)] for i, t in enumerate(texts)]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    store: dict[str, str] = {}
+    redis = AsyncMock()
+
+    async def mget(keys):
+        return [store.get(k) for k in keys]
+
+    pipe = MagicMock()
+    pipe.set = MagicMock(side_effect=lambda k, v, ex=None: store.__setitem__(k, v))
+    pipe.execute = AsyncMock()
+    redis.mget = AsyncMock(side_effect=mget)
+    redis.pipeline = MagicMock(return_value=pipe)
+    monkeypatch.setattr(cache_mod, "get_redis", AsyncMock(return_value=redis))
+    return store
+
+
+@pytest.fixture
+def router(fake_redis):
+    r = LLMRouter(Settings(openai_api_key="", anthropic_api_key="", google_api_key=""))
+    r.providers = {"openai": FakeEmbedProvider()}
+    r.effective_embedding_model = "text-embedding-3-small"
+    r.embedding_cache = EmbeddingCache(max_entries=16, ttl_seconds=60)
+    return r
+
+
+class TestEmbedMany:
+    async def test_preserves_order_and_dedupes(self, router):
+        provider = router.providers["openai"]
+        result = await router.embed_many(["yes", "go ahead", "yes"])
+        assert provider.batches == [["yes", "go ahead"]]
+        assert result[0] == result[2]
+        assert result[1][0] == float(len("go ahead"))
+
+    async def test_repeated_text_never_hits_provider_twice(self, router):
+        provider = router.providers["openai"]
+        await router.embed("go ahead")
+        await router.embed_many(["go ahead", "new"])
+        assert provider.batches == [["go ahead"], ["new"]]
+
+    async def test_redis_layer_survives_lru_eviction(self, router, fake_redis):
+        provider = router.providers["openai"]
+        first = await router.embed("daily briefing")
+        assert embedding_key("text-embedding-3-small", "daily briefing") in fake_redis
+
+        router.embedding_cache._lru.clear()
+        assert await router.embed("daily briefing") == first
+        assert provider.batches == [["daily briefing"]]
+
+    async def test_empty_input(self, router):
+        assert await router.embed_many([]) == []
+
+    async def test_redis_failure_is_a_miss(self, router, monkeypatch):
+        monkeypatch.setattr(cache_mod, "get_redis", AsyncMock(side_effect=ConnectionError("down")))
+        assert await router.embed_many(["a", "b"]) == [[1.0, 0.0], [1.0, 1.0]]
+
+
+class TestEmbeddingCache:
+    def test_key_includes_model(self):
+        assert embedding_key("m1", "hi") != embedding_key("m2", "hi")
+
+    async def test_lru_is_bounded(self, fake_redis):
+        cache = EmbeddingCache(max_entries=2, ttl_seconds=0)
+        await cache.set_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+        assert await cache.get_many("m", ["a", "b", "c"]) == [None, [2.0], [3.0]]
+        assert cache.stats()["hits"] == 2
+        assert fake_redis == {}  # ttl 0 disables the Redis layer
+
+
+class TestDefaultEmbedMany:
+    async def test_base_provider_loops_over_embed(self):
+        class OneAtATime(LLMProvider):
+            async def chat(self, *a, **kw):
+                return LLMResponse()
+
+            async def embed(self, text: str, model: str = "") -> list[float]:
+                return [float(len(text))]
+
+        assert await OneAtATime().embed_many(["a", "bb"]) == [[1.0], [2.0]]
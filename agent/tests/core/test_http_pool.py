@@ -0,0 +1,121 @@
+"""Tests for the pooled module HTTP clients used by the tool registry."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.orchestrator.http_pool import DEFAULT_MODULE_TIMEOUT, ModuleClientPool
+from core.orchestrator.tool_registry import ToolRegistry
+from shared.config import Settings
+from shared.schemas.tools import ToolCall
+
+
+@pytest.fixture
+def settings():
+    return Settings(
+        slow_modules="claude_code,garmin",
+        tool_execution_timeout=120,
+        tool_pool_max_connections=2,
+    )
+
+
+class TestModuleClientPool:
+    def test_timeout_follows_slow_modules(self, settings):
+        pool = ModuleClientPool(settings)
+        assert pool.timeout_for("claude_code") == 120.0
+        assert pool.timeout_for("research") == DEFAULT_MODULE_TIMEOUT
+
+    async def test_client_is_reused_per_module(self, settings):
+        pool = ModuleClientPool(settings)
+        async with pool.client("research") as first:
+            pass
+        async with pool.client("research") as second:
+            pass
+        async with pool.client("weather") as other:
+            pass
+        assert first is second
+        assert other is not first
+        assert pool.stats()["research"]["requests"] == 2
+        await pool.aclose()
+
+    async def test_requests_beyond_limit_are_queued(self, settings):
+        pool = ModuleClientPool(settings)
+        release = asyncio.Event()
+
+        async def hold():
+            async with pool.client("research"):
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = pool.stats()["research"]
+        assert stats["in_use"] == 2
+        assert stats["queued"] == 1
+
+        release.set()
+        await asyncio.gather(*holders)
+        stats = pool.stats()["research"]
+        assert stats["in_use"] == 0
+        assert stats["queued"] == 0
+        await pool.aclose()
+
+    async def test_slot_wait_is_bounded_by_the_module_timeout(self, settings, monkeypatch):
+        pool = ModuleClientPool(settings)
+        monkeypatch.setattr(pool, "timeout_for", lambda module_name: 0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with pool.client("research"):
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(httpx.PoolTimeout):
+            async with pool.client("research"):
+                pass
+        assert pool.stats()["research"]["queued"] == 0
+
+        release.set()
+        await asyncio.gather(*holders)
+        await pool.aclose()
+
+    async def test_slot_wait_timeout_is_reported_as_a_tool_timeout(self, settings, monkeypatch):
+        registry = ToolRegistry(settings.model_copy(
+            update={"module_services": {"research": "http://research:8000"}},
+        ))
+        monkeypatch.setattr(registry.http_pool, "timeout_for", lambda module_name: 0.05)
+        monkeypatch.setattr(registry, "_fire_capture", lambda **kw: None)
+        release = asyncio.Event()
+
+        async def hold():
+            async with registry.http_pool.client("research"):
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        result = await registry.execute_tool(
+            ToolCall(tool_name="research.web_search", arguments={}),
+        )
+        assert not result.success
+        assert result.error.startswith("Tool execution timed out")
+
+        release.set()
+        await asyncio.gather(*holders)
+        await registry.aclose()
+
+    async def test_trace_records_connect_latency(self, settings):
+        pool = ModuleClientPool(settings)
+        trace = pool.trace_for("research")
+        await trace("connection.connect_tcp.started", {})
+        await trace("connection.connect_tcp.complete", {})
+        assert pool.stats()["research"]["connects"] == 1
+
+    async def test_aclose_closes_clients(self, settings):
+        pool = ModuleClientPool(settings)
+        async with pool.client("research") as client:
+            pass
+        await pool.aclose()
+        assert client.is_closed
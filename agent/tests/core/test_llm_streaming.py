@@ -0,0 +1,304 @@
+"""Tests for token streaming through the providers and LLMRouter."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace as NS
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.llm_router.providers.anthropic import AnthropicProvider
+from core.llm_router.providers.base import LLMProvider, LLMResponse, ToolCallAssembler
+from core.llm_router.providers.google import GoogleProvider
+from core.llm_router.providers.openai_provider import OpenAIProvider
+from core.llm_router.router import LLMRouter
+from shared.config import Settings
+from shared.schemas.messages import StreamEvent
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class _FakeStream:
+    """Stand-in for the SDKs' ``AsyncStream``: iterable and closeable."""
+
+    def __init__(self, items):
+        self._items = _aiter(items)
+        self.closed = False
+
+    def __aiter__(self):
+        return self._items
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+
+async def _collect(gen) -> tuple[list[StreamEvent], LLMResponse]:
+    items = [item async for item in gen]
+    assert isinstance(items[-1], LLMResponse)
+    return items[:-1], items[-1]
+
+
+def _texts(events: list[StreamEvent]) -> list[str]:
+    return [e.data["text"] for e in events if e.event == "content"]
+
+
+class TestToolCallAssembler:
+    def test_interleaved_fragments(self):
+        asm = ToolCallAssembler()
+        asm.start(1, "files__read")
+        asm.start(0, "search")
+        asm.append(1, '{"path": "a')
+        asm.append(0, '{"q": "x"}')
+        asm.append(1, '.txt"}')
+        calls = asm.finish({"files__read": "files.read"})
+        assert [(c.tool_name, c.arguments) for c in calls] == [
+            ("search", {"q": "x"}),
+            ("files.read", {"path": "a.txt"}),
+        ]
+
+    def test_empty_arguments(self):
+        asm = ToolCallAssembler()
+        asm.start(0, "ping")
+        assert asm.finish({})[0].arguments == {}
+
+
+class TestAnthropicStreaming:
+    async def test_text_and_tool_use_deltas(self):
+        events = [
+            NS(type="message_start", message=NS(
+                model="claude-test",
+                usage=NS(input_tokens=12, cache_read_input_tokens=0, cache_creation_input_tokens=0),
+            )),
+            NS(type="content_block_start", index=0, content_block=NS(type="text")),
+            NS(type="content_block_delta", index=0, delta=NS(type="text_delta", text="Let me ")),
+            NS(type="content_block_delta", index=0, delta=NS(type="text_delta", text="check.")),
+            NS(type="content_block_start", index=1, content_block=NS(type="tool_use", name="weather")),
+            NS(type="content_block_delta", index=1, delta=NS(type="input_json_delta", partial_json='{"city": ')),
+            NS(type="content_block_delta", index=1, delta=NS(type="input_json_delta", partial_json='"Oslo"}')),
+            NS(type="message_delta", delta=NS(stop_reason="tool_use"), usage=NS(output_tokens=9)),
+        ]
+        provider = AnthropicProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.messages.create = AsyncMock(return_value=_FakeStream(events))
+
+        deltas, response = await _collect(provider.chat_stream(MESSAGES, model="claude-test"))
+
+        assert provider.client.messages.create.await_args.kwargs["stream"] is True
+        assert _texts(deltas) == ["Let me ", "check."]
+        assert all(d.data["delta"] for d in deltas)
+        assert response.content == "Let me check."
+        assert response.stop_reason == "tool_use"
+        assert response.tool_calls[0].tool_name == "weather"
+        assert response.tool_calls[0].arguments == {"city": "Oslo"}
+        assert (response.input_tokens, response.output_tokens) == (12, 9)
+
+    async def test_stream_without_message_start(self):
+        events = [
+            NS(type="content_block_delta", index=0, delta=NS(type="text_delta", text="hi")),
+        ]
+        provider = AnthropicProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.messages.create = AsyncMock(return_value=_FakeStream(events))
+
+        deltas, response = await _collect(provider.chat_stream(MESSAGES, model="claude-test"))
+
+        assert _texts(deltas) == ["hi"]
+        assert response.model == "claude-test"
+        assert (response.input_tokens, response.output_tokens) == (0, 0)
+
+
+    async def test_abandoned_stream_is_closed(self):
+        events = [
+            NS(type="content_block_delta", index=0, delta=NS(type="text_delta", text=t))
+            for t in ("one", "two", "three")
+        ]
+        stream = _FakeStream(events)
+        provider = AnthropicProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.messages.create = AsyncMock(return_value=stream)
+
+        gen = provider.chat_stream(MESSAGES, model="claude-test")
+        assert _texts([await anext(gen)]) == ["one"]
+        await gen.aclose()
+
+        assert stream.closed
+
+
+class TestOpenAIStreaming:
+    async def test_text_and_tool_call_fragments(self):
+        def chunk(content=None, tool_calls=None, finish=None):
+            delta = NS(content=content, tool_calls=tool_calls)
+            return NS(model="gpt-test", usage=None,
+                      choices=[NS(delta=delta, finish_reason=finish)])
+
+        def tc(index, name=None, args=None):
+            return NS(index=index, function=NS(name=name, arguments=args))
+
+        chunks = [
+            chunk(content="Hel"),
+            chunk(content="lo"),
+            chunk(tool_calls=[tc(0, name="search", args='{"q"')]),
+            chunk(tool_calls=[tc(0, args=': "cats"}')]),
+            chunk(finish="tool_calls"),
+            NS(model="gpt-test", usage=NS(prompt_tokens=5, completion_tokens=7), choices=[]),
+        ]
+        provider = OpenAIProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(return_value=_FakeStream(chunks))
+
+        deltas, response = await _collect(provider.chat_stream(MESSAGES, model="gpt-test"))
+
+        kwargs = provider.client.chat.completions.create.await_args.kwargs
+        assert kwargs["stream_options"] == {"include_usage": True}
+        assert _texts(deltas) == ["Hel", "lo"]
+        assert response.content == "Hello"
+        assert response.stop_reason == "tool_use"
+        assert response.tool_calls[0].arguments == {"q": "cats"}
+        assert (response.input_tokens, response.output_tokens) == (5, 7)
+
+
+    async def test_abandoned_stream_is_closed(self):
+        chunks = [
+            NS(model="gpt-test", usage=None,
+               choices=[NS(delta=NS(content=t, tool_calls=None), finish_reason=None)])
+            for t in ("one", "two")
+        ]
+        stream = _FakeStream(chunks)
+        provider = OpenAIProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(return_value=stream)
+
+        gen = provider.chat_stream(MESSAGES, model="gpt-test")
+        assert _texts([await anext(gen)]) == ["one"]
+        await gen.aclose()
+
+        assert stream.closed
+
+
+class TestGoogleStreaming:
+    async def test_text_and_function_call(self):
+        def chunk(parts, finish=None, usage=None):
+            candidate = NS(content=NS(parts=parts), finish_reason=finish)
+            return NS(candidates=[candidate], usage_metadata=usage)
+
+        def part(text=None, call=None):
+            return NS(text=text, function_call=call)
+
+        chunks = [
+            chunk([part(text="One ")]),
+            chunk([part(text="moment")]),
+            chunk(
+                [part(call=NS(name="weather__now", args={"city": "Oslo"}))],
+                finish="STOP",
+                usage=NS(prompt_token_count=3, candidates_token_count=4),
+            ),
+        ]
+        provider = GoogleProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.aio.models.generate_content_stream = AsyncMock(
+            return_value=_aiter(chunks)
+        )
+        tools = [{"name": "weather.now", "description": "", "parameters": {}}]
+
+        deltas, response = await _collect(
+            provider.chat_stream(MESSAGES, tools=tools, model="gemini-test")
+        )
+
+        assert _texts(deltas) == ["One ", "moment"]
+        assert response.tool_calls[0].tool_name == "weather.now"
+        assert response.stop_reason == "tool_use"
+        assert (response.input_tokens, response.output_tokens) == (3, 4)
+
+
+class _ScriptedProvider(LLMProvider):
+    """Streams fixed deltas, optionally failing before the final response."""
+
+    def __init__(self, deltas: list[str], fail: Exception | None = None):
+        self.deltas = deltas
+        self.fail = fail
+
+    async def chat(self, messages, tools=None, model="", max_tokens=4000, temperature=0.7):
+        return LLMResponse(content="".join(self.deltas), model=model)
+
+    async def chat_stream(self, messages, tools=None, model="", max_tokens=4000, temperature=0.7):
+        from core.llm_router.providers.base import content_delta
+
+        for d in self.deltas:
+            yield content_delta(d)
+        if self.fail:
+            raise self.fail
+        yield LLMResponse(content="".join(self.deltas), model=model)
+
+    async def embed(self, text, model=""):
+        raise NotImplementedError
+
+
+def _router(**providers) -> LLMRouter:
+    router = LLMRouter(Settings(
+        anthropic_api_key="", openai_api_key="", google_api_key="",
+        fallback_chain="gpt-4o",
+    ))
+    router.providers.update(providers)
+    return router
+
+
+class TestRouterStreaming:
+    async def test_streams_from_primary(self):
+        router = _router(anthropic=_ScriptedProvider(["a", "b"]))
+        deltas, response = await _collect(router.chat_stream(MESSAGES, model="claude-x"))
+        assert _texts(deltas) == ["a", "b"]
+        assert response.content == "ab"
+
+    async def test_mid_stream_failure_resets_then_falls_back(self):
+        router = _router(
+            anthropic=_ScriptedProvider(["partial"], fail=RuntimeError("connection reset")),
+            openai=_ScriptedProvider(["full answer"]),
+        )
+        deltas, response = await _collect(router.chat_stream(MESSAGES, model="claude-x"))
+        assert [d.data.get("reset", False) for d in deltas] == [False, True, False]
+        assert response.content == "full answer"
+        assert response.model == "gpt-4o"
+
+    async def test_non_streaming_provider_uses_default(self):
+        class Plain(_ScriptedProvider):
+            chat_stream = LLMProvider.chat_stream
+
+        router = _router(anthropic=Plain(["whole"]))
+        deltas, response = await _collect(router.chat_stream(MESSAGES, model="claude-x"))
+        assert deltas == []
+        assert response.content == "whole"
+
+    async def test_bad_request_is_not_retried(self):
+        err = RuntimeError("bad")
+        err.status_code = 400
+        router = _router(
+            anthropic=_ScriptedProvider([], fail=err),
+            openai=_ScriptedProvider(["unused"]),
+        )
+        with pytest.raises(RuntimeError, match="bad"):
+            await _collect(router.chat_stream(MESSAGES, model="claude-x"))
+
+    async def test_abandoned_router_stream_closes_the_provider_stream(self):
+        events = [
+            NS(type="content_block_delta", index=0, delta=NS(type="text_delta", text=t))
+            for t in ("one", "two")
+        ]
+        stream = _FakeStream(events)
+        provider = AnthropicProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.messages.create = AsyncMock(return_value=stream)
+        router = _router(anthropic=provider)
+
+        gen = router.chat_stream(MESSAGES, model="claude-x")
+        assert _texts([await anext(gen)]) == ["one"]
+        await gen.aclose()
+
+        assert stream.closed
@@ -0,0 +1,159 @@
+"""Tests for concurrent, ETag-aware module discovery."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from core.orchestrator import tool_registry as registry_mod
+from core.orchestrator.tool_registry import ToolRegistry
+from shared.config import Settings
+from shared.manifest import manifest_etag, manifest_response
+from shared.schemas.tools import ModuleManifest, ToolDefinition
+
+
+def _manifest(module: str, tool: str = "ping") -> ModuleManifest:
+    return ModuleManifest(
+        module_name=module,
+        description=f"{module} module",
+        tools=[ToolDefinition(name=f"{module}.{tool}", description="t", parameters=[])],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Module side: shared.manifest.manifest_response
+# ---------------------------------------------------------------------------
+
+
+class TestManifestResponse:
+    @pytest.fixture
+    async def client(self):
+        app = FastAPI()
+        manifest = _manifest("research")
+
+        @app.get("/manifest")
+        async def _manifest_route(request: Request):
+            return manifest_response(manifest, request)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c, manifest
+
+    async def test_returns_body_with_etag(self, client):
+        c, manifest = client
+        resp = await c.get("/manifest")
+        assert resp.status_code == 200
+        assert resp.headers["etag"] == manifest_etag(manifest)
+        assert ModuleManifest(**resp.json()) == manifest
+
+    async def test_matching_if_none_match_returns_304(self, client):
+        c, manifest = client
+        resp = await c.get("/manifest", headers={"If-None-Match": manifest_etag(manifest)})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    def test_etag_changes_with_content(self):
+        assert manifest_etag(_manifest("research")) != manifest_etag(_manifest("research", "other"))
+
+
+# ---------------------------------------------------------------------------
+# Core side: ToolRegistry.discover_all
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis.pipeline = MagicMock(return_value=pipe)
+    redis.mget = AsyncMock()
+    monkeypatch.setattr(registry_mod, "get_redis", AsyncMock(return_value=redis))
+    return redis
+
+
+def _patch_transport(monkeypatch, handler):
+    real_client = httpx.AsyncClient
+
+    def _client(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(registry_mod.httpx, "AsyncClient", _client)
+
+
+def _settings(*modules: str) -> Settings:
+    return Settings(module_services={m: f"http://{m}:8000" for m in modules})
+
+
+class TestDiscoverAll:
+    async def test_modules_are_queried_concurrently(self, monkeypatch, fake_redis):
+        manifests = {m: _manifest(m) for m in ("a", "b", "c")}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.1)
+            m = manifests[request.url.host]
+            return httpx.Response(200, content=m.model_dump_json(), headers={"ETag": manifest_etag(m)})
+
+        _patch_transport(monkeypatch, handler)
+        registry = ToolRegistry(_settings("a", "b", "c"))
+
+        started = time.monotonic()
+        await registry.discover_all()
+        assert time.monotonic() - started < 0.25
+        assert set(registry.manifests) == {"a", "b", "c"}
+        pipe = fake_redis.pipeline.return_value
+        assert pipe.set.call_count == 6  # manifest + etag per module
+        pipe.execute.assert_awaited_once()
+
+    async def test_unchanged_manifest_is_not_reparsed(self, monkeypatch, fake_redis):
+        manifest = _manifest("a")
+        etag = manifest_etag(manifest)
+        seen_headers: list[str | None] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304, headers={"ETag": etag})
+            return httpx.Response(200, content=manifest.model_dump_json(), headers={"ETag": etag})
+
+        _patch_transport(monkeypatch, handler)
+        registry = ToolRegistry(_settings("a"))
+        await registry.discover_all()
+        version = registry.manifest_version
+
+        pipe = fake_redis.pipeline.return_value
+        pipe.reset_mock()
+        await registry.discover_all()
+
+        assert seen_headers == [None, etag]
+        assert registry.manifest_version == version
+        pipe.set.assert_not_called()
+        assert pipe.expire.call_count == 2
+
+    async def test_unreachable_module_does_not_block_others(self, monkeypatch, fake_redis):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "down":
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, content=_manifest("up").model_dump_json())
+
+        _patch_transport(monkeypatch, handler)
+        registry = ToolRegistry(_settings("up", "down"))
+        await registry.discover_all()
+        assert set(registry.manifests) == {"up"}
+
+
+class TestLoadFromCache:
+    async def test_single_mget_restores_manifests_and_etags(self, fake_redis):
+        manifest = _manifest("a")
+        fake_redis.mget.return_value = [manifest.model_dump_json(), None, '"abc"', None]
+        registry = ToolRegistry(_settings("a", "b"))
+        await registry.load_from_cache()
+        fake_redis.mget.assert_awaited_once()
+        assert registry.manifests == {"a": manifest}
+        assert registry._manifest_etags == {"a": '"abc"'}
@@ -0,0 +1,183 @@
+"""Tests for the async object storage layer (shared.storage)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from shared.config import Settings
+from shared.file_utils import upload_attachment, upload_attachment_stream
+from shared.storage import STREAM_PART_SIZE, ObjectStorage, ObjectTooLargeError
+
+
+class _FakeResponse:
+    def __init__(self, data: bytes, delay: float):
+        self._data = data
+        self._delay = delay
+        self.closed = False
+
+    def stream(self, amt):
+        for i in range(0, len(self._data), amt):
+            time.sleep(self._delay)  # blocking, like urllib3
+            yield self._data[i:i + amt]
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        pass
+
+
+class _FakeMinio:
+    """In-memory stand-in for the blocking ``Minio`` client."""
+
+    def __init__(self, delay: float = 0.0):
+        self.objects: dict[str, bytes] = {}
+        self.delay = delay
+        self.responses: list[_FakeResponse] = []
+        self.max_part_read = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def put_object(self, bucket, key, data, length, content_type, part_size=0):
+        if length >= 0:
+            self.objects[key] = data.read(length)
+            return
+        parts = []
+        while True:
+            part = data.read(part_size)
+            self.max_part_read = max(self.max_part_read, len(part))
+            if not part:
+                break
+            parts.append(part)
+        self.objects[key] = b"".join(parts)
+
+    def get_object(self, bucket, key, length=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            data = self.objects[key]
+        finally:
+            with self._lock:
+                self.active -= 1
+        resp = _FakeResponse(data[:length] if length else data, 0)
+        self.responses.append(resp)
+        return resp
+
+    def remove_object(self, bucket, key):
+        self.objects.pop(key, None)
+
+
+def _storage(fake: _FakeMinio, **overrides) -> ObjectStorage:
+    settings = Settings(minio_public_url="https://files.test/files/", **overrides)
+    return ObjectStorage(settings, client=fake)
+
+
+async def _chunks(total: int, size: int = 64 * 1024):
+    sent = 0
+    while sent < total:
+        n = min(size, total - sent)
+        sent += n
+        yield b"x" * n
+
+
+class TestObjectStorage:
+    async def test_download_does_not_block_event_loop(self):
+        fake = _FakeMinio(delay=0.2)
+        fake.objects["img"] = b"a" * 10
+        storage = _storage(fake)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        assert await storage.get_bytes("img") == b"a" * 10
+        task.cancel()
+        assert ticks >= 10
+
+    async def test_get_many_runs_concurrently_and_keeps_order(self):
+        fake = _FakeMinio(delay=0.1)
+        fake.objects.update({"a": b"1", "b": b"2", "c": b"3"})
+        storage = _storage(fake)
+
+        started = time.monotonic()
+        results = await storage.get_many(["a", "missing", "c"])
+        assert time.monotonic() - started < 0.25
+        assert results[0] == b"1" and results[2] == b"3"
+        assert isinstance(results[1], KeyError)
+        assert fake.max_active >= 2
+
+    async def test_concurrent_transfers_are_bounded(self):
+        fake = _FakeMinio(delay=0.05)
+        fake.objects.update({str(i): b"x" for i in range(6)})
+        storage = _storage(fake, storage_max_concurrent_transfers=2)
+        await storage.get_many(str(i) for i in range(6))
+        assert fake.max_active <= 2
+
+    async def test_oversized_read_aborts_and_closes(self):
+        fake = _FakeMinio()
+        fake.objects["big"] = b"x" * (3 * 1024 * 1024)
+        storage = _storage(fake)
+        with pytest.raises(ObjectTooLargeError):
+            await storage.get_bytes("big", max_bytes=1024 * 1024)
+        assert fake.responses[-1].closed
+        assert storage.stats()["get"]["errors"] == 1
+
+    async def test_stream_upload_is_multipart_with_bounded_parts(self):
+        fake = _FakeMinio()
+        storage = _storage(fake)
+        total = 12 * 1024 * 1024
+        written = await storage.put_stream("big", _chunks(total), "application/zip")
+        assert written == total
+        assert len(fake.objects["big"]) == total
+        assert fake.max_part_read <= STREAM_PART_SIZE
+
+    async def test_stream_upload_over_limit_is_discarded(self):
+        fake = _FakeMinio()
+        storage = _storage(fake)
+        with pytest.raises(ObjectTooLargeError):
+            await storage.put_stream("big", _chunks(4096, 1024), "text/plain", max_bytes=2048)
+        assert "big" not in fake.objects
+
+    async def test_stats_report_throughput(self):
+        fake = _FakeMinio()
+        storage = _storage(fake)
+        await storage.put_bytes("k", b"x" * 1000, "text/plain")
+        await storage.get_bytes("k")
+        stats = storage.stats()
+        assert stats["put"]["bytes"] == 1000
+        assert stats["get"]["transfers"] == 1
+        assert "throughput_mb_s" in stats["get"]
+
+    def test_public_url_round_trip(self):
+        storage = _storage(_FakeMinio())
+        url = storage.public_url("attachments/ab_x.png")
+        assert url == "https://files.test/files/attachments/ab_x.png"
+        assert storage.key_from_public_url(url) == "attachments/ab_x.png"
+        assert storage.key_from_public_url("https://elsewhere/x.png") is None
+
+
+class TestUploadAttachment:
+    async def test_upload_attachment(self):
+        fake = _FakeMinio()
+        info = await upload_attachment(_storage(fake), b"hello", "my report.txt")
+        assert info["filename"] == "my_report.txt"
+        assert info["mime_type"] == "text/plain"
+        assert info["size_bytes"] == 5
+        assert fake.objects[info["minio_key"]] == b"hello"
+
+    async def test_streamed_attachment_over_limit(self, monkeypatch):
+        monkeypatch.setattr("shared.file_utils.MAX_UPLOAD_SIZE_BYTES", 1000)
+        with pytest.raises(ValueError, match="too large"):
+            await upload_attachment_stream(_storage(_FakeMinio()), _chunks(5000, 500), "a.bin")
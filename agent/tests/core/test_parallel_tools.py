@@ -0,0 +1,113 @@
+"""Tests for concurrent tool execution within one agent iteration."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.orchestrator.agent_loop import AgentLoop
+from shared.config import Settings
+from shared.schemas.tools import ToolCall, ToolResult
+
+
+class _FakeRegistry:
+    """Records execution order and overlap; read-only names are configurable."""
+
+    def __init__(self, read_only: set[str] | None = None, delays: dict[str, float] | None = None):
+        self.read_only = read_only or set()
+        self.delays = delays or {}
+        self.running = 0
+        self.max_running = 0
+        self.started: list[str] = []
+
+    def is_read_only(self, tool_name: str) -> bool:
+        return tool_name in self.read_only
+
+    async def execute_tool(self, tool_call, user_permission=None):
+        self.started.append(tool_call.tool_name)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delays.get(tool_call.tool_name, 0.01))
+        self.running -= 1
+        return ToolResult(tool_name=tool_call.tool_name, success=True, result=tool_call.tool_name)
+
+
+def _loop(registry, max_parallel: int = 4) -> AgentLoop:
+    return AgentLoop(
+        settings=Settings(max_parallel_tool_calls=max_parallel),
+        llm_router=MagicMock(),
+        tool_registry=registry,
+        context_builder=MagicMock(),
+        session_factory=MagicMock(),
+    )
+
+
+def _prepared(*names: str) -> list[tuple[ToolCall, str]]:
+    return [(ToolCall(tool_name=n, arguments={}), f"tool_{i}") for i, n in enumerate(names)]
+
+
+class TestPlanToolBatches:
+    def test_read_only_calls_share_one_batch(self):
+        loop = _loop(_FakeRegistry(read_only={"research.a", "weather.b", "git_platform.c"}))
+        batches = loop._plan_tool_batches(_prepared("research.a", "weather.b", "git_platform.c"))
+        assert [[tc.tool_name for tc, _ in b] for b in batches] == [
+            ["research.a", "weather.b", "git_platform.c"],
+        ]
+
+    def test_other_calls_are_barriers(self):
+        loop = _loop(_FakeRegistry(read_only={"research.a", "weather.b", "weather.c"}))
+        batches = loop._plan_tool_batches(
+            _prepared("research.a", "deployer.deploy", "weather.b", "weather.c")
+        )
+        assert [[tc.tool_name for tc, _ in b] for b in batches] == [
+            ["research.a"],
+            ["deployer.deploy"],
+            ["weather.b", "weather.c"],
+        ]
+
+    def test_undeclared_writes_keep_request_order(self):
+        loop = _loop(_FakeRegistry())
+        batches = loop._plan_tool_batches(
+            _prepared("file_manager.create_document", "file_manager.read_document")
+        )
+        assert [[tc.tool_name for tc, _ in b] for b in batches] == [
+            ["file_manager.create_document"],
+            ["file_manager.read_document"],
+        ]
+
+    def test_manifests_mark_reads_not_writes(self):
+        from modules.file_manager.manifest import MANIFEST as files
+        from modules.scheduler.manifest import MANIFEST as scheduler
+
+        read_only = {t.name for m in (files, scheduler) for t in m.tools if t.read_only}
+        assert "file_manager.list_files" in read_only
+        assert "file_manager.create_document" not in read_only
+        assert "scheduler.add_job" not in read_only
+
+
+class TestExecuteToolBatch:
+    async def test_results_keep_request_order(self):
+        registry = _FakeRegistry(delays={"research.slow": 0.05, "weather.fast": 0.0})
+        loop = _loop(registry)
+        calls = [ToolCall(tool_name=n, arguments={}) for n in ("research.slow", "weather.fast")]
+        results = await loop._execute_tool_batch(calls, "user")
+        assert [r.tool_name for r in results] == ["research.slow", "weather.fast"]
+        assert registry.max_running == 2
+
+    async def test_concurrency_is_bounded(self):
+        registry = _FakeRegistry()
+        loop = _loop(registry, max_parallel=2)
+        calls = [ToolCall(tool_name=f"research.t{i}", arguments={}) for i in range(6)]
+        results = await loop._execute_tool_batch(calls, "user")
+        assert len(results) == 6
+        assert registry.max_running == 2
+
+    @pytest.mark.parametrize("max_parallel", [0, 1])
+    async def test_limit_of_one_runs_serially(self, max_parallel):
+        registry = _FakeRegistry()
+        loop = _loop(registry, max_parallel=max_parallel)
+        calls = [ToolCall(tool_name=f"research.t{i}", arguments={}) for i in range(3)]
+        await loop._execute_tool_batch(calls, "user")
+        assert registry.max_running == 1
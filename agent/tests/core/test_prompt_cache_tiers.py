@@ -0,0 +1,75 @@
+"""Tests for the tiered, byte-stable system prompt and Anthropic breakpoints."""
+
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from core.llm_router.providers.anthropic import AnthropicProvider
+from core.llm_router.providers.base import CACHE_BREAKPOINT
+from core.orchestrator.context_builder import ContextBuilder
+from shared.config import Settings
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def _builder() -> ContextBuilder:
+    builder = ContextBuilder(Settings())
+    builder._get_active_projects = AsyncMock(return_value="Active projects:\n- api")
+    builder._recall_stage = AsyncMock(return_value=("run", ["likes terse answers"]))
+    builder._get_recent_messages = AsyncMock(return_value=[])
+    builder._trim_to_budget = lambda messages, budget, model: messages  # no tiktoken
+    return builder
+
+
+async def _build(builder: ContextBuilder) -> list[dict]:
+    return await builder.build(
+        session=AsyncMock(),
+        user=SimpleNamespace(id=uuid.uuid4()),
+        conversation=SimpleNamespace(id=uuid.uuid4(), platform="discord", is_summarized=False),
+        persona=None,
+        incoming_message="hello there, what can you do",
+        model="claude-sonnet-4-20250514",
+    )
+
+
+class TestStaticTier:
+    def test_system_prompt_has_no_timestamp(self):
+        prompt = ContextBuilder(Settings())._build_system_prompt(None, platform="discord")
+        assert "Current date and time" not in prompt
+
+    async def test_static_block_is_first_flagged_and_stable(self):
+        builder = _builder()
+        first, second = await _build(builder), await _build(builder)
+        assert first[0][CACHE_BREAKPOINT] is True
+        assert first[0]["content"] == second[0]["content"]
+        flagged = [m for m in first if m.get(CACHE_BREAKPOINT)]
+        assert flagged == [first[0]]
+
+    async def test_time_is_the_last_system_block(self):
+        messages = await _build(_builder())
+        system = [m for m in messages if m["role"] == "system"]
+        assert system[-1]["content"].startswith("Current date and time")
+        assert "Active projects" in system[1]["content"]
+
+
+class TestAnthropicBreakpoints:
+    def _convert(self, messages):
+        provider = AnthropicProvider.__new__(AnthropicProvider)
+        return provider._convert_messages(messages)
+
+    async def test_breakpoint_ends_static_tier_only(self):
+        system, _ = self._convert(await _build(_builder()))
+        assert system[0]["cache_control"] == EPHEMERAL
+        assert all("cache_control" not in b for b in system[1:])
+
+    def test_unflagged_callers_keep_last_block_breakpoint(self):
+        system, _ = self._convert([
+            {"role": "system", "content": "a"},
+            {"role": "system", "content": "b"},
+            {"role": "user", "content": "hi"},
+        ])
+        assert "cache_control" not in system[0]
+        assert system[1]["cache_control"] == EPHEMERAL
+
@@ -0,0 +1,128 @@
+"""Tests for the semantic recall policy stage in ContextBuilder."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.orchestrator import context_builder as cb_mod
+from core.orchestrator.context_builder import (
+    RECALL_REUSE,
+    RECALL_RUN,
+    RECALL_SKIP,
+    ContextBuilder,
+)
+from shared.config import Settings
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    store: dict[str, str] = {}
+    redis = AsyncMock()
+    redis.get = AsyncMock(side_effect=lambda k: store.get(k))
+    redis.set = AsyncMock(side_effect=lambda k, v, ex=None: store.__setitem__(k, v))
+    monkeypatch.setattr(cb_mod, "get_redis", AsyncMock(return_value=redis))
+    return store
+
+
+@asynccontextmanager
+async def _session_factory():
+    yield AsyncMock()
+
+
+def _builder(**overrides) -> ContextBuilder:
+    builder = ContextBuilder(Settings(**overrides), llm_router=object(), session_factory=_session_factory)
+    builder._get_semantic_memories = AsyncMock(
+        return_value=[SimpleNamespace(summary="User deploys with docker compose")]
+    )
+    return builder
+
+
+def _conversation():
+    return SimpleNamespace(id=uuid.uuid4(), platform="discord", is_summarized=False)
+
+
+class TestRecallPolicy:
+    @pytest.mark.parametrize("message", ["ok", "do it", "go ahead", "  "])
+    def test_short_follow_ups_do_not_run(self, message):
+        assert _builder()._recall_policy(message) in (RECALL_SKIP, RECALL_REUSE)
+
+    def test_contextual_message_reuses(self):
+        assert _builder()._recall_policy("can you deploy that to staging as well") == RECALL_REUSE
+
+    def test_standalone_query_runs(self):
+        assert _builder()._recall_policy("what is the spot price of inj") == RECALL_RUN
+
+    def test_disabled_policy_always_runs(self):
+        assert _builder(recall_policy_enabled=False)._recall_policy("ok") == RECALL_RUN
+
+
+class TestRecallStage:
+    async def test_short_follow_up_without_cache_skips_embedding(self, fake_redis):
+        builder = _builder()
+        decision, summaries = await builder._recall_stage(AsyncMock(), None, _conversation(), "ok")
+        assert (decision, summaries) == (RECALL_SKIP, [])
+        builder._get_semantic_memories.assert_not_awaited()
+
+    async def test_follow_up_reuses_last_recall(self, fake_redis):
+        builder = _builder()
+        conv = _conversation()
+        first = await builder._recall_stage(AsyncMock(), None, conv, "how do I deploy my app")
+        assert first[0] == RECALL_RUN
+
+        decision, summaries = await builder._recall_stage(AsyncMock(), None, conv, "do it")
+        assert decision == RECALL_REUSE
+        assert summaries == ["User deploys with docker compose"]
+        assert builder._get_semantic_memories.await_count == 1
+
+    async def test_redis_failure_falls_back_to_running(self, monkeypatch):
+        monkeypatch.setattr(cb_mod, "get_redis", AsyncMock(side_effect=ConnectionError("down")))
+        builder = _builder()
+        decision, summaries = await builder._recall_stage(
+            AsyncMock(), None, _conversation(), "tell me more about that deployment",
+        )
+        assert decision == RECALL_RUN
+        assert summaries == ["User deploys with docker compose"]
+
+
+class TestBuildConcurrency:
+    async def test_recall_overlaps_other_reads(self, fake_redis):
+        builder = _builder()
+
+        async def slow_memories(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return [SimpleNamespace(summary="remembered")]
+
+        async def slow_projects(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return None
+
+        builder._get_semantic_memories = slow_memories
+        builder._get_active_projects = slow_projects
+        builder._get_recent_messages = AsyncMock(return_value=[])
+        builder._trim_to_budget = lambda messages, budget, model: messages  # no tiktoken
+
+        metrics: dict = {}
+        # A full GC pause inside the window would look like serialised stages
+        gc.collect()
+        started = time.monotonic()
+        messages = await builder.build(
+            session=AsyncMock(),
+            user=SimpleNamespace(id=uuid.uuid4()),
+            conversation=_conversation(),
+            persona=None,
+            incoming_message="what is the weather in amsterdam",
+            model="gpt-4o",
+            metrics=metrics,
+        )
+        assert time.monotonic() - started < 0.18
+        assert any("remembered" in m["content"] for m in messages if m["role"] == "system")
+        assert metrics["recall"] == RECALL_RUN
+        assert "context_build_ms" in metrics
@@ -0,0 +1,174 @@
+"""Tests for per-user LLMRouter reuse and cached LLM override lookups."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.llm_router import router_cache as router_cache_mod
+from core.llm_router.router_cache import RouterCache, credentials_digest
+from shared import llm_settings_resolver as resolver
+from shared.config import Settings
+
+BASE = Settings(anthropic_api_key="", openai_api_key="", google_api_key="")
+KEYS_A = {"anthropic_api_key": "sk-ant-a"}
+KEYS_B = {"anthropic_api_key": "sk-ant-b", "default_model": "claude-sonnet-4"}
+
+
+class TestRouterCache:
+    def test_same_credentials_reuse_router_and_clients(self):
+        cache = RouterCache(max_entries=8, ttl_seconds=600)
+        user = uuid.uuid4()
+        first = cache.get(BASE, user, dict(KEYS_A))
+        second = cache.get(BASE, user, dict(KEYS_A))
+        assert first is second
+        assert first.providers["anthropic"] is second.providers["anthropic"]
+        assert cache.stats()["hits"] == 1
+
+    def test_digest_is_order_independent_and_hides_keys(self):
+        a = credentials_digest({"x": "1", "y": "2"})
+        assert a == credentials_digest({"y": "2", "x": "1"})
+        assert "sk-ant-a" not in credentials_digest(KEYS_A)
+
+    def test_changed_credentials_retire_old_router(self):
+        cache = RouterCache(max_entries=8, ttl_seconds=600)
+        user = uuid.uuid4()
+        old = cache.get(BASE, user, dict(KEYS_A))
+        new = cache.get(BASE, user, dict(KEYS_B))
+        assert new is not old
+        assert new.settings.default_model == "claude-sonnet-4"
+        assert cache.stats()["entries"] == 1
+
+    def test_ttl_expiry_rebuilds(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(router_cache_mod.time, "monotonic", lambda: clock[0])
+        cache = RouterCache(max_entries=8, ttl_seconds=60)
+        user = uuid.uuid4()
+        first = cache.get(BASE, user, dict(KEYS_A))
+        clock[0] += 61
+        assert cache.get(BASE, user, dict(KEYS_A)) is not first
+
+    def test_lru_bound(self):
+        cache = RouterCache(max_entries=2, ttl_seconds=600)
+        for i in range(3):
+            cache.get(BASE, uuid.uuid4(), {"openai_api_key": f"sk-{i}"})
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_user(self):
+        cache = RouterCache(max_entries=8, ttl_seconds=600)
+        user = uuid.uuid4()
+        first = cache.get(BASE, user, dict(KEYS_A))
+        cache.invalidate_user(user)
+        assert cache.get(BASE, user, dict(KEYS_A)) is not first
+
+
+class TestRetiredRouterClose:
+    async def test_replaced_router_is_closed_after_grace(self):
+        cache = RouterCache(max_entries=8, ttl_seconds=600, close_grace_seconds=0.01)
+        user = uuid.uuid4()
+        old = cache.get(BASE, user, dict(KEYS_A))
+        old.aclose = AsyncMock()
+        current = cache.get(BASE, user, dict(KEYS_B))
+        current.aclose = AsyncMock()
+
+        old.aclose.assert_not_awaited()  # in-flight runs may still hold it
+        await asyncio.sleep(0.05)
+        old.aclose.assert_awaited_once()
+        current.aclose.assert_not_awaited()
+
+    async def test_evicted_router_is_closed(self):
+        cache = RouterCache(max_entries=1, ttl_seconds=600, close_grace_seconds=0)
+        first = cache.get(BASE, uuid.uuid4(), {"openai_api_key": "sk-1"})
+        first.aclose = AsyncMock()
+        cache.get(BASE, uuid.uuid4(), {"openai_api_key": "sk-2"})
+        await asyncio.sleep(0.01)
+        first.aclose.assert_awaited_once()
+
+    async def test_shutdown_closes_cached_and_retiring_routers(self):
+        cache = RouterCache(max_entries=8, ttl_seconds=600, close_grace_seconds=600)
+        user = uuid.uuid4()
+        retiring = cache.get(BASE, user, dict(KEYS_A))
+        retiring.aclose = AsyncMock()
+        cached = cache.get(BASE, user, dict(KEYS_B))
+        cached.aclose = AsyncMock()
+
+        await cache.aclose()
+        retiring.aclose.assert_awaited_once()
+        cached.aclose.assert_awaited_once()
+        assert cache.stats()["entries"] == 0
+
+    async def test_router_closes_its_provider_clients(self):
+        router = RouterCache(max_entries=8, ttl_seconds=600).get(
+            BASE, uuid.uuid4(), dict(KEYS_A),
+        )
+        client = router.providers["anthropic"].client
+        await router.aclose()
+        assert client.is_closed()
+
+
+class _FakeStore:
+    def __init__(self, creds: dict):
+        self.creds = creds
+        self.get_all = AsyncMock(side_effect=lambda session, uid, svc: dict(self.creds))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    values: dict[str, int] = {}
+    redis = AsyncMock()
+    redis.get = AsyncMock(side_effect=lambda k: None if k not in values else str(values[k]))
+
+    async def incr(key):
+        values[key] = values.get(key, 0) + 1
+        return values[key]
+
+    redis.incr = AsyncMock(side_effect=incr)
+    monkeypatch.setattr(resolver, "get_redis", AsyncMock(return_value=redis))
+    resolver._overrides_cache.clear()
+    yield redis
+    resolver._overrides_cache.clear()
+
+
+class TestCachedOverrides:
+    async def test_repeat_lookup_skips_decryption(self, fake_redis):
+        store = _FakeStore(dict(KEYS_A))
+        user = uuid.uuid4()
+        first = await resolver.get_user_llm_overrides(None, user, store)
+        second = await resolver.get_user_llm_overrides(None, user, store)
+        assert first == second == KEYS_A
+        assert store.get_all.await_count == 1
+
+    async def test_users_without_keys_are_cached_too(self, fake_redis):
+        store = _FakeStore({})
+        user = uuid.uuid4()
+        assert await resolver.get_user_llm_overrides(None, user, store) is None
+        assert await resolver.get_user_llm_overrides(None, user, store) is None
+        assert store.get_all.await_count == 1
+
+    async def test_invalidation_reloads_in_other_processes(self, fake_redis):
+        store = _FakeStore(dict(KEYS_A))
+        user = uuid.uuid4()
+        await resolver.get_user_llm_overrides(None, user, store)
+
+        store.creds = dict(KEYS_B)
+        # Simulate the portal (another process) bumping the version only
+        await fake_redis.incr(f"{resolver.LLM_SETTINGS_VERSION_PREFIX}{user}")
+        assert await resolver.get_user_llm_overrides(None, user, store) == KEYS_B
+
+    async def test_callers_cannot_mutate_cached_entry(self, fake_redis):
+        store = _FakeStore(dict(KEYS_A))
+        user = uuid.uuid4()
+        (await resolver.get_user_llm_overrides(None, user, store))["anthropic_api_key"] = "x"
+        assert await resolver.get_user_llm_overrides(None, user, store) == KEYS_A
+
+    async def test_redis_outage_falls_back_to_database(self, fake_redis):
+        fake_redis.get.side_effect = ConnectionError("down")
+        store = _FakeStore(dict(KEYS_A))
+        user = uuid.uuid4()
+        assert await resolver.get_user_llm_overrides(None, user, store) == KEYS_A
+        assert await resolver.get_user_llm_overrides(None, user, store) == KEYS_A
+        assert store.get_all.await_count == 2
@@ -0,0 +1,103 @@
+"""Tests for batched persistence of agent run rows (RunLedger)."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.orchestrator.persistence import RunLedger, charge_tokens_stmt
+
+
+class _RecordingSession:
+    """Captures execute() calls; optionally fails on commit."""
+
+    def __init__(self, fail_commit: bool = False):
+        self.calls: list[tuple] = []
+        self.commits = 0
+        self.fail_commit = fail_commit
+
+    async def execute(self, stmt, params=None):
+        self.calls.append((stmt, params))
+
+    async def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("db down")
+        self.commits += 1
+
+
+def _ledger(batch_rows: int = 24) -> RunLedger:
+    return RunLedger(uuid.uuid4(), uuid.uuid4(), batch_rows)
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestRunLedger:
+    async def test_flush_writes_one_statement_per_table(self):
+        ledger = _ledger()
+        ledger.add_message("user", "hi")
+        for i in range(3):
+            ledger.add_token_log(model="m", input_tokens=10, output_tokens=i)
+            ledger.add_message("tool_call", "{}")
+            ledger.add_message("tool_result", "{}")
+        ledger.charge(100)
+        ledger.charge(23)
+
+        session = _RecordingSession()
+        await ledger.flush(session)
+
+        (msg_stmt, msg_rows), (log_stmt, log_rows), (charge, _) = session.calls
+        assert msg_stmt.table.name == "messages"
+        assert [r["role"] for r in msg_rows] == ["user"] + ["tool_call", "tool_result"] * 3
+        assert log_stmt.table.name == "token_logs"
+        assert len(log_rows) == 3
+        assert all(r["conversation_id"] == ledger.conversation_id for r in msg_rows)
+        assert "tokens_used_this_month=(users.tokens_used_this_month +" in _sql(charge)
+        assert charge.compile().params["tokens_used_this_month_1"] == 123
+        assert session.commits == 1
+        assert ledger.pending_rows == 0
+        assert ledger.rows_written == 10
+
+    async def test_message_rows_keep_creation_order(self):
+        ledger = _ledger()
+        ledger.add_message("tool_call", "a")
+        ledger.add_message("tool_result", "b")
+        session = _RecordingSession()
+        await ledger.flush(session)
+        first, second = session.calls[0][1]
+        assert first["created_at"] <= second["created_at"]
+
+    async def test_empty_flush_only_commits(self):
+        session = _RecordingSession()
+        await _ledger().flush(session)
+        assert session.calls == []
+        assert session.commits == 1
+
+    async def test_failed_flush_keeps_buffer(self):
+        ledger = _ledger()
+        ledger.add_message("assistant", "done")
+        ledger.charge(5)
+        with pytest.raises(RuntimeError):
+            await ledger.flush(_RecordingSession(fail_commit=True))
+        assert ledger.pending_rows == 1
+
+        session = _RecordingSession()
+        await ledger.flush(session)
+        assert len(session.calls) == 2
+
+    def test_should_flush_threshold(self):
+        ledger = _ledger(batch_rows=3)
+        ledger.add_message("tool_call", "{}")
+        ledger.add_message("tool_result", "{}")
+        assert not ledger.should_flush
+        ledger.add_token_log(model="m", input_tokens=1, output_tokens=1)
+        assert ledger.should_flush
+
+
+def test_charge_is_a_single_atomic_update():
+    sql = _sql(charge_tokens_stmt(uuid.uuid4(), 42))
+    assert sql.startswith("UPDATE users SET tokens_used_this_month=(users.tokens_used_this_month +")
+    assert "FOR UPDATE" not in sql
@@ -0,0 +1,106 @@
+"""Tests for cached token accounting and single-pass context trimming."""
+
+from __future__ import annotations
+
+import pytest
+
+from shared.utils import tokens
+from shared.utils.tokens import (
+    count_message_tokens,
+    count_messages_tokens,
+    count_tokens,
+    trim_groups_to_budget,
+)
+
+
+class _WordEncoding:
+    """One token per whitespace-separated word (avoids downloading BPE files)."""
+
+    name = "cl100k_base"
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text: str) -> list[str]:
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    enc = _WordEncoding()
+    monkeypatch.setattr(tokens.tiktoken, "get_encoding", lambda name: enc)
+    monkeypatch.setattr(tokens.tiktoken, "encoding_for_model", lambda model: enc)
+    tokens._get_encoding.cache_clear()
+    tokens._counts.clear()
+    yield enc
+    tokens._get_encoding.cache_clear()
+    tokens._counts.clear()
+
+
+def _msg(role: str, words: int) -> dict:
+    return {"role": role, "content": " ".join(["w"] * words)}
+
+
+class TestCounting:
+    def test_identical_text_is_encoded_once(self, encoding):
+        assert count_tokens("one two three") == 3
+        assert count_tokens("one two three") == 3
+        assert encoding.calls == 1
+
+    def test_cache_holds_digests_not_text(self, encoding, monkeypatch):
+        monkeypatch.setattr(tokens, "_COUNT_CACHE_MAX_ENTRIES", 2)
+        prompt = "word " * 10_000
+        assert count_tokens(prompt) == 10_000
+        ((digest, _),) = tokens._counts
+        assert len(digest) == 16
+        count_tokens("a")
+        count_tokens("b")
+        assert len(tokens._counts) == 2
+        assert count_tokens(prompt) == 10_000  # evicted, so encoded again
+        assert encoding.calls == 4
+
+    def test_message_overhead_and_blocks(self, encoding):
+        assert count_message_tokens(_msg("user", 5)) == 5 + tokens.MESSAGE_OVERHEAD_TOKENS
+        multimodal = {"role": "user", "content": [
+            {"type": "text", "text": "a b"},
+            {"type": "image", "source": {}},
+        ]}
+        assert count_message_tokens(multimodal) == 2 + tokens.MESSAGE_OVERHEAD_TOKENS
+        tool_call = {"role": "tool_call", "name": "x.y", "arguments": {}}
+        assert count_message_tokens(tool_call) == tokens.MESSAGE_OVERHEAD_TOKENS
+
+    def test_messages_total_is_sum(self, encoding):
+        msgs = [_msg("user", 3), _msg("assistant", 7)]
+        assert count_messages_tokens(msgs) == sum(count_message_tokens(m) for m in msgs)
+
+
+class TestTrimGroupsToBudget:
+    def test_fits_returns_all(self, encoding):
+        groups = [[_msg("user", 10)], [_msg("assistant", 10)]]
+        assert trim_groups_to_budget(groups, 0, 1000) == groups
+
+    def test_drops_oldest_first(self, encoding):
+        groups = [[_msg("user", 10)], [_msg("assistant", 10)], [_msg("user", 10)]]
+        # each group costs 14; reserved 20 + 2 groups = 48
+        kept = trim_groups_to_budget(groups, 20, 48)
+        assert kept == groups[1:]
+
+    def test_matches_recount_strategy(self, encoding):
+        system = [_msg("system", 50)]
+        user = _msg("user", 5)
+        groups = [[_msg("assistant", n)] for n in range(1, 60)]
+        budget = 400
+
+        legacy = list(groups)
+        while legacy and count_messages_tokens(
+            system + [m for g in legacy for m in g] + [user]
+        ) > budget:
+            legacy.pop(0)
+
+        reserved = count_messages_tokens(system) + count_message_tokens(user)
+        assert trim_groups_to_budget(groups, reserved, budget) == legacy
+
+    def test_everything_dropped_when_reserved_exceeds_budget(self, encoding):
+        groups = [[_msg("user", 10)]]
+        assert trim_groups_to_budget(groups, 500, 100) == []
@@ -0,0 +1,106 @@
+"""Tests for the per-manifest-version tool schema cache in ToolRegistry."""
+
+from __future__ import annotations
+
+import pytest
+
+from core.llm_router import tool_formats
+from core.orchestrator.tool_registry import ToolRegistry
+from shared.config import Settings
+from shared.schemas.tools import ModuleManifest, ToolDefinition, ToolParameter
+
+
+def _manifest(module: str, *tools: tuple[str, str]) -> ModuleManifest:
+    return ModuleManifest(
+        module_name=module,
+        description=f"{module} module",
+        tools=[
+            ToolDefinition(
+                name=f"{module}.{name}",
+                description=f"{name} tool",
+                parameters=[ToolParameter(name="q", type="string", description="query")],
+                required_permission=perm,
+            )
+            for name, perm in tools
+        ],
+    )
+
+
+@pytest.fixture
+def registry():
+    reg = ToolRegistry(Settings())
+    reg._store_manifest("research", _manifest("research", ("web_search", "guest")))
+    reg._store_manifest("deployer", _manifest("deployer", ("deploy", "admin")))
+    return reg
+
+
+class TestToolSchemaCache:
+    def test_same_key_returns_same_bundle(self, registry):
+        a = registry.get_tool_schemas("user", ["research", "deployer"])
+        b = registry.get_tool_schemas("user", ["deployer", "research"])
+        assert a is b
+        assert [t.name for t in a.tools] == ["research.web_search"]
+
+    def test_keys_are_separated_by_permission(self, registry):
+        user = registry.get_tool_schemas("user", ["research", "deployer"])
+        admin = registry.get_tool_schemas("admin", ["research", "deployer"])
+        assert user is not admin
+        assert [t.name for t in admin.tools] == ["research.web_search", "deployer.deploy"]
+
+    def test_anthropic_payload_is_precomputed(self, registry):
+        bundle = registry.get_tool_schemas("admin", ["research", "deployer"])
+        tools = bundle.openai_tools
+        assert tools.anthropic_name_mapping == {
+            "research_web_search": "research.web_search",
+            "deployer_deploy": "deployer.deploy",
+        }
+        assert tools.anthropic_tools[-1]["cache_control"] == {"type": "ephemeral"}
+        # Providers pick the payload up from the list the router passes through
+        converted, _ = tool_formats.anthropic_tools_for(tools)
+        assert converted is tools.anthropic_tools
+
+    async def test_provider_sends_the_precomputed_payload(self, registry, monkeypatch):
+        from core.llm_router.providers.anthropic import AnthropicProvider
+
+        bundle = registry.get_tool_schemas("admin", ["research", "deployer"])
+        monkeypatch.setattr(
+            tool_formats, "openai_tools_to_anthropic",
+            lambda tools: pytest.fail("precomputed tools were converted again"),
+        )
+        kwargs, mapping = AnthropicProvider(api_key="test")._build_request(
+            [{"role": "user", "content": "hi"}], bundle.openai_tools, "claude", 100, 0.0,
+        )
+        assert kwargs["tools"] is bundle.openai_tools.anthropic_tools
+        assert mapping is bundle.openai_tools.anthropic_name_mapping
+
+    def test_plain_lists_are_converted(self):
+        converted, mapping = tool_formats.anthropic_tools_for(
+            [{"type": "function", "function": {"name": "a.b", "parameters": {}}}]
+        )
+        assert [t["name"] for t in converted] == ["a_b"]
+        assert mapping == {"a_b": "a.b"}
+
+    def test_unchanged_manifest_keeps_cache(self, registry):
+        bundle = registry.get_tool_schemas("user", ["research"])
+        version = registry.manifest_version
+        assert not registry._store_manifest(
+            "research", _manifest("research", ("web_search", "guest"))
+        )
+        assert registry.manifest_version == version
+        assert registry.get_tool_schemas("user", ["research"]) is bundle
+
+    def test_changed_manifest_invalidates_cache(self, registry):
+        bundle = registry.get_tool_schemas("user", ["research"])
+        assert registry._store_manifest(
+            "research", _manifest("research", ("web_search", "guest"), ("fetch", "guest"))
+        )
+        fresh = registry.get_tool_schemas("user", ["research"])
+        assert fresh is not bundle
+        assert fresh.version == registry.manifest_version
+        assert len(fresh.tools) == 2
+        assert len(fresh.openai_tools.anthropic_tools) == 2
+
+    def test_empty_tool_set_has_no_overhead(self, registry):
+        bundle = registry.get_tool_schemas("user", [])
+        assert bundle.openai_tools == []
+        assert bundle.token_overhead("gpt-4o") == 0
@@ -0,0 +1,148 @@
+"""Tests for vision image downscaling and the content-addressed image cache."""
+
+from __future__ import annotations
+
+import base64
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from PIL import Image
+
+from core.orchestrator import vision as vision_mod
+from core.orchestrator.vision import VisionPreprocessor, encode_image
+from shared.config import Settings
+from shared.storage import ObjectTooLargeError
+from tests.core.test_object_storage import _FakeMinio, _storage
+
+
+def _image_bytes(size: tuple[int, int], fmt: str, mode: str = "RGB") -> bytes:
+    img = Image.new(mode, size, (200, 30, 30, 128)[: len(mode)])
+    # Some texture so JPEG/PNG sizes scale with resolution
+    for x in range(0, size[0], 7):
+        img.putpixel((x, x % size[1]), (0, 0, 0, 255)[: len(mode)])
+    out = io.BytesIO()
+    img.save(out, format=fmt)
+    return out.getvalue()
+
+
+def _decoded(block: dict) -> Image.Image:
+    return Image.open(io.BytesIO(base64.b64decode(block["source"]["data"])))
+
+
+class TestEncodeImage:
+    def test_large_photo_is_downscaled_to_jpeg(self):
+        raw = _image_bytes((4000, 3000), "JPEG")
+        out = encode_image(raw, max_edge=1568, max_pixels=1_150_000, jpeg_quality=85)
+        assert out["media_type"] == "image/jpeg"
+        assert max(out["width"], out["height"]) <= 1568
+        assert out["width"] * out["height"] <= 1_150_000
+        assert abs(out["width"] / out["height"] - 4 / 3) < 0.01
+        assert len(out["data"]) < len(raw)
+
+    def test_png_with_alpha_stays_png(self):
+        raw = _image_bytes((3000, 1000), "PNG", mode="RGBA")
+        out = encode_image(raw, max_edge=1568, max_pixels=1_150_000, jpeg_quality=85)
+        assert out["media_type"] == "image/png"
+        assert Image.open(io.BytesIO(out["data"])).mode == "RGBA"
+        assert out["width"] == 1568
+
+    def test_small_image_passes_through(self):
+        raw = _image_bytes((64, 64), "PNG")
+        out = encode_image(raw, max_edge=1568, max_pixels=1_150_000, jpeg_quality=85)
+        assert out["width"] == 64
+        assert len(out["data"]) <= len(raw)
+
+    def test_garbage_raises(self):
+        with pytest.raises(OSError):
+            encode_image(b"not an image", 1568, 1_150_000, 85)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    store: dict[str, str] = {}
+    redis = AsyncMock()
+
+    async def get(key):
+        return store.get(key)
+
+    def pipeline(transaction=False):
+        pipe = MagicMock()
+        pipe.set = lambda k, v, ex=None: store.__setitem__(k, v)
+        pipe.execute = AsyncMock()
+        return pipe
+
+    redis.get = AsyncMock(side_effect=get)
+    redis.pipeline = pipeline
+    monkeypatch.setattr(vision_mod, "get_redis", AsyncMock(return_value=redis))
+    return store
+
+
+def _preprocessor(fake: _FakeMinio, **overrides) -> VisionPreprocessor:
+    return VisionPreprocessor(Settings(**overrides), _storage(fake))
+
+
+class TestVisionPreprocessor:
+    async def test_blocks_are_downscaled_and_ordered(self, fake_redis):
+        fake = _FakeMinio()
+        fake.objects["a.jpg"] = _image_bytes((4000, 3000), "JPEG")
+        fake.objects["b.png"] = _image_bytes((100, 50), "PNG")
+        blocks = await _preprocessor(fake).prepare(["a.jpg", "b.png"])
+
+        assert _decoded(blocks[0]).size[0] <= 1568
+        assert _decoded(blocks[1]).size == (100, 50)
+        assert blocks[0]["type"] == "image"
+        assert blocks[0]["source"]["media_type"] == "image/jpeg"
+
+    async def test_repeat_skips_download_and_encoding(self, fake_redis, monkeypatch):
+        fake = _FakeMinio()
+        fake.objects["a.jpg"] = _image_bytes((2000, 2000), "JPEG")
+        pre = _preprocessor(fake)
+        first = await pre.prepare(["a.jpg"])
+
+        encode = MagicMock(side_effect=AssertionError("re-encoded"))
+        monkeypatch.setattr(vision_mod, "encode_image", encode)
+        second = await pre.prepare(["a.jpg"])
+        assert second == first
+        assert len(fake.responses) == 1
+        assert pre.stats()["hits"] == 1
+
+    async def test_identical_content_under_new_key_is_encoded_once(self, fake_redis):
+        fake = _FakeMinio()
+        raw = _image_bytes((2000, 1000), "JPEG")
+        fake.objects["first.jpg"] = raw
+        fake.objects["again.jpg"] = raw
+        pre = _preprocessor(fake)
+        await pre.prepare(["first.jpg"])
+        await pre.prepare(["again.jpg"])
+        assert pre.stats()["misses"] == 1
+
+    async def test_redis_cache_is_shared_across_processes(self, fake_redis):
+        fake = _FakeMinio()
+        fake.objects["a.jpg"] = _image_bytes((2000, 1000), "JPEG")
+        await _preprocessor(fake).prepare(["a.jpg"])
+
+        other = _preprocessor(fake)
+        await other.prepare(["a.jpg"])
+        assert len(fake.responses) == 1
+        assert other.stats()["misses"] == 0
+
+    async def test_failures_are_returned_in_place(self, fake_redis):
+        fake = _FakeMinio()
+        fake.objects["huge.png"] = b"x" * 4096
+        fake.objects["bad.png"] = b"not an image"
+        fake.objects["ok.png"] = _image_bytes((10, 10), "PNG")
+        results = await _preprocessor(fake, vision_max_source_bytes=2048).prepare(
+            ["huge.png", "bad.png", "ok.png"]
+        )
+        assert isinstance(results[0], ObjectTooLargeError)
+        assert isinstance(results[1], OSError)
+        assert results[2]["type"] == "image"
+
+    async def test_lru_is_bounded_by_bytes(self, fake_redis):
+        fake = _FakeMinio()
+        for i in range(5):
+            fake.objects[f"{i}.png"] = _image_bytes((200 + i, 200), "PNG")
+        pre = _preprocessor(fake, vision_cache_max_bytes=4096, vision_cache_ttl_seconds=0)
+        await pre.prepare([f"{i}.png" for i in range(5)])
+        assert pre.stats()["cached_bytes"] <= 4096
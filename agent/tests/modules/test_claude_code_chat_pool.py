@@ -0,0 +1,188 @@
+"""Tests for the warm orchestrator chat container pool (claude_code module)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from modules.claude_code import chat_pool as chat_pool_mod
+from modules.claude_code.chat_pool import ChatContainerPool
+
+
+class _FakeDocker:
+    """Records docker CLI calls and fakes their results."""
+
+    def __init__(self, scrub_code: int = 0, orphans: str = ""):
+        self.calls: list[tuple[str, ...]] = []
+        self.stdin: list[bytes | None] = []
+        self.scrub_code = scrub_code
+        self.orphans = orphans
+        self.running: set[str] = set()
+
+    async def __call__(self, *args: str, stdin: bytes | None = None, timeout: float = 60):
+        self.calls.append(args)
+        self.stdin.append(stdin)
+        verb = args[0]
+        if verb == "run":
+            self.running.add(args[args.index("--name") + 1])
+            return 0, "container-id"
+        if verb == "rm":
+            self.running.difference_update(args[2:])
+            return 0, ""
+        if verb == "ps":
+            return 0, self.orphans
+        if verb == "exec" and "root" in args:
+            return self.scrub_code, "" if self.scrub_code == 0 else "kill failed"
+        return 0, ""
+
+    def count(self, verb: str) -> int:
+        return sum(1 for c in self.calls if c[0] == verb)
+
+
+def _pool(docker: _FakeDocker, **overrides) -> ChatContainerPool:
+    opts = {"max_size": 3, "min_idle": 1, "idle_seconds": 600, "max_leases": 50}
+    opts.update(overrides)
+    return ChatContainerPool("worker-image", "agent-net", runner=docker, **opts)
+
+
+async def _settle(pool: ChatContainerPool) -> None:
+    while pool._background:
+        await asyncio.gather(*list(pool._background))
+
+
+class TestChatContainerPool:
+    async def test_start_removes_orphans_and_prewarms(self):
+        docker = _FakeDocker(orphans="old1\nold2")
+        pool = _pool(docker, min_idle=2)
+        await pool.start()
+        assert ("rm", "-f", "old1", "old2") in docker.calls
+        assert pool.stats()["idle"] == 2
+        run = next(c for c in docker.calls if c[0] == "run")
+        assert "--network=agent-net" in run
+        assert "my_agent.chat_pool=worker-image" in run
+
+    async def test_prewarmed_container_is_leased_warm(self):
+        docker = _FakeDocker()
+        pool = _pool(docker)
+        await pool.start()
+        container, warm = await pool.acquire("user-a")
+        assert warm
+        assert container.owner == "user-a"
+        await _settle(pool)
+        # The pool tops itself back up to min_idle fresh containers
+        assert pool.stats()["idle"] == 1
+
+    async def test_release_scrubs_and_keeps_session_affinity(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, min_idle=0)
+        first, warm = await pool.acquire("user-a")
+        assert not warm
+        pool.release(first)
+        await _settle(pool)
+
+        scrub = [c for c in docker.calls if c[0] == "exec"][-1]
+        assert scrub[:4] == ("exec", "-u", "root", first.name)
+        assert "pkill -KILL -u claude" in scrub[-1]
+
+        again, warm = await pool.acquire("user-a")
+        assert warm and again is first
+        assert again.leases == 2
+
+    async def test_other_users_never_get_a_used_container(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, min_idle=0)
+        first, _ = await pool.acquire("user-a")
+        pool.release(first)
+        await _settle(pool)
+
+        other, warm = await pool.acquire("user-b")
+        assert not warm
+        assert other is not first
+
+    async def test_at_capacity_lru_idle_container_is_retired(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, max_size=1, min_idle=0)
+        first, _ = await pool.acquire("user-a")
+        pool.release(first)
+        await _settle(pool)
+
+        other, _ = await pool.acquire("user-b")
+        await _settle(pool)
+        assert first.name not in docker.running
+        assert other.pooled
+        assert pool.stats()["leased"] == 1
+
+    async def test_burst_beyond_max_size_uses_one_off_container(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, max_size=1, min_idle=0)
+        await pool.acquire("user-a")
+        burst, warm = await pool.acquire("user-b")
+        assert not warm and not burst.pooled
+        pool.release(burst)
+        await _settle(pool)
+        assert burst.name not in docker.running
+        assert pool.stats()["idle"] == 0
+
+    async def test_failed_scrub_retires_container(self):
+        docker = _FakeDocker(scrub_code=1)
+        pool = _pool(docker, min_idle=0)
+        container, _ = await pool.acquire("user-a")
+        pool.release(container)
+        await _settle(pool)
+        assert container.name not in docker.running
+        assert pool.stats()["scrub_failures"] == 1
+
+    async def test_max_leases_recycles(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, min_idle=0, max_leases=1)
+        container, _ = await pool.acquire("user-a")
+        pool.release(container)
+        await _settle(pool)
+        assert container.name not in docker.running
+        assert docker.count("exec") == 0
+
+    async def test_reap_removes_idle_and_refills(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(chat_pool_mod.time, "monotonic", lambda: clock[0])
+        docker = _FakeDocker()
+        pool = _pool(docker, min_idle=1, idle_seconds=60)
+        await pool.start()
+        used, _ = await pool.acquire("user-a")
+        await _settle(pool)
+        pool.release(used)
+        await _settle(pool)
+        assert pool.stats()["idle"] == 2
+
+        clock[0] += 61
+        assert await pool.reap() == 1
+        assert used.name not in docker.running
+        assert pool.stats()["idle"] == 1
+
+    async def test_zero_max_size_disables_pooling(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, max_size=0, min_idle=2)
+        await pool.start()
+        assert docker.count("run") == 0
+        container, warm = await pool.acquire("user-a")
+        assert not warm and not container.pooled
+        pool.release(container)
+        await _settle(pool)
+        assert docker.running == set()
+
+    async def test_stage_sends_files_over_stdin_as_claude(self):
+        docker = _FakeDocker()
+        pool = _pool(docker, min_idle=0)
+        container, _ = await pool.acquire("user-a")
+        await pool.stage(container, [("/home/claude/.claude/.credentials.json", "{}", 0o600)])
+        call = docker.calls[-1]
+        assert call[:4] == ("exec", "-i", "-u", "claude")
+        assert json.loads(docker.stdin[-1]) == [["/home/claude/.claude/.credentials.json", "{}", 384]]
+
+    async def test_phase_stats(self):
+        pool = _pool(_FakeDocker())
+        pool.record_phases(True, {"lease_ms": 2.0, "first_event_ms": 900.0})
+        pool.record_phases(True, {"lease_ms": 4.0, "first_event_ms": 1100.0})
+        warm = pool.stats()["phases"]["warm"]
+        assert warm["turns"] == 2
+        assert warm["avg_ms"] == {"lease_ms": 3.0, "first_event_ms": 1000.0}
+        assert warm["max_ms"]["first_event_ms"] == 1100.0
@@ -0,0 +1,192 @@
+"""Tests for claude_code task event streaming (Redis Streams + SSE)."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from modules.claude_code import main as claude_code_main
+from modules.claude_code.events import TaskEventPublisher, format_sse, sse_task_events
+from modules.claude_code.task_store import Task
+from shared.auth import require_service_auth
+from shared.schemas.task_events import (
+    TASK_COMPLETIONS_STREAM,
+    TaskEvent,
+    task_event_stream,
+)
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self.redis = redis
+        self.ops: list[tuple] = []
+
+    def xadd(self, stream, fields, maxlen=None, approximate=False):
+        self.ops.append(("xadd", stream, fields))
+
+    def expire(self, stream, ttl):
+        self.ops.append(("expire", stream, ttl))
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        self.redis.executed.append(self.ops)
+        for op in self.ops:
+            if op[0] == "xadd":
+                entries = self.redis.streams.setdefault(op[1], [])
+                entries.append((f"{len(entries) + 1}-0", op[2]))
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.executed: list[list[tuple]] = []
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.reads: list[tuple[dict, int | None]] = []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def xread(self, streams, count=None, block=None):
+        self.reads.append((streams, block))
+        out = []
+        for name, last in streams.items():
+            after = int(last.split("-")[0])
+            entries = [e for e in self.streams.get(name, []) if int(e[0].split("-")[0]) > after]
+            if entries:
+                out.append((name, entries[:count]))
+        return out
+
+
+def _publisher(redis: _FakeRedis) -> TaskEventPublisher:
+    async def factory():
+        return redis
+
+    return TaskEventPublisher(redis_factory=factory, maxlen=100, ttl=60)
+
+
+async def _no_disconnect() -> bool:
+    return False
+
+
+def _status(status: str | None):
+    async def current_status() -> str | None:
+        return status
+
+    return current_status
+
+
+def _events(redis: _FakeRedis, stream: str) -> list[TaskEvent]:
+    return [TaskEvent.model_validate_json(f["event"]) for _id, f in redis.streams.get(stream, [])]
+
+
+class TestTaskEventPublisher:
+    async def test_events_are_batched_in_order(self):
+        redis = _FakeRedis()
+        pub = _publisher(redis)
+        pub.publish("t1", "status", "running")
+        pub.publish("t1", "turn", "running", turn=1, context_tokens=1200)
+        pub.publish("t1", "tool_use", "running", name="Bash")
+        await pub.flush()
+
+        assert len(redis.executed) == 1
+        events = _events(redis, task_event_stream("t1"))
+        assert [e.type for e in events] == ["status", "turn", "tool_use"]
+        assert events[1].data == {"turn": 1, "context_tokens": 1200}
+        assert ("expire", task_event_stream("t1"), 60) in redis.executed[0]
+        assert pub.stats()["published"] == 3
+
+    async def test_terminal_status_is_fanned_out_to_completions(self):
+        redis = _FakeRedis()
+        pub = _publisher(redis)
+        pub.publish("t1", "status", "running")
+        pub.publish("t1", "status", "completed")
+        await pub.flush()
+
+        completions = _events(redis, TASK_COMPLETIONS_STREAM)
+        assert [(e.task_id, e.status) for e in completions] == [("t1", "completed")]
+
+    async def test_redis_failure_is_counted_not_raised(self):
+        pub = _publisher(_FakeRedis(fail=True))
+        pub.publish("t1", "status", "running")
+        await pub.flush()
+        assert pub.stats()["failures"] == 1
+
+
+class TestTaskEventsSse:
+    async def test_replays_from_last_id_and_ends_on_terminal_event(self):
+        redis = _FakeRedis()
+        pub = _publisher(redis)
+        for status in ("running", "running", "completed"):
+            pub.publish("t1", "status", status)
+        await pub.flush()
+
+        messages = [
+            m async for m in sse_task_events(pub, "t1", "1-0", _status("completed"), _no_disconnect)
+        ]
+        assert [m.split("\n")[0] for m in messages] == ["id: 2-0", "id: 3-0"]
+        assert json.loads(messages[-1].split("data: ")[1])["status"] == "completed"
+        assert redis.reads[0][1] == 15_000
+
+    async def test_finished_task_without_stream_gets_a_status_event(self):
+        pub = _publisher(_FakeRedis())
+        messages = [
+            m async for m in sse_task_events(pub, "t1", "0", _status("failed"), _no_disconnect)
+        ]
+        assert len(messages) == 1
+        assert messages[0].startswith("event: status\n")
+        assert '"status":"failed"' in messages[0]
+
+    async def test_running_task_gets_keepalives(self):
+        pub = _publisher(_FakeRedis())
+        polls = iter([False, True])
+
+        async def disconnect_after_one():
+            return next(polls)
+
+        messages = [
+            m async for m in sse_task_events(pub, "t1", "0", _status("running"), disconnect_after_one)
+        ]
+        assert messages == [": keepalive\n\n"]
+
+    def test_format_sse(self):
+        event = TaskEvent(task_id="t1", type="turn", status="running")
+        assert format_sse(event, "5-0").startswith("id: 5-0\nevent: turn\ndata: {")
+
+
+class _StatusSequenceStore:
+    """Task registry whose task reports *statuses* on successive lookups."""
+
+    def __init__(self, *statuses: str):
+        self.statuses = list(statuses)
+
+    async def get(self, task_id: str) -> Task:
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return Task(id=task_id, prompt="p", status=status)
+
+
+class TestTaskEventsEndpoint:
+    async def test_idle_poll_and_late_subscriber_use_the_registry_status(self, monkeypatch):
+        store = _StatusSequenceStore("running", "running", "completed")
+        fake_tools = SimpleNamespace(store=store, events=_publisher(_FakeRedis()))
+
+        async def get_task(task_id, user_id=None):
+            return await store.get(task_id)
+
+        fake_tools._get_task = get_task
+        monkeypatch.setattr(claude_code_main, "tools", fake_tools)
+        claude_code_main.app.dependency_overrides[require_service_auth] = lambda: None
+        try:
+            transport = httpx.ASGITransport(app=claude_code_main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                resp = await client.get("/tasks/t1/events")
+        finally:
+            claude_code_main.app.dependency_overrides.clear()
+
+        assert resp.status_code == 200
+        messages = resp.text.split("\n\n")
+        assert messages[0] == ": keepalive"
+        assert messages[1].startswith("event: status\n")
+        assert '"status":"completed"' in messages[1]
@@ -0,0 +1,149 @@
+"""Tests for the shared git mirror cache (claude_code module)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+from modules.claude_code.git_cache import (
+    DISSOCIATE_SCRIPT,
+    FETCH_SCRIPT,
+    GitMirrorCache,
+    mirror_key,
+)
+
+REPO = "https://github.com/example/big-repo.git"
+
+
+class _FakeGit:
+    """Records git container runs; fetches create the mirror's objects dir."""
+
+    def __init__(self, code: int = 0, delay: float = 0.0):
+        self.calls: list[dict] = []
+        self.code = code
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, script: str, **kwargs):
+        self.calls.append({"script": script, **kwargs})
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.code == 0 and script == FETCH_SCRIPT:
+            os.makedirs(os.path.join(kwargs["env"]["MIRROR_PATH"], "objects"), exist_ok=True)
+        if self.code == 0 and script == DISSOCIATE_SCRIPT:
+            os.remove(os.path.join(kwargs["workdir"], ".git", "objects", "info", "alternates"))
+        return "", "fatal: could not read" if self.code else "", self.code
+
+
+def _cache(tmp_path, runner, **overrides) -> GitMirrorCache:
+    opts = {"max_bytes": 10**9, "max_idle_days": 14, "enabled": True}
+    opts.update(overrides)
+    base = tmp_path / "tasks" / ".git_mirrors"
+    return GitMirrorCache(str(base), "/host/tasks/.git_mirrors", runner, **opts)
+
+
+def _borrowing_workspace(tmp_path, cache: GitMirrorCache, key: str, name: str = "ws1") -> str:
+    ws = tmp_path / "tasks" / name
+    info = ws / ".git" / "objects" / "info"
+    info.mkdir(parents=True)
+    (info / "alternates").write_text(os.path.join(cache.mirror_path(key), "objects") + "\n")
+    return str(ws)
+
+
+def _age(cache: GitMirrorCache, key: str, seconds: float) -> None:
+    cache._index[key]["last_used"] = time.time() - seconds
+
+
+class TestGitMirrorCache:
+    async def test_first_prepare_is_a_miss_then_hits(self, tmp_path):
+        git = _FakeGit()
+        cache = _cache(tmp_path, git)
+        path = await cache.prepare(REPO)
+        assert path == cache.mirror_path(mirror_key(REPO))
+        await cache.prepare(REPO)
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+
+        call = git.calls[0]
+        assert call["env"]["REPO_URL"] == REPO
+        assert call["volumes"] == [(cache.host_mirror_path(mirror_key(REPO)), path, "rw")]
+
+    async def test_concurrent_prepares_for_one_repo_fetch_serially(self, tmp_path):
+        git = _FakeGit(delay=0.01)
+        cache = _cache(tmp_path, git)
+        await asyncio.gather(*(cache.prepare(REPO) for _ in range(3)))
+        assert len(git.calls) == 3
+        assert git.max_active == 1
+
+    async def test_different_repos_fetch_in_parallel(self, tmp_path):
+        git = _FakeGit(delay=0.01)
+        cache = _cache(tmp_path, git)
+        await asyncio.gather(cache.prepare(REPO), cache.prepare(REPO + "-other"))
+        assert git.max_active == 2
+
+    async def test_failed_first_fetch_falls_back_and_removes_mirror(self, tmp_path):
+        cache = _cache(tmp_path, _FakeGit(code=128))
+        assert await cache.prepare(REPO) is None
+        assert not os.path.exists(cache.mirror_path(mirror_key(REPO)))
+        assert cache.stats()["fetch_failures"] == 1
+
+    async def test_disabled_without_host_path(self, tmp_path):
+        git = _FakeGit()
+        cache = GitMirrorCache(str(tmp_path / "m"), "", git)
+        assert await cache.prepare(REPO) is None
+        assert cache.mount_args(str(tmp_path)) == []
+        assert git.calls == []
+
+    async def test_mount_args_follow_workspace_alternates(self, tmp_path):
+        cache = _cache(tmp_path, _FakeGit())
+        key = mirror_key(REPO)
+        ws = _borrowing_workspace(tmp_path, cache, key)
+        assert cache.mount_args(ws) == [
+            "-v", f"{cache.host_mirror_path(key)}:{cache.mirror_path(key)}:ro",
+        ]
+
+    async def test_idle_mirror_is_evicted_after_dissociating_workspaces(self, tmp_path):
+        git = _FakeGit()
+        cache = _cache(tmp_path, git, max_idle_days=1)
+        await cache.prepare(REPO)
+        key = mirror_key(REPO)
+        ws = _borrowing_workspace(tmp_path, cache, key)
+        _age(cache, key, 2 * 86400)
+
+        result = await cache.evict(str(tmp_path / "tasks"))
+        assert result["removed"] == [key]
+        assert git.calls[-1]["script"] == DISSOCIATE_SCRIPT
+        assert git.calls[-1]["workdir"] == ws
+        assert not os.path.exists(cache.mirror_path(key))
+
+    async def test_over_size_evicts_least_recently_used_first(self, tmp_path):
+        cache = _cache(tmp_path, _FakeGit(), max_bytes=150)
+        old, new = REPO, REPO + "-new"
+        for url in (old, new):
+            await cache.prepare(url)
+            with open(os.path.join(cache.mirror_path(mirror_key(url)), "pack"), "wb") as f:
+                f.write(b"x" * 100)
+        _age(cache, mirror_key(old), 3 * 3600)
+        _age(cache, mirror_key(new), 2 * 3600)
+
+        result = await cache.evict(str(tmp_path / "tasks"))
+        assert result["removed"] == [mirror_key(old)]
+        assert os.path.isdir(cache.mirror_path(mirror_key(new)))
+
+    async def test_recently_used_and_undissociable_mirrors_are_kept(self, tmp_path):
+        cache = _cache(tmp_path, _FakeGit(), max_bytes=0)
+        await cache.prepare(REPO)
+        key = mirror_key(REPO)
+        assert (await cache.evict(str(tmp_path / "tasks")))["removed"] == []
+
+        _borrowing_workspace(tmp_path, cache, key)
+        _age(cache, key, 2 * 3600)
+        cache._run = _FakeGit(code=1)
+        assert (await cache.evict(str(tmp_path / "tasks")))["removed"] == []
+        assert os.path.isdir(cache.mirror_path(key))
@@ -0,0 +1,106 @@
+"""Tests for the indexed task log store (claude_code module)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+from modules.claude_code.log_store import (
+    TaskLogWriter,
+    append_lines,
+    index_path,
+    is_log_file,
+    read_lines,
+)
+
+
+def _log(tmp_path) -> str:
+    return str(tmp_path / "task_abc.log")
+
+
+def _write(path: str, lines: list[str], **opts) -> None:
+    writer = TaskLogWriter(path, **opts)
+    for line in lines:
+        writer.write(line)
+    writer.flush()
+
+
+class TestTaskLogStore:
+    def test_tail_and_offset_reads(self, tmp_path):
+        path = _log(tmp_path)
+        _write(path, [f"line {i}\n" for i in range(10)])
+
+        lines, total, first = read_lines(path, None, 3)
+        assert (lines, total, first) == (["line 7", "line 8", "line 9"], 10, 7)
+
+        lines, total, first = read_lines(path, 4, 2)
+        assert (lines, first) == (["line 4", "line 5"], 4)
+
+        lines, _, first = read_lines(path, 9, 100)
+        assert (lines, first) == (["line 9"], 9)
+        assert read_lines(path, 50, 10)[0] == []
+
+    def test_missing_log_reads_empty(self, tmp_path):
+        assert read_lines(_log(tmp_path), None, 10) == ([], 0, 0)
+
+    def test_writes_are_buffered_until_flush(self, tmp_path):
+        path = _log(tmp_path)
+        writer = TaskLogWriter(path, flush_bytes=10**6)
+        writer.write("hello\n")
+        assert read_lines(path, None, 10)[1] == 0
+        writer.flush()
+        assert read_lines(path, None, 10)[0] == ["hello"]
+
+    def test_multiline_records_are_indexed_per_line(self, tmp_path):
+        path = _log(tmp_path)
+        append_lines(path, ["[12:00:00] [auto_push] FAILED: first\nsecond"])
+        assert read_lines(path, 0, 10)[0] == [
+            "[12:00:00] [auto_push] FAILED: first", "second",
+        ]
+
+    def test_legacy_log_is_indexed_on_first_read(self, tmp_path):
+        path = _log(tmp_path)
+        with open(path, "w") as f:
+            f.write("a\nb\nc")
+        assert read_lines(path, None, 2) == (["b", "c"], 3, 1)
+        assert os.path.exists(index_path(path))
+
+        # A writer completes the partial last line before appending
+        append_lines(path, ["d"])
+        assert read_lines(path, None, 2)[0] == ["c", "d"]
+
+    def test_writer_indexes_lines_appended_without_index(self, tmp_path):
+        path = _log(tmp_path)
+        _write(path, ["one", "two"])
+        with open(path, "a") as f:
+            f.write("three\n")
+        append_lines(path, ["four"])
+        assert read_lines(path, 0, 10)[0] == ["one", "two", "three", "four"]
+
+    async def test_rotated_segments_are_compressed_and_readable(self, tmp_path):
+        path = _log(tmp_path)
+        async with TaskLogWriter(path, flush_bytes=1, segment_bytes=20) as writer:
+            for i in range(6):
+                writer.write(f"record {i:02d}")
+        names = sorted(os.listdir(tmp_path))
+        assert "task_abc.log.0.gz" in names
+        assert "task_abc.log.0" not in names
+
+        lines, total, _ = read_lines(path, 0, 10)
+        assert total == 6
+        assert lines == [f"record {i:02d}" for i in range(6)]
+        assert read_lines(path, None, 2)[0] == ["record 04", "record 05"]
+
+    async def test_periodic_flush(self, tmp_path):
+        path = _log(tmp_path)
+        async with TaskLogWriter(path, flush_interval=0.01, flush_bytes=10**6) as writer:
+            writer.write("tick")
+            await asyncio.sleep(0.05)
+            assert read_lines(path, None, 1)[0] == ["tick"]
+
+    def test_log_file_names(self):
+        assert is_log_file("task_abc.log")
+        assert is_log_file("task_abc.log.idx")
+        assert is_log_file("task_abc.log.3.gz")
+        assert not is_log_file("server.log")
+        assert not is_log_file("task_list.md")
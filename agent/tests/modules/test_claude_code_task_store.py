@@ -0,0 +1,251 @@
+"""Tests for the database-backed claude_code task registry."""
+
+from __future__ import annotations
+
+import json
+import os
+from contextlib import asynccontextmanager
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from modules.claude_code.task_store import (
+    IMPORT_MARKER,
+    Task,
+    TaskStore,
+    _count_query,
+    _list_query,
+    _workspace_count_query,
+    read_meta_files,
+)
+from shared.models.claude_code_task import ClaudeCodeTask
+
+
+class _FakeResult:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+
+    def scalars(self):
+        return self
+
+    def all(self) -> list:
+        return []
+
+    def scalar_one(self) -> int:
+        return 0
+
+
+class _FakeSession:
+    def __init__(self, db: "_FakeDb"):
+        self.db = db
+
+    async def execute(self, stmt):
+        if self.db.fail:
+            raise ConnectionError("db down")
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.db.statements.append((str(compiled), compiled.params))
+        return _FakeResult(self.db.rowcount)
+
+    async def get(self, model, key):
+        self.db.gets.append(key)
+        return None
+
+    async def commit(self):
+        self.db.commits += 1
+
+
+class _FakeDb:
+    def __init__(self):
+        self.fail = False
+        self.rowcount = 1
+        self.statements: list[tuple[str, dict]] = []
+        self.gets: list[str] = []
+        self.commits = 0
+
+    def factory(self):
+        @asynccontextmanager
+        async def session():
+            yield _FakeSession(self)
+
+        return session
+
+    def upserts(self) -> list[dict]:
+        return [p for sql, p in self.statements if sql.startswith("INSERT")]
+
+
+def _task(task_id: str = "abc", **kw) -> Task:
+    return Task(id=task_id, prompt="do it", workspace=f"/tmp/claude_tasks/{task_id}", **kw)
+
+
+class TestTaskStoreWrites:
+    async def test_saves_coalesce_into_one_upsert(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        task = _task()
+        store.add(task)
+        task.status = "running"
+        store.save(task)
+        task.status = "completed"
+        store.save(task)
+        await store.flush()
+
+        upserts = db.upserts()
+        assert len(upserts) == 1
+        assert upserts[0]["status_m0"] == "completed"
+        assert store.stats()["writes"] == 1
+
+    async def test_failed_write_is_retried_by_flush(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        db.fail = True
+        store.save(_task())
+        await store.flush()
+        assert store.stats()["pending_writes"] == 1
+        assert store.stats()["failures"] == 1
+
+        db.fail = False
+        await store.flush()
+        assert store.stats()["pending_writes"] == 0
+        assert len(db.upserts()) == 1
+
+    async def test_unwritten_and_live_tasks_are_served_from_memory(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        task = _task()
+        store.add(task)
+        assert await store.get("abc") is task
+
+        store.release(task)
+        await store.flush()
+        assert await store.get("abc") is None
+        assert db.gets == ["abc"]
+
+    async def test_heartbeat_updates_only_tracking_columns(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        task = _task(status="running", peak_context_tokens=5000)
+        store.save(task)
+        await store.flush()
+
+        await store.heartbeat(task)
+        sql, params = db.statements[-1]
+        assert sql.startswith("UPDATE claude_code_tasks SET heartbeat=")
+        assert "prompt" not in sql and "result" not in sql
+        assert params["peak_context_tokens"] == 5000
+
+    async def test_heartbeat_before_first_write_queues_full_save(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        db.rowcount = 0
+        await store.heartbeat(_task())
+        await store.flush()
+        assert len(db.upserts()) == 1
+
+    async def test_deleted_task_is_not_written_again(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        task = _task()
+        store.add(task)
+        await store.delete(["abc"])
+        store.save(task)  # a cancelled run finishing afterwards
+        store.release(task)
+        await store.flush()
+
+        assert db.upserts() == []
+        assert db.statements[-1][0].startswith("DELETE FROM claude_code_tasks")
+        assert store._deleted == set()
+
+    async def test_tombstones_of_finished_tasks_are_dropped_after_delete(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        await store.delete(["old1", "old2"])
+        assert store._deleted == set()
+
+
+class TestMetaFileImport:
+    def _meta(self, path, task_id: str, **data) -> None:
+        with open(path, "w") as f:
+            json.dump({"task_id": task_id, "prompt": "p", **data}, f)
+
+    def test_reads_per_task_and_legacy_files(self, tmp_path):
+        chain = tmp_path / "root1"
+        chain.mkdir()
+        self._meta(chain / "task_meta_root1.json", "root1", user_id="u1")
+        self._meta(
+            chain / "task_meta_child1.json", "child1", user_id="u1",
+            parent_task_id="root1", context_tracking={"num_turns": 7},
+        )
+        (chain / "task_meta_broken.json").write_text("{")
+        legacy = tmp_path / "old1"
+        legacy.mkdir()
+        self._meta(legacy / "task_meta.json", "old1", status="completed")
+        hidden = tmp_path / ".git_mirrors"
+        hidden.mkdir()
+        self._meta(hidden / "task_meta_x.json", "x")
+
+        tasks = {t.id: t for t in read_meta_files(str(tmp_path))}
+        assert sorted(tasks) == ["child1", "old1", "root1"]
+        assert tasks["child1"].parent_task_id == "root1"
+        assert tasks["child1"].num_turns_tracked == 7
+        assert tasks["old1"].status == "completed"
+
+    async def test_recover_imports_once_and_fails_interrupted_runs(self, tmp_path):
+        ws = tmp_path / "abc"
+        ws.mkdir()
+        self._meta(ws / "task_meta_abc.json", "abc", status="running")
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+
+        await store.recover(str(tmp_path))
+        assert os.path.exists(tmp_path / IMPORT_MARKER)
+        sqls = [sql for sql, _ in db.statements]
+        assert sqls[0].startswith("INSERT") and "ON CONFLICT (id) DO NOTHING" in sqls[0]
+        assert sqls[1].startswith("UPDATE claude_code_tasks SET status=")
+
+        await store.recover(str(tmp_path))
+        assert [sql.split()[0] for sql, _ in db.statements] == ["INSERT", "UPDATE", "UPDATE"]
+
+
+class TestTaskQueries:
+    def _sql(self, stmt) -> str:
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    def test_latest_per_chain_ranks_within_chain_root(self):
+        sql = self._sql(_list_query("u1", "completed", latest_per_chain=True))
+        assert (
+            "row_number() OVER (PARTITION BY coalesce(claude_code_tasks.parent_task_id, "
+            "claude_code_tasks.id) ORDER BY claude_code_tasks.created_at DESC)"
+        ) in sql
+        assert "claude_code_tasks.status = " in sql
+
+    def test_status_count_is_one_aggregate(self):
+        sql = self._sql(_count_query("u1", ["running", "queued"]))
+        assert sql.startswith("SELECT count(*) AS count_1 \nFROM claude_code_tasks")
+        assert "claude_code_tasks.status IN (__[POSTCOMPILE_status_1])" in sql
+
+    async def test_list_without_limit_returns_every_task(self):
+        db = _FakeDb()
+        store = TaskStore(db.factory())
+        await store.list_page("u1", limit=None)
+        await store.list_page("u1", limit=20)
+        pages = [sql for sql, _ in db.statements if "ORDER BY" in sql]
+        assert "LIMIT ALL" in pages[0]
+        assert "LIMIT ALL" not in pages[1]
+
+    def test_workspace_count_is_one_aggregate(self):
+        sql = self._sql(_workspace_count_query("u1"))
+        assert sql.startswith(
+            "SELECT count(distinct(coalesce(claude_code_tasks.parent_task_id, claude_code_tasks.id)))"
+        )
+
+    def test_interrupted_sweep_index_is_partial(self):
+        index = next(
+            i for i in ClaudeCodeTask.__table__.indexes if i.name == "ix_claude_code_tasks_active"
+        )
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        assert "WHERE status IN ('queued', 'running')" in ddl
+
+    def test_task_fields_match_table_columns(self):
+        columns = {c.name for c in ClaudeCodeTask.__table__.columns}
+        fields = set(Task.__dataclass_fields__) - {"_asyncio_task"}
+        assert columns == fields
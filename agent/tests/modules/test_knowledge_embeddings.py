@@ -0,0 +1,78 @@
+"""Tests for the knowledge module's batched embedding paths."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from modules.knowledge import tools as knowledge_tools
+from modules.knowledge.tools import KnowledgeTools
+from shared.config import Settings
+from shared.models.memory import MemorySummary
+
+
+@pytest.fixture
+def embed_requests(monkeypatch):
+    """Route the module's HTTP calls to a fake core that embeds text as [len]."""
+    requests: list[tuple[str, dict]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        if request.url.path == "/embed/batch":
+            return httpx.Response(200, json={"embeddings": [[len(t)] for t in body["texts"]]})
+        return httpx.Response(200, json={"embedding": [len(body["text"])]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        knowledge_tools.httpx, "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    return requests
+
+
+def _tools(session) -> KnowledgeTools:
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return KnowledgeTools(factory, Settings(orchestrator_url="http://core"))
+
+
+class TestKnowledgeBatchEmbeddings:
+    async def test_remember_many_embeds_in_one_call(self, embed_requests):
+        session = MagicMock()
+        session.commit = AsyncMock()
+        result = await _tools(session).remember_many(
+            ["likes tea", "", "lives in Oslo"], user_id=str(uuid.uuid4()),
+        )
+
+        assert embed_requests == [("/embed/batch", {"texts": ["likes tea", "lives in Oslo"]})]
+        (memories,) = session.add_all.call_args.args
+        assert [(m.summary, m.embedding) for m in memories] == [
+            ("likes tea", [9]), ("lives in Oslo", [13]),
+        ]
+        assert result["stored"] == 2
+
+    async def test_recall_backfills_missing_embeddings(self, embed_requests):
+        uid = uuid.uuid4()
+        missing = [
+            MemorySummary(id=uuid.uuid4(), user_id=uid, summary=s, embedding=None)
+            for s in ("a", "bb")
+        ]
+        backfill, search = MagicMock(), MagicMock()
+        backfill.scalars.return_value.all.return_value = missing
+        search.scalars.return_value.all.return_value = []
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[backfill, search])
+
+        await _tools(session).recall("tea", user_id=str(uid))
+
+        assert [path for path, _ in embed_requests] == ["/embed", "/embed/batch"]
+        assert [m.embedding for m in missing] == [[1], [2]]
+        session.commit.assert_awaited_once()
@@ -0,0 +1,172 @@
+"""Tests for coalescing identical scheduler poll checks."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from modules.scheduler.http_clients import EXTERNAL_TARGET, SchedulerHttpClients
+from modules.scheduler.worker import _check_poll_module, _check_poll_url
+from shared.config import Settings
+from tests.modules.test_scheduler_worker import _make_job
+
+
+class _CountingHandler:
+    def __init__(self, payload: dict, delay: float = 0.02) -> None:
+        self.payload = payload
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return httpx.Response(200, json=self.payload)
+
+
+def _clients(handler, ttl: float = 5.0) -> SchedulerHttpClients:
+    return SchedulerHttpClients(
+        Settings(scheduler_poll_result_ttl_seconds=ttl),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def _task_status_job(user_id: uuid.UUID, **config):
+    return _make_job(
+        job_type="poll_module",
+        user_id=user_id,
+        check_config={
+            "module": "claude_code",
+            "tool": "claude_code.task_status",
+            "args": {"task_id": "t-1"},
+            **config,
+        },
+    )
+
+
+class TestCoalescer:
+    async def test_concurrent_identical_requests_share_one_call(self):
+        handler = _CountingHandler({"ok": True})
+        clients = _clients(handler)
+        responses = await asyncio.gather(*(
+            clients.request(EXTERNAL_TARGET, "GET", "http://status.example.com/",
+                            job_type="poll_url", timeout=5, coalesce_key="k")
+            for _ in range(5)
+        ))
+        assert handler.calls == 1
+        assert all(r.json() == {"ok": True} for r in responses)
+        assert clients.stats()["coalesced"] == {"calls": 1, "shared": 4, "cache_hits": 0}
+
+    async def test_result_is_reused_until_ttl_expires(self):
+        handler = _CountingHandler({"ok": True}, delay=0)
+        clients = _clients(handler, ttl=0.05)
+
+        async def fetch():
+            return await clients.request(EXTERNAL_TARGET, "GET", "http://a/",
+                                         job_type="poll_url", timeout=5, coalesce_key="k")
+
+        await fetch()
+        await fetch()
+        assert handler.calls == 1
+        await asyncio.sleep(0.06)
+        await fetch()
+        assert handler.calls == 2
+
+    async def test_failures_are_shared_but_not_cached(self):
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("down")
+
+        clients = _clients(handler)
+
+        async def fetch():
+            return await clients.request(EXTERNAL_TARGET, "GET", "http://a/",
+                                         job_type="poll_url", timeout=5, coalesce_key="k")
+
+        results = await asyncio.gather(fetch(), fetch(), return_exceptions=True)
+        assert all(isinstance(r, httpx.ConnectError) for r in results)
+        assert calls == 1
+        with pytest.raises(httpx.ConnectError):
+            await fetch()
+        assert calls == 2
+
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        handler = _CountingHandler({"ok": True}, delay=0.05)
+        clients = _clients(handler)
+
+        def fetch():
+            return asyncio.ensure_future(clients.request(
+                EXTERNAL_TARGET, "GET", "http://a/",
+                job_type="poll_url", timeout=5, coalesce_key="k",
+            ))
+
+        leader = fetch()
+        await asyncio.sleep(0.01)
+        waiters = [fetch(), fetch()]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        responses = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        assert all(r.json() == {"ok": True} for r in responses)
+        assert handler.calls == 2  # one waiter retried as the new leader
+
+
+class TestCoalescedChecks:
+    async def test_workflow_steps_watching_one_task_share_a_poll(self):
+        handler = _CountingHandler({
+            "tool_name": "claude_code.task_status", "success": True,
+            "result": {"status": "completed", "exit_code": 0},
+        })
+        clients = _clients(handler)
+        user = uuid.uuid4()
+        jobs = [
+            _task_status_job(user),
+            _task_status_job(user, success_operator="eq", success_value="completed"),
+            _task_status_job(user, success_values=["failed"]),
+        ]
+        results = await asyncio.gather(*(
+            _check_poll_module(job, Settings(), clients) for job in jobs
+        ))
+        assert handler.calls == 1
+        # Each job still applies its own condition to the shared result
+        assert [met for met, _, _ in results] == [True, True, False]
+
+    async def test_different_users_are_not_coalesced(self):
+        handler = _CountingHandler({
+            "tool_name": "claude_code.task_status", "success": True,
+            "result": {"status": "running"},
+        })
+        clients = _clients(handler)
+        await asyncio.gather(
+            _check_poll_module(_task_status_job(uuid.uuid4()), Settings(), clients),
+            _check_poll_module(_task_status_job(uuid.uuid4()), Settings(), clients),
+        )
+        assert handler.calls == 2
+
+    async def test_poll_url_get_is_shared_across_users(self):
+        handler = _CountingHandler({"state": "green"})
+        clients = _clients(handler)
+        jobs = [
+            _make_job(job_type="poll_url", user_id=uuid.uuid4(), check_config={
+                "url": "https://status.example.com/api", "response_field": "state",
+                "response_value": value,
+            })
+            for value in ("green", "red", "green")
+        ]
+        results = await asyncio.gather(*(_check_poll_url(job, clients) for job in jobs))
+        assert handler.calls == 1
+        assert [met for met, _ in results] == [True, False, True]
+
+    async def test_poll_url_post_is_never_shared(self):
+        handler = _CountingHandler({})
+        clients = _clients(handler)
+        job = _make_job(job_type="poll_url", check_config={"url": "http://a/", "method": "POST"})
+        await asyncio.gather(_check_poll_url(job, clients), _check_poll_url(job, clients))
+        assert handler.calls == 2
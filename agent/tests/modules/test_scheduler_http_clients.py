@@ -0,0 +1,114 @@
+"""Tests for the scheduler worker's pooled HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from modules.scheduler import http_clients as http_mod
+from modules.scheduler.http_clients import EXTERNAL_TARGET, SchedulerHttpClients
+from modules.scheduler.worker import _check_poll_module
+from shared.config import Settings
+from tests.modules.test_scheduler_worker import _make_job
+
+
+def _clients(handler, **overrides) -> SchedulerHttpClients:
+    return SchedulerHttpClients(Settings(**overrides), transport=httpx.MockTransport(handler))
+
+
+class TestPooledClients:
+    async def test_one_client_per_target_is_reused(self):
+        clients = _clients(lambda request: httpx.Response(200, json={}))
+        for _ in range(3):
+            await clients.request(
+                "claude_code", "POST", "http://claude-code:8000/execute",
+                job_type="poll_module", timeout=5,
+            )
+        assert list(clients._clients) == ["claude_code"]
+        assert clients.stats()["job_types"]["poll_module"]["requests"] == 3
+        await clients.aclose()
+
+    async def test_external_client_sends_no_service_token(self, monkeypatch):
+        monkeypatch.setattr(
+            http_mod, "get_service_auth_headers", lambda: {"Authorization": "Bearer secret"}
+        )
+        seen: dict[str, str | None] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen[request.url.host] = request.headers.get("authorization")
+            return httpx.Response(200)
+
+        clients = _clients(handler)
+        await clients.request("research", "POST", "http://research:8000/execute",
+                              job_type="poll_module", timeout=5)
+        await clients.request(EXTERNAL_TARGET, "GET", "https://status.example.com/",
+                              job_type="poll_url", timeout=5)
+        assert seen == {"research": "Bearer secret", "status.example.com": None}
+        await clients.aclose()
+
+    async def test_jobs_on_the_same_host_do_not_share_cookies(self):
+        sent: list[str | None] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.headers.get("cookie"))
+            return httpx.Response(200, headers={"Set-Cookie": "session=user-a; Path=/"})
+
+        clients = _clients(handler)
+        for job in ("job-a", "job-b"):
+            await clients.request(EXTERNAL_TARGET, "GET", f"https://status.example.com/{job}",
+                                  job_type="poll_url", timeout=5)
+        assert sent == [None, None]
+        await clients.aclose()
+
+    async def test_concurrency_is_capped_per_host(self):
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        clients = _clients(handler, scheduler_http_max_per_host=2)
+        await asyncio.gather(*(
+            clients.request("claude_code", "POST", "http://claude-code:8000/execute",
+                            job_type="poll_module", timeout=5)
+            for _ in range(6)
+        ))
+        assert peak == 2
+        assert clients.stats()["hosts"]["claude-code:8000"] == {"in_use": 0, "queued": 0}
+        await clients.aclose()
+
+    async def test_server_errors_are_counted(self):
+        clients = _clients(lambda request: httpx.Response(503))
+        resp = await clients.request(EXTERNAL_TARGET, "GET", "http://example.com/",
+                                     job_type="poll_url", timeout=5)
+        assert resp.status_code == 503
+        stats = clients.stats()["job_types"]["poll_url"]
+        assert stats["requests"] == 1 and stats["errors"] == 1
+        await clients.aclose()
+
+
+class TestPollModuleUsesPool:
+    async def test_poll_module_goes_through_module_client(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/execute"
+            return httpx.Response(200, json={
+                "tool_name": "claude_code.task_status",
+                "success": True,
+                "result": {"status": "completed"},
+            })
+
+        clients = _clients(handler)
+        job = _make_job(
+            job_type="poll_module",
+            check_config={"module": "claude_code", "tool": "task_status", "args": {"task_id": "t"}},
+        )
+        met, failed, result = await _check_poll_module(job, Settings(), clients)
+
+        assert (met, failed, result) == (True, False, {"status": "completed"})
+        assert "claude_code" in clients._clients
+        await clients.aclose()
@@ -0,0 +1,203 @@
+"""Tests for event-driven scheduler wakeups and immediate webhook completion."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from modules.scheduler import tools as tools_mod
+from modules.scheduler.tools import SchedulerTools
+from modules.scheduler.wakeup import WakeupTimer, expedite_task_polls
+from modules.scheduler.worker import WEBHOOK_TRIGGER_KEY, _EvaluatorPool, _evaluate_job
+from shared.config import Settings
+from tests.modules.test_scheduler_worker import _make_job
+
+
+def _in(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+class TestWakeupTimer:
+    async def test_sleeps_until_earliest_due_time(self):
+        timer = WakeupTimer()
+        timer.push(_in(5))
+        timer.push(_in(0.05))
+        started = time.monotonic()
+        await timer.wait(max_seconds=10)
+        assert 0.04 <= time.monotonic() - started < 1
+        assert timer.next_due() > datetime.now(timezone.utc)
+
+    async def test_earlier_push_cuts_sleep_short(self):
+        timer = WakeupTimer()
+        timer.push(_in(10))
+
+        async def push_soon():
+            await asyncio.sleep(0.05)
+            timer.push(_in(0))
+
+        started = time.monotonic()
+        await asyncio.gather(timer.wait(max_seconds=10), push_soon())
+        assert time.monotonic() - started < 1
+
+    async def test_later_push_does_not_end_wait(self):
+        timer = WakeupTimer()
+        timer.push(_in(0.1))
+
+        async def push_later():
+            await asyncio.sleep(0.01)
+            timer.push(_in(10))
+
+        started = time.monotonic()
+        await asyncio.gather(timer.wait(max_seconds=10), push_later())
+        assert 0.09 <= time.monotonic() - started < 1
+
+    async def test_wake_returns_immediately(self):
+        timer = WakeupTimer()
+        timer.wake()
+        started = time.monotonic()
+        await timer.wait(max_seconds=10)
+        assert time.monotonic() - started < 0.05
+
+    async def test_overdue_time_still_sleeps_the_minimum(self):
+        timer = WakeupTimer()
+        timer.push(_in(-30))
+        started = time.monotonic()
+        await timer.wait(max_seconds=10, min_seconds=0.1)
+        assert 0.09 <= time.monotonic() - started < 1
+        assert timer.next_due() is None
+
+    async def test_idle_wait_is_capped(self):
+        started = time.monotonic()
+        await WakeupTimer().wait(max_seconds=0.05)
+        assert time.monotonic() - started < 1
+
+    async def test_evaluated_jobs_feed_their_next_run_into_the_heap(self):
+        timer = WakeupTimer()
+        pool = _EvaluatorPool(2, on_result=timer.push)
+        next_run = _in(30)
+
+        async def evaluate():
+            return next_run
+
+        pool.spawn(evaluate())
+        await pool.drain()
+        await asyncio.sleep(0)
+        assert timer.next_due() == next_run
+
+
+class TestWebhookCompletion:
+    async def test_triggered_webhook_completes_with_payload(self):
+        job = _make_job(
+            job_type="webhook",
+            check_config={},
+            on_success_message="Deployed {result.ref}",
+            last_result={WEBHOOK_TRIGGER_KEY: {"payload": {"ref": "main"}}},
+        )
+        redis = AsyncMock()
+        await _evaluate_job(job, Settings(), redis)
+
+        assert job.status == "completed"
+        assert job.last_result == {"ref": "main"}
+        published = redis.publish.await_args.args[1]
+        assert "Deployed main" in published
+
+    async def test_untriggered_webhook_is_a_heartbeat(self):
+        job = _make_job(job_type="webhook", check_config={})
+        redis = AsyncMock()
+        await _evaluate_job(job, Settings(), redis)
+
+        assert job.status == "active"
+        assert job.next_run_at > datetime.now(timezone.utc)
+        redis.publish.assert_not_awaited()
+
+
+class TestToolsSignalWorker:
+    @pytest.fixture
+    def notify(self, monkeypatch):
+        notify = AsyncMock()
+        monkeypatch.setattr(tools_mod, "notify_scheduler", notify)
+        return notify
+
+    def _tools(self, job=None):
+        @asynccontextmanager
+        async def factory():
+            session = AsyncMock()
+            session.add = MagicMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            session.execute = AsyncMock(return_value=result)
+            yield session
+
+        return SchedulerTools(factory, Settings())
+
+    async def test_add_job_wakes_worker_at_first_run(self, notify):
+        await self._tools().add_job(
+            job_type="delay",
+            check_config={"delay_seconds": 2},
+            on_success_message="done",
+            interval_seconds=2,
+            platform="discord",
+            platform_channel_id="1",
+            user_id=str(uuid.uuid4()),
+        )
+        (when,), _ = notify.await_args
+        assert timedelta(0) < when - datetime.now(timezone.utc) <= timedelta(seconds=2)
+
+    async def test_trigger_webhook_makes_job_due_now(self, notify):
+        job = _make_job(job_type="webhook", check_config={}, next_run_at=_in(30))
+        result = await self._tools(job).trigger_webhook(
+            job_id=str(job.id), payload={"ref": "main"}, user_id=str(job.user_id),
+        )
+
+        assert result["status"] == "triggered"
+        assert job.status == "active"
+        assert job.last_result[WEBHOOK_TRIGGER_KEY]["payload"] == {"ref": "main"}
+        assert job.next_run_at <= datetime.now(timezone.utc)
+        notify.assert_awaited_once()
+
+    async def test_repeat_trigger_is_idempotent(self, notify):
+        job = _make_job(
+            job_type="webhook", check_config={},
+            last_result={WEBHOOK_TRIGGER_KEY: {"payload": None}},
+        )
+        result = await self._tools(job).trigger_webhook(
+            job_id=str(job.id), payload={"ref": "other"}, user_id=str(job.user_id),
+        )
+        assert result["status"] == "triggered"
+        assert job.last_result[WEBHOOK_TRIGGER_KEY]["payload"] is None
+        notify.assert_not_awaited()
+
+
+class TestTaskCompletionExpedite:
+    def _factory(self, rowcount: int):
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(rowcount=rowcount))
+
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        return factory, session
+
+    async def test_makes_matching_poll_jobs_due(self):
+        factory, session = self._factory(rowcount=2)
+        assert await expedite_task_polls(factory, ["task-1"]) == 2
+        session.commit.assert_awaited_once()
+
+        (stmt,), _ = session.execute.await_args
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE scheduled_jobs SET next_run_at")
+        assert "->>" in sql
+        assert "scheduled_jobs.job_type =" in sql
+
+    async def test_no_task_ids_skips_the_database(self):
+        factory, session = self._factory(rowcount=0)
+        assert await expedite_task_polls(factory, []) == 0
+        session.execute.assert_not_awaited()
@@ -2,26 +2,35 @@
 
 Covers: delay accuracy, result interpolation, permanent errors,
 transient error backoff, cron rescheduling, workflow sibling cancellation,
-poll_url JSON inspection, and condition operators.
+poll_url JSON inspection, condition operators, and SKIP LOCKED job
+leasing with bounded concurrent evaluation.
 """
 
 from __future__ import annotations
 
+import asyncio
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from modules.scheduler import worker
 from modules.scheduler.worker import (
+    _claim_due_jobs_query,
     _check_delay,
     _check_poll_url,
     _evaluate_condition,
     _get_nested_value,
     _interpolate_result,
+    _process_due_jobs,
+    _run_claimed_job,
     _summarize_result,
     validate_webhook_signature,
 )
+from shared.config import Settings
 from shared.models.scheduled_job import ScheduledJob
 
 
@@ -60,6 +69,7 @@ def _make_job(**kwargs) -> ScheduledJob:
         next_run_at=now,
         created_at=now,
         completed_at=None,
+        lease_expires_at=None,
     )
     defaults.update(kwargs)
     job = MagicMock(spec=ScheduledJob)
@@ -279,7 +289,7 @@ class TestCheckPollUrl:
         mock_client.__aexit__ = AsyncMock(return_value=False)
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("modules.scheduler.worker.httpx.AsyncClient", return_value=mock_client):
+        with patch("modules.scheduler.http_clients.httpx.AsyncClient", return_value=mock_client):
             condition_met, result_data = await _check_poll_url(job)
 
         assert condition_met is True
@@ -298,7 +308,7 @@ class TestCheckPollUrl:
         mock_client.__aexit__ = AsyncMock(return_value=False)
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("modules.scheduler.worker.httpx.AsyncClient", return_value=mock_client):
+        with patch("modules.scheduler.http_clients.httpx.AsyncClient", return_value=mock_client):
             condition_met, result_data = await _check_poll_url(job)
 
         assert condition_met is False
@@ -323,7 +333,7 @@ class TestCheckPollUrl:
         mock_client.__aexit__ = AsyncMock(return_value=False)
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("modules.scheduler.worker.httpx.AsyncClient", return_value=mock_client):
+        with patch("modules.scheduler.http_clients.httpx.AsyncClient", return_value=mock_client):
             condition_met, result_data = await _check_poll_url(job)
 
         assert condition_met is True
@@ -349,7 +359,7 @@ class TestCheckPollUrl:
         mock_client.__aexit__ = AsyncMock(return_value=False)
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("modules.scheduler.worker.httpx.AsyncClient", return_value=mock_client):
+        with patch("modules.scheduler.http_clients.httpx.AsyncClient", return_value=mock_client):
             condition_met, _ = await _check_poll_url(job)
 
         assert condition_met is False
@@ -374,7 +384,7 @@ class TestCheckPollUrl:
         mock_client.__aexit__ = AsyncMock(return_value=False)
         mock_client.get = AsyncMock(return_value=mock_resp)
 
-        with patch("modules.scheduler.worker.httpx.AsyncClient", return_value=mock_client):
+        with patch("modules.scheduler.http_clients.httpx.AsyncClient", return_value=mock_client):
             condition_met, _ = await _check_poll_url(job)
 
         assert condition_met is True
@@ -408,6 +418,256 @@ class TestWebhookSignature:
         assert validate_webhook_signature("wrongsecret", body, sig) is False
 
 
+# ---------------------------------------------------------------------------
+# Leasing and concurrent evaluation
+# ---------------------------------------------------------------------------
+
+class _FakeLeaseStore:
+    """In-memory stand-in for _claim_due_jobs: each job can be claimed once."""
+
+    def __init__(self, count: int) -> None:
+        now = datetime.now(timezone.utc)
+        lease = now + timedelta(seconds=300)
+        self.due = [(uuid.uuid4(), now, lease) for _ in range(count)]
+        self.requests: list[int] = []
+
+    async def claim(self, session_factory, settings, limit):
+        self.requests.append(limit)
+        claimed, self.due = self.due[:limit], self.due[limit:]
+        return claimed
+
+
+class TestJobLeasing:
+    def test_claim_query_skips_locked_and_leased_rows(self):
+        sql = str(
+            _claim_due_jobs_query(datetime.now(timezone.utc), 10)
+            .compile(dialect=postgresql.dialect())
+        )
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "scheduled_jobs.lease_expires_at IS NULL" in sql
+        assert "ORDER BY scheduled_jobs.next_run_at" in sql
+        assert "LIMIT" in sql
+
+    async def test_evaluations_are_bounded_by_pool_size(self, monkeypatch):
+        store = _FakeLeaseStore(20)
+        in_flight = peak = 0
+        evaluated: list = []
+
+        async def fake_run(job_id, session_factory, settings, redis, http=None, *, lease_expires_at):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            evaluated.append(job_id)
+            in_flight -= 1
+
+        monkeypatch.setattr(worker, "_claim_due_jobs", store.claim)
+        monkeypatch.setattr(worker, "_run_claimed_job", fake_run)
+
+        settings = Settings(scheduler_max_concurrent_jobs=4)
+        assert await _process_due_jobs(None, settings, AsyncMock()) == 20
+        assert len(evaluated) == 20
+        assert peak == 4
+        assert max(store.requests) <= 4
+
+    async def test_slow_job_does_not_stall_the_rest(self, monkeypatch):
+        store = _FakeLeaseStore(10)
+        slow_id = store.due[0][0]
+        finished: list = []
+
+        async def fake_run(job_id, session_factory, settings, redis, http=None, *, lease_expires_at):
+            await asyncio.sleep(0.3 if job_id == slow_id else 0.01)
+            finished.append(job_id)
+
+        monkeypatch.setattr(worker, "_claim_due_jobs", store.claim)
+        monkeypatch.setattr(worker, "_run_claimed_job", fake_run)
+
+        pool = worker._EvaluatorPool(2)
+        await _process_due_jobs(None, Settings(), AsyncMock(), pool)
+        # Everything except the slow job was claimed and ran on the free slot
+        assert len(finished) == 9
+        assert slow_id not in finished
+        await pool.drain()
+        assert finished[-1] == slow_id
+
+    async def test_crashed_evaluation_releases_lease(self, monkeypatch):
+        job = _make_job(lease_expires_at=datetime.now(timezone.utc))
+        sessions: list = []
+
+        @asynccontextmanager
+        async def factory():
+            session = AsyncMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            session.execute = AsyncMock(return_value=result)
+            sessions.append(session)
+            yield session
+
+        monkeypatch.setattr(
+            worker, "_evaluate_job", AsyncMock(side_effect=RuntimeError("boom"))
+        )
+        await _run_claimed_job(
+            job.id, factory, Settings(), AsyncMock(), lease_expires_at=job.lease_expires_at,
+        )
+
+        assert len(sessions) == 2
+        release = sessions[1].execute.await_args.args[0]
+        assert "lease_expires_at" in str(release)
+        sessions[1].commit.assert_awaited_once()
+        # Retried after a backoff rather than reclaimed in a tight loop
+        retry_at = release.compile().params["param_1"]
+        assert retry_at >= datetime.now(timezone.utc) + timedelta(seconds=job.interval_seconds)
+        assert "consecutive_failures=(scheduled_jobs.consecutive_failures +" in str(release)
+        assert release.compile().params["lease_expires_at_1"] == job.lease_expires_at
+
+    async def test_reschedule_keeps_a_next_run_moved_during_evaluation(self, monkeypatch):
+        claimed_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        job = _make_job(job_type="webhook", next_run_at=claimed_at)
+        sessions: list = []
+
+        @asynccontextmanager
+        async def factory():
+            session = AsyncMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            session.execute = AsyncMock(return_value=result)
+            sessions.append(session)
+            yield session
+
+        async def heartbeat(job, settings, redis, http=None):
+            job.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        monkeypatch.setattr(worker, "_evaluate_job", heartbeat)
+        await _run_claimed_job(
+            job.id, factory, Settings(), AsyncMock(), lease_expires_at=job.lease_expires_at,
+        )
+
+        write = sessions[1].execute.await_args.args[0].compile(dialect=postgresql.dialect())
+        assert (
+            "next_run_at=CASE WHEN (scheduled_jobs.next_run_at = %(next_run_at_1)s::TIMESTAMP WITH TIME ZONE)"
+            in str(write)
+        )
+        assert write.params["next_run_at_1"] == claimed_at
+
+    async def test_successful_evaluation_clears_lease(self, monkeypatch):
+        job = _make_job(lease_expires_at=datetime.now(timezone.utc))
+        sessions: list = []
+
+        @asynccontextmanager
+        async def factory():
+            session = AsyncMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            session.execute = AsyncMock(return_value=result)
+            sessions.append(session)
+            yield session
+
+        monkeypatch.setattr(worker, "_evaluate_job", AsyncMock())
+        await _run_claimed_job(
+            job.id, factory, Settings(), AsyncMock(), lease_expires_at=job.lease_expires_at,
+        )
+
+        write = sessions[1].execute.await_args.args[0]
+        # Only written while this worker still holds the lease it claimed
+        assert write.compile().params == {
+            "lease_expires_at": None,
+            "id_1": job.id,
+            "lease_expires_at_1": job.lease_expires_at,
+        }
+
+    async def test_lost_lease_drops_the_write_back(self, monkeypatch):
+        job = _make_job(lease_expires_at=datetime.now(timezone.utc), workflow_id=uuid.uuid4())
+        sessions: list = []
+
+        @asynccontextmanager
+        async def factory():
+            session = AsyncMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            # Another replica reclaimed the job: the guarded update matches nothing
+            result.one_or_none.return_value = None
+            session.execute = AsyncMock(return_value=result)
+            sessions.append(session)
+            yield session
+
+        async def fail(job, settings, redis, http=None):
+            job.status = "failed"
+
+        cancel_siblings = AsyncMock()
+        monkeypatch.setattr(worker, "_evaluate_job", fail)
+        monkeypatch.setattr(worker, "_cancel_workflow_siblings", cancel_siblings)
+        assert await _run_claimed_job(
+            job.id, factory, Settings(), AsyncMock(), lease_expires_at=job.lease_expires_at,
+        ) is None
+
+        cancel_siblings.assert_not_awaited()
+        sessions[1].commit.assert_not_awaited()
+
+    async def test_lease_is_renewed_during_a_long_evaluation(self, monkeypatch):
+        claimed = datetime.now(timezone.utc) + timedelta(seconds=1)
+        job = _make_job(lease_expires_at=claimed)
+        writes: list = []
+
+        @asynccontextmanager
+        async def factory():
+            session = AsyncMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            session.execute = AsyncMock(return_value=result)
+            yield session
+            writes.extend(call.args[0] for call in session.execute.await_args_list)
+
+        async def slow(job, settings, redis, http=None):
+            await asyncio.sleep(0.45)
+
+        monkeypatch.setattr(worker, "_evaluate_job", slow)
+        await _run_claimed_job(
+            job.id, factory, Settings(scheduler_lease_seconds=1), AsyncMock(),
+            lease_expires_at=claimed,
+        )
+
+        # load, one renewal a third of the way into the lease, write-back
+        renewal, write_back = (w.compile().params for w in writes[1:])
+        assert renewal["lease_expires_at_1"] == claimed
+        assert renewal["lease_expires_at"] > claimed
+        assert write_back["lease_expires_at_1"] == renewal["lease_expires_at"]
+
+    async def test_no_session_is_open_during_evaluation(self, monkeypatch):
+        job = _make_job(job_type="poll_url", attempts=2)
+        open_sessions = 0
+        writes: list = []
+
+        @asynccontextmanager
+        async def factory():
+            nonlocal open_sessions
+            session = AsyncMock()
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = job
+            session.execute = AsyncMock(return_value=result)
+            open_sessions += 1
+            try:
+                yield session
+            finally:
+                open_sessions -= 1
+            writes.extend(call.args[0] for call in session.execute.await_args_list)
+
+        async def evaluate(job, settings, redis, http=None):
+            assert open_sessions == 0
+            job.attempts += 1
+            job.consecutive_failures = 0
+
+        monkeypatch.setattr(worker, "_evaluate_job", evaluate)
+        await _run_claimed_job(
+            job.id, factory, Settings(), AsyncMock(), lease_expires_at=job.lease_expires_at,
+        )
+
+        params = writes[-1].compile().params
+        # Only the columns the evaluation changed are written back
+        assert params["attempts"] == 3
+        assert "consecutive_failures" not in params
+        assert "last_result" not in params and "status" not in params
+
+
 # ---------------------------------------------------------------------------
 # Regression: platform args stripping (original test preserved)
 # ---------------------------------------------------------------------------